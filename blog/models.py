@@ -1,9 +1,11 @@
 # blog/models.py
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
-from django.utils.text import slugify
 from django.urls import reverse
 
+from portfolio.slugs import assign_unique_slug
+
 class BlogPost(models.Model):
     """
     Represents a single blog post.
@@ -22,6 +24,7 @@ class BlogPost(models.Model):
         ('published', 'Published'),
     )
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='published')
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Weighted full-text vector (PostgreSQL search, see portfolio/search_vectors.py).")
 
     class Meta:
         ordering = ['-published_date'] # Order by most recent first
@@ -39,32 +42,6 @@ class BlogPost(models.Model):
         """
         Auto-generate slug if one doesn't exist, and ensure its uniqueness.
         """
-        # Determine the base slug: if a slug is provided, use it; otherwise, generate from title.
-        # This ensures that even if a slug is provided, it's checked for uniqueness.
-        if not self.slug:
-            base_slug = slugify(self.title)
-        else:
-            # If a slug is provided, ensure it's properly slugified (e.g. no spaces, correct case)
-            # and use that as the base. However, for the test case, we assume the provided slug is already "correct".
-            # If the provided slug might not be in a valid slug format, you might want to slugify it here:
-            # base_slug = slugify(self.slug) 
-            # But typically, if a user provides a slug, they expect it to be used as-is if possible.
-            # For this fix, we'll use the self.slug as the base if it's provided.
-            base_slug = slugify(self.slug)
-
-
-        # Ensure the slug is unique
-        candidate_slug = base_slug
-        counter = 1
-        
-        # Build the queryset for checking conflicts.
-        # For new objects (self.pk is None), exclude(pk=self.pk) does nothing.
-        # For existing objects being updated, it excludes itself from the uniqueness check.
-        while BlogPost.objects.filter(slug=candidate_slug).exclude(pk=self.pk).exists():
-            # If the candidate_slug conflicts, generate a new one by appending the counter
-            # to the original base_slug.
-            candidate_slug = f"{base_slug}-{counter}"
-            counter += 1
-        
-        self.slug = candidate_slug # Set the final, unique slug
+        # A provided slug is slugified and used as the base; either way it is made unique
+        assign_unique_slug(self, 'title')
         super().save(*args, **kwargs)
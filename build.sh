@@ -21,6 +21,13 @@ echo "Running database migrations..."
 python manage.py migrate --no-input # && python manage.py import_data data/demos.csv --model_type demos --update # && python manage.py import_data data/skills.csv --model_type skills --update && python manage.py import_data data/topics.csv --model_type topics --update
 echo "Migrations finished."
 python manage.py initial_populate_all
+# Fill the PostgreSQL full-text search columns (no-op on other databases)
+python manage.py update_search_vectors
+# Precompute the sitemap index and its gzip-compressed sections (without SITEMAP_DOMAIN the
+# sitemap views generate them for each requested host on first use)
+if [ -n "$SITEMAP_DOMAIN" ]; then
+    python manage.py generate_sitemaps
+fi
 # --- Add Data Import/Update Commands Here ---
 # IMPORTANT: Use the --update flag to avoid duplicates on redeploy!
 # Adjust paths, model_type, and unique_field as needed for your CSVs.
@@ -1,6 +1,6 @@
 # demos/admin.py
 from django.contrib import admin
-from .models import Demo, DemoSection
+from .models import Demo, DemoSection, DemoJob
 
 class DemoSectionInline(admin.TabularInline): # Or admin.StackedInline
     model = DemoSection
@@ -68,3 +68,15 @@ class DemoSectionAdmin(admin.ModelAdmin):
             'fields': ('code_language', 'code_snippet_title', 'code_snippet', 'code_snippet_explanation')
         }),
     )
+
+
+@admin.register(DemoJob)
+class DemoJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    readonly_fields = ('id', 'kind', 'payload', 'input_file', 'result', 'error_message', 'attempts', 'created_at', 'started_at', 'finished_at')
+    fields = ('id', 'kind', 'status', 'payload', 'input_file', 'result', 'error_message', 'attempts', 'created_at', 'started_at', 'finished_at')
+    date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DemosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'demos'
+
+    def ready(self):
+        from . import signals  # noqa: F401 -- connects demo catalogue invalidation receivers
@@ -0,0 +1,144 @@
+# demos/catalog.py
+"""
+Precomputed catalogue of the demo cards listed by ``all_demos_list_view``.
+
+The catalogue merges the published ``Demo`` rows with ``HARDCODED_DEMO_ENTRIES``
+(the interactive demos that have their own views), resolves every URL once
+and sorts the cards by title. It lives in a VersionedContextCache
+('demo_catalog') that the Demo receivers in demos/signals.py invalidate, so a
+list page only slices the cached tuple: its cost does not depend on the
+number of demos, and a broken ``demo_url_name`` is logged once per rebuild
+instead of on every request.
+
+As before, nothing is listed while the database holds no published demo, and
+a hardcoded entry is left out when a database demo already links to its view.
+"""
+import logging
+
+from django.urls import NoReverseMatch, reverse
+
+from portfolio.context_cache import VersionedContextCache
+
+from .models import Demo
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_IMAGE = 'https://placehold.co/600x400/cccccc/ffffff?text=Preview+Not+Available'
+
+
+# Define your hardcoded demo entries here
+# The 'url_name' should match the 'name' attribute in your demos/urls.py path() definitions.
+# Ensure you have app_name = 'demos' in demos/urls.py for namespacing (e.g., 'demos:image_classifier').
+# Replace placeholder image_urls with actual paths to your static images.
+HARDCODED_DEMO_ENTRIES = [
+    {
+        'url_name': 'demos:image_classifier',
+        'title': 'Image Classification Demo',
+        'description': 'Upload an image and see predictions from a MobileNetV2 model.',
+        'image_url': 'https://placehold.co/600x400/6366f1/FFFFFF?text=Image+Classifier', # Replace with your static image path
+    },
+    {
+        'url_name': 'demos:sentiment_analyzer',
+        'title': 'Sentiment Analysis Demo',
+        'description': 'Analyze the sentiment of a piece of text using a pre-trained model.',
+        'image_url': 'https://placehold.co/600x400/10b981/FFFFFF?text=Sentiment+Analysis', # Replace with your static image path
+    },
+    {
+        'url_name': 'demos:data_analyser',
+        'title': 'Simple CSV Data Analyzer',
+        'description': 'Upload a CSV file to get basic data analysis and visualizations.',
+        'image_url': 'https://placehold.co/600x400/f59e0b/FFFFFF?text=Data+Analyser', # Replace with your static image path
+    },
+    {
+        'url_name': 'demos:data_wrangler',
+        'title': 'Simple Data Wrangling Demo',
+        'description': 'Upload a CSV and apply some basic data wrangling steps.',
+        'image_url': 'https://placehold.co/600x400/3b82f6/FFFFFF?text=Data+Wrangler',
+    },
+    {
+        'url_name': 'demos:explainable_ai',
+        'title': 'Explainable AI (Decision Tree)',
+        'description': 'See how a decision tree makes predictions and understand its feature importance.',
+        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Explainable+AI',
+    },
+    {
+        'url_name': 'demos:causal_inference',
+        'title': 'Causal Inference',
+        'description': 'This demo illustrates a common challenge in data analysis: estimating the true causal effect of an intervention.',
+        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Causal+Inference',
+    },
+    {
+        'url_name': 'demos:optimization_demo',
+        'title': 'Optimisation Demo',
+        'description': 'This demo uses scipy.optimize.minimize to find a local minimum of a mathematical function (Himmelblau\'s function)',
+        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Optimisation+Demo',
+    },
+    {
+        'url_name': 'demos:keras_nmt_demo',
+        'title': 'Keras NMT Demo',
+        'description': 'Keras NMT Demo: A step-by-step guide to building and running a simple English-to-German translator using Keras.',
+        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Keras+NMT+Demo',
+    },
+    {
+        'url_name': 'demos:amazon_price_tracker',
+        'title': 'Amazon Price Tracker Demo',
+        'description': 'Enter an Amazon product URL to track its price and simulate alerts.',
+        'image_url': 'https://placehold.co/600x400/06b6d4/FFFFFF?text=Price+Tracker',
+    },
+    { # New Flight Deal Finder Demo Entry
+        'url_name': 'demos:flight_deal_finder', # This name will be used in urls.py
+        'title': 'Flight Deal Finder Demo',
+        'description': 'Simulate finding cheap flight deals based on origin, destination, and target price using sample data.',
+        'image_url': 'https://placehold.co/600x400/38bdf8/FFFFFF?text=Flight+Deals', # Example placeholder
+    },
+    { # New Cybersecurity Demo Entry
+        'url_name': 'demos:cybersecurity_ds_demo', # The name of its path() in demos/urls.py
+        'title': 'Cybersecurity Demo',
+        'description': 'This demonstration explores the critical role of data science in modern cybersecurity, focusing on how data generated by tools like Nmap and Wireshark can be leveraged for enhanced threat detection',
+        'image_url': 'https://placehold.co/600x400/38bdf8/FFFFFF?text=Cybersecurity+Demo', # Example placeholder
+    },
+]
+
+
+def build_catalog():
+    """ Tuple of card dicts ({'id', 'title', 'description', 'image_url', 'detail_url'}) sorted by title. """
+    db_demos = Demo.objects.filter(is_published=True).order_by('order', 'title').only(
+        'slug', 'title', 'description', 'image_url', 'demo_url_name',
+    )
+    cards = [
+        {
+            'id': f"db_{demo.slug}",
+            'title': demo.title,
+            'description': demo.description or "Detailed content available.",
+            'image_url': demo.image_url or PLACEHOLDER_IMAGE,
+            'detail_url': demo.get_absolute_url(),
+        }
+        for demo in db_demos
+    ]
+    if not cards:
+        logger.info("No demos found in the database. Hardcoded demos will not be listed either.")
+        return ()
+
+    listed_urls = {card['detail_url'] for card in cards}
+    for demo_def in HARDCODED_DEMO_ENTRIES:
+        try:
+            detail_url = reverse(demo_def['url_name'])
+        except NoReverseMatch as e:
+            logger.error(f"Error processing hardcoded demo '{demo_def.get('title', 'Unknown')}': {e}")
+            continue
+        if detail_url in listed_urls:
+            continue # A database demo already links to this view
+        listed_urls.add(detail_url)
+        cards.append({
+            'id': f"hc_{demo_def['url_name'].replace(':', '_')}",
+            'title': demo_def.get('title', 'Untitled Interactive Demo'),
+            'description': demo_def.get('description', 'No description available.'),
+            'image_url': demo_def.get('image_url', PLACEHOLDER_IMAGE),
+            'detail_url': detail_url,
+        })
+    cards.sort(key=lambda card: card['title'].lower())
+    return tuple(cards)
+
+
+# Invalidated by the Demo post_save/post_delete receivers in demos/signals.py
+demo_catalog_cache = VersionedContextCache('demo_catalog', build_catalog)
@@ -0,0 +1,267 @@
+# demos/csv_analysis.py
+"""
+Chunked CSV profiling for the data analyser and data wrangling demos.
+
+Uploads are read with ``pd.read_csv(chunksize=...)`` so memory stays bounded
+by the chunk size rather than the file size. Column types are inferred from a
+sample of the first rows; every chunk then updates per-column summaries:
+non-null counts, mean/variance (merged with Chan's parallel formula),
+min/max, a reservoir-sampled quantile sketch (exact while the column has
+fewer values than the reservoir holds) and a fixed-size histogram whose bin
+width doubles when later values fall outside its range.
+
+A column that looks numeric in the sample but holds text further down is
+demoted to ``object`` and its numeric statistics are dropped, mirroring how
+``pd.read_csv`` would type the full column.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_SAMPLE_ROWS = 1_000
+DEFAULT_SKETCH_SIZE = 10_000
+DEFAULT_HISTOGRAM_BINS = 32
+
+
+class QuantileSketch:
+    """ Fixed-size uniform reservoir of the values seen so far, used for approximate quantiles. """
+
+    def __init__(self, capacity=DEFAULT_SKETCH_SIZE, seed=0):
+        self.capacity = capacity
+        self.seen = 0
+        self._values = np.empty(0, dtype=float)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        room = self.capacity - self._values.size
+        if room > 0:
+            self._values = np.concatenate([self._values, values[:room]])
+            self.seen += min(room, values.size)
+            values = values[room:]
+        if values.size:
+            # Algorithm R, vectorised: item i (0-based overall) replaces slot j ~ U[0, i] if j < capacity
+            positions = np.arange(self.seen, self.seen + values.size)
+            slots = self._rng.integers(0, positions + 1)
+            keep = slots < self.capacity
+            self._values[slots[keep]] = values[keep]
+            self.seen += values.size
+
+    @property
+    def exact(self):
+        return self.seen <= self.capacity
+
+    def quantile(self, q):
+        if not self._values.size:
+            return np.nan
+        return float(np.quantile(self._values, q))
+
+
+class StreamingHistogram:
+    """ Histogram with a fixed number of equal-width bins that widens its range as new data arrives. """
+
+    def __init__(self, bins=DEFAULT_HISTOGRAM_BINS):
+        if bins % 2:
+            raise ValueError("StreamingHistogram needs an even number of bins.")
+        self.bins = bins
+        self.start = None
+        self.width = None
+        self.counts = None
+
+    @property
+    def end(self):
+        return self.start + self.width * self.bins
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        if not values.size:
+            return
+        low, high = float(values.min()), float(values.max())
+        if self.counts is None:
+            self.start = low
+            self.width = (high - low) / self.bins or max(abs(low), 1.0) / self.bins
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+        while low < self.start or high > self.end:
+            self._double(grow_left=low < self.start)
+        index = np.clip(((values - self.start) / self.width).astype(np.int64), 0, self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+    def _double(self, grow_left):
+        """ Merges neighbouring bins pairwise, doubling the covered range to the left or right. """
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        padding = np.zeros(self.bins // 2, dtype=np.int64)
+        if grow_left:
+            self.start -= self.width * self.bins
+            self.counts = np.concatenate([padding, merged])
+        else:
+            self.counts = np.concatenate([merged, padding])
+        self.width *= 2
+
+    def edges_and_counts(self):
+        """ Bin edges and counts with empty bins at either end trimmed off. """
+        if self.counts is None or not self.counts.any():
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        filled = np.flatnonzero(self.counts)
+        first, last = filled[0], filled[-1] + 1
+        edges = self.start + self.width * np.arange(first, last + 1)
+        return edges, self.counts[first:last]
+
+
+class ColumnSummary:
+    def __init__(self, name, dtype, sketch_size=DEFAULT_SKETCH_SIZE, histogram_bins=DEFAULT_HISTOGRAM_BINS):
+        self.name = name
+        self.dtype = str(dtype)
+        self.numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        self.non_null = 0
+        self.nulls = 0
+        # Numeric statistics
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(sketch_size) if self.numeric else None
+        self.histogram = StreamingHistogram(histogram_bins) if self.numeric else None
+
+    def coerce(self, series):
+        """ Returns the chunk's column as numbers for numeric columns, demoting the column if that loses values. """
+        if not self.numeric or pd.api.types.is_numeric_dtype(series.dtype):
+            return series
+        converted = pd.to_numeric(series, errors='coerce')
+        if converted.notna().sum() < series.notna().sum():
+            self._demote()
+            return series
+        return converted
+
+    def _demote(self):
+        self.numeric = False
+        self.dtype = 'object'
+        self.sketch = None
+        self.histogram = None
+
+    def update(self, series):
+        series = self.coerce(series)
+        non_null = int(series.notna().sum())
+        self.non_null += non_null
+        self.nulls += len(series) - non_null
+        if not self.numeric:
+            return
+        if self.dtype.startswith('int') and (non_null < len(series) or not pd.api.types.is_integer_dtype(series.dtype)):
+            self.dtype = 'float64'
+        values = series.dropna().to_numpy(dtype=float)
+        if not values.size:
+            return
+        # Chan et al. pairwise update of count/mean/M2
+        chunk_n, chunk_mean = values.size, float(values.mean())
+        chunk_m2 = float(((values - chunk_mean) ** 2).sum())
+        total = self.n + chunk_n
+        delta = chunk_mean - self.mean
+        self.mean += delta * chunk_n / total
+        self.m2 += chunk_m2 + delta * delta * self.n * chunk_n / total
+        self.n = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+        self.histogram.update(values)
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else np.nan
+
+    def median(self):
+        return self.sketch.quantile(0.5) if self.numeric else np.nan
+
+    def describe(self):
+        if not self.n:
+            return [0.0] + [np.nan] * 7
+        return [
+            float(self.n), self.mean, self.std, self.min,
+            self.sketch.quantile(0.25), self.sketch.quantile(0.5), self.sketch.quantile(0.75), self.max,
+        ]
+
+
+class CSVProfile:
+    """ Result of ``profile_csv``: row count, the first rows and a ColumnSummary per column. """
+
+    DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+    def __init__(self, columns, head):
+        self.columns = columns
+        self.head = head
+        self.rows = 0
+        self.chunks = 0
+
+    @property
+    def shape(self):
+        return (self.rows, len(self.columns))
+
+    @property
+    def column_names(self):
+        return list(self.columns)
+
+    def numeric_columns(self):
+        return [summary for summary in self.columns.values() if summary.numeric]
+
+    def describe_frame(self):
+        """ Same layout as ``DataFrame.describe()`` for the numeric columns (None if there are none). """
+        numeric = self.numeric_columns()
+        if not numeric:
+            return None
+        return pd.DataFrame({summary.name: summary.describe() for summary in numeric}, index=self.DESCRIBE_INDEX)
+
+    def info_text(self):
+        """ A ``DataFrame.info()``-style summary built from the streamed counts. """
+        summaries = list(self.columns.values())
+        name_width = max([len('Column')] + [len(str(s.name)) for s in summaries])
+        count_width = max([len('Non-Null Count')] + [len(f"{s.non_null} non-null") for s in summaries])
+        lines = [
+            "<class 'pandas.core.frame.DataFrame'>",
+            f"RangeIndex: {self.rows} entries" + (f", 0 to {self.rows - 1}" if self.rows else ""),
+            f"Data columns (total {len(summaries)} columns):",
+            f" #   {'Column':<{name_width}}  {'Non-Null Count':<{count_width}}  Dtype",
+            f"---  {'-' * 6:<{name_width}}  {'-' * 14:<{count_width}}  -----",
+        ]
+        for position, summary in enumerate(summaries):
+            non_null = f"{summary.non_null} non-null"
+            lines.append(f" {position:<3} {str(summary.name):<{name_width}}  {non_null:<{count_width}}  {summary.dtype}")
+        dtype_counts = {}
+        for summary in summaries:
+            dtype_counts[summary.dtype] = dtype_counts.get(summary.dtype, 0) + 1
+        lines.append("dtypes: " + ", ".join(f"{dtype}({count})" for dtype, count in sorted(dtype_counts.items())))
+        lines.append(f"read in {self.chunks} chunk(s)")
+        return "\n".join(lines) + "\n"
+
+
+def _rewind(file):
+    if hasattr(file, 'seek'):
+        file.seek(0)
+
+
+def iter_chunks(file, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """ Yields DataFrames of at most ``chunk_rows`` rows, starting from the beginning of ``file``. """
+    _rewind(file)
+    with pd.read_csv(file, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def profile_csv(file, chunk_rows=DEFAULT_CHUNK_ROWS, sample_rows=DEFAULT_SAMPLE_ROWS, head_rows=5,
+                sketch_size=DEFAULT_SKETCH_SIZE, histogram_bins=DEFAULT_HISTOGRAM_BINS):
+    """
+    Streams a CSV file (path or seekable file object) and returns a CSVProfile.
+    Raises ``pd.errors.EmptyDataError`` for empty files, like ``pd.read_csv``.
+    """
+    _rewind(file)
+    sample = pd.read_csv(file, nrows=sample_rows)
+    profile = CSVProfile(
+        {name: ColumnSummary(name, dtype, sketch_size, histogram_bins) for name, dtype in sample.dtypes.items()},
+        sample.head(head_rows),
+    )
+    del sample
+    for chunk in iter_chunks(file, chunk_rows):
+        profile.rows += len(chunk)
+        profile.chunks += 1
+        for name, summary in profile.columns.items():
+            summary.update(chunk[name])
+    _rewind(file)
+    return profile
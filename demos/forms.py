@@ -1,5 +1,6 @@
 # demos/forms.py
 from django import forms
+from django.conf import settings
 from django.core.validators import RegexValidator
 
 # Validator for IATA codes (3 uppercase letters)
@@ -39,6 +40,12 @@ class CSVUploadForm(forms.Form):
             'accept': '.csv' # Suggest only CSV files
         })
     )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        max_mb = getattr(settings, 'DEMO_CSV_MAX_UPLOAD_MB', 200)
+        self.fields['csv_file'].help_text = f'(Max size: {max_mb}MB, must contain headers)'
+
     # Optional: Add fields for user to select columns for analysis later
     # numerical_col = forms.CharField(label='Numerical Column for Histogram', max_length=100, required=False)
     # categorical_col = forms.CharField(label='Categorical Column for Bar Chart', max_length=100, required=False)
@@ -0,0 +1,245 @@
+# demos/inference.py
+"""
+Micro-batched inference for the image classification and sentiment demos.
+
+Requests are queued on a ``MicroBatcher``; a background thread waits up to
+``DEMO_INFERENCE_MAX_WAIT_MS`` for more requests to arrive and then runs one
+batched forward pass over at most ``DEMO_INFERENCE_MAX_BATCH`` inputs.
+
+When ``settings.DEMO_INFERENCE_ADDRESS`` is set, the views send their inputs
+to a dedicated worker process (``manage.py run_inference_worker``) over a
+local socket, so web workers never hold the models and concurrent demo
+requests share batched calls there. If no address is configured, or the
+worker cannot be reached, inference runs in-process through the same batch
+functions. A worker that accepts a request but does not answer within
+``DEMO_INFERENCE_TIMEOUT`` (plus a small margin) raises ``InferenceError``.
+"""
+import hashlib
+import io
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+from django.conf import settings
+
+from .model_registry import model_registry, IMAGE_CLASSIFIER, SENTIMENT_PIPELINE
+
+logger = logging.getLogger(__name__)
+
+IMAGE_TASK = 'image_classification'
+SENTIMENT_TASK = 'sentiment_analysis'
+REMOTE_TIMEOUT_MARGIN = 5 # Seconds on top of DEMO_INFERENCE_TIMEOUT, so the worker's own timeout answers first
+
+
+class InferenceError(Exception):
+    """ Raised when an inference request fails (in-process or in the worker). """
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# --- Batch functions: take a list of inputs, return one result (or exception) per input ---
+
+def classify_image_batch(images, top=3):
+    """ Classifies a batch of raw image bytes with MobileNetV2 in a single predict() call. """
+    classifier = model_registry.get(IMAGE_CLASSIFIER)
+    results = [None] * len(images)
+    arrays, positions = [], []
+    for i, image_bytes in enumerate(images):
+        try:
+            img = classifier.load_img(io.BytesIO(image_bytes), target_size=(224, 224))
+            arrays.append(classifier.img_to_array(img))
+            positions.append(i)
+        except Exception as e:
+            results[i] = InferenceError(f"Could not read image: {e}")
+    if arrays:
+        batch = classifier.preprocess_input(np.stack(arrays))
+        predictions = classifier.model.predict(batch)
+        decoded = classifier.decode_predictions(predictions, top=top)
+        for i, item in zip(positions, decoded):
+            results[i] = [{'label': label.replace('_', ' '), 'probability': float(prob) * 100} for (_, label, prob) in item]
+    return results
+
+
+def sentiment_batch(texts):
+    """ Runs the sentiment pipeline over a list of texts in one call. """
+    sentiment_pipeline = model_registry.get(SENTIMENT_PIPELINE)
+    outputs = sentiment_pipeline(list(texts))
+    if not outputs or len(outputs) != len(texts):
+        return [InferenceError("Could not analyze sentiment for the provided text.")] * len(texts)
+    return [dict(output) for output in outputs]
+
+
+BATCH_FUNCTIONS = {
+    IMAGE_TASK: classify_image_batch,
+    SENTIMENT_TASK: sentiment_batch,
+}
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into batched calls of ``batch_fn``.
+    ``submit()`` returns a Future resolved with the item's result.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=16, max_wait=0.01, name="batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._start_lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name=f"inference-{self.name}", daemon=True)
+                    self._thread.start()
+
+    def submit(self, item):
+        future = Future()
+        self._ensure_started()
+        self._queue.put((item, future))
+        return future
+
+    def _collect(self):
+        """ Blocks for the first item, then gathers more until the batch is full or max_wait elapses. """
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.batch_fn(items)
+            except Exception as e:
+                logger.error(f"Batched inference '{self.name}' failed for {len(items)} item(s): {e}", exc_info=True)
+                results = [e] * len(items)
+            for (_, future), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_batcher(task):
+    with _batchers_lock:
+        if task not in _batchers:
+            _batchers[task] = MicroBatcher(
+                BATCH_FUNCTIONS[task],
+                max_batch_size=_setting('DEMO_INFERENCE_MAX_BATCH', 16),
+                max_wait=_setting('DEMO_INFERENCE_MAX_WAIT_MS', 10) / 1000.0,
+                name=task,
+            )
+        return _batchers[task]
+
+
+# --- Worker process transport ---
+
+def _authkey():
+    return hashlib.sha256(f"demo-inference:{settings.SECRET_KEY}".encode('utf-8')).digest()
+
+
+def parse_address(address):
+    """ 'host:port' becomes a TCP address tuple; anything else is treated as a Unix socket path. """
+    host, sep, port = str(address).rpartition(':')
+    if sep and host and port.isdigit():
+        return (host, int(port))
+    return str(address)
+
+
+def serve(address, ready_callback=None):
+    """ Runs the inference worker: accepts connections and feeds their requests into the batchers. """
+    listener = Listener(parse_address(address), authkey=_authkey())
+    logger.info(f"Inference worker listening on {address}")
+    if ready_callback:
+        ready_callback(listener)
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                # Failed authentication handshakes and aborted connections
+                logger.warning(f"Inference worker rejected a connection: {e}")
+                continue
+            threading.Thread(target=_handle_connection, args=(conn,), daemon=True).start()
+    finally:
+        listener.close()
+
+
+def _handle_connection(conn):
+    timeout = _setting('DEMO_INFERENCE_TIMEOUT', 30)
+    try:
+        with conn:
+            while True:
+                try:
+                    task, payload = conn.recv()
+                except EOFError:
+                    return
+                try:
+                    result = get_batcher(task).submit(payload).result(timeout=timeout)
+                    conn.send(('ok', result))
+                except Exception as e:
+                    conn.send(('error', str(e) or e.__class__.__name__))
+    except Exception as e:
+        logger.warning(f"Inference worker connection error: {e}")
+
+
+def _run_remote(address, task, payload):
+    timeout = _setting('DEMO_INFERENCE_TIMEOUT', 30) + REMOTE_TIMEOUT_MARGIN
+    with Client(parse_address(address), authkey=_authkey()) as conn:
+        conn.send((task, payload))
+        if not conn.poll(timeout):
+            # A hung worker must not block the web worker: give up (closing the connection)
+            logger.error(f"Inference worker at {address} did not answer '{task}' within {timeout}s.")
+            raise InferenceError(f"The inference worker did not answer within {timeout} seconds.")
+        status, result = conn.recv()
+    if status != 'ok':
+        raise InferenceError(result)
+    return result
+
+
+def run_inference(task, payload):
+    """
+    Runs one inference request, through the worker process when configured and
+    reachable, otherwise through the in-process micro-batcher.
+    """
+    address = _setting('DEMO_INFERENCE_ADDRESS', None)
+    if address:
+        try:
+            return _run_remote(address, task, payload)
+        except (ConnectionError, OSError, EOFError) as e:
+            logger.warning(f"Inference worker at {address} unreachable ({e}); running '{task}' in-process.")
+    return get_batcher(task).submit(payload).result(timeout=_setting('DEMO_INFERENCE_TIMEOUT', 30))
+
+
+def classify_image(image_bytes):
+    """ Returns the top-3 ImageNet predictions for an image as [{'label', 'probability'}, ...]. """
+    return run_inference(IMAGE_TASK, image_bytes)
+
+
+def analyze_sentiment(text):
+    """ Returns the sentiment pipeline output for a text, e.g. {'label': 'POSITIVE', 'score': 0.99}. """
+    return run_inference(SENTIMENT_TASK, text)
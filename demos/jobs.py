@@ -0,0 +1,234 @@
+# demos/jobs.py
+"""
+Background execution for the slow demos.
+
+With ``settings.DEMO_JOBS_ENABLED`` the image classification, sentiment
+analysis, CSV analysis and Amazon price tracker views no longer do their
+work inside the request: they store a ``DemoJob`` row (plus the uploaded
+file, if any) and redirect to ``<demo page>?job=<id>``. That page polls
+``demos:job_status`` and reloads itself once the job has finished, at which
+point the view renders the stored result like a synchronous response.
+
+``manage.py run_demo_jobs`` claims pending jobs and runs them in a process
+pool. Handlers run in the pool processes and never touch the database; the
+worker's main process records results. Claiming uses a conditional UPDATE,
+so several workers can share one queue.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DemoJob
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CLASSIFICATION = 'image_classification'
+SENTIMENT_ANALYSIS = 'sentiment_analysis'
+CSV_ANALYSIS = 'csv_analysis'
+AMAZON_PRICE = 'amazon_price'
+
+# Demo page that renders each kind of job
+JOB_PAGES = {
+    IMAGE_CLASSIFICATION: 'demos:image_classifier',
+    SENTIMENT_ANALYSIS: 'demos:sentiment_analyzer',
+    CSV_ANALYSIS: 'demos:data_analyser',
+    AMAZON_PRICE: 'demos:amazon_price_tracker',
+}
+
+
+class JobError(Exception):
+    """ Raised in a pool process when a job handler crashes; carries a picklable message. """
+
+
+def jobs_enabled():
+    return getattr(settings, 'DEMO_JOBS_ENABLED', False)
+
+
+def enqueue(kind, payload=None, upload=None):
+    """ Creates a pending job; ``upload`` (an UploadedFile) is saved to storage for the worker. """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'.")
+    job = DemoJob(kind=kind, payload=payload or {})
+    if upload is not None:
+        job.input_file.save(upload.name, upload, save=False)
+    job.save()
+    return job
+
+
+# --- Handlers (executed in pool processes; they return the template context for the result) ---
+
+def _run_image_classification(payload, input_path):
+    from . import views
+    with open(input_path, 'rb') as f:
+        return views._classify_image_upload(f.read(), payload.get('content_type'))
+
+
+def _run_sentiment_analysis(payload, input_path):
+    from . import views
+    return views._analyse_sentiment_text(payload['text'])
+
+
+def _run_csv_analysis(payload, input_path):
+    from . import views
+    return views._analyse_csv_upload(input_path, payload['filename'])
+
+
+def _run_amazon_price(payload, input_path):
+    from . import views
+    target_price = payload.get('target_price')
+    return views._check_amazon_price(payload['product_url'], Decimal(target_price) if target_price else None)
+
+
+JOB_HANDLERS = {
+    IMAGE_CLASSIFICATION: _run_image_classification,
+    SENTIMENT_ANALYSIS: _run_sentiment_analysis,
+    CSV_ANALYSIS: _run_csv_analysis,
+    AMAZON_PRICE: _run_amazon_price,
+}
+
+
+def execute(kind, payload, input_path=None):
+    """ Runs one job handler. Unexpected errors are re-raised as JobError so they pickle cleanly. """
+    try:
+        return JOB_HANDLERS[kind](payload, input_path)
+    except Exception as e:
+        logger.error(f"Demo job '{kind}' crashed: {e}", exc_info=True)
+        raise JobError(f"{e.__class__.__name__}: {e}") from None
+
+
+# --- Queue operations (worker main process) ---
+
+def claim_jobs(limit):
+    """ Marks up to ``limit`` of the oldest pending jobs as running and returns them. """
+    claimed = []
+    if limit <= 0:
+        return claimed
+    candidates = DemoJob.objects.filter(status=DemoJob.STATUS_PENDING).order_by('created_at').values_list('pk', flat=True)[:limit]
+    for pk in list(candidates):
+        # Only one worker can win the conditional update
+        updated = DemoJob.objects.filter(pk=pk, status=DemoJob.STATUS_PENDING).update(
+            status=DemoJob.STATUS_RUNNING, started_at=timezone.now(), attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(DemoJob.objects.get(pk=pk))
+    return claimed
+
+
+def finish_job(job, result=None, error=None):
+    job.status = DemoJob.STATUS_FAILED if error else DemoJob.STATUS_SUCCEEDED
+    job.result = result
+    job.error_message = error or ''
+    job.finished_at = timezone.now()
+    if job.input_file:
+        job.input_file.delete(save=False)
+    job.save(update_fields=['status', 'result', 'error_message', 'finished_at', 'input_file'])
+
+
+def requeue_stale(older_than_seconds):
+    """ Puts jobs left 'running' by a crashed worker back in the queue. Returns the count. """
+    cutoff = timezone.now() - timedelta(seconds=older_than_seconds)
+    return DemoJob.objects.filter(status=DemoJob.STATUS_RUNNING, started_at__lt=cutoff).update(
+        status=DemoJob.STATUS_PENDING, started_at=None,
+    )
+
+
+def purge_finished(older_than_seconds):
+    """ Deletes finished jobs (and any leftover input files) older than the given age. """
+    cutoff = timezone.now() - timedelta(seconds=older_than_seconds)
+    removed = 0
+    for job in DemoJob.objects.filter(status__in=DemoJob.FINISHED_STATUSES, finished_at__lt=cutoff).iterator():
+        if job.input_file:
+            job.input_file.delete(save=False)
+        job.delete()
+        removed += 1
+    return removed
+
+
+def _input_path(job):
+    return job.input_file.path if job.input_file else None
+
+
+class JobWorker:
+    """
+    Polls the queue and runs jobs in a pool of ``processes`` worker processes
+    (``processes=0`` runs them in this process, which is handy for development).
+    """
+
+    def __init__(self, processes=2, poll_interval=1.0, stale_after=600, keep_finished=86400):
+        self.processes = processes
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.keep_finished = keep_finished
+        self.completed = 0
+        self.failed = 0
+
+    def _record(self, job, run):
+        try:
+            result = run()
+        except Exception as e:
+            finish_job(job, error=str(e) or e.__class__.__name__)
+            self.failed += 1
+        else:
+            finish_job(job, result=result)
+            self.completed += 1
+
+    def _new_pool(self):
+        # Forked pool processes must not share the parent's database connections
+        if not connection.in_atomic_block:
+            connections.close_all()
+        return ProcessPoolExecutor(max_workers=self.processes)
+
+    def run(self, once=False):
+        """ Processes jobs until interrupted (or, with ``once``, until the queue is empty). """
+        requeued = requeue_stale(self.stale_after)
+        if requeued:
+            logger.warning(f"Requeued {requeued} stale demo job(s).")
+        if self.processes <= 0:
+            return self._run_inline(once)
+        pool = self._new_pool()
+        running = {}
+        last_purge = time.monotonic()
+        try:
+            while True:
+                for job in claim_jobs(self.processes - len(running)):
+                    running[pool.submit(execute, job.kind, job.payload, _input_path(job))] = job
+                if not running:
+                    if once:
+                        break
+                    time.sleep(self.poll_interval)
+                else:
+                    done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    broken = False
+                    for future in done:
+                        job = running.pop(future)
+                        self._record(job, future.result)
+                        broken = broken or isinstance(future.exception(), BrokenProcessPool)
+                    if broken:
+                        logger.error("Demo job pool broke (a worker process died); starting a new pool.")
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = self._new_pool()
+                if self.keep_finished and time.monotonic() - last_purge > 3600:
+                    purge_finished(self.keep_finished)
+                    last_purge = time.monotonic()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return self.completed, self.failed
+
+    def _run_inline(self, once):
+        while True:
+            jobs = claim_jobs(1)
+            if not jobs:
+                if once:
+                    return self.completed, self.failed
+                time.sleep(self.poll_interval)
+                continue
+            job = jobs[0]
+            self._record(job, lambda: execute(job.kind, job.payload, _input_path(job)))
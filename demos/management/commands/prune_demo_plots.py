@@ -0,0 +1,23 @@
+# demos/management/commands/prune_demo_plots.py
+from django.core.management.base import BaseCommand
+
+from demos import plot_store
+
+
+class Command(BaseCommand):
+    help = (
+        'Deletes generated demo plot images that have not been saved or re-used recently. '
+        'Plots for the fixed demos are recreated on their next visit.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=float,
+            default=7,
+            help='Remove plots older than this many days (default: 7).'
+        )
+
+    def handle(self, *args, **options):
+        removed = plot_store.prune(options['days'] * 86400)
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} plot(s) from {plot_store.plot_root()}."))
@@ -0,0 +1,59 @@
+# demos/management/commands/run_demo_jobs.py
+from django.core.management.base import BaseCommand
+
+from demos.jobs import JobWorker, jobs_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs queued demo jobs (image classification, sentiment analysis, CSV analysis, '
+        'Amazon price checks) in a pool of worker processes. Views only queue jobs when '
+        'DEMO_JOBS_ENABLED is set.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=2,
+            help='Number of pool processes (default: 2). 0 runs jobs in this process.'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds between queue polls when idle (default: 1).'
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help="Requeue jobs left 'running' for longer than this many seconds at startup (default: 600)."
+        )
+        parser.add_argument(
+            '--keep-hours',
+            type=float,
+            default=24,
+            help='Delete finished jobs after this many hours (default: 24, 0 keeps them).'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty instead of polling forever.'
+        )
+
+    def handle(self, *args, **options):
+        if not jobs_enabled():
+            self.stdout.write(self.style.WARNING('DEMO_JOBS_ENABLED is off: views run demos synchronously and will not queue jobs.'))
+        worker = JobWorker(
+            processes=options['processes'],
+            poll_interval=options['poll_interval'],
+            stale_after=options['stale_after'],
+            keep_finished=int(options['keep_hours'] * 3600),
+        )
+        self.stdout.write(f"Running demo jobs with {options['processes']} process(es)...")
+        try:
+            completed, failed = worker.run(once=options['once'])
+        except KeyboardInterrupt:
+            completed, failed = worker.completed, worker.failed
+        self.stdout.write(self.style.SUCCESS(f"Demo jobs finished: {completed} succeeded, {failed} failed."))
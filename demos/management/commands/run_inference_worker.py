@@ -0,0 +1,45 @@
+# demos/management/commands/run_inference_worker.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from demos import inference
+from demos.model_registry import model_registry, IMAGE_CLASSIFIER, SENTIMENT_PIPELINE
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the demo inference worker. Web workers send image classification and sentiment '
+        'requests to it over a local socket (settings.DEMO_INFERENCE_ADDRESS), and concurrent '
+        'requests are micro-batched into single forward passes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--address',
+            type=str,
+            default=None,
+            help="Address to listen on: 'host:port' or a Unix socket path. Defaults to settings.DEMO_INFERENCE_ADDRESS."
+        )
+        parser.add_argument(
+            '--no-warm',
+            action='store_true',
+            help='Do not load the models before accepting connections.'
+        )
+
+    def handle(self, *args, **options):
+        address = options['address'] or getattr(settings, 'DEMO_INFERENCE_ADDRESS', None)
+        if not address:
+            raise CommandError("No address given. Pass --address or set DEMO_INFERENCE_ADDRESS.")
+
+        if not options['no_warm']:
+            for name, seconds, error in model_registry.warm([IMAGE_CLASSIFIER, SENTIMENT_PIPELINE]):
+                if error:
+                    self.stdout.write(self.style.WARNING(f"{name}: failed to load after {seconds:.2f}s ({error})"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"{name}: loaded in {seconds:.2f}s"))
+
+        self.stdout.write(self.style.SUCCESS(f"Inference worker listening on {address}"))
+        try:
+            inference.serve(address)
+        except KeyboardInterrupt:
+            self.stdout.write("Inference worker stopped.")
@@ -0,0 +1,50 @@
+# demos/management/commands/warm_demo_models.py
+from django.core.management.base import BaseCommand, CommandError
+
+from demos.model_registry import model_registry
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads the demo ML models through the model registry, downloading any pretrained '
+        'weights into the local framework caches so the first demo request does not pay for it. '
+        'Reports how long each model took to load.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models',
+            nargs='*',
+            help=f"Names of the models to warm (default: all). Available: {', '.join(model_registry.names())}."
+        )
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List the registered models and exit.'
+        )
+        parser.add_argument(
+            '--fail-on-error',
+            action='store_true',
+            help='Exit with an error if any model fails to load (useful in build scripts).'
+        )
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for name in model_registry.names():
+                self.stdout.write(f"{name}: {model_registry.describe(name)}")
+            return
+
+        unknown = [name for name in options['models'] if name not in model_registry.names()]
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(unknown)}. Available: {', '.join(model_registry.names())}.")
+
+        failures = []
+        for name, seconds, error in model_registry.warm(options['models']):
+            if error:
+                failures.append(name)
+                self.stdout.write(self.style.WARNING(f"{name}: failed after {seconds:.2f}s ({error})"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: loaded in {seconds:.2f}s"))
+
+        if failures and options['fail_on_error']:
+            raise CommandError(f"Failed to load: {', '.join(failures)}")
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:01
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('demos', '0002_rendered_markdown_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemoJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(help_text='Which demo computation to run (see demos.jobs.JOB_HANDLERS).', max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='JSON-serialisable inputs for the job.')),
+                ('input_file', models.FileField(blank=True, help_text='Uploaded input, deleted once the job finishes.', null=True, upload_to='demo_jobs/')),
+                ('result', models.JSONField(blank=True, help_text='Template context produced by the job.', null=True)),
+                ('error_message', models.TextField(blank=True, default='')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='demos_demoj_status_c99197_idx')],
+            },
+        ),
+    ]
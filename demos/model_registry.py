@@ -0,0 +1,187 @@
+# demos/model_registry.py
+"""
+Lazy registry for the ML models used by the demo views.
+
+Models are loaded the first time a view asks for them rather than when
+``demos.views`` is imported, so a worker that only serves blog or portfolio
+pages never imports TensorFlow or transformers. Loaded models that have not
+been used for ``settings.DEMO_MODEL_IDLE_TIMEOUT`` seconds are dropped on the
+next registry access (0/None disables eviction). ``warm_demo_models`` loads
+them ahead of traffic.
+"""
+import importlib.util
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def library_available(module_name):
+    """ True if a library can be imported, without importing it. """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class ModelUnavailable(Exception):
+    """ Raised when a registered model cannot be loaded. """
+
+
+class _Entry:
+    def __init__(self, name, loader, description):
+        self.name = name
+        self.loader = loader
+        self.description = description
+        self.model = None
+        self.loaded_at = None
+        self.last_used = None
+        self.error = None
+        self.failed_at = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """ Thread-safe registry of lazily loaded models, keyed by name. """
+
+    def __init__(self):
+        self._entries = {}
+
+    def register(self, name, loader, description=""):
+        self._entries[name] = _Entry(name, loader, description)
+
+    def names(self):
+        return list(self._entries)
+
+    def _entry(self, name):
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise ModelUnavailable(f"Unknown model '{name}'.")
+
+    @property
+    def idle_timeout(self):
+        return getattr(settings, 'DEMO_MODEL_IDLE_TIMEOUT', None)
+
+    @property
+    def retry_after(self):
+        # Seconds to wait before retrying a model whose load failed
+        return getattr(settings, 'DEMO_MODEL_RETRY_AFTER', 300)
+
+    def get(self, name):
+        """ Returns the loaded model, loading it on first use. Raises ModelUnavailable on failure. """
+        self.evict_idle(exclude=name)
+        entry = self._entry(name)
+        if entry.model is None:
+            with entry.lock:
+                if entry.model is None:
+                    if entry.error is not None and time.monotonic() - entry.failed_at < self.retry_after:
+                        raise ModelUnavailable(entry.error)
+                    started = time.monotonic()
+                    try:
+                        entry.model = entry.loader()
+                    except Exception as e:
+                        entry.error = str(e) or e.__class__.__name__
+                        entry.failed_at = time.monotonic()
+                        logger.error(f"Error loading demo model '{name}': {e}", exc_info=True)
+                        raise ModelUnavailable(entry.error) from e
+                    entry.error = None
+                    entry.loaded_at = time.time()
+                    logger.info(f"Demo model '{name}' loaded in {time.monotonic() - started:.2f}s.")
+        entry.last_used = time.monotonic()
+        return entry.model
+
+    def describe(self, name):
+        return self._entry(name).description
+
+    def is_loaded(self, name):
+        return self._entry(name).model is not None
+
+    def has_failed(self, name):
+        """ True if the last load attempt for this model raised an error. """
+        entry = self._entry(name)
+        return entry.model is None and entry.error is not None
+
+    def evict(self, name):
+        entry = self._entry(name)
+        with entry.lock:
+            if entry.model is not None:
+                entry.model = None
+                entry.loaded_at = None
+                logger.info(f"Demo model '{name}' evicted.")
+
+    def evict_idle(self, exclude=None):
+        """ Drops loaded models that have been idle longer than the configured timeout. """
+        timeout = self.idle_timeout
+        if not timeout:
+            return
+        cutoff = time.monotonic() - timeout
+        for name, entry in self._entries.items():
+            if name != exclude and entry.model is not None and entry.last_used is not None and entry.last_used < cutoff:
+                self.evict(name)
+
+    def warm(self, names=None):
+        """
+        Loads the given models (all registered models by default) and returns a list of
+        (name, seconds, error) tuples. Can be called from a gunicorn post_fork hook to
+        load models into a worker before it takes traffic.
+        """
+        results = []
+        for name in names or self.names():
+            started = time.monotonic()
+            try:
+                self.get(name)
+                results.append((name, time.monotonic() - started, None))
+            except ModelUnavailable as e:
+                results.append((name, time.monotonic() - started, str(e)))
+        return results
+
+    def reset(self, name):
+        """ Evicts a model and clears any recorded load error, so the next get() retries. """
+        self.evict(name)
+        self._entry(name).error = None
+
+
+# --- Loaders ---
+
+def load_image_classifier():
+    """ MobileNetV2 (ImageNet weights) plus the Keras helpers needed around it. """
+    from tensorflow.keras.applications.mobilenet_v2 import MobileNetV2, preprocess_input, decode_predictions
+    from tensorflow.keras.preprocessing import image as keras_image_utils
+    return SimpleNamespace(
+        model=MobileNetV2(weights='imagenet'),
+        preprocess_input=preprocess_input,
+        decode_predictions=decode_predictions,
+        load_img=keras_image_utils.load_img,
+        img_to_array=keras_image_utils.img_to_array,
+    )
+
+
+def load_sentiment_pipeline():
+    """ Distilled SST-2 sentiment pipeline from Hugging Face transformers. """
+    from transformers import pipeline
+    return pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+
+
+def load_iris_decision_tree():
+    """ A shallow decision tree trained on Iris, together with the dataset metadata. """
+    from sklearn.datasets import load_iris
+    from sklearn.tree import DecisionTreeClassifier
+    iris = load_iris()
+    model = DecisionTreeClassifier(max_depth=3, random_state=42) # Limit depth for simplicity
+    model.fit(iris.data, iris.target)
+    return SimpleNamespace(model=model, dataset=iris)
+
+
+IMAGE_CLASSIFIER = 'image_classifier'
+SENTIMENT_PIPELINE = 'sentiment_pipeline'
+IRIS_DECISION_TREE = 'iris_decision_tree'
+
+model_registry = ModelRegistry()
+model_registry.register(IMAGE_CLASSIFIER, load_image_classifier, "MobileNetV2 image classifier (TensorFlow)")
+model_registry.register(SENTIMENT_PIPELINE, load_sentiment_pipeline, "DistilBERT sentiment pipeline (transformers)")
+model_registry.register(IRIS_DECISION_TREE, load_iris_decision_tree, "Iris decision tree (scikit-learn)")
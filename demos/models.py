@@ -1,17 +1,24 @@
 # demos/models.py
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.urls import reverse, NoReverseMatch
 from django.utils.text import slugify
 from django.utils import timezone # Ensure timezone is imported
 import logging
+import uuid
+
+from portfolio.markdown_cache import MarkdownCacheMixin
+from portfolio.slugs import unique_slug
 
 logger = logging.getLogger(__name__)
 
-class Demo(models.Model):
+class Demo(MarkdownCacheMixin, models.Model):
     """ 
     Represents an informational demo page, primarily populated from a CSV,
     but can also be managed via Admin.
     """
+    markdown_fields = ('description', 'meta_description')
+
     title = models.CharField(max_length=200, help_text="The main display title of the demo page.")
     slug = models.SlugField(
         max_length=220, 
@@ -45,6 +52,7 @@ class Demo(models.Model):
 
     date_created = models.DateTimeField(auto_now_add=True)
     last_updated = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Weighted full-text vector (PostgreSQL search, see portfolio/search_vectors.py).")
 
     class Meta:
         ordering = ['order', 'title'] # Default ordering
@@ -75,23 +83,14 @@ class Demo(models.Model):
         and ensure its uniqueness.
         """
         if not self.slug: # Only generate if slug is empty
-            base_slug = slugify(self.title)
-            candidate_slug = base_slug
-            counter = 1
-            # Check for uniqueness, excluding self if updating
-            qs_check = Demo.objects.all()
-            if self.pk:
-                qs_check = qs_check.exclude(pk=self.pk)
-            
-            while qs_check.filter(slug=candidate_slug).exists():
-                candidate_slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = candidate_slug
+            self.slug = unique_slug(Demo, slugify(self.title), exclude_pk=self.pk)
         super().save(*args, **kwargs)
 
 
-class DemoSection(models.Model):
+class DemoSection(MarkdownCacheMixin, models.Model):
     """ Represents a content section within a Demo page, populated from CSV or Admin. """
+    markdown_fields = ('section_content_markdown', 'code_snippet_explanation')
+
     demo = models.ForeignKey(Demo, related_name='sections', on_delete=models.CASCADE, help_text="The demo this section belongs to.")
     section_order = models.FloatField(default=1.0, help_text="Order of this section within the demo page (e.g., 1, 1.1, 2).")
     section_title = models.CharField(max_length=255, blank=True, null=True, help_text="Title of this section (optional).")
@@ -110,3 +109,52 @@ class DemoSection(models.Model):
         title_part = f" ({self.section_title})" if self.section_title else " (Untitled)"
         return f"{self.demo.title} - Section {self.section_order}{title_part}"
 
+
+
+class DemoJob(models.Model):
+    """
+    A slow demo computation (image/sentiment inference, CSV analysis, price scraping)
+    queued by a view and executed by the ``run_demo_jobs`` worker. See demos/jobs.py.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    FINISHED_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=50, help_text="Which demo computation to run (see demos.jobs.JOB_HANDLERS).")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    payload = models.JSONField(default=dict, blank=True, help_text="JSON-serialisable inputs for the job.")
+    input_file = models.FileField(upload_to='demo_jobs/', blank=True, null=True, help_text="Uploaded input, deleted once the job finishes.")
+    result = models.JSONField(blank=True, null=True, help_text="Template context produced by the job.")
+    error_message = models.TextField(blank=True, default='')
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"{self.kind} job {self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
+
+    def page_url(self):
+        """ The demo page that renders this job's result (it polls until the job is finished). """
+        from .jobs import JOB_PAGES
+        return f"{reverse(JOB_PAGES[self.kind])}?job={self.pk}"
+
+    def get_status_url(self):
+        return reverse('demos:job_status', kwargs={'job_id': self.pk})
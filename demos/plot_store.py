@@ -0,0 +1,111 @@
+# demos/plot_store.py
+"""
+Content-addressed store for PNG plots generated by the demo views.
+
+Instead of base64-encoding every matplotlib figure into the page, views save
+the PNG bytes here and put the returned URL in their context. Files are named
+after the SHA-256 of their contents (``<DEMO_PLOT_ROOT>/<ab>/<digest>.png``),
+so an artifact never changes once written: ``plot_artifact_view`` serves it
+with a year-long ``immutable`` Cache-Control header and the digest as ETag,
+and browsers revisiting a demo only download the HTML.
+
+Media files are only served by Django in DEBUG, hence the dedicated view.
+``prune_demo_plots`` removes artifacts that have not been written or
+re-referenced for a while (uploads to the data analyser create new ones).
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def plot_root():
+    root = getattr(settings, 'DEMO_PLOT_ROOT', None)
+    return Path(root) if root else Path(settings.MEDIA_ROOT) / 'demo_plots'
+
+
+def plot_path(digest):
+    if not DIGEST_RE.match(digest or ''):
+        raise ValueError(f"Invalid plot digest: {digest!r}")
+    return plot_root() / digest[:2] / f"{digest}.png"
+
+
+def save_plot(png_bytes):
+    """
+    Stores PNG bytes under their content hash and returns the digest.
+    Writing is atomic (temp file + rename), so concurrent writers of the
+    same plot never expose a partial file.
+    """
+    digest = hashlib.sha256(png_bytes).hexdigest()
+    path = plot_path(digest)
+    if path.exists():
+        # Refresh the mtime so pruning keeps plots that are still referenced
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return digest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(png_bytes)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return digest
+
+
+def plot_url(digest):
+    return reverse('demos:plot_artifact', kwargs={'digest': digest})
+
+
+def store_plot_url(png_bytes):
+    """ View helper: stores a PNG (if any) and returns its URL, or None. """
+    if not png_bytes:
+        return None
+    try:
+        return plot_url(save_plot(png_bytes))
+    except OSError as e:
+        logger.error(f"Could not store demo plot: {e}", exc_info=True)
+        return None
+
+
+def figure_png(fig, **savefig_kwargs):
+    """ Renders a matplotlib figure (or the pyplot module) to PNG bytes. """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', **savefig_kwargs)
+    return buffer.getvalue()
+
+
+def prune(max_age_seconds):
+    """ Deletes stored plots not written or re-saved within ``max_age_seconds``. Returns the count removed. """
+    root = plot_root()
+    if not root.exists():
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for path in root.glob('*/*'):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
@@ -0,0 +1,107 @@
+# demos/result_cache.py
+"""
+Content-addressed cache for deterministic, CPU-heavy demo computations.
+
+A result is keyed by a hash of the demo name, its inputs, a code version
+(bumped by hand when the computation changes) and the versions of the
+numerical libraries involved. Values (numbers, HTML snippets, PNG bytes)
+are kept in a small in-process LRU for fast hits and mirrored to Django's
+cache framework so other processes sharing that backend can reuse them.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from importlib import metadata
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Libraries whose versions can change numerical output or rendered plots
+FINGERPRINT_PACKAGES = ('numpy', 'pandas', 'scipy', 'statsmodels', 'matplotlib', 'seaborn')
+
+
+def _package_versions():
+    versions = {}
+    for package in FINGERPRINT_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+class DemoResultCache:
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._package_versions = None
+
+    @property
+    def timeout(self):
+        # Seconds to keep results in the shared cache; None keeps them until evicted
+        return getattr(settings, 'DEMO_RESULT_CACHE_TIMEOUT', None)
+
+    def make_key(self, name, inputs, version):
+        if self._package_versions is None:
+            self._package_versions = _package_versions()
+        payload = json.dumps(
+            {'name': name, 'inputs': inputs, 'version': version, 'packages': self._package_versions},
+            sort_keys=True, default=str,
+        )
+        return f"demo_result:{name}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, name, inputs, version, compute, cacheable=None):
+        """
+        Returns the cached value for (name, inputs, version), calling ``compute()``
+        at most once per process on a miss. ``compute`` may return None to signal
+        a result that must not be cached (e.g. a failure); values for which
+        ``cacheable(value)`` is false are returned without being cached.
+        """
+        key = self.make_key(name, inputs, version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                with self._lock:
+                    if key in self._entries:
+                        return self._entries[key]
+                value = cache.get(key)
+                if value is None:
+                    value = compute()
+                    if value is None or (cacheable is not None and not cacheable(value)):
+                        return value
+                    try:
+                        cache.set(key, value, timeout=self.timeout)
+                    except Exception as e:
+                        logger.warning(f"Could not store demo result '{name}' in the shared cache: {e}")
+                self._remember(key, value)
+                return value
+        finally:
+            # Inputs can be user-supplied: keep locks only while a computation is in flight
+            with self._lock:
+                if self._key_locks.get(key) is key_lock:
+                    del self._key_locks[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+result_cache = DemoResultCache()
@@ -0,0 +1,12 @@
+# demos/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Demo
+from .catalog import demo_catalog_cache
+
+
+@receiver([post_save, post_delete], sender=Demo, dispatch_uid="demos_invalidate_demo_catalog")
+def invalidate_demo_catalog(sender, **kwargs):
+    """ Drops the cached demo catalogue whenever a demo is added, changed or removed. """
+    demo_catalog_cache.invalidate()
@@ -2,7 +2,7 @@
 
 from django.contrib.sitemaps import Sitemap
 from django.urls import reverse, NoReverseMatch
-import pandas as pd
+import csv
 import os
 from django.conf import settings
 import logging 
@@ -49,79 +49,55 @@ class DemoModelSitemap(Sitemap):
 class CSVDemoPagesSitemap(Sitemap):
     """
     Sitemap for demo pages defined in a CSV file, which use the generic_demo_detail view.
+    Only slugs with a published Demo are listed; they are resolved with a single query.
     """
     changefreq = "monthly"
     priority = 0.6
+    depends_on = ('demos.Demo',) # Models whose changes alter this sitemap (see portfolio/sitemap_files.py)
 
-    def items(self):
-        items_list = []
+    def _csv_slugs(self):
+        """ Distinct, non-empty 'demo_slug' values of the CSV, in file order. """
         if not os.path.exists(DEMOS_SUMMARY_CSV_PATH):
             logger.warning(f"Sitemap: CSV summary file not found at {DEMOS_SUMMARY_CSV_PATH}")
-            return items_list
-        
+            return []
+        if os.path.getsize(DEMOS_SUMMARY_CSV_PATH) == 0:
+            logger.warning(f"Sitemap: CSV summary file is empty at {DEMOS_SUMMARY_CSV_PATH}")
+            return []
+        slug_column_name = 'demo_slug'
+        with open(DEMOS_SUMMARY_CSV_PATH, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            if slug_column_name not in (reader.fieldnames or []):
+                logger.warning(f"Sitemap: '{slug_column_name}' column not found in {DEMOS_SUMMARY_CSV_PATH}. Available columns are: {reader.fieldnames}")
+                return []
+            slugs = (row.get(slug_column_name) or '' for row in reader)
+            return list(dict.fromkeys(slug.strip() for slug in slugs if slug.strip()))
+
+    def items(self):
+        if not (DEMO_MODEL_EXISTS and Demo):
+            # This sitemap strictly ties CSV entries to existing, published Demo objects
+            return []
         try:
-            # Check for empty file before attempting to read
-            if os.path.getsize(DEMOS_SUMMARY_CSV_PATH) == 0:
-                logger.warning(f"Sitemap: CSV summary file is empty at {DEMOS_SUMMARY_CSV_PATH}")
-                return items_list
-            
-            df = pd.read_csv(DEMOS_SUMMARY_CSV_PATH)
-
-            # Ensure df is a DataFrame before proceeding
-            if not isinstance(df, pd.DataFrame):
-                logger.error(f"Sitemap: Failed to read {DEMOS_SUMMARY_CSV_PATH} as a DataFrame.")
-                return items_list
-
-            # The CSV is expected to have a 'demo_slug' column based on your models/admin
-            slug_column_name = 'demo_slug' # Or 'slug' if that's the actual column name in CSV
-
-            if slug_column_name not in df.columns:
-                logger.warning(f"Sitemap: '{slug_column_name}' column not found in {DEMOS_SUMMARY_CSV_PATH}. Available columns are: {df.columns.tolist() if isinstance(df, pd.DataFrame) else 'N/A'}")
-                return items_list
-
-            slugs = df[slug_column_name].dropna().unique()
-            for slug_val in slugs:
-                if slug_val and isinstance(slug_val, str) and slug_val.strip():
-                    # Only add if a corresponding published Demo object exists
-                    if DEMO_MODEL_EXISTS and Demo and Demo.objects.filter(slug=slug_val.strip(), is_published=True).exists():
-                        items_list.append({'slug': slug_val.strip()})
-                    # If Demo model isn't used/available, this sitemap might not be appropriate
-                    # or would need a different logic to determine valid items.
-                    # For now, it strictly ties CSV entries to existing, published Demo objects.
-
-        except pd.errors.EmptyDataError:
-            logger.warning(f"Sitemap: CSV file {DEMOS_SUMMARY_CSV_PATH} is empty (pandas EmptyDataError).")
-        except Exception as e:
+            slugs = self._csv_slugs()
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
             logger.error(f"Sitemap: Error reading or processing CSV {DEMOS_SUMMARY_CSV_PATH}: {e}", exc_info=True)
-        return items_list
+            return []
+        if not slugs:
+            return []
+        published = dict(Demo.objects.filter(slug__in=slugs, is_published=True).values_list('slug', 'last_updated'))
+        return [{'slug': slug, 'last_updated': published[slug]} for slug in slugs if slug in published]
+
+    def lastmod(self, item_dict):
+        return item_dict.get('last_updated')
 
     def location(self, item_dict):
         slug = item_dict.get('slug')
         if not slug:
             return ''
-        
-        # This sitemap is for pages backed by Demo model entries.
-        # Ensure the Demo object exists and is published before generating a URL.
-        if DEMO_MODEL_EXISTS and Demo:
-            if Demo.objects.filter(slug=slug, is_published=True).exists():
-                try:
-                    return reverse('demos:generic_demo_detail', kwargs={'demo_slug': slug})
-                except NoReverseMatch:
-                    logger.error(f"Sitemap: NoReverseMatch for generic_demo_detail with slug '{slug}'.")
-                    return ''
-            else:
-                # If no published Demo object with this slug, it shouldn't be in the sitemap.
-                # The items() method should have already filtered this out.
-                return '' 
-        else:
-            # Fallback if Demo model isn't available (should ideally not happen if items() filters correctly)
-            # This path is less likely to be hit if items() is strict.
-            try:
-                return reverse('demos:generic_demo_detail', kwargs={'demo_slug': slug})
-            except NoReverseMatch:
-                logger.error(f"Sitemap: NoReverseMatch for generic_demo_detail with slug '{slug}' (Demo model not checked/available).")
-                return ''
-
+        try:
+            return reverse('demos:generic_demo_detail', kwargs={'demo_slug': slug})
+        except NoReverseMatch:
+            logger.error(f"Sitemap: NoReverseMatch for generic_demo_detail with slug '{slug}'.")
+            return ''
 
 class HardcodedDemoViewsSitemap(Sitemap):
     """
@@ -5,7 +5,11 @@ import shutil
 import uuid # Required for pagination test
 import io
 import base64
+import tempfile
+import threading
+from multiprocessing.connection import Listener
 from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
 
 # Import pandas
 import pandas as pd
@@ -20,14 +24,25 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import IntegrityError
 from django.conf import settings
 from django.core.paginator import Page 
+from django.core.management import call_command
+from django.core.management.base import CommandError
 # from django.http import Http404 
 
 # Models
-from .models import Demo, DemoSection
+from .models import Demo, DemoSection, DemoJob
 
 # Views
 from . import views 
 from .views import HARDCODED_DEMO_ENTRIES 
+from .catalog import demo_catalog_cache
+from portfolio.context_cache import VersionedContextCache
+from .model_registry import ModelRegistry, ModelUnavailable, IMAGE_CLASSIFIER
+from . import inference
+from .inference import MicroBatcher
+from .result_cache import DemoResultCache, result_cache
+from . import plot_store
+from . import jobs
+from .csv_analysis import profile_csv, QuantileSketch, StreamingHistogram
 
 # Sitemaps
 from .sitemaps import DemoModelSitemap, CSVDemoPagesSitemap, HardcodedDemoViewsSitemap, MainDemosPageSitemap
@@ -43,6 +58,10 @@ from portfolio.models import UserProfile
 
 # --- Helper Functions / Test Data ---
 
+# Generated plots are written here instead of MEDIA_ROOT during tests
+TEST_PLOT_ROOT = tempfile.mkdtemp(prefix='demo_plots_test_')
+TEST_JOB_MEDIA_ROOT = tempfile.mkdtemp(prefix='demo_jobs_test_')
+
 def create_test_image_file(name="test_image.png", ext="png", size=(50, 50), color=(255, 0, 0)):
     """Creates a simple image file for upload tests."""
     try:
@@ -270,6 +289,7 @@ class DemoURLTests(TestCase):
 
 
 # --- View Tests ---
+@override_settings(DEMO_PLOT_ROOT=TEST_PLOT_ROOT)
 class DemoViewTests(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -451,18 +471,17 @@ class DemoViewTests(TestCase):
         self.assertIn('user_profile', response.context)
 
     @patch('demos.views.TF_AVAILABLE', True)
-    @patch('demos.views.IMAGE_MODEL_LOADED', True)
-    @patch('demos.views.image_model.predict') 
-    @patch('demos.views.decode_predictions')
-    @patch('demos.views.keras_image_utils.load_img')
-    @patch('demos.views.keras_image_utils.img_to_array')
-    @patch('demos.views.preprocess_input')
-    def test_image_classification_view_post_valid(self, mock_preprocess, mock_img_to_array, mock_load_img, mock_decode, mock_predict):
+    @patch('demos.views.model_registry.get')
+    def test_image_classification_view_post_valid(self, mock_registry_get):
+        classifier = MagicMock()
+        mock_registry_get.return_value = classifier
+        mock_predict = classifier.model.predict
+        mock_decode = classifier.decode_predictions
         mock_predict.return_value = MagicMock() 
         mock_decode.return_value = [[('class_id_1', 'German_shepherd', 0.9), ('class_id_2', 'Golden_Retriever', 0.05)]]
-        mock_load_img.return_value = MagicMock() 
-        mock_img_to_array.return_value = MagicMock() 
-        mock_preprocess.return_value = MagicMock() 
+        classifier.load_img.return_value = MagicMock() 
+        classifier.img_to_array.return_value = MagicMock() 
+        classifier.preprocess_input.return_value = MagicMock() 
 
         image = create_test_image_file()
         response = self.client.post(reverse('demos:image_classifier'), {'image': image})
@@ -479,6 +498,7 @@ class DemoViewTests(TestCase):
         self.assertIsNone(response.context.get('error_message')) 
         mock_predict.assert_called_once()
         mock_decode.assert_called_once()
+        mock_registry_get.assert_called_with(IMAGE_CLASSIFIER)
         self.assertIn('user_profile', response.context)
 
     def test_image_classification_view_post_invalid_form(self):
@@ -497,8 +517,8 @@ class DemoViewTests(TestCase):
         self.assertIn('user_profile', response.context)
 
     @patch('demos.views.TF_AVAILABLE', True)
-    @patch('demos.views.IMAGE_MODEL_LOADED', False)
-    def test_image_classification_view_model_not_loaded(self):
+    @patch('demos.views.model_registry.has_failed', return_value=True)
+    def test_image_classification_view_model_not_loaded(self, mock_has_failed):
         response = self.client.get(reverse('demos:image_classifier'))
         self.assertEqual(response.status_code, 200)
         self.assertIsNotNone(response.context.get('error_message'))
@@ -513,9 +533,10 @@ class DemoViewTests(TestCase):
         self.assertIn('user_profile', response.context)
 
     @patch('demos.views.TRANSFORMERS_AVAILABLE', True)
-    @patch('demos.views.SENTIMENT_MODEL_LOADED', True)
-    @patch('demos.views.sentiment_pipeline') 
-    def test_sentiment_analysis_view_post_valid(self, mock_pipeline_func):
+    @patch('demos.views.model_registry.get')
+    def test_sentiment_analysis_view_post_valid(self, mock_registry_get):
+        mock_pipeline_func = MagicMock()
+        mock_registry_get.return_value = mock_pipeline_func
         mock_pipeline_func.return_value = [{'label': 'POSITIVE', 'score': 0.99}]
         
         text_input = "This is a fantastic test!"
@@ -526,7 +547,7 @@ class DemoViewTests(TestCase):
             self.assertEqual(response.context['sentiment_result']['label'], 'POSITIVE')
             self.assertAlmostEqual(response.context['sentiment_result']['score'], 99.0) 
         self.assertEqual(response.context.get('submitted_text'), text_input)
-        mock_pipeline_func.assert_called_once_with(text_input)
+        mock_pipeline_func.assert_called_once_with([text_input])
         self.assertIn('user_profile', response.context)
 
     @patch('demos.views.TRANSFORMERS_AVAILABLE', False)
@@ -558,10 +579,10 @@ class DemoViewTests(TestCase):
         self.assertIn('user_profile', response.context)
 
     @patch('demos.views.SKLEARN_AVAILABLE', True)
-    @patch('demos.views.TREE_MODEL_LOADED', True)
-    @patch('demos.views.decision_tree_model') 
-    @patch('demos.views.iris') 
-    def test_explainable_ai_view_post_valid(self, mock_iris, mock_tree_model):
+    @patch('demos.views.model_registry.get')
+    def test_explainable_ai_view_post_valid(self, mock_registry_get):
+        mock_iris, mock_tree_model = MagicMock(), MagicMock()
+        mock_registry_get.return_value = SimpleNamespace(model=mock_tree_model, dataset=mock_iris)
         mock_iris.target_names = np.array(['setosa', 'versicolor', 'virginica'])
         mock_iris.feature_names = ['sepal length (cm)', 'sepal width (cm)', 'petal length (cm)', 'petal width (cm)']
         
@@ -620,6 +641,41 @@ class DemoViewTests(TestCase):
         self.assertEqual(response.context['page_title'], 'Neural Machine Translation with Keras')
         self.assertIn('user_profile', response.context)
 
+@patch.object(VersionedContextCache, 'can_store', return_value=True) # TestCase wraps each test in a transaction
+class DemoCatalogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.demo = Demo.objects.create(title="Catalog Demo", slug="catalog-demo", description="In the catalogue.", is_published=True)
+
+    def setUp(self):
+        demo_catalog_cache.invalidate()
+
+    def test_catalog_is_built_once_and_sliced_per_page(self, mock_can_store):
+        catalog = demo_catalog_cache.get()
+        self.assertEqual(len(catalog), 1 + len(HARDCODED_DEMO_ENTRIES))
+        self.assertEqual([card['title'] for card in catalog], sorted((card['title'] for card in catalog), key=str.lower))
+        with self.assertNumQueries(0):
+            self.assertIs(demo_catalog_cache.get(), catalog)
+
+    def test_every_hardcoded_entry_resolves(self, mock_can_store):
+        with self.assertNoLogs('demos.catalog', level='ERROR'):
+            urls = {card['detail_url'] for card in demo_catalog_cache.get()}
+        self.assertIn(reverse('demos:cybersecurity_ds_demo'), urls)
+
+    def test_demo_changes_rebuild_the_catalog(self, mock_can_store):
+        demo_catalog_cache.get()
+        self.demo.title = "Renamed Catalog Demo"
+        self.demo.save()
+        self.assertIn("Renamed Catalog Demo", [card['title'] for card in demo_catalog_cache.get()])
+        self.demo.delete()
+        self.assertEqual(demo_catalog_cache.get(), ())
+
+    def test_database_demo_replaces_the_hardcoded_entry_for_its_view(self, mock_can_store):
+        Demo.objects.create(title="Classifier (DB)", slug="classifier-db", demo_url_name='demos:image_classifier', is_published=True)
+        cards = [card for card in demo_catalog_cache.get() if card['detail_url'] == reverse('demos:image_classifier')]
+        self.assertEqual([card['title'] for card in cards], ["Classifier (DB)"])
+
+
 # --- Sitemap Tests ---
 @override_settings(BASE_DIR=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class DemoSitemapTests(TestCase):
@@ -649,38 +705,35 @@ class DemoSitemapTests(TestCase):
         sitemap = DemoModelSitemap()
         self.assertEqual(sitemap.lastmod(self.published_db_demo), self.published_db_demo.last_updated)
 
-    @patch('pandas.read_csv')
-    @patch('demos.sitemaps.DEMO_MODEL_EXISTS', True)
-    @patch('demos.models.Demo.objects.filter')
-    @patch('os.path.exists')
-    @patch('os.path.getsize')
-    def test_csv_demo_pages_sitemap_items_valid_csv_and_demo_exists(self, mock_getsize, mock_exists, mock_demo_objects_filter, mock_read_csv):
-        mock_exists.return_value = True
-        mock_getsize.return_value = 100
-        mock_df = pd.DataFrame({'demo_slug': ['csv-slug-exists', 'csv-slug-does-not-exist', None, '']})
-        mock_read_csv.return_value = mock_df
-        def filter_side_effect(slug, is_published): 
-            mock_qs = MagicMock()
-            if slug == 'csv-slug-exists' and is_published: 
-                mock_qs.exists.return_value = True
-            else:
-                mock_qs.exists.return_value = False
-            return mock_qs
-        mock_demo_objects_filter.side_effect = filter_side_effect
-        sitemap = CSVDemoPagesSitemap()
-        items = sitemap.items()
-        self.assertEqual(len(items), 1, f"Expected 1 item from CSV, got {len(items)}. Items: {items}")
-        self.assertIn({'slug': 'csv-slug-exists'}, items)
-        self.assertNotIn({'slug': 'csv-slug-does-not-exist'}, items)
-
-    @patch('pandas.read_csv')
-    @patch('os.path.exists')
-    @patch('os.path.getsize')
-    def test_csv_demo_pages_sitemap_items_empty_csv(self, mock_getsize, mock_exists, mock_read_csv):
-        mock_exists.return_value = True
-        mock_getsize.return_value = 0
-        sitemap = CSVDemoPagesSitemap()
-        self.assertEqual(sitemap.items(), [])
+    def write_summary_csv(self, content):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_csv_demo_pages_sitemap_items_valid_csv_and_demo_exists(self):
+        path = self.write_summary_csv(
+            "demo_slug,title\ncsv-slug-exists,A\ncsv-slug-does-not-exist,B\n,C\n"
+            "sitemap-test-draft-demo,D\ncsv-slug-exists,E\n"
+        )
+        with patch('demos.sitemaps.DEMOS_SUMMARY_CSV_PATH', path):
+            sitemap = CSVDemoPagesSitemap()
+            with self.assertNumQueries(1):
+                items = sitemap.items()
+        self.assertEqual([item['slug'] for item in items], ['csv-slug-exists'])
+        demo = Demo.objects.get(slug='csv-slug-exists')
+        self.assertEqual(sitemap.lastmod(items[0]), demo.last_updated)
+
+    def test_csv_demo_pages_sitemap_items_empty_csv(self):
+        with patch('demos.sitemaps.DEMOS_SUMMARY_CSV_PATH', self.write_summary_csv("")):
+            sitemap = CSVDemoPagesSitemap()
+            self.assertEqual(sitemap.items(), [])
+
+    def test_csv_demo_pages_sitemap_items_missing_slug_column(self):
+        with patch('demos.sitemaps.DEMOS_SUMMARY_CSV_PATH', self.write_summary_csv("title\nA\n")):
+            with self.assertNumQueries(0):
+                self.assertEqual(CSVDemoPagesSitemap().items(), [])
 
     @patch('os.path.exists')
     def test_csv_demo_pages_sitemap_items_csv_not_found(self, mock_exists):
@@ -688,25 +741,12 @@ class DemoSitemapTests(TestCase):
         sitemap = CSVDemoPagesSitemap()
         self.assertEqual(sitemap.items(), [])
 
-    @patch('demos.sitemaps.DEMO_MODEL_EXISTS', True)
-    @patch('demos.models.Demo.objects.filter')
-    def test_csv_demo_pages_sitemap_location(self, mock_demo_filter):
+    def test_csv_demo_pages_sitemap_location(self):
         sitemap = CSVDemoPagesSitemap()
-        item_dict_valid = {'slug': 'csv-slug-exists'}
-        mock_valid_qs = MagicMock()
-        mock_valid_qs.exists.return_value = True
-        mock_demo_filter.return_value = mock_valid_qs
         expected_url = reverse('demos:generic_demo_detail', kwargs={'demo_slug': 'csv-slug-exists'})
-        self.assertEqual(sitemap.location(item_dict_valid), expected_url)
-        mock_demo_filter.assert_called_with(slug='csv-slug-exists', is_published=True)
-
-        item_dict_invalid_demo = {'slug': 'slug-that-will-not-map-to-a-demo'}
-        mock_invalid_qs = MagicMock()
-        mock_invalid_qs.exists.return_value = False
-        mock_demo_filter.return_value = mock_invalid_qs
-        self.assertEqual(sitemap.location(item_dict_invalid_demo), '',
-                         "Location for a slug not mapping to a published Demo object should be empty.")
-        mock_demo_filter.assert_called_with(slug='slug-that-will-not-map-to-a-demo', is_published=True)
+        with self.assertNumQueries(0):
+            self.assertEqual(sitemap.location({'slug': 'csv-slug-exists'}), expected_url)
+        self.assertEqual(sitemap.location({'slug': ''}), '')
 
     def test_hardcoded_demo_views_sitemap_location(self):
         sitemap = HardcodedDemoViewsSitemap()
@@ -771,8 +811,390 @@ class DemoAdminTests(TestCase):
         self.assertIn('demo', DemoSectionAdmin.autocomplete_fields)
 
 # --- tearDownModule ---
+class ModelRegistryTests(TestCase):
+    def setUp(self):
+        self.loader = MagicMock(return_value="loaded-model")
+        self.registry = ModelRegistry()
+        self.registry.register('dummy', self.loader, "Dummy model")
+
+    def test_model_loaded_lazily_and_only_once(self):
+        self.loader.assert_not_called()
+        self.assertFalse(self.registry.is_loaded('dummy'))
+        self.assertEqual(self.registry.get('dummy'), "loaded-model")
+        self.assertEqual(self.registry.get('dummy'), "loaded-model")
+        self.loader.assert_called_once()
+        self.assertTrue(self.registry.is_loaded('dummy'))
+
+    def test_importing_views_does_not_load_models(self):
+        from .model_registry import model_registry
+        for name in model_registry.names():
+            self.assertFalse(model_registry.is_loaded(name))
+
+    def test_load_failure_raises_and_is_not_retried_immediately(self):
+        self.loader.side_effect = RuntimeError("weights missing")
+        with self.assertLogs('demos.model_registry', level='ERROR'), self.assertRaises(ModelUnavailable):
+            self.registry.get('dummy')
+        self.assertTrue(self.registry.has_failed('dummy'))
+        with self.assertRaises(ModelUnavailable):
+            self.registry.get('dummy')
+        self.loader.assert_called_once()
+        self.registry.reset('dummy')
+        self.loader.side_effect = None
+        self.assertEqual(self.registry.get('dummy'), "loaded-model")
+
+    @override_settings(DEMO_MODEL_IDLE_TIMEOUT=60)
+    def test_idle_models_are_evicted(self):
+        other_loader = MagicMock(return_value="other-model")
+        self.registry.register('other', other_loader)
+        self.registry.get('dummy')
+        with patch('demos.model_registry.time.monotonic', return_value=10**9):
+            self.registry.get('other')
+        self.assertFalse(self.registry.is_loaded('dummy'))
+        self.assertTrue(self.registry.is_loaded('other'))
+
+    def test_unknown_model_raises(self):
+        with self.assertRaises(ModelUnavailable):
+            self.registry.get('missing')
+
+    def test_warm_demo_models_command_reports_failures(self):
+        with patch('demos.management.commands.warm_demo_models.model_registry', self.registry):
+            self.loader.side_effect = RuntimeError("no network")
+            out = StringIO()
+            with self.assertLogs('demos.model_registry', level='ERROR'):
+                call_command('warm_demo_models', stdout=out)
+            self.assertIn("dummy: failed", out.getvalue())
+            with self.assertRaises(CommandError):
+                call_command('warm_demo_models', 'dummy', '--fail-on-error', stdout=StringIO())
+
+
+class InferenceBatchingTests(TestCase):
+    def test_micro_batcher_coalesces_concurrent_requests(self):
+        batch_sizes = []
+        def batch_fn(items):
+            batch_sizes.append(len(items))
+            return [item * 2 for item in items]
+        batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait=0.5, name="test")
+        futures = [batcher.submit(i) for i in range(5)]
+        self.assertEqual([f.result(timeout=5) for f in futures], [0, 2, 4, 6, 8])
+        self.assertEqual(batch_sizes, [5])
+
+    def test_micro_batcher_respects_max_batch_size_and_item_errors(self):
+        def batch_fn(items):
+            return [ValueError("bad item") if item < 0 else item for item in items]
+        batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait=0.05, name="test-errors")
+        ok, bad = batcher.submit(1), batcher.submit(-1)
+        self.assertEqual(ok.result(timeout=5), 1)
+        with self.assertRaises(ValueError):
+            bad.result(timeout=5)
+
+    def test_requests_go_through_worker_process_socket(self):
+        # The listener unlinks its socket file itself when the process exits
+        socket_path = os.path.join(tempfile.gettempdir(), f'test-inference-{uuid.uuid4().hex[:8]}.sock')
+        ready = threading.Event()
+        echo_functions = {'echo': lambda items: [item.upper() for item in items]}
+        with patch.dict('demos.inference.BATCH_FUNCTIONS', echo_functions):
+            threading.Thread(target=inference.serve, args=(socket_path,), kwargs={'ready_callback': lambda listener: ready.set()}, daemon=True).start()
+            self.assertTrue(ready.wait(5))
+            with override_settings(DEMO_INFERENCE_ADDRESS=socket_path):
+                self.assertEqual(inference.run_inference('echo', 'hello'), 'HELLO')
+                with self.assertRaises(inference.InferenceError):
+                    inference.run_inference('unknown-task', 'hello')
+
+    def test_hung_worker_times_out(self):
+        socket_path = os.path.join(tempfile.gettempdir(), f'test-inference-{uuid.uuid4().hex[:8]}.sock')
+        listener = Listener(socket_path, authkey=inference._authkey())
+        self.addCleanup(listener.close)
+        accepted = []
+        threading.Thread(target=lambda: accepted.append(listener.accept()), daemon=True).start() # Never answers
+        with override_settings(DEMO_INFERENCE_ADDRESS=socket_path, DEMO_INFERENCE_TIMEOUT=0), \
+                patch('demos.inference.REMOTE_TIMEOUT_MARGIN', 0.2):
+            with self.assertLogs('demos.inference', level='ERROR'), self.assertRaises(inference.InferenceError):
+                inference.run_inference('echo', 'hello')
+
+    @override_settings(DEMO_INFERENCE_ADDRESS='/nonexistent/inference.sock')
+    def test_unreachable_worker_falls_back_to_in_process(self):
+        with patch.dict('demos.inference.BATCH_FUNCTIONS', {'echo-local': lambda items: [f"local:{item}" for item in items]}):
+            with self.assertLogs('demos.inference', level='WARNING'):
+                self.assertEqual(inference.run_inference('echo-local', 'x'), 'local:x')
+
+
+@override_settings(DEMO_PLOT_ROOT=TEST_PLOT_ROOT)
+class DemoResultCacheTests(TestCase):
+    def setUp(self):
+        self.cache = DemoResultCache(max_entries=2)
+
+    def test_result_computed_once_per_inputs_and_version(self):
+        compute = MagicMock(return_value={'value': 1, 'plot_png': b'png'})
+        with patch('demos.result_cache.cache', MagicMock(get=MagicMock(return_value=None))):
+            first = self.cache.get_or_compute('demo', {'seed': 1}, 1, compute)
+            second = self.cache.get_or_compute('demo', {'seed': 1}, 1, compute)
+            self.assertIs(first, second)
+            compute.assert_called_once()
+            self.cache.get_or_compute('demo', {'seed': 2}, 1, compute)
+            self.cache.get_or_compute('demo', {'seed': 1}, 2, compute)
+        self.assertEqual(compute.call_count, 3)
+        self.assertEqual(self.cache._key_locks, {}) # No lock is kept per distinct input set
+
+    def test_key_depends_on_inputs_version_and_name(self):
+        base = self.cache.make_key('demo', {'a': 1, 'b': 2}, 1)
+        self.assertEqual(base, self.cache.make_key('demo', {'b': 2, 'a': 1}, 1))
+        self.assertNotEqual(base, self.cache.make_key('demo', {'a': 1, 'b': 3}, 1))
+        self.assertNotEqual(base, self.cache.make_key('demo', {'a': 1, 'b': 2}, 2))
+        self.assertNotEqual(base, self.cache.make_key('other', {'a': 1, 'b': 2}, 1))
+
+    def test_none_results_are_not_cached(self):
+        compute = MagicMock(return_value=None)
+        self.assertIsNone(self.cache.get_or_compute('demo-none', {}, 1, compute))
+        self.assertIsNone(self.cache.get_or_compute('demo-none', {}, 1, compute))
+        self.assertEqual(compute.call_count, 2)
+
+    def test_failed_plots_are_not_cached(self):
+        result_cache.clear()
+        with patch('demos.result_cache.cache', MagicMock(get=MagicMock(return_value=None))) as shared, \
+                patch('demos.views.plt.savefig', side_effect=RuntimeError("no display")):
+            response = self.client.get(reverse('demos:causal_inference'))
+        self.assertIsNone(response.context['error_message'])
+        self.assertIsNone(response.context['results']['plot_url'])
+        self.assertEqual(response.context['results']['true_ate'], 20) # The numbers are still shown
+        shared.set.assert_not_called()
+        result_cache.clear()
+
+    def test_cache_hits_reuse_the_stored_plot_url(self):
+        result_cache.clear()
+        self.client.get(reverse('demos:optimization_demo'))
+        with patch('demos.views.store_plot_url') as mock_store:
+            response = self.client.get(reverse('demos:optimization_demo'))
+        mock_store.assert_not_called()
+        url = response.context['results']['plot_url']
+        self.assertTrue(url.startswith('/demos/plots/'))
+        stale = views._plot_saved[url] - views.PLOT_REFRESH_SECONDS - 1
+        with patch.dict(views._plot_saved, {url: stale}), \
+                patch('demos.views.store_plot_url', wraps=views.store_plot_url) as mock_store:
+            self.client.get(reverse('demos:optimization_demo'))
+        mock_store.assert_called_once() # Re-saved now and then, so pruning keeps it
+        result_cache.clear()
+
+    def test_causal_inference_view_served_from_cache(self):
+        result_cache.clear()
+        with patch('demos.views._compute_causal_inference', wraps=views._compute_causal_inference) as mock_compute:
+            first = self.client.get(reverse('demos:causal_inference'))
+            second = self.client.get(reverse('demos:causal_inference'))
+        self.assertEqual(first.status_code, 200)
+        self.assertLessEqual(mock_compute.call_count, 1) # 0 if another process/test already cached it
+        self.assertIsNone(second.context['error_message'])
+        self.assertEqual(first.context['results']['ate_estimate'], second.context['results']['ate_estimate'])
+        self.assertTrue(second.context['results']['plot_url'].startswith('/demos/plots/'))
+
+
+@override_settings(DEMO_PLOT_ROOT=TEST_PLOT_ROOT)
+class PlotStoreTests(TestCase):
+    png = b'\x89PNG\r\n\x1a\nnot-really-a-plot'
+
+    def test_save_plot_is_content_addressed(self):
+        digest = plot_store.save_plot(self.png)
+        self.assertEqual(digest, plot_store.save_plot(self.png))
+        self.assertNotEqual(digest, plot_store.save_plot(self.png + b'!'))
+        with open(plot_store.plot_path(digest), 'rb') as f:
+            self.assertEqual(f.read(), self.png)
+
+    def test_artifact_served_with_immutable_cache_headers(self):
+        url = plot_store.store_plot_url(self.png)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), self.png)
+
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], response['ETag'])
+
+    def test_unknown_or_invalid_digest_returns_404(self):
+        self.assertEqual(self.client.get(reverse('demos:plot_artifact', kwargs={'digest': 'f' * 64})).status_code, 404)
+        self.assertEqual(self.client.get('/demos/plots/not-a-digest.png').status_code, 404)
+        self.assertIsNone(plot_store.store_plot_url(b''))
+
+    def test_prune_removes_old_plots(self):
+        digest = plot_store.save_plot(self.png + b'old')
+        path = plot_store.plot_path(digest)
+        os.utime(path, (0, 0))
+        out = StringIO()
+        call_command('prune_demo_plots', '--days', '1', stdout=out)
+        self.assertFalse(path.exists())
+        self.assertIn('Removed', out.getvalue())
+
+    def test_data_analyser_links_stored_plot(self):
+        csv_file = SimpleUploadedFile('data.csv', b'a,b\n1,2\n3,4\n5,6\n', content_type='text/csv')
+        response = self.client.post(reverse('demos:data_analyser'), {'csv_file': csv_file})
+        self.assertEqual(response.status_code, 200)
+        plot_url = response.context['analysis_results']['plot_url']
+        self.assertTrue(plot_url.startswith('/demos/plots/'))
+        self.assertNotContains(response, 'data:image/png;base64')
+        self.assertEqual(self.client.get(plot_url).status_code, 200)
+
+
+
+class CSVAnalysisTests(TestCase):
+    def make_csv(self, rows=3000):
+        rng = np.random.default_rng(7)
+        df = pd.DataFrame({
+            'Price': rng.uniform(1, 400, rows),
+            'Quantity': rng.integers(0, 50, rows),
+            'Region': rng.choice(['North', 'South', None], rows),
+        })
+        df.loc[::11, 'Price'] = np.nan
+        df.loc[rows - 1, 'Quantity'] = 10_000 # Outlier in the last chunk widens the histogram
+        return df, df.to_csv(index=False).encode('utf-8')
+
+    def test_chunked_profile_matches_full_read(self):
+        df, data = self.make_csv()
+        full = pd.read_csv(io.BytesIO(data))
+        profile = profile_csv(io.BytesIO(data), chunk_rows=250, sample_rows=50)
+        self.assertEqual(profile.shape, full.shape)
+        self.assertEqual(profile.chunks, 12)
+        pd.testing.assert_frame_equal(profile.describe_frame(), full.describe())
+        self.assertEqual(profile.columns['Region'].nulls, full['Region'].isnull().sum())
+        self.assertIn('int64', profile.info_text())
+        edges, counts = profile.columns['Quantity'].histogram.edges_and_counts()
+        self.assertEqual(counts.sum(), len(full))
+        self.assertLessEqual(edges[0], full['Quantity'].min())
+        self.assertGreaterEqual(edges[-1], full['Quantity'].max())
+
+    def test_numeric_sample_column_with_text_later_is_demoted(self):
+        data = b"value\n" + b"1\n" * 20 + b"abc\n"
+        profile = profile_csv(io.BytesIO(data), chunk_rows=5, sample_rows=10)
+        self.assertFalse(profile.columns['value'].numeric)
+        self.assertEqual(profile.columns['value'].dtype, 'object')
+        self.assertIsNone(profile.describe_frame())
+
+    def test_quantile_sketch_is_bounded_and_approximate(self):
+        sketch = QuantileSketch(capacity=1000)
+        values = np.arange(100_000, dtype=float)
+        for chunk in np.array_split(values, 10):
+            sketch.update(chunk)
+        self.assertFalse(sketch.exact)
+        self.assertEqual(sketch._values.size, 1000)
+        self.assertAlmostEqual(sketch.quantile(0.5), 50_000, delta=5_000)
+
+    def test_streaming_histogram_grows_both_ways(self):
+        histogram = StreamingHistogram(bins=8)
+        histogram.update([0.0, 1.0])
+        histogram.update([-5.0, 20.0])
+        edges, counts = histogram.edges_and_counts()
+        self.assertEqual(counts.sum(), 4)
+        self.assertLessEqual(edges[0], -5.0)
+        self.assertGreaterEqual(edges[-1], 20.0)
+
+    @override_settings(DEMO_PLOT_ROOT=TEST_PLOT_ROOT)
+    def test_data_wrangling_view_streams_upload(self):
+        df, data = self.make_csv(rows=200)
+        response = self.client.post(reverse('demos:data_wrangler'), {'csv_file': SimpleUploadedFile('sales.csv', data, content_type='text/csv')})
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context['error_message'])
+        results = response.context['wrangling_results']
+        self.assertEqual(results['original_shape'], (200, 3))
+        self.assertEqual(results['wrangled_shape'], (200, 4))
+        self.assertEqual(results['wrangled_columns'], ['Price', 'Units_Sold', 'Region', 'Price_Category'])
+        self.assertTrue(any("median" in step for step in results['steps_applied']))
+
+    @override_settings(DEMO_CSV_MAX_UPLOAD_MB=0)
+    def test_upload_limit_comes_from_settings(self):
+        response = self.client.post(reverse('demos:data_analyser'), {'csv_file': SimpleUploadedFile('a.csv', b'a\n1\n', content_type='text/csv')})
+        self.assertEqual(response.context['error_message'], "File size exceeds 0MB limit.")
+
+
+@override_settings(DEMO_JOBS_ENABLED=True, DEMO_PLOT_ROOT=TEST_PLOT_ROOT, MEDIA_ROOT=TEST_JOB_MEDIA_ROOT)
+class DemoJobTests(TestCase):
+    def run_worker(self, processes=0):
+        return jobs.JobWorker(processes=processes, poll_interval=0.05).run(once=True)
+
+    @patch('demos.views.TRANSFORMERS_AVAILABLE', True)
+    def test_sentiment_post_queues_job_and_page_polls(self):
+        response = self.client.post(reverse('demos:sentiment_analyzer'), {'text_input': 'Great stuff'})
+        job = DemoJob.objects.get()
+        self.assertRedirects(response, job.page_url(), fetch_redirect_response=False)
+        self.assertEqual(job.kind, jobs.SENTIMENT_ANALYSIS)
+        self.assertEqual(job.status, DemoJob.STATUS_PENDING)
+
+        page = self.client.get(job.page_url())
+        self.assertContains(page, 'id="job-status"')
+        self.assertContains(page, job.get_status_url())
+
+        status = self.client.get(job.get_status_url()).json()
+        self.assertEqual(status['status'], 'pending')
+        self.assertFalse(status['finished'])
+
+    @patch('demos.views.TRANSFORMERS_AVAILABLE', True)
+    @patch('demos.views.analyze_sentiment', return_value={'label': 'POSITIVE', 'score': 0.98})
+    def test_worker_runs_job_and_page_renders_result(self, mock_analyze):
+        self.client.post(reverse('demos:sentiment_analyzer'), {'text_input': 'Great stuff'})
+        self.assertEqual(self.run_worker(), (1, 0))
+        job = DemoJob.objects.get()
+        self.assertEqual(job.status, DemoJob.STATUS_SUCCEEDED)
+        mock_analyze.assert_called_once_with('Great stuff')
+
+        self.assertTrue(self.client.get(job.get_status_url()).json()['finished'])
+        page = self.client.get(job.page_url())
+        self.assertNotContains(page, 'id="job-status"')
+        self.assertEqual(page.context['sentiment_result'], {'label': 'POSITIVE', 'score': 98.0})
+        self.assertEqual(page.context['submitted_text'], 'Great stuff')
+
+    def test_csv_analysis_job_uses_stored_upload(self):
+        csv_file = SimpleUploadedFile('data.csv', b'a,b\n1,x\n2,y\n3,\n', content_type='text/csv')
+        self.client.post(reverse('demos:data_analyser'), {'csv_file': csv_file})
+        job = DemoJob.objects.get()
+        input_path = job.input_file.path
+        self.assertTrue(os.path.exists(input_path))
+        self.run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, DemoJob.STATUS_SUCCEEDED)
+        self.assertFalse(os.path.exists(input_path))
+        results = self.client.get(job.page_url()).context['analysis_results']
+        self.assertEqual(results['filename'], 'data.csv')
+        self.assertEqual(list(results['shape']), [3, 2])
+
+    def test_crashing_handler_marks_job_failed(self):
+        job = jobs.enqueue(jobs.SENTIMENT_ANALYSIS, {'text': 'hello'})
+        with patch.dict(jobs.JOB_HANDLERS, {jobs.SENTIMENT_ANALYSIS: MagicMock(side_effect=RuntimeError('boom'))}):
+            self.assertEqual(self.run_worker(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, DemoJob.STATUS_FAILED)
+        self.assertIn('boom', job.error_message)
+        with patch('demos.views.TRANSFORMERS_AVAILABLE', True):
+            page = self.client.get(job.page_url())
+        self.assertIn('boom', page.context['error_message'])
+
+    def test_jobs_are_claimed_once_and_stale_jobs_requeued(self):
+        first = jobs.enqueue(jobs.SENTIMENT_ANALYSIS, {'text': 'one'})
+        jobs.enqueue(jobs.SENTIMENT_ANALYSIS, {'text': 'two'})
+        claimed = jobs.claim_jobs(1)
+        self.assertEqual([job.pk for job in claimed], [first.pk])
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertEqual(len(jobs.claim_jobs(5)), 1)
+        self.assertEqual(jobs.claim_jobs(5), [])
+        DemoJob.objects.update(started_at=timezone.now() - timezone.timedelta(hours=1))
+        self.assertEqual(jobs.requeue_stale(60), 2)
+
+    def test_unknown_job_returns_404(self):
+        self.assertEqual(self.client.get(reverse('demos:job_status', kwargs={'job_id': uuid.uuid4()})).status_code, 404)
+        self.assertEqual(self.client.get(reverse('demos:data_analyser') + '?job=not-a-uuid').status_code, 404)
+        with self.assertRaises(ValueError):
+            jobs.enqueue('unknown-kind')
+
+    def test_process_pool_worker(self):
+        # Pool processes are forked, so they inherit the patched inference function
+        job = jobs.enqueue(jobs.SENTIMENT_ANALYSIS, {'text': 'hello'})
+        with patch('demos.views.analyze_sentiment', return_value={'label': 'NEGATIVE', 'score': 0.5}):
+            out = StringIO()
+            call_command('run_demo_jobs', '--processes', '1', '--once', '--poll-interval', '0.05', stdout=out)
+        job.refresh_from_db()
+        self.assertEqual(job.status, DemoJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.result['sentiment_result'], {'label': 'NEGATIVE', 'score': 50.0})
+        self.assertIn('1 succeeded', out.getvalue())
+
 def tearDownModule():
     temp_dirs_to_clean = []
+    temp_dirs_to_clean.extend([TEST_PLOT_ROOT, TEST_JOB_MEDIA_ROOT])
     if hasattr(settings, 'MEDIA_ROOT'):
         temp_demos_plots_dir = os.path.join(settings.MEDIA_ROOT, 'temp_demos', 'plots')
         if os.path.exists(temp_demos_plots_dir):
@@ -16,6 +16,10 @@ urlpatterns = [
 
     # Add path for data analysis demo
     path('data-analysis/', views.data_analyser_view, name='data_analyser'),
+    # Generated plots (content-addressed, cached forever by browsers)
+    path('plots/<str:digest>.png', views.plot_artifact_view, name='plot_artifact'),
+    # Status of queued demo jobs (polled by the demo pages)
+    path('jobs/<uuid:job_id>/', views.job_status_view, name='job_status'),
     # Add path for data wrangling demo
     path('data-wrangler/', views.data_wrangling_view, name='data_wrangler'),
     # Add path for explainable AI demo
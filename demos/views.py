@@ -2,9 +2,14 @@
 
 import os
 import io # For handling dataframe info in memory
+import time
 import uuid # For unique filenames
 import base64
-from django.shortcuts import render, get_object_or_404, Http404
+from django.shortcuts import render, redirect, get_object_or_404, Http404
+from django.http import FileResponse, HttpResponseNotModified, JsonResponse
+from django.core.exceptions import ValidationError
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_safe
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.conf import settings
 from django.core.files.storage import FileSystemStorage
@@ -12,7 +17,8 @@ from django.urls import reverse # Import reverse for generating URLs
 from .forms import ImageUploadForm, SentimentAnalysisForm, CSVUploadForm, ExplainableAIDemoForm, AmazonProductURLForm, FlightDealFinderForm
 import numpy as np
 # Import Demo model
-from .models import Demo
+from .models import Demo, DemoJob
+from .catalog import HARDCODED_DEMO_ENTRIES, demo_catalog_cache
 import logging # Import logging
 
 #import csv # For processing uploaded CSVs in upload_demo_data_view
@@ -21,63 +27,29 @@ import requests
 from bs4 import BeautifulSoup
 # import smtplib # Not sending actual emails in the demo
 from datetime import datetime, timedelta # For Flight Deal Finder (simulated dates)
+from decimal import Decimal
 import random # For Flight Deal Finder (simulated dates)
 
 logger = logging.getLogger(__name__) # Define logger at module level
 
-# --- TensorFlow / Keras Imports (for Image Classification) ---
-try:
-    import tensorflow as tf
-    from tensorflow.keras.applications.mobilenet_v2 import MobileNetV2, preprocess_input, decode_predictions
-    from tensorflow.keras.preprocessing import image as keras_image_utils
-    
-    TF_AVAILABLE = True
-    try:
-        # Load model only if needed for the image demo
-        # Consider lazy loading if memory is a concern
-        image_model = MobileNetV2(weights='imagenet')
-        IMAGE_MODEL_LOADED = True
-        logger.info("MobileNetV2 model loaded successfully.")
-    except Exception as e:
-        logger.error(f"Error loading MobileNetV2 model: {e}", exc_info=True)
-        IMAGE_MODEL_LOADED = False
-        image_model = None # Define as None on error
-except ImportError:
+# --- ML models (Image Classification, Sentiment Analysis, Explainable AI) ---
+# TensorFlow, transformers and scikit-learn models are loaded lazily through the
+# model registry the first time a demo needs them, so importing this module (which
+# dl_portfolio_project/urls.py does for every worker) stays cheap.
+from .model_registry import model_registry, ModelUnavailable, library_available, IMAGE_CLASSIFIER, SENTIMENT_PIPELINE, IRIS_DECISION_TREE
+from .inference import classify_image, analyze_sentiment
+from .result_cache import result_cache
+from . import jobs
+from .csv_analysis import profile_csv, iter_chunks
+from .plot_store import store_plot_url, figure_png, plot_path, CACHE_CONTROL
+
+TF_AVAILABLE = library_available('tensorflow')
+if not TF_AVAILABLE:
     logger.warning("TensorFlow not found. Image Classification demo disabled.")
-    TF_AVAILABLE = False
-    IMAGE_MODEL_LOADED = False
-    image_model = None # Define as None if TF not available
-    # Define dummy classes/functions if TF not available to prevent NameErrors later if needed
-    class keras_image_utils: # Dummy class
-        @staticmethod
-        def load_img(*args, **kwargs): raise ImportError("TensorFlow not available")
-        @staticmethod
-        def img_to_array(*args, **kwargs): raise ImportError("TensorFlow not available")
-
-
-# --- Hugging Face Transformers Imports (for Sentiment Analysis) ---
-sentiment_pipeline = None # Initialize as None at module level
-SENTIMENT_MODEL_LOADED = False
-TRANSFORMERS_AVAILABLE = False
-try:
-    # Use pipeline for easy sentiment analysis
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-    try:
-        # Load pipeline once on startup (or use caching/lazy loading)
-        # Using a distilled version for potentially faster/smaller footprint
-        sentiment_pipeline = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
-        SENTIMENT_MODEL_LOADED = True
-        logger.info("Sentiment analysis pipeline loaded successfully.")
-    except Exception as e:
-        logger.error(f"Error loading sentiment analysis pipeline: {e}", exc_info=True)
-        # sentiment_pipeline remains None
-        SENTIMENT_MODEL_LOADED = False
-except ImportError:
+
+TRANSFORMERS_AVAILABLE = library_available('transformers')
+if not TRANSFORMERS_AVAILABLE:
     logger.warning("Transformers library not found. Sentiment Analysis demo disabled.")
-    # sentiment_pipeline remains None
-    TRANSFORMERS_AVAILABLE = False
-    SENTIMENT_MODEL_LOADED = False
 
 #####
 
@@ -93,34 +65,10 @@ except ImportError:
     logger.warning("Pandas, Matplotlib, or Seaborn not found. Data Analysis/Wrangling demos disabled.")
     DATA_LIBS_AVAILABLE = False
 
-# --- Scikit-learn Imports (for XAI Demo) ---
-try:
-    from sklearn.datasets import load_iris
-    from sklearn.tree import DecisionTreeClassifier, export_text
-    from sklearn import tree # For plotting if needed later
-    SKLEARN_AVAILABLE = True
-    # Load Iris data and train a simple tree ONCE on startup
-    # In production, load a pre-saved model instead.
-    try:
-        iris = load_iris()
-        X_iris, y_iris = iris.data, iris.target
-        # Train a simple Decision Tree
-        decision_tree_model = DecisionTreeClassifier(max_depth=3, random_state=42) # Limit depth for simplicity
-        decision_tree_model.fit(X_iris, y_iris)
-        TREE_MODEL_LOADED = True
-        logger.info("Decision Tree model trained successfully.")
-    except Exception as e:
-        logger.error(f"Error loading Iris data or training Decision Tree: {e}", exc_info=True)
-        TREE_MODEL_LOADED = False
-        decision_tree_model = None
-        iris = None
-
-except ImportError:
+# --- Scikit-learn (for XAI Demo) ---
+SKLEARN_AVAILABLE = library_available('sklearn')
+if not SKLEARN_AVAILABLE:
     logger.warning("Scikit-learn not found. Explainable AI demo disabled.")
-    SKLEARN_AVAILABLE = False
-    TREE_MODEL_LOADED = False
-    decision_tree_model = None
-    iris = None
 
 # Statsmodels (for Causal Inference Demo)
 try:
@@ -196,150 +144,22 @@ IATA_ALIASES = {
 }
 
 
-# Define your hardcoded demo entries here
-# The 'url_name' should match the 'name' attribute in your demos/urls.py path() definitions.
-# Ensure you have app_name = 'demos' in demos/urls.py for namespacing (e.g., 'demos:image_classifier').
-# Replace placeholder image_urls with actual paths to your static images.
-HARDCODED_DEMO_ENTRIES = [
-    {
-        'url_name': 'demos:image_classifier',
-        'title': 'Image Classification Demo',
-        'description': 'Upload an image and see predictions from a MobileNetV2 model.',
-        'image_url': 'https://placehold.co/600x400/6366f1/FFFFFF?text=Image+Classifier', # Replace with your static image path
-    },
-    {
-        'url_name': 'demos:sentiment_analyzer',
-        'title': 'Sentiment Analysis Demo',
-        'description': 'Analyze the sentiment of a piece of text using a pre-trained model.',
-        'image_url': 'https://placehold.co/600x400/10b981/FFFFFF?text=Sentiment+Analysis', # Replace with your static image path
-    },
-    {
-        'url_name': 'demos:data_analyser',
-        'title': 'Simple CSV Data Analyzer',
-        'description': 'Upload a CSV file to get basic data analysis and visualizations.',
-        'image_url': 'https://placehold.co/600x400/f59e0b/FFFFFF?text=Data+Analyser', # Replace with your static image path
-    },
-    {
-        'url_name': 'demos:data_wrangler',
-        'title': 'Simple Data Wrangling Demo',
-        'description': 'Upload a CSV and apply some basic data wrangling steps.',
-        'image_url': 'https://placehold.co/600x400/3b82f6/FFFFFF?text=Data+Wrangler',
-    },
-    {
-        'url_name': 'demos:explainable_ai',
-        'title': 'Explainable AI (Decision Tree)',
-        'description': 'See how a decision tree makes predictions and understand its feature importance.',
-        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Explainable+AI',
-    },
-    {
-        'url_name': 'demos:causal_inference',
-        'title': 'Causal Inference',
-        'description': 'This demo illustrates a common challenge in data analysis: estimating the true causal effect of an intervention.',
-        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Causal+Inference',
-    },
-    {
-        'url_name': 'demos:optimization_demo',
-        'title': 'Optimisation Demo',
-        'description': 'This demo uses scipy.optimize.minimize to find a local minimum of a mathematical function (Himmelblau\'s function)',
-        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Optimisation+Demo',
-    },
-    {
-        'url_name': 'demos:keras_nmt_demo',
-        'title': 'Keras NMT Demo',
-        'description': 'Keras NMT Demo: A step-by-step guide to building and running a simple English-to-German translator using Keras.',
-        'image_url': 'https://placehold.co/600x400/8b5cf6/FFFFFF?text=Keras+NMT+Demo',
-    },
-    {
-        'url_name': 'demos:amazon_price_tracker',
-        'title': 'Amazon Price Tracker Demo',
-        'description': 'Enter an Amazon product URL to track its price and simulate alerts.',
-        'image_url': 'https://placehold.co/600x400/06b6d4/FFFFFF?text=Price+Tracker',
-    },
-    { # New Flight Deal Finder Demo Entry
-        'url_name': 'demos:flight_deal_finder', # This name will be used in urls.py
-        'title': 'Flight Deal Finder Demo',
-        'description': 'Simulate finding cheap flight deals based on origin, destination, and target price using sample data.',
-        'image_url': 'https://placehold.co/600x400/38bdf8/FFFFFF?text=Flight+Deals', # Example placeholder
-    },
-        { # New Cybersecurity Demo Entry
-        'url_name': 'demos:cybersecurity-data-science', # This name will be used in urls.py
-        'title': 'Cybersecurity Demo',
-        'description': 'This demonstration explores the critical role of data science in modern cybersecurity, focusing on how data generated by tools like Nmap and Wireshark can be leveraged for enhanced threat detection',
-        'image_url': 'https://placehold.co/600x400/38bdf8/FFFFFF?text=Cybersecurity+Demo', # Example placeholder
-    },
-]
-
 def all_demos_list_view(request):
     """
-    Displays a paginated list of demos.
-    If demos exist in the database, it shows both database demos and hardcoded interactive demos.
-    If the database is empty, no demos (neither DB nor hardcoded) are shown.
+    Displays a paginated list of demos: the database demos and the hardcoded
+    interactive demos, served from the precomputed catalogue (see catalog.py).
     """
-    all_display_demos = []
     error_message = None
-    placeholder_image = 'https://placehold.co/600x400/cccccc/ffffff?text=Preview+Not+Available'
-
     try:
-        # Fetch all published demos from the database
-        db_demos = Demo.objects.filter(is_published=True).order_by('order', 'title')
-
-        if db_demos.exists():
-            logger.info(f"Found {db_demos.count()} demos in the database. Processing them and hardcoded demos.")
-            # 1. Process demos from the database
-            for demo_item in db_demos:
-                all_display_demos.append({
-                    'id': f"db_{demo_item.slug}", # Unique ID for potential de-duplication if needed later
-                    'title': demo_item.title,
-                    'description': demo_item.description or "Detailed content available.",
-                    'image_url': demo_item.image_url or placeholder_image,
-                    'detail_url': demo_item.get_absolute_url()
-                })
-
-            # 2. Process hardcoded demo entries (ONLY if DB demos exist)
-            for demo_def in HARDCODED_DEMO_ENTRIES:
-                try:
-                    # Simple check to avoid adding a hardcoded demo if a DB demo links to the same specific view
-                    # This assumes DB demos for specific views would have a matching `demo_url_name`
-                    # or their slug would be used to generate a URL that matches one of these.
-                    # A more robust de-duplication might be needed if slugs and url_names can clash.
-                    is_duplicate = False
-                    for db_disp_item in all_display_demos:
-                        # This de-duplication is basic. If a DB item's get_absolute_url()
-                        # resolves to the same as reverse(demo_def['url_name']), it's a conceptual duplicate.
-                        # For simplicity, we'll assume for now that if a DB demo exists,
-                        # we list all hardcoded ones unless a very direct URL name match is found in a DB demo's specific field.
-                        # If your Demo model has a 'url_name_override' field:
-                        # if hasattr(db_disp_item, 'db_object') and getattr(db_disp_item['db_object'], 'url_name_override', None) == demo_def['url_name']:
-                        #    is_duplicate = True
-                        #    break
-                        pass # Keeping it simple for now: add all hardcoded if DB is not empty.
-
-                    if not is_duplicate:
-                        all_display_demos.append({
-                            'id': f"hc_{demo_def['url_name'].replace(':', '_')}", # Unique ID
-                            'title': demo_def.get('title', 'Untitled Interactive Demo'),
-                            'description': demo_def.get('description', 'No description available.'),
-                            'image_url': demo_def.get('image_url', placeholder_image),
-                            'detail_url': reverse(demo_def['url_name']) # Ensure url_name exists
-                        })
-                except Exception as e: # Catch errors like NoReverseMatch
-                    logger.error(f"Error processing hardcoded demo '{demo_def.get('title', 'Unknown')}': {e}", exc_info=True)
-        else:
-            # Database is empty, so hardcoded demos are not processed either.
-            logger.info("No demos found in the database. Hardcoded demos will not be processed for display.")
-            # all_display_demos will remain empty.
-
+        catalog = demo_catalog_cache.get()
     except Exception as e:
         logger.error(f"Error fetching or processing demos: {e}", exc_info=True)
         error_message = "Could not load demo information. Please try again later."
+        catalog = ()
 
-    # Optional: Sort all combined demos by title for consistent ordering
-    # This is useful now that we might have two sources (DB and hardcoded).
-    all_display_demos.sort(key=lambda x: x.get('title', '').lower())
-
-    # Pagination
+    # Pagination: slices the cached, already sorted tuple
     items_per_page = 9
-    paginator = Paginator(all_display_demos, items_per_page)
+    paginator = Paginator(catalog, items_per_page)
     page_number = request.GET.get('page')
 
     try:
@@ -630,116 +450,140 @@ def keras_nmt_demo_demo_view(request):
     return render(request, 'demos/keras_nmt_demo_page.html', context=context)
 
 
+# --- Background jobs ---
+def _job_from_request(request):
+    """ The DemoJob named by ?job=<id> (set after a view queued one), or None. """
+    job_id = request.GET.get('job')
+    if not job_id:
+        return None
+    try:
+        return DemoJob.objects.get(pk=job_id)
+    except (DemoJob.DoesNotExist, ValidationError, ValueError):
+        raise Http404("Job not found.")
+
+
+def _apply_job_result(job, context):
+    """ Copies a finished job's result into the view context. """
+    if job.status == DemoJob.STATUS_SUCCEEDED and job.result:
+        context.update(job.result)
+    elif job.status == DemoJob.STATUS_FAILED:
+        context['error_message'] = f"The demo job failed: {job.error_message}"
+
+
+@never_cache
+def job_status_view(request, job_id):
+    """ JSON status of a background demo job, polled by the demo pages. """
+    job = get_object_or_404(DemoJob, pk=job_id)
+    return JsonResponse({
+        'id': str(job.pk),
+        'kind': job.kind,
+        'status': job.status,
+        'finished': job.is_finished,
+        'error_message': job.error_message or None,
+        'result_url': job.page_url(),
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    })
+
+
 # --- Image Classification View (MODIFIED) ---
+def _classify_image_upload(image_bytes, content_type):
+    """ Classifies uploaded image bytes; returns the template context for the results card. """
+    try:
+        # Decode, preprocess and predict. Requests are micro-batched, either
+        # in the inference worker process (if configured) or in-process.
+        prediction_results = classify_image(image_bytes)
+    except ModelUnavailable:
+        return {'error_message': "Image classification model could not be loaded. Please check server logs."}
+    except Exception as e:
+        logger.error(f"Image Classification Error: {e}", exc_info=True)
+        return {'error_message': f"Error processing image or making prediction: {e}"}
+    # Prepare for display (convert original bytes to base64 data URI)
+    uploaded_image_base64 = base64.b64encode(image_bytes).decode('utf-8')
+    return {
+        'prediction_results': prediction_results,
+        'uploaded_image_url': f"data:{content_type};base64,{uploaded_image_base64}",
+        'error_message': None,
+    }
+
+
 def image_classification_view(request):
     form = ImageUploadForm()
-    prediction_results = None
-    uploaded_image_base64 = None # Store image as base64 for display
-    error_message = None
+    context = {'prediction_results': None, 'uploaded_image_url': None, 'error_message': None}
 
     if not TF_AVAILABLE:
-        error_message = "TensorFlow library is not installed. This demo cannot function."
-    elif not IMAGE_MODEL_LOADED:
-        error_message = "Image classification model could not be loaded. Please check server logs."
+        context['error_message'] = "TensorFlow library is not installed. This demo cannot function."
+    elif model_registry.has_failed(IMAGE_CLASSIFIER):
+        context['error_message'] = "Image classification model could not be loaded. Please check server logs."
 
-    if request.method == 'POST' and TF_AVAILABLE and IMAGE_MODEL_LOADED:
+    if request.method == 'POST' and TF_AVAILABLE:
         form = ImageUploadForm(request.POST, request.FILES)
         if form.is_valid():
             uploaded_image = form.cleaned_data['image']
-
-            # --- Process Image In-Memory ---
-            try:
-                # 1. Read image content into memory
-                image_bytes = uploaded_image.read()
-
-                # 2. Load image using Keras utils from bytes
-                # Use io.BytesIO to treat the bytes as a file
-                img = keras_image_utils.load_img(io.BytesIO(image_bytes), target_size=(224, 224))
-
-                # 3. Prepare for display (convert original bytes to base64)
-                # Determine image format (optional, but good for data URI)
-                image_format = uploaded_image.content_type.split('/')[-1] # e.g., 'jpeg', 'png'
-                uploaded_image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-                # Prepend the data URI scheme
-                uploaded_image_base64 = f"data:{uploaded_image.content_type};base64,{uploaded_image_base64}"
-
-                # 4. Preprocess for prediction
-                img_array = keras_image_utils.img_to_array(img)
-                img_array_expanded = np.expand_dims(img_array, axis=0)
-                img_preprocessed = preprocess_input(img_array_expanded)
-
-                # 5. Predict
-                predictions = image_model.predict(img_preprocessed)
-                decoded = decode_predictions(predictions, top=3)[0]
-                prediction_results = [{'label': label.replace('_', ' '), 'probability': float(prob) * 100} for (_, label, prob) in decoded]
-
-            except ImportError:
-                 # This might happen if the dummy keras_image_utils is used
-                 error_message = "TensorFlow library is not available for image processing."
-                 logger.error("Attempted image processing without TensorFlow.")
-            except Exception as e:
-                error_message = f"Error processing image or making prediction: {e}"
-                logger.error(f"Image Classification Error: {e}", exc_info=True)
-                uploaded_image_base64 = None # Clear image on error
-            # --- End In-Memory Processing ---
-
+            if jobs.jobs_enabled():
+                job = jobs.enqueue(jobs.IMAGE_CLASSIFICATION, {'content_type': uploaded_image.content_type}, upload=uploaded_image)
+                return redirect(job.page_url())
+            # Process the image in memory
+            context.update(_classify_image_upload(uploaded_image.read(), uploaded_image.content_type))
         else:
-            error_message = "Invalid form submission. Please upload a valid image file."
-
-    context = {
+            context['error_message'] = "Invalid form submission. Please upload a valid image file."
+    else:
+        job = _job_from_request(request)
+        if job:
+            context['job'] = job
+            _apply_job_result(job, context)
+
+    context.update({
         'form': form,
-        'prediction_results': prediction_results,
-        'uploaded_image_url': uploaded_image_base64, # Pass base64 data URI instead of file URL
-        'error_message': error_message,
         'page_title': 'Image Classification Demo',
         'meta_description': "Upload an image and see predictions from the MobileNetV2 model.",
         'meta_keywords': "image classification, deep learning, MobileNetV2, TensorFlow, Keras, demo",
-    }
+    })
     return render(request, 'demos/image_classification_demo.html', context=context)
 
 
 # --- Sentiment Analysis View (NEW) ---
+def _analyse_sentiment_text(text):
+    """ Runs text through the pipeline (micro-batched with concurrent requests). """
+    try:
+        sentiment_result = analyze_sentiment(text)
+        sentiment_result['score'] = round(sentiment_result['score'] * 100, 1)
+    except ModelUnavailable:
+        return {'submitted_text': text, 'error_message': "Sentiment analysis model could not be loaded. Please check server logs."}
+    except Exception as e:
+        return {'submitted_text': text, 'error_message': f"Error during sentiment analysis: {e}"}
+    return {'sentiment_result': sentiment_result, 'submitted_text': text, 'error_message': None}
+
+
 def sentiment_analysis_view(request):
     form = SentimentAnalysisForm()
-    sentiment_result = None
-    submitted_text = None
-    error_message = None
+    context = {'sentiment_result': None, 'submitted_text': None, 'error_message': None}
 
     if not TRANSFORMERS_AVAILABLE:
-        error_message = "Transformers library not installed. This demo cannot function."
-    elif not SENTIMENT_MODEL_LOADED:
-        error_message = "Sentiment analysis model could not be loaded. Please check server logs."
+        context['error_message'] = "Transformers library not installed. This demo cannot function."
+    elif model_registry.has_failed(SENTIMENT_PIPELINE):
+        context['error_message'] = "Sentiment analysis model could not be loaded. Please check server logs."
 
-    if request.method == 'POST' and TRANSFORMERS_AVAILABLE and SENTIMENT_MODEL_LOADED:
+    if request.method == 'POST' and TRANSFORMERS_AVAILABLE:
         form = SentimentAnalysisForm(request.POST)
         if form.is_valid():
             submitted_text = form.cleaned_data['text_input']
-            try:
-                # Run text through the pipeline
-                # Check if pipeline object actually exists before calling
-                if sentiment_pipeline:
-                    results = sentiment_pipeline(submitted_text)
-                    if results:
-                        sentiment_result = results[0] # Get the first result dictionary
-                        sentiment_result['score'] = round(sentiment_result['score'] * 100, 1)
-                    else:
-                        error_message = "Could not analyze sentiment for the provided text."
-                else:
-                    # This case should ideally not be reached if MODEL_LOADED is True, but added for safety
-                    error_message = "Sentiment analysis pipeline is not available."
-
-            except Exception as e:
-                error_message = f"Error during sentiment analysis: {e}"
+            if jobs.jobs_enabled():
+                job = jobs.enqueue(jobs.SENTIMENT_ANALYSIS, {'text': submitted_text})
+                return redirect(job.page_url())
+            context.update(_analyse_sentiment_text(submitted_text))
         else:
-            error_message = "Please enter some text to analyze."
-
-    context = {
+            context['error_message'] = "Please enter some text to analyze."
+    else:
+        job = _job_from_request(request)
+        if job:
+            context['job'] = job
+            _apply_job_result(job, context)
+
+    context.update({
         'form': form,
-        'sentiment_result': sentiment_result,
-        'submitted_text': submitted_text,
-        'error_message': error_message,
         'page_title': 'Sentiment Analysis Demo',
-    }
+    })
     return render(request, 'demos/sentiment_analysis_demo.html', context=context)
 
 ##### 
@@ -748,59 +592,106 @@ def sentiment_analysis_view(request):
 ##### Data Analyser
 
 
+def _csv_upload_limit():
+    """ Maximum CSV upload size in bytes (uploads are streamed in chunks, so this is a policy limit). """
+    return getattr(settings, 'DEMO_CSV_MAX_UPLOAD_MB', 200) * 1024 * 1024
+
+
+def _csv_upload_error(csv_file):
+    if csv_file.size > _csv_upload_limit():
+        return f"File size exceeds {getattr(settings, 'DEMO_CSV_MAX_UPLOAD_MB', 200)}MB limit."
+    if not csv_file.name.lower().endswith('.csv'):
+        return "Invalid file type. Please upload a CSV file."
+    return None
+
+
+def _analyse_csv_upload(csv_file, filename):
+    """
+    Profiles a CSV (uploaded file or path) and returns the template context for the results.
+    Streamed in chunks: memory depends on the chunk size, not the upload size.
+    """
+    try:
+        profile = profile_csv(csv_file)
+        describe_df = profile.describe_frame()
+        df_describe_html = None
+        if describe_df is not None:
+             df_describe_html = describe_df.to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400 border border-collapse border-gray-200 dark:border-gray-700', border=0)
+
+        # plot_url points at the stored PNG (see plot_store)
+        plot_url = None
+        numeric_columns = profile.numeric_columns()
+        if numeric_columns:
+            col_to_plot = numeric_columns[0].name
+            edges, counts = numeric_columns[0].histogram.edges_and_counts()
+            if counts.size:
+                plt.figure(figsize=(8, 4))
+                plt.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='white')
+                plt.title(f'Distribution of {col_to_plot}')
+                plt.xlabel(col_to_plot); plt.ylabel('Frequency'); plt.tight_layout()
+                plot_url = store_plot_url(figure_png(plt))
+                plt.close()
+
+        analysis_results = {
+            'filename': filename, 'shape': profile.shape, 'columns': profile.column_names,
+            'head': profile.head.to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400', border=0, index=False),
+            'info': profile.info_text(), 'describe_html': df_describe_html,
+            'plot_url': plot_url
+        }
+    except pd.errors.EmptyDataError: return {'error_message': "Uploaded CSV is empty."}
+    except Exception as e:
+        logger.error(f"Data Analyser Error: {e}", exc_info=True)
+        return {'error_message': f"Error processing CSV: {e}"}
+    return {'analysis_results': analysis_results, 'error_message': None}
+
+
 def data_analyser_view(request):
     form = CSVUploadForm()
-    analysis_results = None
-    error_message = None
-    # plot_image_url will be base64 data URI
+    context = {'analysis_results': None, 'error_message': None}
 
-    if not DATA_LIBS_AVAILABLE: error_message = "Data science libraries (Pandas, Matplotlib, Seaborn) not installed."
+    if not DATA_LIBS_AVAILABLE: context['error_message'] = "Data science libraries (Pandas, Matplotlib, Seaborn) not installed."
 
     if request.method == 'POST' and DATA_LIBS_AVAILABLE:
         form = CSVUploadForm(request.POST, request.FILES)
         if form.is_valid():
             csv_file = form.cleaned_data['csv_file']
-            if csv_file.size > 5 * 1024 * 1024: error_message = "File size exceeds 5MB."
-            elif not csv_file.name.lower().endswith('.csv'): error_message = "Invalid file type. Please upload CSV."
-            else:
-                try:
-                    df = pd.read_csv(csv_file)
-                    buffer = io.StringIO()
-                    df.info(buf=buffer)
-                    df_info = buffer.getvalue()
-                    df_describe_html = None
-                    numeric_df = df.select_dtypes(include=np.number)
-                    if not numeric_df.empty:
-                         df_describe_html = numeric_df.describe().to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400 border border-collapse border-gray-200 dark:border-gray-700', border=0)
-                    
-                    plot_base64 = None
-                    if not numeric_df.empty:
-                        col_to_plot = numeric_df.columns[0]
-                        plt.figure(figsize=(8, 4))
-                        sns.histplot(df[col_to_plot], kde=True)
-                        plt.title(f'Distribution of {col_to_plot}')
-                        plt.xlabel(col_to_plot); plt.ylabel('Frequency'); plt.tight_layout()
-                        img_buffer = io.BytesIO()
-                        plt.savefig(img_buffer, format='png'); img_buffer.seek(0)
-                        plot_base64 = base64.b64encode(img_buffer.getvalue()).decode('utf-8')
-                        plt.close()
-                    
-                    analysis_results = {
-                        'filename': csv_file.name, 'shape': df.shape, 'columns': df.columns.tolist(),
-                        'head': df.head().to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400', border=0, index=False),
-                        'info': df_info, 'describe_html': df_describe_html,
-                        'plot_url': f"data:image/png;base64,{plot_base64}" if plot_base64 else None
-                    }
-                except pd.errors.EmptyDataError: error_message = "Uploaded CSV is empty."
-                except Exception as e: error_message = f"Error processing CSV: {e}"; logger.error(f"Data Analyser Error: {e}", exc_info=True)
+            context['error_message'] = _csv_upload_error(csv_file)
+            if not context['error_message']:
+                if jobs.jobs_enabled():
+                    job = jobs.enqueue(jobs.CSV_ANALYSIS, {'filename': csv_file.name}, upload=csv_file)
+                    return redirect(job.page_url())
+                context.update(_analyse_csv_upload(csv_file, csv_file.name))
         # else: form errors handled by template
-    context = {
-        'form': form, 'analysis_results': analysis_results, 'error_message': error_message,
+    else:
+        job = _job_from_request(request)
+        if job:
+            context['job'] = job
+            _apply_job_result(job, context)
+    context.update({
+        'form': form,
         'page_title': 'Simple CSV Data Analyzer',
-    }
+    })
     return render(request, 'demos/data_analysis_demo.html', context=context)
 
 
+@require_safe
+def plot_artifact_view(request, digest):
+    """ Serves a stored demo plot. Artifacts are content-addressed, so they never change. """
+    try:
+        path = plot_path(digest)
+    except ValueError:
+        raise Http404("Plot not found.")
+    etag = f'"{digest}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        try:
+            response = FileResponse(open(path, 'rb'), content_type='image/png')
+        except FileNotFoundError:
+            raise Http404("Plot not found.")
+    response['ETag'] = etag
+    response['Cache-Control'] = CACHE_CONTROL
+    return response
+
 # --- Cybersecurity & Data Science Demo View (NEW) ---
 def cybersecurity_ds_demo_view(request):
     """ Renders the conceptual demo page for Cybersecurity & Data Science. """
@@ -1022,6 +913,23 @@ The integration of data science and AI into cybersecurity is rapidly advancing.
 ##### --- Data Wrangling View ---
 
 
+def _wrangle_chunk(chunk, fill_values, rename_map, numeric_cols):
+    """ Applies the wrangling steps to one chunk, using fill values computed over the whole file. """
+    for col in numeric_cols:
+        chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+    chunk = chunk.fillna(fill_values)
+    if rename_map:
+        chunk = chunk.rename(columns=rename_map)
+    if 'Price' in chunk.columns:
+        # Ensure Price is numeric first
+        chunk['Price'] = pd.to_numeric(chunk['Price'], errors='coerce')
+        chunk = chunk.dropna(subset=['Price']) # Drop rows where conversion failed
+        bins = [0, 50, 200, np.inf] # Define price ranges
+        labels = ['Low', 'Medium', 'High']
+        chunk['Price_Category'] = pd.cut(chunk['Price'], bins=bins, labels=labels, right=False)
+    return chunk
+
+
 def data_wrangling_view(request):
     form = CSVUploadForm() # Reuse the CSV upload form
     wrangling_results = None
@@ -1036,67 +944,65 @@ def data_wrangling_view(request):
             csv_file = form.cleaned_data['csv_file']
 
             # Basic validation
-            if csv_file.size > 5 * 1024 * 1024: # Max 5 MB
-                error_message = "File size exceeds 5MB limit."
-            elif not csv_file.name.lower().endswith('.csv'):
-                error_message = "Invalid file type. Please upload a CSV file."
-            else:
+            error_message = _csv_upload_error(csv_file)
+            if not error_message:
                 try:
-                    # Read CSV
-                    df = pd.read_csv(csv_file)
-                    original_head_html = df.head().to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400', border=0, index=False)
-                    original_columns = df.columns.tolist()
-                    original_shape = df.shape
+                    # First pass: column types, null counts and medians, streamed in chunks
+                    profile = profile_csv(csv_file)
+                    original_head_html = profile.head.to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400', border=0, index=False)
 
-                    # --- Apply Wrangling Steps ---
+                    # --- Plan Wrangling Steps ---
                     steps_applied = []
-                    df_wrangled = df.copy() # Work on a copy
+                    fill_values = {}
+                    numeric_cols = [summary.name for summary in profile.numeric_columns()]
 
                     # 1. Handle Missing Numerical Values (Example: fill with median)
-                    numeric_cols = df_wrangled.select_dtypes(include=np.number).columns
-                    for col in numeric_cols:
-                        if df_wrangled[col].isnull().any():
-                            median_val = df_wrangled[col].median()
-                            df_wrangled[col].fillna(median_val, inplace=True)
-                            steps_applied.append(f"Filled missing values in numerical column '{col}' with median ({median_val:.2f}).")
+                    for summary in profile.numeric_columns():
+                        if summary.nulls and summary.n:
+                            median_val = summary.median()
+                            fill_values[summary.name] = median_val
+                            steps_applied.append(f"Filled missing values in numerical column '{summary.name}' with median ({median_val:.2f}).")
 
                     # 2. Handle Missing Categorical Values (Example: fill with 'Unknown')
-                    categorical_cols = df_wrangled.select_dtypes(include='object').columns
-                    for col in categorical_cols:
-                        if df_wrangled[col].isnull().any():
-                            df_wrangled[col].fillna('Unknown', inplace=True)
-                            steps_applied.append(f"Filled missing values in categorical column '{col}' with 'Unknown'.")
+                    for summary in profile.columns.values():
+                        if summary.dtype == 'object' and summary.nulls:
+                            fill_values[summary.name] = 'Unknown'
+                            steps_applied.append(f"Filled missing values in categorical column '{summary.name}' with 'Unknown'.")
 
                     # 3. Rename a Column (Example: if 'QuantitySold' exists)
-                    if 'QuantitySold' in df_wrangled.columns:
-                        df_wrangled.rename(columns={'QuantitySold': 'Units_Sold'}, inplace=True)
+                    rename_map = {}
+                    if 'QuantitySold' in profile.columns:
+                        rename_map = {'QuantitySold': 'Units_Sold'}
                         steps_applied.append("Renamed column 'QuantitySold' to 'Units_Sold'.")
-                    elif 'Quantity' in df_wrangled.columns: # Alternative common name
-                            df_wrangled.rename(columns={'Quantity': 'Units_Sold'}, inplace=True)
-                            steps_applied.append("Renamed column 'Quantity' to 'Units_Sold'.")
-
+                    elif 'Quantity' in profile.columns: # Alternative common name
+                        rename_map = {'Quantity': 'Units_Sold'}
+                        steps_applied.append("Renamed column 'Quantity' to 'Units_Sold'.")
 
                     # 4. Create a Derived Column (Example: Price Category)
-                    if 'Price' in df_wrangled.columns:
-                        # Ensure Price is numeric first
-                        df_wrangled['Price'] = pd.to_numeric(df_wrangled['Price'], errors='coerce')
-                        df_wrangled.dropna(subset=['Price'], inplace=True) # Drop rows where conversion failed
-
-                        bins = [0, 50, 200, np.inf] # Define price ranges
-                        labels = ['Low', 'Medium', 'High']
-                        df_wrangled['Price_Category'] = pd.cut(df_wrangled['Price'], bins=bins, labels=labels, right=False)
+                    if 'Price' in profile.columns:
                         steps_applied.append("Created 'Price_Category' column based on 'Price' (Low: <50, Medium: 50-199, High: >=200).")
 
+                    # --- Second pass: apply the steps chunk by chunk, keeping only the row count and the head ---
+                    wrangled_rows = 0
+                    head_parts = []
+                    for chunk in iter_chunks(csv_file):
+                        chunk = _wrangle_chunk(chunk, fill_values, rename_map, numeric_cols)
+                        wrangled_rows += len(chunk)
+                        if sum(len(part) for part in head_parts) < 5 or not head_parts:
+                            head_parts.append(chunk.head(5))
+                    wrangled_head = pd.concat(head_parts).head(5) if head_parts else profile.head.rename(columns=rename_map)
+                    wrangled_columns = wrangled_head.columns.tolist()
+
                     # --- Prepare results ---
-                    wrangled_head_html = df_wrangled.head().to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400', border=0, index=False)
+                    wrangled_head_html = wrangled_head.to_html(classes='w-full text-sm text-left text-gray-500 dark:text-gray-400', border=0, index=False)
 
                     wrangling_results = {
                         'filename': csv_file.name,
-                        'original_shape': original_shape,
-                        'original_columns': original_columns,
+                        'original_shape': profile.shape,
+                        'original_columns': profile.column_names,
                         'original_head': original_head_html,
-                        'wrangled_shape': df_wrangled.shape,
-                        'wrangled_columns': df_wrangled.columns.tolist(),
+                        'wrangled_shape': (wrangled_rows, len(wrangled_columns)),
+                        'wrangled_columns': wrangled_columns,
                         'wrangled_head': wrangled_head_html,
                         'steps_applied': steps_applied,
                     }
@@ -1120,6 +1026,146 @@ def data_wrangling_view(request):
 
 
 # --- Amazon Price Tracker View (NEW) ---
+def _check_amazon_price(product_url, target_price_formval=None):
+    """
+    Scrapes an Amazon product page and compares its price with an optional target.
+    Returns a dict with product_title, current_price, alert_message and error_message.
+    Runs in the request or, with DEMO_JOBS_ENABLED, in the run_demo_jobs worker.
+    """
+    product_title = None
+    current_price = None
+    alert_message = None
+    error_message = None
+
+    # --- Headers for request (mimic browser) ---
+    # Using a more generic User-Agent
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+        "Connection": "keep-alive",
+        "Upgrade-Insecure-Requests": "1",
+        "DNT": "1", # Do Not Track
+    }
+
+    try:
+        logger.info(f"Attempting to fetch URL: {product_url}")
+        response = requests.get(product_url, headers=headers, timeout=10)
+        response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
+
+        soup = BeautifulSoup(response.content, "html.parser")
+
+        # --- Extract Product Title ---
+        # Common selectors for Amazon product titles (these can change!)
+        title_selectors = [
+            "#productTitle",
+            "span.a-size-large.product-title-word-break", # Another common one
+            "h1#title span#productTitle" # More specific
+        ]
+        for selector in title_selectors:
+            title_element = soup.select_one(selector)
+            if title_element:
+                product_title = title_element.get_text().strip()
+                break
+
+        if not product_title: # Fallback if specific selectors fail
+            product_title_element = soup.find("span", {"id": "productTitle"})
+            if product_title_element:
+                 product_title = product_title_element.get_text().strip()
+            else: # Broader search if still not found
+                h1_title = soup.find('h1')
+                if h1_title: product_title = h1_title.get_text(separator=" ", strip=True).splitlines()[0]
+
+
+        # --- Extract Product Price ---
+        # Common selectors for Amazon prices (these can change!)
+        # Order matters: try more specific/reliable ones first.
+        price_selectors = [
+            "span.a-price span.a-offscreen", # Often the main price
+            "span.a-price.reinventPricePriceToPayMargin span.a-offscreen", # Variation
+            "span.a-price.aok-align-center span.a-offscreen", 
+            "div#corePrice_feature_div span.a-price span.a-offscreen", # Inside a specific div
+            "div#corePriceDisplay_desktop_feature_div span.a-price span.a-offscreen",
+            "span.priceToPay span.a-offscreen", # For some layouts
+            "span.apexPriceToPay span.a-offscreen",
+            "td.a-span12 span.a-price span.a-offscreen", # Inside tables for some book formats
+            "div#price span.a-offscreen", # Simpler one
+            ".a-price-whole", # Just the whole part, might need to combine with fraction
+        ]
+        price_text = None
+        for selector in price_selectors:
+            price_element = soup.select_one(selector)
+            if price_element:
+                price_text = price_element.get_text().strip()
+                break
+
+        # If only whole part was found, try to find fraction
+        if not price_text or (price_text and not price_text.startswith("£") and not price_text.startswith("$") and not price_text.startswith("€")):
+            whole_price_el = soup.select_one("span.a-price-whole")
+            fraction_price_el = soup.select_one("span.a-price-fraction")
+            currency_el = soup.select_one("span.a-price-symbol")
+            if whole_price_el and fraction_price_el and currency_el:
+                price_text = f"{currency_el.get_text().strip()}{whole_price_el.get_text().strip()}.{fraction_price_el.get_text().strip()}"
+
+
+        if price_text:
+            # Clean price (remove currency symbol and commas, handle different decimal separators if needed)
+            # Assuming price is in £ for .co.uk, adapt if international
+            price_cleaned = price_text.replace("£", "").replace("$", "").replace("€", "").replace(",", "").strip()
+            current_price = float(price_cleaned)
+        else:
+            logger.warning(f"Could not find price for URL: {product_url}. Soup sample: {soup.title.string if soup.title else 'No title'}")
+
+
+        if not product_title:
+             logger.warning(f"Could not find product title for URL: {product_url}. Soup sample: {soup.title.string if soup.title else 'No title'}")
+             error_message = "Could not extract product title. Amazon's page structure might have changed or the URL is for a non-standard product page."
+        if not current_price and not error_message: # Only set this if title was found but price wasn't
+             error_message = "Could not extract product price. Amazon's page structure might have changed."
+
+
+        if product_title and current_price:
+            if target_price_formval: # If a target price was given
+                if current_price < target_price_formval:
+                    alert_message = f"Success! The current price (£{current_price:.2f}) is below your target of £{target_price_formval:.2f}. (Email alert simulated)"
+                elif current_price == target_price_formval:
+                    alert_message = f"The current price (£{current_price:.2f}) matches your target of £{target_price_formval:.2f}. (Email alert simulated)"
+                else:
+                    alert_message = f"The current price (£{current_price:.2f}) is above your target of £{target_price_formval:.2f}."
+            else: # No target price given
+                alert_message = "Product details fetched successfully. No target price was set for comparison."
+
+        # elif not error_message: # If scraping failed to get title or price but no specific exception
+        #     error_message = "Could not retrieve product details. The Amazon page structure might have changed, the URL is invalid, or the product is unavailable."
+
+    except requests.exceptions.HTTPError as e:
+        error_message = f"HTTP error accessing URL: {e}. The product page may be unavailable or the URL is incorrect."
+        logger.error(f"HTTPError for {product_url}: {e}")
+    except requests.exceptions.ConnectionError:
+        error_message = "Network error. Could not connect to Amazon. Please check your internet connection."
+        logger.error(f"ConnectionError for {product_url}")
+    except requests.exceptions.Timeout:
+        error_message = "The request to Amazon timed out. The server might be busy or your connection slow."
+        logger.error(f"Timeout for {product_url}")
+    except requests.exceptions.RequestException as e:
+        error_message = f"An error occurred while fetching the product page: {e}"
+        logger.error(f"RequestException for {product_url}: {e}")
+    except ValueError: # For float conversion error
+        error_message = "Could not parse the price value from the page. The format might be unexpected."
+        logger.error(f"ValueError parsing price from {product_url}")
+    except Exception as e:
+        error_message = f"An unexpected error occurred: {e}. Please check the URL and try again."
+        logger.error(f"Unexpected error for {product_url}: {e}", exc_info=True)
+
+    return {
+        'product_title': product_title,
+        'current_price': current_price,
+        'alert_message': alert_message,
+        'error_message': error_message,
+    }
+
+
 def amazon_price_tracker_view(request):
     """
     Handles the Amazon Price Tracker demo.
@@ -1131,6 +1177,7 @@ def amazon_price_tracker_view(request):
     target_price_formval = None # To store the target price from the form for display
     alert_message = None
     error_message = None
+    job = None
 
     if request.method == 'POST':
         form = AmazonProductURLForm(request.POST)
@@ -1138,133 +1185,35 @@ def amazon_price_tracker_view(request):
             product_url = form.cleaned_data['product_url']
             target_price_formval = form.cleaned_data.get('target_price') # Get optional target price
 
-            # --- Headers for request (mimic browser) ---
-            # Using a more generic User-Agent
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/98.0.4758.102 Safari/537.36",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "DNT": "1", # Do Not Track
-            }
-            
-            try:
-                logger.info(f"Attempting to fetch URL: {product_url}")
-                response = requests.get(product_url, headers=headers, timeout=10)
-                response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
-                
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                # --- Extract Product Title ---
-                # Common selectors for Amazon product titles (these can change!)
-                title_selectors = [
-                    "#productTitle",
-                    "span.a-size-large.product-title-word-break", # Another common one
-                    "h1#title span#productTitle" # More specific
-                ]
-                for selector in title_selectors:
-                    title_element = soup.select_one(selector)
-                    if title_element:
-                        product_title = title_element.get_text().strip()
-                        break
-                
-                if not product_title: # Fallback if specific selectors fail
-                    product_title_element = soup.find("span", {"id": "productTitle"})
-                    if product_title_element:
-                         product_title = product_title_element.get_text().strip()
-                    else: # Broader search if still not found
-                        h1_title = soup.find('h1')
-                        if h1_title: product_title = h1_title.get_text(separator=" ", strip=True).splitlines()[0]
-
-
-                # --- Extract Product Price ---
-                # Common selectors for Amazon prices (these can change!)
-                # Order matters: try more specific/reliable ones first.
-                price_selectors = [
-                    "span.a-price span.a-offscreen", # Often the main price
-                    "span.a-price.reinventPricePriceToPayMargin span.a-offscreen", # Variation
-                    "span.a-price.aok-align-center span.a-offscreen", 
-                    "div#corePrice_feature_div span.a-price span.a-offscreen", # Inside a specific div
-                    "div#corePriceDisplay_desktop_feature_div span.a-price span.a-offscreen",
-                    "span.priceToPay span.a-offscreen", # For some layouts
-                    "span.apexPriceToPay span.a-offscreen",
-                    "td.a-span12 span.a-price span.a-offscreen", # Inside tables for some book formats
-                    "div#price span.a-offscreen", # Simpler one
-                    ".a-price-whole", # Just the whole part, might need to combine with fraction
-                ]
-                price_text = None
-                for selector in price_selectors:
-                    price_element = soup.select_one(selector)
-                    if price_element:
-                        price_text = price_element.get_text().strip()
-                        break
-                
-                # If only whole part was found, try to find fraction
-                if not price_text or (price_text and not price_text.startswith("£") and not price_text.startswith("$") and not price_text.startswith("€")):
-                    whole_price_el = soup.select_one("span.a-price-whole")
-                    fraction_price_el = soup.select_one("span.a-price-fraction")
-                    currency_el = soup.select_one("span.a-price-symbol")
-                    if whole_price_el and fraction_price_el and currency_el:
-                        price_text = f"{currency_el.get_text().strip()}{whole_price_el.get_text().strip()}.{fraction_price_el.get_text().strip()}"
-
-
-                if price_text:
-                    # Clean price (remove currency symbol and commas, handle different decimal separators if needed)
-                    # Assuming price is in £ for .co.uk, adapt if international
-                    price_cleaned = price_text.replace("£", "").replace("$", "").replace("€", "").replace(",", "").strip()
-                    current_price = float(price_cleaned)
-                else:
-                    logger.warning(f"Could not find price for URL: {product_url}. Soup sample: {soup.title.string if soup.title else 'No title'}")
-
-
-                if not product_title:
-                     logger.warning(f"Could not find product title for URL: {product_url}. Soup sample: {soup.title.string if soup.title else 'No title'}")
-                     error_message = "Could not extract product title. Amazon's page structure might have changed or the URL is for a non-standard product page."
-                if not current_price and not error_message: # Only set this if title was found but price wasn't
-                     error_message = "Could not extract product price. Amazon's page structure might have changed."
-
-
-                if product_title and current_price:
-                    if target_price_formval: # If a target price was given
-                        if current_price < target_price_formval:
-                            alert_message = f"Success! The current price (£{current_price:.2f}) is below your target of £{target_price_formval:.2f}. (Email alert simulated)"
-                        elif current_price == target_price_formval:
-                            alert_message = f"The current price (£{current_price:.2f}) matches your target of £{target_price_formval:.2f}. (Email alert simulated)"
-                        else:
-                            alert_message = f"The current price (£{current_price:.2f}) is above your target of £{target_price_formval:.2f}."
-                    else: # No target price given
-                        alert_message = "Product details fetched successfully. No target price was set for comparison."
-                
-                # elif not error_message: # If scraping failed to get title or price but no specific exception
-                #     error_message = "Could not retrieve product details. The Amazon page structure might have changed, the URL is invalid, or the product is unavailable."
-
-            except requests.exceptions.HTTPError as e:
-                error_message = f"HTTP error accessing URL: {e}. The product page may be unavailable or the URL is incorrect."
-                logger.error(f"HTTPError for {product_url}: {e}")
-            except requests.exceptions.ConnectionError:
-                error_message = "Network error. Could not connect to Amazon. Please check your internet connection."
-                logger.error(f"ConnectionError for {product_url}")
-            except requests.exceptions.Timeout:
-                error_message = "The request to Amazon timed out. The server might be busy or your connection slow."
-                logger.error(f"Timeout for {product_url}")
-            except requests.exceptions.RequestException as e:
-                error_message = f"An error occurred while fetching the product page: {e}"
-                logger.error(f"RequestException for {product_url}: {e}")
-            except ValueError: # For float conversion error
-                error_message = "Could not parse the price value from the page. The format might be unexpected."
-                logger.error(f"ValueError parsing price from {product_url}")
-            except Exception as e:
-                error_message = f"An unexpected error occurred: {e}. Please check the URL and try again."
-                logger.error(f"Unexpected error for {product_url}: {e}", exc_info=True)
+            if jobs.jobs_enabled():
+                job = jobs.enqueue(jobs.AMAZON_PRICE, {
+                    'product_url': product_url,
+                    'target_price': str(target_price_formval) if target_price_formval is not None else None,
+                })
+                return redirect(job.page_url())
+            scraped = _check_amazon_price(product_url, target_price_formval)
+            product_title = scraped['product_title']
+            current_price = scraped['current_price']
+            alert_message = scraped['alert_message']
+            error_message = scraped['error_message']
         else:
             # Form is not valid, errors will be displayed by the form in the template
             pass
-
+    else:
+        job = _job_from_request(request)
+        if job:
+            if job.payload.get('target_price'):
+                target_price_formval = Decimal(job.payload['target_price'])
+            job_context = {}
+            _apply_job_result(job, job_context)
+            product_title = job_context.get('product_title')
+            current_price = job_context.get('current_price')
+            alert_message = job_context.get('alert_message')
+            error_message = job_context.get('error_message')
 
     context = {
         'form': form,
+        'job': job,
         'product_title': product_title,
         'current_price': current_price,
         'target_price_formval': target_price_formval, # Pass submitted target price back to template
@@ -1283,13 +1232,15 @@ def explainable_ai_view(request):
     input_features_dict = None; probability_list = None; error_message = None
 
     if not SKLEARN_AVAILABLE: error_message = "Scikit-learn library is not installed."
-    elif not TREE_MODEL_LOADED: error_message = "Decision Tree model or Iris data could not be loaded."
+    elif model_registry.has_failed(IRIS_DECISION_TREE): error_message = "Decision Tree model or Iris data could not be loaded."
 
-    if request.method == 'POST' and SKLEARN_AVAILABLE and TREE_MODEL_LOADED:
+    if request.method == 'POST' and SKLEARN_AVAILABLE:
         form = ExplainableAIDemoForm(request.POST)
         if form.is_valid():
             input_features_dict = form.cleaned_data
             try:
+                tree_bundle = model_registry.get(IRIS_DECISION_TREE)
+                decision_tree_model, iris = tree_bundle.model, tree_bundle.dataset
                 input_arr = np.array([[v for k,v in sorted(input_features_dict.items())]])
                 pred_idx = decision_tree_model.predict(input_arr)[0]
                 prediction = iris.target_names[pred_idx]
@@ -1323,6 +1274,8 @@ def explainable_ai_view(request):
 
                 importances = decision_tree_model.feature_importances_
                 feature_importances = sorted(zip(feature_names, importances * 100), key=lambda x: x[1], reverse=True)
+            except ModelUnavailable:
+                error_message = "Decision Tree model or Iris data could not be loaded."
             except Exception as e: 
                 error_message = f"Error during prediction: {e}"
                 logger.error(f"XAI Error: {e}", exc_info=True)
@@ -1341,7 +1294,124 @@ def explainable_ai_view(request):
     return render(request, 'demos/explainable_ai_demo.html', context=context)
 
 
-# --- Causal Inference Demo View (NEW) ---
+# --- Causal Inference Demo (NEW) ---
+# The demo is fully deterministic (fixed seed), so its numbers and plot are computed
+# once and served from the demo result cache. Bump the version when changing the code.
+CAUSAL_INFERENCE_VERSION = 2
+CAUSAL_INFERENCE_INPUTS = {'seed': 42, 'n_customers': 1000, 'true_ate': 20}
+PLOT_REFRESH_SECONDS = 24 * 3600 # Re-save cached plots this often, so prune_demo_plots keeps them
+_plot_saved = {} # plot URL -> time.monotonic() of its last save in this process
+
+
+def _plot_is_stored(value):
+    return value['plot_url'] is not None
+
+
+def _store_plot(plot_png):
+    """ ``store_plot_url`` for cached results, remembering when the file was saved. """
+    url = store_plot_url(plot_png)
+    if url is not None:
+        _plot_saved[url] = time.monotonic()
+    return url
+
+
+def _cached_plot_url(cached):
+    """
+    The plot URL stored with a cached demo result (None if the plot failed). Hits do
+    not touch the file, except to re-save it every PLOT_REFRESH_SECONDS in case it was pruned.
+    """
+    url = cached['plot_url']
+    saved = _plot_saved.get(url)
+    if url is not None and (saved is None or time.monotonic() - saved > PLOT_REFRESH_SECONDS):
+        _store_plot(cached['plot_png'])
+    return url
+
+
+def _compute_causal_inference(seed, n_customers, true_ate):
+    """
+    Simulates the marketing campaign data, estimates the ATE by regression
+    adjustment and renders and stores the scatterplot. Returns
+    {'results': ..., 'plot_png': bytes, 'plot_url': str}; both plot values are
+    None (and the result is not cached) if the plot could not be rendered.
+    """
+    # 1. Simulate Data with Confounding
+    np.random.seed(seed) # for reproducibility
+    # Confounder: 'engagement_score' (influences both treatment and outcome)
+    engagement_score = np.random.normal(50, 15, n_customers).clip(1, 100)
+    # Treatment Assignment (Promotion): More engaged customers are more likely to get promo
+    prob_promo = 1 / (1 + np.exp(-( -2.5 + 0.05 * engagement_score))) # Sigmoid function
+    received_promo = (np.random.rand(n_customers) < prob_promo).astype(int) # 1 if promo, 0 otherwise
+    # Outcome (Spending): Depends on engagement, promo (true effect=20), and noise
+    spending = 50 + 0.8 * engagement_score + true_ate * received_promo + np.random.normal(0, 10, n_customers)
+    spending = spending.clip(10) # Min spending of 10
+
+    df = pd.DataFrame({
+        'customer_id': range(n_customers),
+        'engagement': engagement_score.round(1),
+        'received_promo': received_promo, # Treatment (0 or 1)
+        'spending': spending.round(2)      # Outcome
+    })
+
+    # 2. Naive Comparison (Incorrect due to confounding)
+    naive_diff = df[df['received_promo'] == 1]['spending'].mean() - \
+                 df[df['received_promo'] == 0]['spending'].mean()
+
+    # 3. Regression Adjustment
+    # Model: spending ~ engagement + received_promo
+    # Fit OLS model using statsmodels
+    # Use C(received_promo) if you want explicit categorical treatment
+    ols_formula = 'spending ~ engagement + received_promo'
+    ols_model = smf.ols(formula=ols_formula, data=df).fit()
+
+    # Predict potential outcomes
+    # Predict spending if EVERYONE received promo
+    df_promo_all = df.assign(received_promo=1)
+    pred_spending_if_promo = ols_model.predict(df_promo_all)
+
+    # Predict spending if NO ONE received promo
+    df_no_promo_all = df.assign(received_promo=0)
+    pred_spending_if_no_promo = ols_model.predict(df_no_promo_all)
+
+    # Calculate Average Treatment Effect (ATE)
+    ate_estimate = (pred_spending_if_promo - pred_spending_if_no_promo).mean()
+
+    # 4. Prepare results for template
+    results = {
+        'n_customers': n_customers,
+        'naive_difference': round(naive_diff, 2),
+        'confounder_info': "Higher engagement scores increase both the chance of receiving a promotion AND baseline spending.",
+        'method_used': "Regression Adjustment",
+        'regression_formula': ols_formula,
+        'ate_estimate': round(ate_estimate, 2),
+        'true_ate': true_ate, # For comparison in the demo
+        'ols_summary': ols_model.summary().as_html() # Get model summary as HTML table
+    }
+
+    # 5. Generate a simple plot (Optional)
+    try:
+        plt.figure(figsize=(7, 5))
+        sns.scatterplot(data=df, x='engagement', y='spending', hue='received_promo', alpha=0.6)
+        plt.title('Spending vs Engagement (Colored by Promo)')
+        plt.xlabel("Engagement Score")
+        plt.ylabel("Customer Spending ($)")
+        plt.legend(title='Received Promo', loc='upper left')
+        plt.grid(True, linestyle='--', alpha=0.6)
+        plt.tight_layout()
+
+        # Save plot to buffer (raw PNG bytes are cached; the view encodes them)
+        buf = io.BytesIO()
+        plt.savefig(buf, format='png', bbox_inches='tight')
+        plt.close() # Close the figure
+        plot_png = buf.getvalue()
+
+    except Exception as plot_e:
+        print(f"Error generating plot: {plot_e}")
+        plt.close()
+        plot_png = None # Possibly transient: the result is not cached, the next request tries again
+
+    return {'results': results, 'plot_png': plot_png, 'plot_url': _store_plot(plot_png)}
+
+
 def causal_inference_demo_view(request):
     """
     Demonstrates Causal Inference using Regression Adjustment
@@ -1358,83 +1428,12 @@ def causal_inference_demo_view(request):
          return render(request, 'demos/causal_inference_demo.html', context)
 
     try:
-        # 1. Simulate Data with Confounding
-        np.random.seed(42) # for reproducibility
-        n_customers = 1000
-        # Confounder: 'engagement_score' (influences both treatment and outcome)
-        engagement_score = np.random.normal(50, 15, n_customers).clip(1, 100)
-        # Treatment Assignment (Promotion): More engaged customers are more likely to get promo
-        prob_promo = 1 / (1 + np.exp(-( -2.5 + 0.05 * engagement_score))) # Sigmoid function
-        received_promo = (np.random.rand(n_customers) < prob_promo).astype(int) # 1 if promo, 0 otherwise
-        # Outcome (Spending): Depends on engagement, promo (true effect=20), and noise
-        true_ate = 20
-        spending = 50 + 0.8 * engagement_score + true_ate * received_promo + np.random.normal(0, 10, n_customers)
-        spending = spending.clip(10) # Min spending of 10
-
-        df = pd.DataFrame({
-            'customer_id': range(n_customers),
-            'engagement': engagement_score.round(1),
-            'received_promo': received_promo, # Treatment (0 or 1)
-            'spending': spending.round(2)      # Outcome
-        })
-
-        # 2. Naive Comparison (Incorrect due to confounding)
-        naive_diff = df[df['received_promo'] == 1]['spending'].mean() - \
-                     df[df['received_promo'] == 0]['spending'].mean()
-
-        # 3. Regression Adjustment
-        # Model: spending ~ engagement + received_promo
-        # Fit OLS model using statsmodels
-        # Use C(received_promo) if you want explicit categorical treatment
-        ols_formula = 'spending ~ engagement + received_promo'
-        ols_model = smf.ols(formula=ols_formula, data=df).fit()
-
-        # Predict potential outcomes
-        # Predict spending if EVERYONE received promo
-        df_promo_all = df.assign(received_promo=1)
-        pred_spending_if_promo = ols_model.predict(df_promo_all)
-
-        # Predict spending if NO ONE received promo
-        df_no_promo_all = df.assign(received_promo=0)
-        pred_spending_if_no_promo = ols_model.predict(df_no_promo_all)
-
-        # Calculate Average Treatment Effect (ATE)
-        ate_estimate = (pred_spending_if_promo - pred_spending_if_no_promo).mean()
-
-        # 4. Prepare results for template
-        results = {
-            'n_customers': n_customers,
-            'naive_difference': round(naive_diff, 2),
-            'confounder_info': "Higher engagement scores increase both the chance of receiving a promotion AND baseline spending.",
-            'method_used': "Regression Adjustment",
-            'regression_formula': ols_formula,
-            'ate_estimate': round(ate_estimate, 2),
-            'true_ate': true_ate, # For comparison in the demo
-            'ols_summary': ols_model.summary().as_html() # Get model summary as HTML table
-        }
-
-        # 5. Generate a simple plot (Optional)
-        try:
-            plt.figure(figsize=(7, 5))
-            sns.scatterplot(data=df, x='engagement', y='spending', hue='received_promo', alpha=0.6)
-            plt.title('Spending vs Engagement (Colored by Promo)')
-            plt.xlabel("Engagement Score")
-            plt.ylabel("Customer Spending ($)")
-            plt.legend(title='Received Promo', loc='upper left')
-            plt.grid(True, linestyle='--', alpha=0.6)
-            plt.tight_layout()
-
-            # Save plot to buffer and encode as base64
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight')
-            buf.seek(0)
-            plot_url = base64.b64encode(buf.getvalue()).decode('utf-8')
-            plt.close() # Close the figure
-            results['plot_url'] = f"data:image/png;base64,{plot_url}"
-
-        except Exception as plot_e:
-            print(f"Error generating plot: {plot_e}")
-            results['plot_url'] = None # Handle plot error gracefully
+        cached = result_cache.get_or_compute(
+            'causal_inference', CAUSAL_INFERENCE_INPUTS, CAUSAL_INFERENCE_VERSION,
+            lambda: _compute_causal_inference(**CAUSAL_INFERENCE_INPUTS), cacheable=_plot_is_stored,
+        )
+        results = dict(cached['results'])
+        results['plot_url'] = _cached_plot_url(cached)
 
     except Exception as e:
         error_message = f"An error occurred during analysis: {e}"
@@ -1450,7 +1449,108 @@ def causal_inference_demo_view(request):
     return render(request, 'demos/causal_inference_demo.html', context=context)
 
 
-# --- Optimization Demo View (NEW) ---
+# --- Optimization Demo (NEW) ---
+# Deterministic as well: the optimisation result and contour plot are cached.
+OPTIMIZATION_VERSION = 2
+OPTIMIZATION_INPUTS = {'start_point': [0.0, 0.0], 'method': 'Nelder-Mead', 'xatol': 1e-6}
+
+
+def _compute_optimization(start_point, method, xatol):
+    """
+    Minimises Himmelblau's function and renders and stores the contour plot.
+    Returns {'results': ..., 'plot_png': bytes, 'plot_url': str, 'error_message': str|None};
+    both plot values are None (and the result is not cached) if the plot could not be rendered.
+    """
+    # 1. Define the function to minimize (Himmelblau's function)
+    # This function has multiple local minima.
+    def himmelblau(p):
+        x, y = p
+        # f(x, y) = (x^2 + y - 11)^2 + (x + y^2 - 7)^2
+        term1 = (x**2 + y - 11)**2
+        term2 = (x + y**2 - 7)**2
+        return term1 + term2
+
+    function_str = "(x**2 + y - 11)**2 + (x + y**2 - 7)**2"
+    start_point = np.array(start_point, dtype=float) # Where the optimization starts
+
+    # 2. Perform Optimization
+    # Use scipy.optimize.minimize. 'Nelder-Mead' is a common gradient-free method.
+    optimization_result = optimize.minimize(
+        himmelblau,
+        start_point,
+        method=method,
+        options={'xatol': xatol, 'disp': False} # Tolerance and display options
+    )
+
+    # 3. Prepare results
+    error_message = None
+    if optimization_result.success:
+        found_minimum_x = optimization_result.x
+        found_minimum_value = optimization_result.fun
+        results = {
+            'function': function_str,
+            'start_point': start_point.tolist(),
+            'method': method,
+            'success': optimization_result.success,
+            'message': optimization_result.message,
+            'found_minimum_point': [round(coord, 4) for coord in found_minimum_x],
+            'found_minimum_value': round(found_minimum_value, 4),
+            'iterations': optimization_result.nit,
+        }
+    else:
+        error_message = f"Optimization failed: {optimization_result.message}"
+        results = {'success': False, 'message': optimization_result.message}
+
+
+    # 4. Generate Contour Plot
+    try:
+        x_range = np.arange(-5.0, 5.0, 0.1)
+        y_range = np.arange(-5.0, 5.0, 0.1)
+        X_grid, Y_grid = np.meshgrid(x_range, y_range)
+        Z_grid = himmelblau([X_grid, Y_grid])
+
+        plt.figure(figsize=(7, 6))
+        # Use contourf for filled contours, contour for lines
+        contour_plot = plt.contourf(X_grid, Y_grid, Z_grid, levels=np.logspace(0, 3, 15), cmap='viridis', alpha=0.8)
+        plt.colorbar(contour_plot, label='Function Value (log scale)')
+        plt.contour(X_grid, Y_grid, Z_grid, levels=np.logspace(0, 3, 15), colors='white', linewidths=0.5, alpha=0.5)
+
+        # Mark known minima for Himmelblau's function
+        known_minima = [
+            (3.0, 2.0),
+            (-2.805118, 3.131312),
+            (-3.779310, -3.283186),
+            (3.584428, -1.848126)
+        ]
+        for km in known_minima:
+            plt.plot(km[0], km[1], 'r*', markersize=10, label='Known Minimum' if km == known_minima[0] else "")
+
+        # Mark start point and found minimum
+        plt.plot(start_point[0], start_point[1], 'go', markersize=8, label='Start Point')
+        if optimization_result.success:
+            plt.plot(found_minimum_x[0], found_minimum_x[1], 'yo', markersize=8, label='Found Minimum')
+
+        plt.xlabel('x')
+        plt.ylabel('y')
+        plt.title("Optimization of Himmelblau's Function")
+        plt.legend(fontsize='small')
+        plt.grid(True, linestyle=':', alpha=0.4)
+        plt.axis('equal') # Ensure aspect ratio is equal
+
+        # Save plot to buffer (raw PNG bytes are cached; the view encodes them)
+        buf = io.BytesIO()
+        plt.savefig(buf, format='png', bbox_inches='tight')
+        plt.close() # Close the figure
+        plot_png = buf.getvalue()
+
+    except Exception as plot_e:
+        print(f"Error generating plot: {plot_e}")
+        plt.close()
+        plot_png = None # Possibly transient: the result is not cached, the next request tries again
+
+    return {'results': results, 'plot_png': plot_png, 'plot_url': _store_plot(plot_png), 'error_message': error_message}
+
+
 def optimization_demo_view(request):
     """
     Demonstrates finding the minimum of a function using SciPy's optimize module.
@@ -1465,92 +1565,13 @@ def optimization_demo_view(request):
         return render(request, 'demos/optimization_demo.html', context)
 
     try:
-        # 1. Define the function to minimize (Himmelblau's function)
-        # This function has multiple local minima.
-        def himmelblau(p):
-            x, y = p
-            # f(x, y) = (x^2 + y - 11)^2 + (x + y^2 - 7)^2
-            term1 = (x**2 + y - 11)**2
-            term2 = (x + y**2 - 7)**2
-            return term1 + term2
-
-        function_str = "(x**2 + y - 11)**2 + (x + y**2 - 7)**2"
-        start_point = np.array([0.0, 0.0]) # Where the optimization starts
-
-        # 2. Perform Optimization
-        # Use scipy.optimize.minimize. 'Nelder-Mead' is a common gradient-free method.
-        optimization_result = optimize.minimize(
-            himmelblau,
-            start_point,
-            method='Nelder-Mead',
-            options={'xatol': 1e-6, 'disp': False} # Tolerance and display options
+        cached = result_cache.get_or_compute(
+            'optimization', OPTIMIZATION_INPUTS, OPTIMIZATION_VERSION,
+            lambda: _compute_optimization(**OPTIMIZATION_INPUTS), cacheable=_plot_is_stored,
         )
-
-        # 3. Prepare results
-        if optimization_result.success:
-            found_minimum_x = optimization_result.x
-            found_minimum_value = optimization_result.fun
-            results = {
-                'function': function_str,
-                'start_point': start_point.tolist(),
-                'method': 'Nelder-Mead',
-                'success': optimization_result.success,
-                'message': optimization_result.message,
-                'found_minimum_point': [round(coord, 4) for coord in found_minimum_x],
-                'found_minimum_value': round(found_minimum_value, 4),
-                'iterations': optimization_result.nit,
-            }
-        else:
-            error_message = f"Optimization failed: {optimization_result.message}"
-            results = {'success': False, 'message': optimization_result.message}
-
-
-        # 4. Generate Contour Plot
-        try:
-            x_range = np.arange(-5.0, 5.0, 0.1)
-            y_range = np.arange(-5.0, 5.0, 0.1)
-            X_grid, Y_grid = np.meshgrid(x_range, y_range)
-            Z_grid = himmelblau([X_grid, Y_grid])
-
-            plt.figure(figsize=(7, 6))
-            # Use contourf for filled contours, contour for lines
-            contour_plot = plt.contourf(X_grid, Y_grid, Z_grid, levels=np.logspace(0, 3, 15), cmap='viridis', alpha=0.8)
-            plt.colorbar(contour_plot, label='Function Value (log scale)')
-            plt.contour(X_grid, Y_grid, Z_grid, levels=np.logspace(0, 3, 15), colors='white', linewidths=0.5, alpha=0.5)
-
-            # Mark known minima for Himmelblau's function
-            known_minima = [
-                (3.0, 2.0),
-                (-2.805118, 3.131312),
-                (-3.779310, -3.283186),
-                (3.584428, -1.848126)
-            ]
-            for km in known_minima:
-                plt.plot(km[0], km[1], 'r*', markersize=10, label='Known Minimum' if km == known_minima[0] else "")
-
-            # Mark start point and found minimum
-            plt.plot(start_point[0], start_point[1], 'go', markersize=8, label='Start Point')
-            if optimization_result.success:
-                plt.plot(found_minimum_x[0], found_minimum_x[1], 'yo', markersize=8, label='Found Minimum')
-
-            plt.xlabel('x')
-            plt.ylabel('y')
-            plt.title("Optimization of Himmelblau's Function")
-            plt.legend(fontsize='small')
-            plt.grid(True, linestyle=':', alpha=0.4)
-            plt.axis('equal') # Ensure aspect ratio is equal
-
-            # Save plot to buffer and encode as base64
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', bbox_inches='tight')
-            buf.seek(0)
-            plot_url = base64.b64encode(buf.getvalue()).decode('utf-8')
-            plt.close() # Close the figure
-            if results: results['plot_url'] = f"data:image/png;base64,{plot_url}"
-
-        except Exception as plot_e:
-            print(f"Error generating plot: {plot_e}")
-            if results: results['plot_url'] = None # Handle plot error gracefully
+        error_message = cached['error_message']
+        results = dict(cached['results']) if cached['results'] else None
+        if results: results['plot_url'] = _cached_plot_url(cached)
 
     except Exception as e:
         error_message = f"An error occurred during optimization setup: {e}"
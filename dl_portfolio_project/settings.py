@@ -1,6 +1,7 @@
 # dl_portfolio_project/settings.py
 
 import os
+import tempfile
 from pathlib import Path
 import dj_database_url
 # --- Add these lines ---
@@ -76,7 +77,29 @@ CSV_FILES = {
     'COLOPHON_ENTRIES_CSV': 'data_import/09_colophon_entries.csv',
 }
 
+# Demo ML models are loaded on first use (see demos/model_registry.py).
+# Models idle for longer than this many seconds are unloaded; 0 keeps them loaded.
+DEMO_MODEL_IDLE_TIMEOUT = int(os.environ.get('DEMO_MODEL_IDLE_TIMEOUT', 1800))
+
+# Upload cap for the CSV demos. Files are analysed in chunks (demos/csv_analysis.py) and
+# uploads above FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk, so memory stays bounded.
+DEMO_CSV_MAX_UPLOAD_MB = int(os.environ.get('DEMO_CSV_MAX_UPLOAD_MB', 200))
+
+# Micro-batched inference for the image/sentiment demos (see demos/inference.py).
+# Set DEMO_INFERENCE_ADDRESS (e.g. '127.0.0.1:6011' or a Unix socket path) and run
+# `manage.py run_inference_worker` to serve the models from a dedicated process.
+DEMO_INFERENCE_ADDRESS = os.environ.get('DEMO_INFERENCE_ADDRESS') or None
+DEMO_INFERENCE_MAX_BATCH = int(os.environ.get('DEMO_INFERENCE_MAX_BATCH', 16))
+DEMO_INFERENCE_MAX_WAIT_MS = int(os.environ.get('DEMO_INFERENCE_MAX_WAIT_MS', 10))
+DEMO_INFERENCE_TIMEOUT = int(os.environ.get('DEMO_INFERENCE_TIMEOUT', 30))
+
+# Run the slow demos (image, sentiment, CSV analysis, Amazon scrape) as background jobs.
+# Requires `manage.py run_demo_jobs` running alongside the web workers (see demos/jobs.py).
+DEMO_JOBS_ENABLED = os.environ.get('DEMO_JOBS_ENABLED', 'False') == 'True'
+
 MIDDLEWARE = [
+    # Request timing for Server-Timing headers and /metrics (first, so that everything below is included)
+    'portfolio.request_metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # Add WhiteNoise middleware right after SecurityMiddleware
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -85,8 +108,14 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    # Anonymous full-page cache (needs the user and messages set up above)
+    'portfolio.page_cache.PageCacheMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     #'ratelimit.middleware.RatelimitMiddleware',
+    # Opt-in sampling profiler (PROFILING_ENABLED below)
+    'portfolio.profiling.ProfilingMiddleware',
+    # Times the view itself for RequestMetricsMiddleware (keep last)
+    'portfolio.request_metrics.ViewTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'dl_portfolio_project.urls'
@@ -94,7 +123,8 @@ ROOT_URLCONF = 'dl_portfolio_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django's backend with render and context processor timing (portfolio/request_metrics.py)
+        'BACKEND': 'portfolio.request_metrics.TimedDjangoTemplates',
         # 'DIRS': [],
         'DIRS': [BASE_DIR / 'templates'], # <--- UPDATE THIS LINE
         'APP_DIRS': True,
@@ -127,6 +157,51 @@ TEMPLATES = [
 #     }
 # }
 
+# Django's built-in Redis backend when REDIS_URL is set (shared by all workers, so page and context
+# cache purges reach every process); otherwise a per-process in-memory cache
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "portfolio-default",
+        }
+    }
+
+# Anonymous full-page cache (portfolio/page_cache.py). On by default only in production with Redis: purges
+# bump tag versions in the cache, and a per-process cache would only drop the pages of the worker that saved
+PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', str(bool(os.environ.get('REDIS_URL')) and not DEBUG)) == 'True'
+PAGE_CACHE_TIMEOUT = 300 # Seconds; bounds staleness if enabled with a per-process cache backend
+# Versioned fragment cache for card grids (portfolio/fragment_cache.py). Keys change with the content,
+# so the timeout only bounds how long fragments nobody asks for any more occupy the cache.
+FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'True') == 'True'
+FRAGMENT_CACHE_TIMEOUT = 86400
+# Per-request timing (portfolio/request_metrics.py): Server-Timing headers (staff only unless
+# SERVER_TIMING_ENABLED, as they show query counts and timings), and per-route histograms that every worker
+# writes under METRICS_DIR (a runtime directory) and /metrics serves to staff or to 'Authorization: Bearer <METRICS_TOKEN>'
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', 'True') == 'True'
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', str(DEBUG)) == 'True'
+METRICS_DIR = os.environ.get('METRICS_DIR') or Path(tempfile.gettempdir()) / 'portfolio-metrics'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Opt-in sampling profiler (portfolio/profiling.py): profiles requests sent with a signed X-Profile header
+# (token shown in the admin), a random PROFILING_SAMPLE_RATE share of requests, and, when PROFILING_SLOW_MS
+# is set, every request slower than that. Profiles are stored under PROFILING_DIR and shown in the admin.
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_SLOW_MS = float(os.environ['PROFILING_SLOW_MS']) if os.environ.get('PROFILING_SLOW_MS') else None
+PROFILING_INTERVAL_MS = 5
+PROFILING_MAX_PROFILES = 200
+PROFILING_DIR = os.environ.get('PROFILING_DIR') or BASE_DIR / 'profiles'
+# Deployed code version, part of the ETags of conditional_page views (portfolio/conditional.py):
+# a deploy with template changes must not keep answering 304. Render sets RENDER_GIT_COMMIT.
+SITE_VERSION = os.environ.get('SITE_VERSION') or os.environ.get('RENDER_GIT_COMMIT', '')
+
 WSGI_APPLICATION = 'dl_portfolio_project.wsgi.application'
 
 
@@ -169,6 +244,29 @@ STATIC_ROOT = BASE_DIR / 'staticfiles' # For collectstatic in production
 # https://docs.djangoproject.com/en/stable/howto/static-files/#serving-files-uploaded-by-a-user-during-development
 MEDIA_URL = '/media/' # Base URL for serving media files
 MEDIA_ROOT = BASE_DIR / 'mediafiles' # Absolute filesystem path to the directory for user uploads
+# Content-addressed PNGs generated by the demos (see demos/plot_store.py); served by demos:plot_artifact
+DEMO_PLOT_ROOT = os.environ.get('DEMO_PLOT_ROOT') or MEDIA_ROOT / 'demo_plots'
+# On-disk snapshots of the site search index (see portfolio/search_index.py), shared by all workers
+SEARCH_INDEX_DIR = os.environ.get('SEARCH_INDEX_DIR') or BASE_DIR / 'search_index'
+# Search box typeahead: most suggestions per response and their Cache-Control max-age (seconds)
+SEARCH_SUGGEST_LIMIT = 8
+SEARCH_SUGGEST_MAX_AGE = 60
+# Site search backend: 'auto' uses PostgreSQL full-text search (portfolio/search_vectors.py) when the
+# database is PostgreSQL and the in-process index otherwise; 'index' always uses the index
+SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+SEARCH_VECTOR_CONFIG = 'english' # PostgreSQL text search configuration for the search vectors
+# Precomputed sitemaps (see portfolio/sitemap_files.py). Their URLs use SITEMAP_DOMAIN (required by
+# `manage.py generate_sitemaps`); when it is empty the files are generated per requested host on first use
+SITEMAP_DIR = os.environ.get('SITEMAP_DIR') or BASE_DIR / 'sitemaps'
+SITEMAP_DOMAIN = os.environ.get('SITEMAP_DOMAIN', '')
+SITEMAP_PROTOCOL = 'http' if DEBUG else 'https'
+SITEMAP_MAX_AGE = 3600 # Cache-Control max-age (seconds) of the sitemap files
+# Pre-rendered HTML written by `manage.py export_static_site` (see portfolio/static_export.py).
+# With SERVE_STATIC_EXPORT=True WhiteNoise serves those files ahead of the views (restart after exporting)
+STATIC_EXPORT_DIR = os.environ.get('STATIC_EXPORT_DIR') or BASE_DIR / 'static_export'
+if os.environ.get('SERVE_STATIC_EXPORT', 'False') == 'True':
+    WHITENOISE_ROOT = STATIC_EXPORT_DIR
+    WHITENOISE_INDEX_FILE = True
 
 # Staticfiles storage using WhiteNoise (Recommended for Render)
 # For Django 4.2+
@@ -1,11 +1,12 @@
 # dl_portfolio_project/urls.py
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
-# Import sitemaps view and your sitemap classes
-from django.contrib.sitemaps.views import sitemap
+# Precomputed sitemap files (see portfolio/sitemap_files.py) built from the sitemap classes below
+from portfolio.sitemap_files import sitemap_index_view, sitemap_section_view
+from portfolio.request_metrics import metrics_view
 
 # from demos.sitemaps import DemoModelSitemap, CSVDemoPagesSitemap
 # Import TemplateView for robots.txt
@@ -82,9 +83,13 @@ urlpatterns = [
     # Include URLs from your new 'accounts' app for custom views like a members page
     path('accounts/', include('accounts.urls')), # Custom account views
     
-    # Add the sitemap URL pattern
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps},
+    # Sitemap index and its gzip-compressed sections, served from the files written by generate_sitemaps
+    path('sitemap.xml', sitemap_index_view,
             name='django.contrib.sitemaps.views.sitemap'),
+    re_path(r'^(?P<filename>sitemap-[\w-]+\.xml\.gz)$', sitemap_section_view, name='sitemap_section'),
+
+    # Prometheus scrape endpoint (staff or METRICS_TOKEN bearer only)
+    path('metrics', metrics_view, name='metrics'),
 
     # Add the robots.txt URL pattern using TemplateView
     path(
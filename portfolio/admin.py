@@ -1,8 +1,10 @@
 # portfolio/admin.py
 
 from django.contrib import admin
+from django.utils.safestring import mark_safe
 # Import models from this app
-from .models import Project, Certificate, UserProfile, ColophonEntry
+from .models import Project, Certificate, UserProfile, ColophonEntry, RequestProfile
+from .profiling import enabled as profiling_enabled, flame_graph_svg, load_profile, make_token
 # Import models from other apps that might be related or managed here
 from topics.models import ProjectTopic # Assuming Project model has a ForeignKey or ManyToMany to ProjectTopic
 
@@ -121,3 +123,31 @@ class ColophonEntryAdmin(admin.ModelAdmin):
     ordering = ('category', 'order', 'name') # Default sorting in the admin view
     fields = ('name', 'category', 'description', 'url', 'icon_class', 'order') # Explicit field order in edit form
 
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """
+    Read-only list of the sampled request profiles, each shown as a flame graph.
+    """
+    list_display = ('created_at', 'method', 'route', 'path', 'status_code', 'duration_ms', 'sample_count', 'trigger')
+    list_filter = ('trigger', 'route', 'status_code')
+    search_fields = ('path', 'route')
+    fields = ('created_at', 'method', 'path', 'route', 'status_code', 'duration_ms', 'sample_count', 'trigger', 'flame_graph')
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False # Profiles are only recorded by ProfilingMiddleware
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description="Flame graph")
+    def flame_graph(self, obj):
+        profile = load_profile(obj.file_name)
+        if profile is None:
+            return "The profile file is missing."
+        return mark_safe(flame_graph_svg(profile))
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), 'profile_token': make_token(), 'profiling_enabled': profiling_enabled()}
+        return super().changelist_view(request, extra_context=extra_context)
@@ -0,0 +1,376 @@
+# portfolio/benchmark.py
+"""
+HTTP-level benchmark of the public pages (``manage.py benchmark_routes``).
+
+``seed`` fills the database with a synthetic catalogue (projects with
+skills and topics, blog posts, demos, recommendations, certificates and a
+site profile) whose size is ``BASE_COUNTS`` times a scale factor.
+``discover_routes`` walks the root URLconf: every route without arguments
+is requested as is, and routes with arguments get one sample URL taken from
+the sitemaps (project, blog post, skill, topic, demo and recommendation
+pages, plus a sitemap section). Admin, login/sign-up, media and /metrics
+routes are left out, and search and its typeahead are requested with a query.
+
+``measure_route`` requests a route through Django's test client: once cold
+(the first request after seeding, which fills the caches), a few warm-up
+requests, then ``iterations`` timed requests for the p50/p95/p99 latency,
+and a last request for the warm query count and the peak memory allocated
+while serving it (``tracemalloc``). Results are plain dicts, so a run can be
+saved as a JSON baseline and compared with ``compare`` on the next run.
+"""
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, resolve, reverse, Resolver404
+from django.urls.resolvers import RoutePattern, URLResolver
+from django.utils import timezone
+
+from . import context_cache, search_vectors
+from .models import Certificate, Project, UserProfile
+from .project_cards import rebuild_project_cards
+from .search_index import search_index
+from .sitemap_files import registered_sitemaps, section_filename
+from .static_export import sitemap_paths
+
+# Import models from other apps safely
+try:
+    from blog.models import BlogPost
+except ImportError:
+    BlogPost = None
+try:
+    from skills.models import Skill, SkillCategory
+except ImportError:
+    Skill = SkillCategory = None
+try:
+    from topics.models import ProjectTopic
+except ImportError:
+    ProjectTopic = None
+try:
+    from demos.models import Demo
+except ImportError:
+    Demo = None
+try:
+    from recommendations.models import RecommendedProduct
+except ImportError:
+    RecommendedProduct = None
+
+RESULT_VERSION = 1
+SLUG_PREFIX = 'bench'
+
+# Rows seeded at scale 1.0
+BASE_COUNTS = {
+    'projects': 60,
+    'skills': 40,
+    'skill_categories': 6,
+    'topics': 12,
+    'blog_posts': 30,
+    'demos': 12,
+    'recommendations': 24,
+    'certificates': 10,
+}
+
+# Words the synthetic text is made of; search is benchmarked with the first one
+VOCABULARY = (
+    "python", "django", "pytorch", "tensorflow", "keras", "pandas", "numpy", "scikit", "vision",
+    "transformer", "regression", "clustering", "forecasting", "pipeline", "embedding", "dashboard",
+    "scraping", "optimisation", "sql", "docker", "api", "streaming", "anomaly", "recommendation",
+)
+SEARCH_QUERY = VOCABULARY[0]
+SUGGEST_QUERY = VOCABULARY[0][:2]
+
+# Route prefixes that are not public pages (or not pages at all)
+EXCLUDED_PREFIXES = ('admin/', 'accounts/', 'media/', 'static/', 'metrics')
+
+# Allowed growth before a metric counts as a regression, on top of the relative threshold
+MIN_DELTA_MS = 2.0
+MIN_DELTA_KB = 64.0
+
+
+# --- Synthetic data ---
+
+def counts_for(scale):
+    return {name: max(1, round(count * scale)) for name, count in BASE_COUNTS.items()}
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(count))
+
+
+def _markdown(rng, paragraphs=3):
+    blocks = []
+    for i in range(paragraphs):
+        blocks.append(f"## {_words(rng, 3).title()}\n\n{_words(rng, 40).capitalize()}.")
+        blocks.append("\n".join(f"- **{rng.choice(VOCABULARY)}**: {_words(rng, 8)}" for _ in range(4)))
+    return "\n\n".join(blocks)
+
+
+def _create(model, objects):
+    """ bulk_create (refreshing cached Markdown first) and return the rows re-read, with their pks. """
+    for obj in objects:
+        if hasattr(obj, 'refresh_rendered_markdown'):
+            obj.refresh_rendered_markdown()
+    model.objects.bulk_create(objects, batch_size=500)
+    return list(model.objects.filter(slug__startswith=f"{SLUG_PREFIX}-").order_by('pk'))
+
+
+def seed(scale=1.0, seed_value=0):
+    """
+    Writes the synthetic catalogue (see the module docstring) and returns the row counts.
+    ``bulk_create`` sends no signals: derived data (project cards, search vectors) is built here.
+    """
+    rng = random.Random(seed_value)
+    counts = counts_for(scale)
+    today = timezone.now()
+
+    UserProfile.objects.update_or_create(site_identifier="main_profile", defaults={
+        'full_name': "Benchmark Profile",
+        'tagline': _words(rng, 6).title(),
+        'about_me_markdown': _markdown(rng),
+        'about_me_intro_markdown': _markdown(rng, 1),
+        'hire_me_intro_markdown': _markdown(rng, 1),
+    })
+    Certificate.objects.bulk_create(Certificate(
+        title=f"{_words(rng, 3).title()} Certificate {i}", issuer=_words(rng, 2).title(),
+        date_issued=(today - timedelta(days=30 * i)).date(), order=i,
+    ) for i in range(counts['certificates']))
+
+    skills, topics = [], []
+    if Skill:
+        SkillCategory.objects.bulk_create(SkillCategory(
+            name=f"Benchmark category {i}", order=i,
+        ) for i in range(counts['skill_categories']))
+        categories = list(SkillCategory.objects.filter(name__startswith="Benchmark category ").order_by('pk'))
+        skills = _create(Skill, [Skill(
+            name=f"{VOCABULARY[i % len(VOCABULARY)].title()} {i}", slug=f"{SLUG_PREFIX}-skill-{i}",
+            description=_words(rng, 30), category=rng.choice(categories + [None]), order=i,
+        ) for i in range(counts['skills'])])
+    if ProjectTopic:
+        topics = _create(ProjectTopic, [ProjectTopic(
+            name=f"{_words(rng, 2).title()} {i}", slug=f"{SLUG_PREFIX}-topic-{i}",
+            description=_words(rng, 25), order=i,
+        ) for i in range(counts['topics'])])
+
+    projects = _create(Project, [Project(
+        title=f"{_words(rng, 4).title()} {i}", slug=f"{SLUG_PREFIX}-project-{i}",
+        description=_words(rng, 50), long_description_markdown=_markdown(rng),
+        results_metrics=_words(rng, 20), challenges=_words(rng, 20), lessons_learned=_words(rng, 20),
+        code_snippet="import numpy as np\nprint(np.arange(10).sum())",
+        is_featured=i < 6, order=i, date_created=(today - timedelta(days=i)).date(),
+    ) for i in range(counts['projects'])])
+    if skills:
+        Project.skills.through.objects.bulk_create(
+            Project.skills.through(project_id=project.pk, skill_id=skill.pk)
+            for project in projects for skill in rng.sample(skills, min(4, len(skills)))
+        )
+    if topics:
+        Project.topics.through.objects.bulk_create(
+            Project.topics.through(project_id=project.pk, projecttopic_id=topic.pk)
+            for project in projects for topic in rng.sample(topics, min(2, len(topics)))
+        )
+
+    if BlogPost:
+        _create(BlogPost, [BlogPost(
+            title=f"{_words(rng, 5).title()} {i}", slug=f"{SLUG_PREFIX}-post-{i}",
+            content=_markdown(rng, 4), published_date=today - timedelta(days=3 * i), status='published',
+        ) for i in range(counts['blog_posts'])])
+    if Demo:
+        _create(Demo, [Demo(
+            title=f"{_words(rng, 3).title()} Demo {i}", slug=f"{SLUG_PREFIX}-demo-{i}",
+            description=_words(rng, 30), meta_description=_words(rng, 15), meta_keywords=_words(rng, 4),
+            is_published=True, is_featured=i < 3, order=i,
+        ) for i in range(counts['demos'])])
+    if RecommendedProduct:
+        _create(RecommendedProduct, [RecommendedProduct(
+            name=f"{_words(rng, 3).title()} {i}", slug=f"{SLUG_PREFIX}-recommendation-{i}",
+            short_description=_words(rng, 20), main_description_md=_markdown(rng, 2),
+            product_url=f"https://example.com/product/{i}", category=rng.choice(VOCABULARY).title(), order=i,
+        ) for i in range(counts['recommendations'])])
+
+    _rebuild_derived_data()
+    return counts
+
+
+def _rebuild_derived_data():
+    rebuild_project_cards()
+    if connection.vendor == 'postgresql':
+        for source in search_vectors.VECTOR_SOURCES.values():
+            search_vectors.update_search_vectors(apps.get_model(source.model_label))
+    search_index.rebuild(persist=False) # In-process only: never replaces a real snapshot
+    for cache in list(context_cache._registry.values()):
+        cache.invalidate()
+
+
+# --- Routes ---
+
+def _walk(patterns, prefix='', namespace=None):
+    """ Yields (route, qualified url name, has arguments) for every URL pattern. """
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            child_namespace = pattern.namespace or namespace
+            if namespace and pattern.namespace:
+                child_namespace = f"{namespace}:{pattern.namespace}"
+            yield from _walk(pattern.url_patterns, route, child_namespace)
+            continue
+        name = pattern.name and (f"{namespace}:{pattern.name}" if namespace else pattern.name)
+        has_arguments = not isinstance(pattern.pattern, RoutePattern) or '<' in route
+        yield route, name, has_arguments
+
+
+def _sample_paths():
+    """ {qualified url name: one path} for the pages listed in the sitemaps. """
+    samples = {}
+    for path in sitemap_paths():
+        try:
+            match = resolve(path)
+        except Resolver404:
+            continue
+        samples.setdefault(match.view_name, path)
+    return samples
+
+
+def discover_routes():
+    """
+    The benchmarked routes, as an ordered {key: path} dict. The key is the route's qualified
+    URL name (with the query string for search), or its path when the route has no name.
+    """
+    routes = {}
+    samples = None
+    for route, name, has_arguments in _walk(get_resolver().url_patterns):
+        if route.startswith(EXCLUDED_PREFIXES) or (name or route) in routes:
+            continue
+        if not has_arguments:
+            routes[name or f"/{route}"] = f"/{route}"
+            continue
+        if samples is None:
+            samples = _sample_paths()
+        if name in samples:
+            routes[name] = samples[name]
+        elif name == 'sitemap_section':
+            sections = list(registered_sitemaps())
+            if sections:
+                routes[name] = reverse(name, kwargs={'filename': section_filename(sections[0])})
+    for name, query in (('portfolio:search_results', SEARCH_QUERY), ('portfolio:search_suggest', SUGGEST_QUERY)):
+        if name in routes:
+            routes[f"{name}?q={query}"] = f"{routes[name]}?q={query}"
+    return routes
+
+
+# --- Measurement ---
+
+def _fetch(client, path, secure):
+    """ Requests ``path`` and reads the whole body; returns (status, bytes). """
+    response = client.get(path, secure=secure)
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+    response.close()
+    return response.status_code, size
+
+
+def measure_route(client, path, iterations=20, warmup=2, secure=False):
+    """ Latency percentiles (ms), query counts, response size and peak memory of ``path`` (see the module docstring). """
+    with CaptureQueriesContext(connection) as cold_queries:
+        started = time.perf_counter()
+        status, size = _fetch(client, path, secure)
+        cold_ms = (time.perf_counter() - started) * 1000
+    cold_query_count = len(cold_queries) # Read now: the captured list is a slice of the live query log
+    for _ in range(warmup):
+        _fetch(client, path, secure)
+    timings = []
+    for _ in range(max(1, iterations)):
+        started = time.perf_counter()
+        _fetch(client, path, secure)
+        timings.append((time.perf_counter() - started) * 1000)
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as warm_queries:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            _fetch(client, path, secure)
+            _, peak = tracemalloc.get_traced_memory()
+        query_count = len(warm_queries)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return {
+        'path': path,
+        'status': status,
+        'bytes': size,
+        'cold_ms': round(cold_ms, 3),
+        'p50_ms': round(quantiles[49], 3),
+        'p95_ms': round(quantiles[94], 3),
+        'p99_ms': round(quantiles[98], 3),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'cold_queries': cold_query_count,
+        'queries': query_count,
+        'peak_kb': round((peak - baseline) / 1024, 1),
+    }
+
+
+# --- Baselines ---
+
+def save_results(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        results = json.load(f)
+    if results.get('version') != RESULT_VERSION:
+        raise ValueError(f"Unsupported benchmark result version {results.get('version')!r} in {path}.")
+    return results
+
+
+def compare(current, baseline, threshold=0.25, min_delta_ms=MIN_DELTA_MS):
+    """
+    Regressions of ``current`` against ``baseline``, as messages: a route whose status changed,
+    that runs more queries, or whose p95 latency, response size or peak memory grew by more
+    than ``threshold`` (a fraction; latency also by at least ``min_delta_ms``).
+    """
+    regressions = []
+
+    def grew(now, before, slack=0.0):
+        return now > before * (1 + threshold) and now - before > slack
+
+    for key, row in current['routes'].items():
+        before = baseline.get('routes', {}).get(key)
+        if before is None:
+            continue
+        if row['status'] != before['status']:
+            regressions.append(f"{key}: status {before['status']} -> {row['status']}")
+        if row['queries'] > before['queries']:
+            regressions.append(f"{key}: queries {before['queries']} -> {row['queries']}")
+        if grew(row['p95_ms'], before['p95_ms'], min_delta_ms):
+            regressions.append(f"{key}: p95 {before['p95_ms']:.2f}ms -> {row['p95_ms']:.2f}ms")
+        if grew(row['bytes'], before['bytes']):
+            regressions.append(f"{key}: response {before['bytes']} -> {row['bytes']} bytes")
+        if grew(row['peak_kb'], before['peak_kb'], MIN_DELTA_KB):
+            regressions.append(f"{key}: peak memory {before['peak_kb']:.0f}KB -> {row['peak_kb']:.0f}KB")
+    return regressions
+
+
+@contextmanager
+def throwaway_database(verbosity=0):
+    """ Runs the block against a freshly migrated test database, destroyed afterwards. """
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
@@ -0,0 +1,98 @@
+# portfolio/conditional.py
+"""
+Conditional GET for the model-backed list and detail pages.
+
+``conditional_page(dependencies)`` wraps a view with Django's ``condition``
+decorator. ``dependencies(request, *args, **kwargs)`` returns the querysets
+whose rows the page shows; for each one a single aggregate query reads
+``Max(<timestamp field>)``, ``Count`` and ``Sum(pk)`` (the last two catch
+deletions and swapped M2M links, which change no timestamp). Together with
+the site profile's ``updated_at`` and the recommendation count, both taken
+from the context caches, they give the page's ETag and Last-Modified, so
+``If-None-Match``/``If-Modified-Since`` are answered with 304 before the
+view or any template runs. ``settings.SITE_VERSION`` is part of the ETag so
+a deploy with template changes does not keep serving 304s.
+
+Only anonymous requests without pending messages get validators; other
+pages depend on the visitor.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+from django.views.decorators.http import condition
+
+from . import page_cache
+from .page_cache import _has_messages, _is_anonymous
+
+
+TIMESTAMP_FIELDS = ('updated_at', 'last_updated', 'updated_date')
+_STATE_ATTR = '_conditional_page_state'
+
+
+def timestamp_field(model):
+    """ Name of the auto-updated modification timestamp of ``model``, or None. """
+    names = {field.name for field in model._meta.concrete_fields}
+    for name in TIMESTAMP_FIELDS:
+        if name in names:
+            return name
+    return None
+
+
+def queryset_state(queryset):
+    """ (latest modification, row count, pk sum) of ``queryset`` from one aggregate query. """
+    field = timestamp_field(queryset.model)
+    aggregates = {'count': Count('pk'), 'pk_sum': Sum('pk')}
+    if field:
+        aggregates['latest'] = Max(field)
+    values = queryset.order_by().aggregate(**aggregates)
+    return values.get('latest'), values['count'], values['pk_sum'] or 0
+
+
+def _shared_state():
+    """ Validators of the page chrome filled in by the context processors (served from their caches). """
+    from .context_processors import _context_field_names, profile_cache
+    row = profile_cache.get()
+    profile_updated = row[_context_field_names().index('updated_at')] if row else None
+    try:
+        from recommendations.context_processors import recommendation_count_cache
+        recommendation_count = recommendation_count_cache.get()
+    except ImportError:
+        recommendation_count = None
+    return profile_updated, recommendation_count
+
+
+def page_state(request, dependencies, *args, **kwargs):
+    """ {'etag', 'last_modified'} for the request (computed once per request), or None. """
+    if not hasattr(request, _STATE_ATTR):
+        state = None
+        if request.method in ('GET', 'HEAD') and _is_anonymous(request) and not _has_messages(request):
+            # The view reads the same rows, so its own queries already record the page's dependencies
+            with page_cache.paused():
+                profile_updated, recommendation_count = _shared_state()
+                parts = [getattr(settings, 'SITE_VERSION', ''), profile_updated, recommendation_count]
+                timestamps = [profile_updated]
+                for queryset in dependencies(request, *args, **kwargs):
+                    latest, count, pk_sum = queryset_state(queryset)
+                    parts.append((queryset.model._meta.label, latest, count, pk_sum))
+                    timestamps.append(latest)
+            timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+            state = {
+                'etag': hashlib.sha1(repr(parts).encode('utf-8')).hexdigest(),
+                'last_modified': max(timestamps) if timestamps else None,
+            }
+        setattr(request, _STATE_ATTR, state)
+    return getattr(request, _STATE_ATTR)
+
+
+def conditional_page(dependencies):
+    """ View decorator adding ETag/Last-Modified and 304 responses (see the module docstring). """
+    def etag(request, *args, **kwargs):
+        state = page_state(request, dependencies, *args, **kwargs)
+        return state and state['etag']
+
+    def last_modified(request, *args, **kwargs):
+        state = page_state(request, dependencies, *args, **kwargs)
+        return state and state['last_modified']
+
+    return condition(etag_func=etag, last_modified_func=last_modified)
@@ -0,0 +1,108 @@
+# portfolio/context_cache.py
+"""
+Versioned in-process cache for values that context processors add to every
+template render (the site profile, the recommendation count, ...).
+
+Each cached value keeps a local copy per worker process together with the
+version it was built for. The current version lives in Django's cache
+framework, so a ``post_save``/``post_delete`` receiver that calls
+``invalidate()`` makes every process sharing that cache backend rebuild the
+value on its next request. With the default per-process LocMemCache other
+workers only notice on expiry, so entries also carry a TTL
+(``settings.CONTEXT_CACHE_TIMEOUT``, seconds) to bound staleness.
+
+Values read inside an open transaction are served but never stored, since
+the transaction may still roll back (and rollbacks send no signals).
+
+Pages in the anonymous page cache that used a value are tagged
+``context:<name>`` and purged by ``invalidate()`` as well.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from . import page_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300  # Seconds a process-local copy may live without a version check failing
+
+_registry = {} # name -> VersionedContextCache, for resolving ``context:<name>`` page dependencies
+
+
+def registered(name):
+    """ The VersionedContextCache created with ``name``, or None. """
+    return _registry.get(name)
+
+
+class VersionedContextCache:
+    """ Process-level cache for a single value, rebuilt by ``loader`` when its version changes. """
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.version_key = f"context_cache:{name}:version"
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._expires_at = 0.0
+        _registry[name] = self
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'CONTEXT_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+    def current_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            version = 1
+            cache.add(self.version_key, version, timeout=None)
+        return version
+
+    def can_store(self):
+        """ Only cache values read outside a transaction, i.e. values that are known to be committed. """
+        return not connection.in_atomic_block
+
+    def get(self):
+        """ Returns the cached value, reloading it if the version changed or the entry expired. """
+        page_cache.add_tags(f"context:{self.name}")
+        if not self.can_store():
+            return self.loader()
+        version = self.current_version()
+        now = time.monotonic()
+        if self._version == version and now < self._expires_at:
+            return self._value
+        with self._lock:
+            if self._version == version and now < self._expires_at:
+                return self._value
+            value = self.loader()
+            self._value = value
+            self._version = version
+            self._expires_at = now + self.timeout
+            return value
+
+    def invalidate(self, **kwargs):
+        """
+        Bumps the shared version and drops the local copy. Called from signal receivers;
+        when inside a transaction the bump is repeated on commit so that other processes
+        cannot re-cache the pre-commit value in between.
+        """
+        self._bump()
+        if connection.in_atomic_block:
+            transaction.on_commit(self._bump)
+        page_cache.purge_tags(f"context:{self.name}")
+
+    def _bump(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            # Key missing (evicted or never set): any new value differs from locally cached versions.
+            cache.set(self.version_key, int(time.time() * 1000), timeout=None)
+        with self._lock:
+            self._version = None
+            self._value = None
+        logger.debug(f"Context cache '{self.name}' invalidated.")
@@ -1,41 +1,74 @@
 # portfolio/context_processors.py
 import logging # Import the logging module
+from django.db import router
 from .models import UserProfile
+from .context_cache import VersionedContextCache
 
 # Get an instance of a logger for this module
 # Using __name__ is a common practice as it names the logger after the module (e.g., "portfolio.context_processors")
 logger = logging.getLogger(__name__)
 
+# Fields of UserProfile needed by base.html and the shared page chrome.
+# The large Markdown fields are left deferred and only loaded (in a single query)
+# by the pages that actually render them.
+PROFILE_CONTEXT_FIELDS = (
+    'id', 'site_identifier', 'full_name', 'tagline', 'location', 'email',
+    'linkedin_url', 'github_url', 'personal_website_url', 'cv_url', 'profile_picture_url',
+    'default_meta_description', 'default_meta_keywords', 'updated_at',
+)
+
+
+def _context_field_names():
+    # Model.from_db() expects values in the model's field order.
+    return [f.attname for f in UserProfile._meta.concrete_fields if f.attname in PROFILE_CONTEXT_FIELDS]
+
+
+def _load_profile_row():
+    """ Fetches the slim projection of the site profile as a tuple of PROFILE_CONTEXT_FIELDS values. """
+    field_names = _context_field_names()
+    # Attempt to fetch the main profile using a specific identifier
+    row = UserProfile.objects.filter(site_identifier="main_profile").values_list(*field_names).first()
+
+    # If the main profile isn't found, try to get any existing profile as a fallback
+    if row is None:
+        row = UserProfile.objects.values_list(*field_names).order_by('pk').first()
+        # If still no profile exists at all, log a warning.
+        if row is None:
+            logger.warning(
+                "No UserProfile found in the database (neither 'main_profile' nor any other). "
+                "The 'user_profile' context variable will be None."
+            )
+    return row
+
+
+profile_cache = VersionedContextCache('user_profile', _load_profile_row)
+
+
+def get_context_profile():
+    """
+    Returns a UserProfile instance built from the cached slim projection, or None.
+    A fresh (deferred) instance is created on each call, so loading the deferred
+    fields on one request never leaks into the shared cache.
+    """
+    row = profile_cache.get()
+    if row is None:
+        return None
+    return UserProfile.from_db(router.db_for_read(UserProfile), _context_field_names(), row)
+
+
 def user_profile_context(request):
     """
     Adds the UserProfile instance to the context for all templates.
+    The profile is served from a versioned in-process cache (invalidated by
+    the UserProfile post_save/post_delete signals) and memoised on the request.
     Uses logging for errors and warnings.
     """
+    if request is not None and hasattr(request, '_cached_user_profile'):
+        return {'user_profile': request._cached_user_profile}
+
     profile = None
     try:
-        # Attempt to fetch the main profile using a specific identifier
-        profile = UserProfile.objects.filter(site_identifier="main_profile").first()
-        
-        # If the main profile isn't found, try to get any existing profile as a fallback
-        if not profile:
-            profile = UserProfile.objects.first()
-            # If still no profile exists at all, log a warning.
-            if not profile:
-                logger.warning(
-                    "No UserProfile found in the database (neither 'main_profile' nor any other). "
-                    "The 'user_profile' context variable will be None."
-                )
-                
-    except UserProfile.DoesNotExist:
-        # This specific exception might not be strictly necessary if .first() is used,
-        # as .first() returns None if no object is found, rather than raising DoesNotExist.
-        # However, keeping it can be useful if the query logic changes.
-        logger.warning(
-            "UserProfile.DoesNotExist caught (this might be unexpected if using .first()). "
-            "No UserProfile available for context."
-        )
-        profile = None
-        
+        profile = get_context_profile()
     except Exception as e:
         # Catch any other potential errors during the database query or processing
         # Log the error with level ERROR, including traceback information (exc_info=True)
@@ -44,5 +77,7 @@ def user_profile_context(request):
             exc_info=True  # This includes the full traceback in your logs
         )
         profile = None # Ensure profile is None if an error occurs
-        
+
+    if request is not None:
+        request._cached_user_profile = profile
     return {'user_profile': profile}
@@ -0,0 +1,100 @@
+# portfolio/fragment_cache.py
+"""
+Versioned template fragment cache for card markup ("Russian doll" caching).
+
+``{% cachefragment "name" obj ... %}...{% endcachefragment %}`` (template tag
+library ``fragment_cache``) stores the rendered block under a key built from
+the fragment name, ``settings.SITE_VERSION`` and the version of every vary
+argument. The version of a model instance is its label, pk and modification
+timestamp (see ``conditional.timestamp_field``), plus the versions of the
+related objects already loaded on it by ``select_related``/``prefetch_related``
+or ``attach_cards``; lists, querysets and paginator pages use the versions of
+their items. Computing a key therefore never runs a query, and an edit to a
+project, its card or one of its skills gives that card a new key.
+
+Grids wrap the loop of per-item fragments in a fragment of their own, keyed on
+the whole list: an edit renders the grid again, and the grid is composed of
+the cached fragments of every card except the edited one. Entries are never
+invalidated, only no longer asked for, and expire after
+``settings.FRAGMENT_CACHE_TIMEOUT`` seconds.
+
+Each entry keeps the page-cache dependency tags recorded while it rendered,
+and adds them to the page being rendered on a hit, so pages built from cached
+fragments are still purged when the rows they show change.
+"""
+import hashlib
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page
+from django.db.models import Model, QuerySet
+
+from . import page_cache
+from .conditional import timestamp_field
+
+DEFAULT_TIMEOUT = 86400
+
+
+def enabled():
+    return getattr(settings, 'FRAGMENT_CACHE_ENABLED', True)
+
+
+def timeout():
+    return getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def _instance_version(obj, seen):
+    key = (obj._meta.label, obj.pk)
+    if key in seen:
+        return key # Back-reference (e.g. card.project): already part of the version
+    seen.add(key)
+    field = timestamp_field(type(obj))
+    if field and field in obj.__dict__:
+        state = obj.__dict__[field]
+    else:
+        # No timestamp (or deferred): the loaded field values themselves
+        state = hashlib.sha1(repr([
+            obj.__dict__.get(f.attname) for f in obj._meta.concrete_fields
+        ]).encode('utf-8')).hexdigest()
+    related = sorted(
+        (name, version(value, seen)) for name, value in obj._state.fields_cache.items()
+    )
+    prefetched = getattr(obj, '_prefetched_objects_cache', {})
+    related += sorted((name, version(value, seen)) for name, value in prefetched.items())
+    return key + (state, tuple(related))
+
+
+def version(obj, seen=None):
+    """ Hashable version of a vary argument; never runs a query for already-loaded data. """
+    if seen is None:
+        seen = set()
+    if isinstance(obj, Model):
+        return _instance_version(obj, seen)
+    if isinstance(obj, (QuerySet, Page, list, tuple)):
+        return tuple(version(item, seen) for item in obj)
+    if isinstance(obj, Mapping):
+        return tuple(sorted((str(key), version(value, seen)) for key, value in obj.items()))
+    return obj
+
+
+def fragment_key(name, vary=()):
+    parts = (getattr(settings, 'SITE_VERSION', ''), name, version(list(vary)))
+    return f"fragment_cache:{name}:{hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()}"
+
+
+def cached_fragment(name, vary, render):
+    """ The HTML of fragment ``name`` for ``vary``, from the cache or from ``render()``. """
+    if not enabled():
+        return render()
+    key = fragment_key(name, vary)
+    entry = cache.get(key)
+    if entry is not None:
+        page_cache.add_tags(*entry['tags'])
+        return entry['html']
+    with page_cache.recording() as recorder:
+        html = render()
+    tags = recorder.all_tags()
+    page_cache.add_tags(*tags)
+    cache.set(key, {'html': html, 'tags': sorted(tags)}, timeout=timeout())
+    return html
@@ -0,0 +1,133 @@
+# portfolio/home_snapshot.py
+"""
+Precomputed content of the home page (``portfolio.views.index``).
+
+The snapshot holds the featured projects (with their skills prefetched),
+certificates, demos and recommendations, the latest published blog post,
+and ``ROTATION_COUNT`` precomputed random picks of ``RANDOM_DISPLAY_COUNT``
+skills and topics. Building it reads only the primary keys of the skill and
+topic tables into compact ``array('q')`` id arrays, samples every rotation
+from them and loads the picked rows with one query per table; each request
+then shows a random rotation, so a page view costs no queries and memory
+that does not grow with the catalogue.
+
+The snapshot lives in a VersionedContextCache ('home_snapshot'): the
+receivers in signals.py invalidate it when any of the shown models change,
+and bulk imports invalidate it explicitly. A blog post scheduled after the
+build is kept aside and shown once its publication date has passed.
+"""
+import logging
+import random
+from array import array
+
+from django.utils import timezone
+
+from .context_cache import VersionedContextCache
+from .models import Certificate, Project
+
+logger = logging.getLogger(__name__)
+
+# Import models from other apps safely
+try:
+    from blog.models import BlogPost
+except ImportError:
+    BlogPost = None
+try:
+    from skills.models import Skill
+except ImportError:
+    Skill = None
+try:
+    from recommendations.models import RecommendedProduct
+except ImportError:
+    RecommendedProduct = None
+try:
+    from demos.models import Demo
+except ImportError:
+    Demo = None
+try:
+    from topics.models import ProjectTopic
+except ImportError:
+    ProjectTopic = None
+
+FEATURED_ITEMS_COUNT = 6
+RANDOM_DISPLAY_COUNT = 6
+ROTATION_COUNT = 24 # Precomputed random selections of skills and topics per snapshot
+
+# Models whose saves and deletes invalidate the snapshot (see signals.py)
+SNAPSHOT_MODELS = tuple(model for model in (Project, Certificate, BlogPost, Skill, RecommendedProduct, Demo, ProjectTopic) if model is not None)
+
+
+class HomeSnapshot:
+    """ Immutable home-page content; ``context()`` returns a template context with a random rotation. """
+
+    def __init__(self, featured, skill_rotations, topic_rotations, latest_blog_post, upcoming_blog_post):
+        self.featured = featured
+        self.skill_rotations = skill_rotations
+        self.topic_rotations = topic_rotations
+        self.latest_blog_post = latest_blog_post
+        self.upcoming_blog_post = upcoming_blog_post
+
+    def context(self):
+        latest_blog_post = self.latest_blog_post
+        if self.upcoming_blog_post is not None and self.upcoming_blog_post.published_date <= timezone.now():
+            latest_blog_post = self.upcoming_blog_post
+        return {
+            **self.featured,
+            'latest_blog_post': latest_blog_post,
+            'featured_skills': list(random.choice(self.skill_rotations)) if self.skill_rotations else [],
+            'featured_topics': list(random.choice(self.topic_rotations)) if self.topic_rotations else [],
+        }
+
+
+def _rotations(queryset, rng):
+    """ Up to ROTATION_COUNT random selections of RANDOM_DISPLAY_COUNT rows, loaded with one query. """
+    ids = array('q', queryset.order_by().values_list('pk', flat=True))
+    if not ids:
+        return []
+    if len(ids) <= RANDOM_DISPLAY_COUNT:
+        # Everything fits: a single rotation, in the model's default order
+        return [tuple(queryset.model.objects.filter(pk__in=ids))]
+    picks = [rng.sample(ids, RANDOM_DISPLAY_COUNT) for _ in range(ROTATION_COUNT)]
+    rows = queryset.model.objects.in_bulk({pk for pick in picks for pk in pick})
+    return [tuple(rows[pk] for pk in pick if pk in rows) for pick in picks]
+
+
+def _blog_posts():
+    """ (latest published post, next scheduled post) """
+    if BlogPost is None:
+        return None, None
+    now = timezone.now()
+    published = BlogPost.objects.filter(status='published')
+    latest = published.filter(published_date__lte=now).order_by('-published_date').first()
+    upcoming = published.filter(published_date__gt=now).order_by('published_date').first()
+    return latest, upcoming
+
+
+def _safely(label, build, default):
+    try:
+        return build()
+    except Exception as e:
+        logger.error(f"Error building home snapshot {label}: {e}", exc_info=True)
+        return default
+
+
+def build_snapshot():
+    rng = random.Random()
+    featured = {
+        # The template lists each project's skills: prefetch them instead of a query per card
+        'featured_projects': list(Project.objects.order_by('order', '-date_created').prefetch_related('skills')[:FEATURED_ITEMS_COUNT]),
+        'featured_certificates': list(Certificate.objects.order_by('order', '-date_issued')[:FEATURED_ITEMS_COUNT]),
+        'featured_recommendations': _safely('recommendations', lambda: list(
+            RecommendedProduct.objects.order_by('order', 'name')[:FEATURED_ITEMS_COUNT]
+        ), []) if RecommendedProduct else [],
+        'featured_demos': _safely('demos', lambda: list(
+            Demo.objects.filter(is_published=True, is_featured=True).order_by('order', 'title')[:FEATURED_ITEMS_COUNT]
+        ), []) if Demo else [],
+    }
+    skill_rotations = _safely('skills', lambda: _rotations(Skill.objects.all(), rng), []) if Skill else []
+    topic_rotations = _safely('topics', lambda: _rotations(ProjectTopic.objects.all(), rng), []) if ProjectTopic else []
+    latest_blog_post, upcoming_blog_post = _safely('blog posts', _blog_posts, (None, None))
+    return HomeSnapshot(featured, skill_rotations, topic_rotations, latest_blog_post, upcoming_blog_post)
+
+
+home_snapshot_cache = VersionedContextCache('home_snapshot', build_snapshot)
@@ -0,0 +1,85 @@
+# portfolio/import_manifest.py
+"""
+Change detection for ``initial_populate_all``.
+
+Each configured import source (one CSV, or a summary/content CSV pair) has an
+``ImportManifest`` row holding a fingerprint of its files and a SHA-256 per
+row key (the unique field for ``import_data`` sources, the slug column for
+the demo and recommendation pairs; all rows sharing a key are hashed
+together). On the next run an unchanged fingerprint skips the source without
+parsing it; otherwise only the keys whose hash changed are written to a
+temporary CSV and imported, and keys that disappeared are deleted.
+"""
+import csv
+import hashlib
+import json
+import os
+
+from django.conf import settings
+
+
+def resolve_path(path):
+    """ CSV paths in settings.CSV_FILES are relative to BASE_DIR, as in the import commands. """
+    return os.path.join(settings.BASE_DIR, path)
+
+
+def fingerprint(paths, options):
+    """ SHA-256 over the import options and the raw bytes of every file. """
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True, default=str).encode('utf-8'))
+    for path in paths:
+        digest.update(b'\0')
+        with open(resolve_path(path), 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class KeyedCSV:
+    """ A CSV file read as a header plus rows grouped by the value of ``key_column``. """
+
+    def __init__(self, path, key_column, encoding='utf-8-sig'):
+        self.path = path
+        with open(resolve_path(path), mode='r', encoding=encoding, newline='') as f:
+            reader = csv.reader(f)
+            # Plain rows rather than DictReader: some files repeat (empty) column names
+            self.header = next(reader, [])
+            rows = list(reader)
+        key_index = self.header.index(key_column) if key_column in self.header else None
+        self.rows_by_key = {}
+        self.keyless_rows = 0
+        for row in rows:
+            if not any(value.strip() for value in row):
+                continue
+            key = row[key_index].strip() if key_index is not None and key_index < len(row) else ''
+            if not key:
+                self.keyless_rows += 1
+                continue
+            self.rows_by_key.setdefault(key, []).append(row)
+
+    def write_subset(self, keys, path):
+        """ Writes the header and the rows of ``keys`` (in file order) to ``path``. """
+        with open(path, mode='w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.header)
+            for key, rows in self.rows_by_key.items():
+                if key in keys:
+                    writer.writerows(rows)
+
+
+def row_hashes(keyed_files):
+    """ {key: SHA-256} over each key's rows (and the headers) across all of a source's files. """
+    keys = set()
+    for keyed in keyed_files:
+        keys.update(keyed.rows_by_key)
+    hashes = {}
+    for key in keys:
+        payload = [[keyed.header, keyed.rows_by_key.get(key, [])] for keyed in keyed_files]
+        hashes[key] = hashlib.sha256(json.dumps(payload).encode('utf-8')).hexdigest()
+    return hashes
+
+
+def diff_row_hashes(old, new):
+    """ Returns (changed_or_new_keys, removed_keys). """
+    changed = {key for key, digest in new.items() if old.get(key) != digest}
+    removed = set(old) - set(new)
+    return changed, removed
@@ -0,0 +1,127 @@
+# portfolio/management/commands/benchmark_routes.py
+import platform
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from portfolio import benchmark
+from portfolio.sitemap_files import write_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks every public route of the root URLconf over HTTP (Django's test client) on a "
+        "synthetic dataset: p50/p95/p99 latency, database queries, response size and peak memory. "
+        "Runs on a throwaway test database and an isolated in-memory cache, writes the results as "
+        "JSON and flags regressions against a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help=f"Dataset size relative to {benchmark.BASE_COUNTS['projects']} projects (and so on).")
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per route.')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per route after the cold one.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--page-cache', action='store_true', help='Benchmark with the full-page cache on.')
+        parser.add_argument('--only', action='append', default=[], metavar='TEXT',
+                            help='Only routes whose name or path contains TEXT (repeatable).')
+        parser.add_argument('--output', help='Write the results to this JSON file (e.g. to use as a baseline).')
+        parser.add_argument('--baseline', help='Compare with the results in this JSON file.')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Relative growth of p95 latency, size or memory that counts as a regression.')
+        parser.add_argument('--min-delta-ms', type=float, default=benchmark.MIN_DELTA_MS,
+                            help='Smallest p95 increase (ms) that counts as a regression.')
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error if anything regressed.')
+        parser.add_argument('--host', default='localhost', help='Host header of the requests.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = benchmark.load_results(options['baseline'])
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read baseline: {e}")
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING(
+                "DEBUG is on: every query is logged and timings will be higher than in production."
+            ))
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark-routes'}},
+            SEARCH_INDEX_DIR=Path(directory) / 'search_index',
+            SITEMAP_DIR=Path(directory) / 'sitemaps',
+            METRICS_DIR=Path(directory) / 'metrics',
+            PAGE_CACHE_ENABLED=options['page_cache'],
+        ), benchmark.throwaway_database():
+            results = self._run(options)
+
+        self._write_table(results['routes'])
+        if options['output']:
+            benchmark.save_results(results, options['output'])
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}."))
+        if baseline is not None:
+            self._compare(results, baseline, options)
+
+    def _run(self, options):
+        started = time.perf_counter()
+        counts = benchmark.seed(options['scale'], options['seed'])
+        write_sitemaps(domain=options['host'])
+        self.stdout.write(
+            f"Seeded {', '.join(f'{count} {name}' for name, count in counts.items())} "
+            f"in {time.perf_counter() - started:.1f}s."
+        )
+        routes = benchmark.discover_routes()
+        if options['only']:
+            routes = {key: path for key, path in routes.items()
+                      if any(text in key or text in path for text in options['only'])}
+        client = Client(HTTP_HOST=options['host'], raise_request_exception=False)
+        secure = getattr(settings, 'SECURE_SSL_REDIRECT', False)
+        measured = {}
+        for key, path in routes.items():
+            measured[key] = benchmark.measure_route(client, path, options['iterations'], options['warmup'], secure)
+        return {
+            'version': benchmark.RESULT_VERSION,
+            'created': timezone.now().isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'scale': options['scale'],
+            'counts': counts,
+            'iterations': options['iterations'],
+            'page_cache': options['page_cache'],
+            'routes': measured,
+        }
+
+    def _write_table(self, routes):
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'Route':<44} {'Status':>6} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+            f"{'Queries':>9} {'KB':>8} {'Peak KB':>8}"
+        )
+        for key, row in routes.items():
+            self.stdout.write(
+                f"{key[:44]:<44} {row['status']:>6} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} "
+                f"{row['cold_queries']:>4}/{row['queries']:<4} {row['bytes'] / 1024:>8.1f} {row['peak_kb']:>8.0f}"
+            )
+        self.stdout.write("(Queries: first request after seeding / warm request)")
+
+    def _compare(self, results, baseline, options):
+        for setting in ('scale', 'database', 'page_cache'):
+            if baseline.get(setting) != results[setting]:
+                self.stdout.write(self.style.WARNING(
+                    f"Baseline was run with {setting}={baseline.get(setting)!r}, this run with {results[setting]!r}."
+                ))
+        regressions = benchmark.compare(results, baseline, options['threshold'], options['min_delta_ms'])
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
+            return
+        self.stdout.write(self.style.ERROR(f"{len(regressions)} regression(s) against {options['baseline']}:"))
+        for regression in regressions:
+            self.stdout.write(f"  {regression}")
+        if options['fail_on_regression']:
+            raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}.")
@@ -0,0 +1,150 @@
+# portfolio/management/commands/benchmark_search.py
+import itertools
+import random
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from portfolio.models import Project
+from portfolio.search_index import SearchIndex
+from portfolio import search_vectors
+
+SYLLABLES = (
+    "ka", "lo", "mi", "ne", "ro", "ta", "vi", "su", "de", "pa", "gri", "zen", "tor", "mal", "quin",
+    "ber", "sol", "ux", "fra", "dy", "mon", "lek", "tra", "ob", "nix", "cal", "ver", "hu", "ist", "opt",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the site search backends on a synthetic corpus of projects: the in-process BM25 "
+        "index, PostgreSQL full-text search (on PostgreSQL only) and the old icontains scan. "
+        "The corpus is written inside a transaction that is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help='Number of synthetic projects.')
+        parser.add_argument('--queries', type=int, default=200, help='Number of queries timed per backend.')
+        parser.add_argument('--vocabulary', type=int, default=20_000, help='Number of distinct synthetic words.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--skip-icontains', action='store_true', help='Do not time the icontains scan.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        vocabulary = self._vocabulary(rng, options['vocabulary'])
+        # Zipf-like word frequencies, as in natural text (cumulative, for random.choices)
+        weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+        queries = self._queries(rng, vocabulary, options['queries'])
+        results = []
+        with transaction.atomic():
+            started = time.perf_counter()
+            self._create_corpus(rng, vocabulary, weights, options['rows'])
+            self.stdout.write(f"Created {options['rows']} synthetic project(s) in {time.perf_counter() - started:.1f}s.")
+            results.append(self._bench_index(queries))
+            if connection.vendor == 'postgresql':
+                results.append(self._bench_postgres(queries))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f"Database is {connection.vendor}: PostgreSQL full-text search not benchmarked."
+                ))
+            if not options['skip_icontains']:
+                results.append(self._bench_icontains(queries))
+            transaction.set_rollback(True)
+        self._write_table(results)
+
+    # --- Corpus ---
+
+    def _vocabulary(self, rng, size):
+        words = set()
+        while len(words) < size:
+            words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+        return sorted(words)
+
+    def _text(self, rng, vocabulary, weights, length):
+        return " ".join(rng.choices(vocabulary, cum_weights=weights, k=length))
+
+    def _create_corpus(self, rng, vocabulary, weights, rows, batch_size=2000):
+        batch = []
+        for i in range(rows):
+            batch.append(Project(
+                title=self._text(rng, vocabulary, weights, 4).title(),
+                slug=f"search-benchmark-{i}",
+                description=self._text(rng, vocabulary, weights, 40),
+                long_description_markdown=self._text(rng, vocabulary, weights, 80),
+            ))
+            if len(batch) == batch_size:
+                Project.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Project.objects.bulk_create(batch)
+
+    def _queries(self, rng, vocabulary, count):
+        # Mid-frequency words: very common ones match most rows, rare ones almost none
+        pool = vocabulary[50:2000]
+        queries = []
+        for i in range(count):
+            kind = i % 3
+            if kind == 0:
+                queries.append(rng.choice(pool))
+            elif kind == 1:
+                queries.append(f"{rng.choice(pool)} {rng.choice(pool)}")
+            else:
+                queries.append(rng.choice(pool)[:4])
+        return queries
+
+    # --- Backends ---
+
+    def _time_queries(self, name, setup_seconds, queries, run):
+        timings, hits = [], []
+        for query in queries:
+            started = time.perf_counter()
+            hits.append(run(query))
+            timings.append((time.perf_counter() - started) * 1000)
+        return {
+            'backend': name,
+            'setup': setup_seconds,
+            'p50': statistics.median(timings),
+            'p95': statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0],
+            'mean': statistics.fmean(timings),
+            'hits': statistics.fmean(hits),
+        }
+
+    def _bench_index(self, queries):
+        with tempfile.TemporaryDirectory() as directory:
+            index = SearchIndex(directory=directory)
+            started = time.perf_counter()
+            index.rebuild(persist=False)
+            setup = time.perf_counter() - started
+            return self._time_queries("BM25 index", setup, queries,
+                                      lambda query: len(index.search(query, doc_types={'project'}, limit=100)))
+
+    def _bench_postgres(self, queries):
+        started = time.perf_counter()
+        search_vectors.update_search_vectors(Project)
+        setup = time.perf_counter() - started
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE "{Project._meta.db_table}"')
+        return self._time_queries("PostgreSQL FTS", setup, queries, lambda query: len(list(
+            search_vectors.ranked(Project.objects.all(), 'project', query, 100).values_list('pk', 'search_headline')
+        )))
+
+    def _bench_icontains(self, queries):
+        def run(query):
+            condition = Q()
+            for word in query.split():
+                condition &= Q(title__icontains=word) | Q(description__icontains=word) | Q(long_description_markdown__icontains=word)
+            return len(list(Project.objects.filter(condition).values_list('pk', flat=True)[:100]))
+        return self._time_queries("icontains scan", 0.0, queries, run)
+
+    def _write_table(self, results):
+        self.stdout.write("")
+        self.stdout.write(f"{'Backend':<16} {'Setup (s)':>10} {'p50 (ms)':>10} {'p95 (ms)':>10} {'Mean (ms)':>10} {'Avg hits':>9}")
+        for row in results:
+            self.stdout.write(
+                f"{row['backend']:<16} {row['setup']:>10.2f} {row['p50']:>10.2f} {row['p95']:>10.2f} "
+                f"{row['mean']:>10.2f} {row['hits']:>9.1f}"
+            )
@@ -0,0 +1,37 @@
+# portfolio/management/commands/export_static_site.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.static_export import export_site
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders every page listed in the sitemaps to pre-rendered HTML (<output>/<path>/index.html) "
+        "for WhiteNoise or a static host. Only pages whose database rows changed since the last "
+        "export are rendered again; use --force after template or code changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None, help='Output directory (default: settings.STATIC_EXPORT_DIR).')
+        parser.add_argument('--host', default=None, help='Host name the pages are rendered for (default: first ALLOWED_HOSTS entry).')
+        parser.add_argument('--force', action='store_true', help='Render every page, ignoring the export manifest.')
+
+    def handle(self, *args, **options):
+        output = options['output'] or settings.STATIC_EXPORT_DIR
+        host = options['host'] or self._default_host()
+        if not host:
+            raise CommandError("No usable host in ALLOWED_HOSTS; pass --host.")
+        result = export_site(output, host=host, force=options['force'])
+        for path in result.skipped:
+            self.stdout.write(self.style.WARNING(f"Skipped {path} (not a static page)."))
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported to {output}: {len(result.written)} written, {len(result.unchanged)} unchanged, "
+            f"{len(result.up_to_date)} up to date, {len(result.removed)} removed."
+        ))
+
+    def _default_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host and host != '*' and not host.startswith('.'):
+                return host
+        return None
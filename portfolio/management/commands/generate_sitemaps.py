@@ -0,0 +1,31 @@
+# portfolio/management/commands/generate_sitemaps.py
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.sitemap_files import domain_dir, registered_sitemaps, write_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes the sitemap index and gzip-compressed sitemap sections of settings.SITEMAP_DOMAIN (or --domain) "
+        "to settings.SITEMAP_DIR. "
+        "Files whose content did not change are left untouched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('sections', nargs='*', help='Sections to regenerate (default: all).')
+        parser.add_argument('--domain', default=None, help='Domain used in the URLs (default: settings.SITEMAP_DOMAIN).')
+        parser.add_argument('--protocol', default=None, choices=('http', 'https'), help='Default: settings.SITEMAP_PROTOCOL.')
+
+    def handle(self, *args, **options):
+        if not (options['domain'] or settings.SITEMAP_DOMAIN):
+            raise CommandError("Set settings.SITEMAP_DOMAIN or pass --domain (without them the sitemap views "
+                               "generate the files of each requested host on first use).")
+        sections = options['sections'] or None
+        if sections:
+            unknown = set(sections) - set(registered_sitemaps())
+            for name in sorted(unknown):
+                self.stdout.write(self.style.WARNING(f"Unknown sitemap section '{name}' ignored."))
+        written = write_sitemaps(sections, domain=options['domain'], protocol=options['protocol'])
+        directory = domain_dir(options['domain'] or settings.SITEMAP_DOMAIN)
+        self.stdout.write(self.style.SUCCESS(f"Sitemaps in {directory} are up to date ({len(written)} file(s) written)."))
@@ -1,12 +1,22 @@
 # core/management/commands/initial_populate_all.py
 # (Place this in a 'core' app or your main 'portfolio' app's management/commands directory)
 
+from django.apps import apps
 from django.core.management.base import BaseCommand, CommandError
 from django.core import management
 from django.conf import settings
+from django.db import transaction
 import os
+import tempfile
+import time
+
+from portfolio.import_manifest import KeyedCSV, diff_row_hashes, fingerprint, row_hashes
+from portfolio.management.commands.import_data import MODEL_MAP
+from portfolio.models import ImportManifest
 
 # Define the sequence of data to import and their respective CSV files and parameters.
+# 'dependents' lists later sources whose rows link to this one's (by name): when this source
+# changes, their manifests are dropped so that they are re-imported in full and relinked.
 # Assumes CSV_FILES is defined in settings.py as suggested.
 # Example settings.py entry:
 # CSV_FILES = {
@@ -22,7 +32,8 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'USER_PROFILE_CSV', # New key for settings.CSV_FILES
         'model_type': 'userprofile',
         'unique_field': 'site_identifier', # UserProfile uses 'site_identifier'
-        'update': True # Ensures it updates the existing one or creates if not present
+        'update': True, # Ensures it updates the existing one or creates if not present
+        'bulk': True # Set-based import: one preload query, then bulk writes
     },
     {
         'label': 'Skill Categories',
@@ -30,7 +41,9 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'SKILLCATEGORIES_CSV', # Key in settings.CSV_FILES
         'model_type': 'skillcategories',
         'unique_field': 'name',
-        'update': True
+        'update': True,
+        'bulk': True,
+        'dependents': ['Skills'], # Skill.category
     },
     {
         'label': 'Skills',
@@ -38,7 +51,9 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'SKILLS_CSV',
         'model_type': 'skills',
         'unique_field': 'name',
-        'update': True
+        'update': True,
+        'bulk': True,
+        'dependents': ['Projects'], # Project.skills
     },
     {
         'label': 'Project Topics',
@@ -46,7 +61,9 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'TOPICS_CSV',
         'model_type': 'topics',
         'unique_field': 'name',
-        'update': True
+        'update': True,
+        'bulk': True,
+        'dependents': ['Projects'], # Project.topics
     },
     {
         'label': 'Certificates',
@@ -54,7 +71,8 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'CERTIFICATES_CSV',
         'model_type': 'certificates',
         'unique_field': 'title',
-        'update': True
+        'update': True,
+        'bulk': True
     },
     {
         'label': 'Projects',
@@ -62,7 +80,8 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'PROJECTS_CSV',
         'model_type': 'projects',
         'unique_field': 'title',
-        'update': True
+        'update': True,
+        'bulk': True
     },
     {
         'label': 'Blog Posts',
@@ -70,7 +89,8 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'BLOGPOSTS_CSV',
         'model_type': 'blogposts',
         'unique_field': 'title',
-        'update': True
+        'update': True,
+        'bulk': True
     },
     { # NEW ENTRY for Colophon
         'label': 'Colophon Entries',
@@ -78,7 +98,8 @@ INITIAL_IMPORT_CONFIG = [
         'csv_filepath_setting': 'COLOPHON_ENTRIES_CSV', # Needs to be added to settings.CSV_FILES
         'model_type': 'colophonentires', # Matches MODEL_MAP key in import_data.py
         'unique_field': 'name', # Assuming 'name' is unique enough for colophon entries
-        'update': True
+        'update': True,
+        'bulk': True
     },
     {
         'label': 'Demos (Summary & Content)',
@@ -87,6 +108,10 @@ INITIAL_IMPORT_CONFIG = [
             'DEMOS_SUMMARY_CSV',
             'DEMOS_CONTENT_CSV'
         ],
+        # Rows of both files are grouped by this column for change detection
+        'row_key_column': 'demo_slug',
+        'model': 'demos.Demo',
+        'model_lookup': 'slug',
     },
     {
         'label': 'Recommendations (Summary & Content)',
@@ -95,19 +120,34 @@ INITIAL_IMPORT_CONFIG = [
             'RECOMMENDATIONS_SUMMARY_CSV',
             'RECOMMENDATIONS_CONTENT_CSV'
         ],
+        'row_key_column': 'reco_slug',
+        'model': 'recommendations.RecommendedProduct',
+        'model_lookup': 'slug',
     },
 ]
 
 class Command(BaseCommand):
-    help = 'Performs the initial comprehensive population of the database from predefined CSV files configured in settings.CSV_FILES.'
+    help = (
+        'Populates the database from the CSV files configured in settings.CSV_FILES. '
+        'Sources whose files are unchanged since the last run are skipped; for changed ones only '
+        'new or modified rows are imported and rows removed from the CSV are deleted (see portfolio/import_manifest.py).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Ignore the import manifest and re-import every file in full.',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS("Starting initial database population sequence..."))
-        self.stdout.write(self.style.WARNING("This will attempt to import data for all configured models. Ensure your database is clean or backups exist if running on existing data."))
 
         if not hasattr(settings, 'CSV_FILES') or not isinstance(settings.CSV_FILES, dict):
             raise CommandError("The 'CSV_FILES' dictionary is not defined in your Django settings.py.")
 
+        summary = []
+        total_started = time.monotonic()
         for config_item in INITIAL_IMPORT_CONFIG:
             label = config_item['label']
             command_name = config_item['command_name']
@@ -117,6 +157,7 @@ class Command(BaseCommand):
             keyword_options_for_call = {}
 
             self.stdout.write(self.style.MIGRATE_HEADING(f"\n--- Importing: {label} ---"))
+            started = time.monotonic()
 
             try:
                 # Prepare arguments and options based on command type
@@ -139,25 +180,98 @@ class Command(BaseCommand):
                     keyword_options_for_call['unique_field'] = config_item.get('unique_field', 'slug')
                     if config_item.get('update', False):
                         keyword_options_for_call['update'] = True
+                    if config_item.get('bulk', False):
+                        keyword_options_for_call['bulk'] = True
                     if 'encoding' in config_item: # Allow overriding encoding per config item
                          keyword_options_for_call['encoding'] = config_item['encoding']
 
-
-                # Call the command
-                management.call_command(command_name, *positional_args_for_call, **keyword_options_for_call)
-
-                self.stdout.write(self.style.SUCCESS(f"Successfully imported {label}."))
+                status, rows, upserted, deleted = self._import_source(
+                    config_item, positional_args_for_call, keyword_options_for_call, options['force'],
+                )
+                if status == 'unchanged':
+                    self.stdout.write(f"{label}: files unchanged since the last import, skipped.")
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"Successfully imported {label}."))
 
             except KeyError as ke:
+                status, rows, upserted, deleted = 'failed', 0, 0, 0
                 self.stderr.write(self.style.ERROR(f"Configuration error for '{label}': Missing key {ke} in settings.CSV_FILES or config_item."))
                 self.stdout.write(self.style.WARNING(f"Skipping {label} due to configuration error. Continuing with next item..."))
             except CommandError as ce:
+                status, rows, upserted, deleted = 'failed', 0, 0, 0
                 self.stderr.write(self.style.ERROR(f"CommandError during import of {label}: {ce}"))
                 self.stdout.write(self.style.WARNING(f"Skipping {label} due to error. Continuing with next item..."))
             except Exception as e:
+                status, rows, upserted, deleted = 'failed', 0, 0, 0
                 self.stderr.write(self.style.ERROR(f"An unexpected error occurred importing {label}: {e}"))
                 self.stdout.write(self.style.WARNING(f"Skipping {label} due to unexpected error. Continuing with next item..."))
+            summary.append((label, status, rows, upserted, deleted, time.monotonic() - started))
 
+        self._write_summary(summary, time.monotonic() - total_started)
         self.stdout.write(self.style.SUCCESS("\nInitial database population sequence complete!"))
         
         # self.stdout.write(self.style.NOTICE("Remember to create a superuser if you haven't already (if the migration didn't run or env vars weren't set): python manage.py createsuperuser"))
+
+    def _source_details(self, config_item):
+        """ (row key column, model, model lookup field) used for change detection and deletes. """
+        if config_item['command_name'] == 'import_data':
+            unique_field = config_item.get('unique_field', 'slug')
+            return unique_field, MODEL_MAP[config_item['model_type']], unique_field
+        return config_item['row_key_column'], apps.get_model(config_item['model']), config_item['model_lookup']
+
+    def _import_source(self, config_item, csv_paths, keyword_options, force):
+        """
+        Imports one source, skipping it when its files are unchanged and otherwise importing
+        only changed rows. Returns (status, row keys, rows upserted, rows deleted).
+        """
+        label = config_item['label']
+        command_name = config_item['command_name']
+        key_column, TargetModel, lookup = self._source_details(config_item)
+        encoding = config_item.get('encoding', 'utf-8-sig')
+
+        current_fingerprint = fingerprint(csv_paths, {key: value for key, value in config_item.items() if key != 'label'})
+        manifest = None if force else ImportManifest.objects.filter(source=label).first()
+        if manifest and manifest.fingerprint == current_fingerprint:
+            return 'unchanged', len(manifest.row_hashes), 0, 0
+
+        keyed_files = [KeyedCSV(path, key_column, encoding) for path in csv_paths]
+        hashes = row_hashes(keyed_files)
+        with transaction.atomic():
+            if manifest is None:
+                # First run (or --force): import the files as they are
+                status, changed, removed = 'full', set(hashes), set()
+                management.call_command(command_name, *csv_paths, **keyword_options)
+            else:
+                status = 'incremental'
+                changed, removed = diff_row_hashes(manifest.row_hashes, hashes)
+                if removed:
+                    deleted, _ = TargetModel.objects.filter(**{f"{lookup}__in": removed}).delete()
+                    self.stdout.write(f"Deleted {len(removed)} {TargetModel._meta.verbose_name_plural} removed from the CSV ({deleted} objects).")
+                if changed:
+                    with tempfile.TemporaryDirectory() as tmpdir:
+                        subset_paths = []
+                        for keyed in keyed_files:
+                            subset_path = os.path.join(tmpdir, os.path.basename(keyed.path))
+                            keyed.write_subset(changed, subset_path)
+                            subset_paths.append(subset_path)
+                        self.stdout.write(f"Importing {len(changed)} new or changed row key(s) of {len(hashes)}.")
+                        management.call_command(command_name, *subset_paths, **keyword_options)
+            ImportManifest.objects.update_or_create(
+                source=label, defaults={'fingerprint': current_fingerprint, 'row_hashes': hashes},
+            )
+            dependents = config_item.get('dependents', [])
+            if (changed or removed) and dependents:
+                # Deleted or recreated rows took their links with them (and new rows may now resolve)
+                invalidated, _ = ImportManifest.objects.filter(source__in=dependents).delete()
+                if invalidated:
+                    self.stdout.write(f"Dropped the manifest of {', '.join(dependents)} to re-import links to {label} in full.")
+        return status, len(hashes), len(changed), len(removed)
+
+    def _write_summary(self, summary, total_seconds):
+        self.stdout.write(self.style.MIGRATE_HEADING("\n--- Import summary ---"))
+        label_width = max([len('Source')] + [len(row[0]) for row in summary])
+        self.stdout.write(f"{'Source':<{label_width}}  {'Status':<11}  {'Rows':>5}  {'Upserted':>8}  {'Deleted':>7}  {'Time':>7}")
+        for label, status, rows, upserted, deleted, seconds in summary:
+            line = f"{label:<{label_width}}  {status:<11}  {rows:>5}  {upserted:>8}  {deleted:>7}  {seconds:>6.2f}s"
+            self.stdout.write(self.style.ERROR(line) if status == 'failed' else line)
+        self.stdout.write(f"Total: {total_seconds:.2f}s")
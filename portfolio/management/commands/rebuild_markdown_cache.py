@@ -0,0 +1,50 @@
+# portfolio/management/commands/rebuild_markdown_cache.py
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from portfolio.markdown_cache import MarkdownCacheMixin
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders and stores the HTML cache for every model using MarkdownCacheMixin. "
+        "Only fields whose source hash changed are re-rendered unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-render every Markdown field even if its cached hash still matches.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of rows written per bulk_update call.',
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        force = options['force']
+        batch_size = options['batch_size']
+
+        for model in apps.get_models():
+            if not issubclass(model, MarkdownCacheMixin) or not model.markdown_fields:
+                continue
+            label = model._meta.label
+            only_fields = ('rendered_markdown',) + tuple(model.markdown_fields)
+            pending = []
+            scanned = updated = 0
+            for obj in model.objects.only(*only_fields).iterator(chunk_size=batch_size):
+                scanned += 1
+                if obj.refresh_rendered_markdown(force=force):
+                    pending.append(obj)
+                    updated += 1
+                if len(pending) >= batch_size:
+                    model.objects.bulk_update(pending, ['rendered_markdown'])
+                    pending = []
+            if pending:
+                model.objects.bulk_update(pending, ['rendered_markdown'])
+            self.stdout.write(self.style.SUCCESS(f"{label}: scanned {scanned} row(s), re-rendered {updated}."))
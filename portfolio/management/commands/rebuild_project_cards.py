@@ -0,0 +1,25 @@
+# portfolio/management/commands/rebuild_project_cards.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from portfolio.project_cards import rebuild_project_cards
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the ProjectCard read model used by the project listing pages. "
+        "Run after changing the Markdown settings or editing data outside the ORM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of cards written per bulk upsert.',
+        )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        written = rebuild_project_cards(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} project card(s)."))
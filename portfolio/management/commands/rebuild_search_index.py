@@ -0,0 +1,26 @@
+# portfolio/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from portfolio.search_index import search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the site search index from the database and writes a new snapshot to "
+        "settings.SEARCH_INDEX_DIR, which running workers load on their next search. With --compact, only "
+        "merges the changes logged since the last snapshot into a new one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--compact', action='store_true',
+                            help='Merge the logged changes into a new snapshot instead of reindexing everything.')
+
+    def handle(self, *args, **options):
+        if options['compact']:
+            if search_index.compact():
+                self.stdout.write(self.style.SUCCESS(f"Compacted the search index in {search_index.directory}."))
+            else:
+                self.stdout.write("No logged changes to compact.")
+            return
+        documents = search_index.rebuild(persist=True)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {documents} document(s) into {search_index.directory}."))
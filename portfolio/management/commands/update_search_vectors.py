@@ -0,0 +1,26 @@
+# portfolio/management/commands/update_search_vectors.py
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from portfolio.search_vectors import VECTOR_SOURCES, update_search_vectors
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the weighted full-text search vectors used by PostgreSQL site search. "
+        "Run after editing data outside the ORM. Does nothing on other databases."
+    )
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                f"The database is {connection.vendor}, not PostgreSQL: search uses the in-process index instead."
+            ))
+            return
+        for doc_type, source in VECTOR_SOURCES.items():
+            if source.model is None:
+                continue
+            updated = update_search_vectors(source.model)
+            self.stdout.write(f"  {source.model_label}: {updated} row(s)")
+        self.stdout.write(self.style.SUCCESS("Search vectors updated."))
@@ -0,0 +1,119 @@
+# portfolio/markdown_cache.py
+"""
+Render cache for Markdown fields.
+
+Rendering Markdown through the ``markdownify`` filter (markdown extensions,
+Pygments highlighting and bleach sanitising) on every request is the most
+expensive part of several pages. Models that use ``MarkdownCacheMixin``
+store the sanitised HTML for each of their Markdown fields in a
+``rendered_markdown`` JSON column, keyed by a hash of the source text and
+the active MARKDOWNIFY profile, so the HTML only has to be rebuilt when the
+source (or the rendering configuration) changes.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.db import models
+from django.utils.safestring import mark_safe
+
+from markdownify.templatetags.markdownify import markdownify
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = "default"
+
+
+def _profile_fingerprint(profile=DEFAULT_PROFILE):
+    """ Returns a stable string describing the MARKDOWNIFY settings for a profile. """
+    profile_settings = getattr(settings, "MARKDOWNIFY", {}).get(profile, {})
+    return repr(sorted(profile_settings.items(), key=lambda item: item[0]))
+
+
+def content_hash(text, profile=DEFAULT_PROFILE):
+    """
+    Hash of the Markdown source plus the rendering profile. A change to either
+    the text or the MARKDOWNIFY settings yields a different hash.
+    """
+    digest = hashlib.sha256()
+    digest.update(_profile_fingerprint(profile).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((text or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def render_markdown(text, profile=DEFAULT_PROFILE):
+    """ Renders Markdown exactly as the ``markdownify`` template filter would. """
+    return markdownify(text or "", profile)
+
+
+class MarkdownCacheMixin(models.Model):
+    """
+    Abstract model mixin that keeps pre-rendered HTML next to Markdown fields.
+
+    Subclasses list their Markdown source fields in ``markdown_fields``. The
+    cache is refreshed in ``save()`` for any field whose content hash changed;
+    code paths that bypass ``save()`` (``bulk_create``/``bulk_update``) should
+    call ``refresh_rendered_markdown()`` on each instance first.
+    """
+    markdown_fields = ()
+    markdown_profile = DEFAULT_PROFILE
+
+    rendered_markdown = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Cache of rendered HTML for Markdown fields, keyed by field name."
+    )
+
+    class Meta:
+        abstract = True
+
+    def refresh_rendered_markdown(self, force=False):
+        """
+        Re-renders Markdown fields whose source hash no longer matches the cache.
+        Returns True if the cache was modified.
+        """
+        cache = dict(self.rendered_markdown or {})
+        changed = False
+        for field_name in self.markdown_fields:
+            source = getattr(self, field_name, None)
+            if not source:
+                if field_name in cache:
+                    del cache[field_name]
+                    changed = True
+                continue
+            source_hash = content_hash(source, self.markdown_profile)
+            entry = cache.get(field_name)
+            if not force and entry and entry.get("hash") == source_hash:
+                continue
+            try:
+                html = str(render_markdown(source, self.markdown_profile))
+            except Exception as e:
+                logger.error(f"Error rendering Markdown for {self.__class__.__name__}.{field_name} (pk={self.pk}): {e}", exc_info=True)
+                cache.pop(field_name, None)
+                changed = True
+                continue
+            cache[field_name] = {"hash": source_hash, "html": html}
+            changed = True
+        if changed:
+            self.rendered_markdown = cache
+        return changed
+
+    def rendered_html(self, field_name):
+        """
+        Returns sanitised HTML for a Markdown field, served from the cache when
+        the stored hash matches the current source and rendered live otherwise.
+        """
+        source = getattr(self, field_name, None)
+        if not source:
+            return mark_safe("")
+        entry = (self.rendered_markdown or {}).get(field_name)
+        if entry and entry.get("hash") == content_hash(source, self.markdown_profile):
+            return mark_safe(entry.get("html", ""))
+        return render_markdown(source, self.markdown_profile)
+
+    def save(self, *args, **kwargs):
+        changed = self.refresh_rendered_markdown()
+        update_fields = kwargs.get("update_fields")
+        if changed and update_fields is not None and "rendered_markdown" not in update_fields:
+            kwargs["update_fields"] = list(update_fields) + ["rendered_markdown"]
+        super().save(*args, **kwargs)
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0003_rendered_markdown_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportManifest',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text='Label of the import source in INITIAL_IMPORT_CONFIG.', max_length=100, unique=True)),
+                ('fingerprint', models.CharField(help_text="SHA-256 of the source's files and import options.", max_length=64)),
+                ('row_hashes', models.JSONField(blank=True, default=dict, help_text="Row key -> SHA-256 of that key's CSV rows.")),
+                ('imported_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['source'],
+            },
+        ),
+    ]
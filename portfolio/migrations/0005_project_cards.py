@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_import_manifest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectCard',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='portfolio.project')),
+                ('excerpt', models.TextField(blank=True, help_text='Plain-text start of the rendered description.')),
+                ('skills', models.JSONField(blank=True, default=list, help_text="First skills as [{'name', 'slug'}, ...].")),
+                ('skill_count', models.PositiveIntegerField(default=0)),
+                ('topics', models.JSONField(blank=True, default=list, help_text="All topics as [{'name', 'slug'}, ...].")),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='colophonentry',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Last modification (conditional GET validators).'),
+        ),
+    ]
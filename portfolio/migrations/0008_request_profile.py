@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('method', models.CharField(max_length=10)),
+                ('path', models.CharField(max_length=500)),
+                ('route', models.CharField(db_index=True, help_text='URL name of the view.', max_length=200)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration_ms', models.FloatField(help_text='Time spent below the profiling middleware.')),
+                ('sample_count', models.PositiveIntegerField()),
+                ('trigger', models.CharField(choices=[('header', 'Signed X-Profile header'), ('sample', 'Random sample'), ('slow', 'Slower than PROFILING_SLOW_MS')], max_length=10)),
+                ('file_name', models.CharField(help_text='Profile file in PROFILING_DIR.', max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
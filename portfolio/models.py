@@ -1,11 +1,14 @@
 # portfolio/models.py
 
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
-from django.utils.text import slugify
 from django.urls import reverse
 import logging # Import logging
 
+from .markdown_cache import MarkdownCacheMixin
+from .slugs import assign_unique_slug
+
 logger = logging.getLogger(__name__) # Define logger at module level
 
 
@@ -22,8 +25,10 @@ except ImportError:
     ProjectTopic = None
 
 
-class Project(models.Model):
+class Project(MarkdownCacheMixin, models.Model):
     """ Represents a single project in the portfolio. """
+    markdown_fields = ('description', 'long_description_markdown', 'results_metrics', 'challenges', 'lessons_learned')
+
     title = models.CharField(max_length=200, help_text="The title of the project.")
     slug = models.SlugField(max_length=250, unique=True, blank=True, help_text="URL-friendly version of the title (auto-generated if blank).")
     description = models.TextField(help_text="A detailed description of the project.")
@@ -60,7 +65,8 @@ class Project(models.Model):
 
     order = models.PositiveIntegerField(default=0, help_text="Order for display (lower numbers show first).")
     date_created = models.DateField(default=timezone.now, help_text="The date the project was created or started.")
-    # last_updated = models.DateTimeField(auto_now=True) # Optional: if you want to track updates
+    updated_at = models.DateTimeField(auto_now=True, help_text="Last modification (conditional GET validators).")
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Weighted full-text vector (PostgreSQL search, see portfolio/search_vectors.py).")
 
     class Meta:
         ordering = ['order', '-date_created'] # Default ordering
@@ -86,28 +92,33 @@ class Project(models.Model):
         and ensure its uniqueness. If a slug is provided, it will be used
         as the base (and slugified if not already).
         """
-        # Determine the base slug
-        if not self.slug:  # If slug is empty or None
-            base_slug = slugify(self.title)
-        else:
-            # FIX: If a slug is provided, use it but ensure it's properly slugified
-            base_slug = slugify(self.slug)
-
-        candidate_slug = base_slug
-        counter = 1
-        
-        # Build the queryset for checking conflicts.
-        qs_check = Project.objects.all()
-        if self.pk: # If updating an existing instance, exclude itself
-            qs_check = qs_check.exclude(pk=self.pk)
-            
-        while qs_check.filter(slug=candidate_slug).exists():
-            candidate_slug = f"{base_slug}-{counter}"
-            counter += 1
-        
-        self.slug = candidate_slug
+        assign_unique_slug(self, 'title') # One query for the taken slugs (see slugs.py)
         super().save(*args, **kwargs)
 
+# --- Project card read model ---
+class ProjectCard(models.Model):
+    """
+    Denormalised data for a project's card on the listing pages (all projects,
+    topic and skill detail), so a listing renders from one joined query instead
+    of per-card M2M queries and Markdown renders. Maintained by
+    ``portfolio.project_cards`` from signals and the importers.
+    """
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='card')
+    excerpt = models.TextField(blank=True, help_text="Plain-text start of the rendered description.")
+    skills = models.JSONField(default=list, blank=True, help_text="First skills as [{'name', 'slug'}, ...].")
+    skill_count = models.PositiveIntegerField(default=0)
+    topics = models.JSONField(default=list, blank=True, help_text="All topics as [{'name', 'slug'}, ...].")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Card for {self.project_id}"
+
+    @property
+    def more_skills(self):
+        """ Number of skills beyond those stored on the card. """
+        return max(self.skill_count - len(self.skills), 0)
+
+
 # --- Certificate Model ---
 class Certificate(models.Model):
     title = models.CharField(max_length=250)
@@ -121,6 +132,7 @@ class Certificate(models.Model):
         help_text="Upload a logo image for the issuer or certificate (optional)."
     )    
     order = models.PositiveIntegerField(default=0, help_text="Order for display (e.g., 0 for most recent/important).")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order', '-date_issued']
@@ -128,7 +140,17 @@ class Certificate(models.Model):
     def __str__(self):
         return f"{self.title} - {self.issuer}"
 
-class UserProfile(models.Model):
+class UserProfile(MarkdownCacheMixin, models.Model):
+    markdown_fields = (
+        'about_me_markdown',
+        'about_me_intro_markdown', 'about_me_journey_markdown', 'about_me_expertise_markdown',
+        'about_me_philosophy_markdown', 'about_me_beyond_work_markdown',
+        'hire_me_intro_markdown', 'hire_me_seeking_markdown', 'hire_me_strengths_markdown',
+        'hire_me_availability_markdown',
+        'skills_overview_ml_markdown', 'skills_overview_datasci_markdown', 'skills_overview_general_markdown',
+        'privacy_policy_markdown', 'terms_conditions_markdown', 'accessibility_statement_markdown',
+    )
+
     # Basic Info
     full_name = models.CharField(max_length=100, default="Julian Stone")
     tagline = models.CharField(max_length=255, blank=True, help_text="e.g., Web Developer & Data Science Enthusiast")
@@ -264,6 +286,17 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.full_name}'s Profile"
 
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        """
+        The context processor hands templates a slim, deferred instance. When a page
+        touches one deferred field, load all deferred fields in one query instead of
+        issuing a query per Markdown field.
+        """
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
     class Meta:
         verbose_name = "User Profile"
         verbose_name_plural = "User Profiles"
@@ -299,6 +332,7 @@ class ColophonEntry(models.Model):
         help_text="Optional: Font Awesome class or similar for an icon (e.g., 'fab fa-python')."
     )
     order = models.PositiveIntegerField(default=0, help_text="Order within its category for display.")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['category', 'order', 'name'] # Default ordering
@@ -307,3 +341,49 @@ class ColophonEntry(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class ImportManifest(models.Model):
+    """
+    Records what ``initial_populate_all`` last imported from one configured source
+    (one or two CSV files): a fingerprint of the files and a content hash per row key,
+    so unchanged sources can be skipped and changed ones imported row by row.
+    """
+    source = models.CharField(max_length=100, unique=True, help_text="Label of the import source in INITIAL_IMPORT_CONFIG.")
+    fingerprint = models.CharField(max_length=64, help_text="SHA-256 of the source's files and import options.")
+    row_hashes = models.JSONField(default=dict, blank=True, help_text="Row key -> SHA-256 of that key's CSV rows.")
+    imported_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['source']
+
+    def __str__(self):
+        return self.source
+
+
+class RequestProfile(models.Model):
+    """
+    A sampled call-stack profile of one request (see portfolio/profiling.py). The samples
+    are stored compressed in ``settings.PROFILING_DIR``; this row holds the metadata.
+    """
+    TRIGGER_CHOICES = (
+        ('header', 'Signed X-Profile header'),
+        ('sample', 'Random sample'),
+        ('slow', 'Slower than PROFILING_SLOW_MS'),
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    route = models.CharField(max_length=200, db_index=True, help_text="URL name of the view.")
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField(help_text="Time spent below the profiling middleware.")
+    sample_count = models.PositiveIntegerField()
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    file_name = models.CharField(max_length=100, unique=True, help_text="Profile file in PROFILING_DIR.")
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
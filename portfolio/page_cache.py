@@ -0,0 +1,339 @@
+# portfolio/page_cache.py
+"""
+Full-page cache for anonymous GET requests.
+
+``PageCacheMiddleware`` stores the HTML of successful anonymous responses in
+Django's cache, keyed on host, path and the normalised query string (sorted,
+tracking parameters dropped). Pages that used a CSRF token, set cookies,
+showed messages or opted out with ``Cache-Control: private/no-cache/no-store``
+are never stored, and authenticated visitors or visitors with pending
+messages always get a fresh render. A hit answers the stored ETag and
+Last-Modified validators itself (304 Not Modified when they match).
+
+While a page renders, its dependencies are recorded as tags:
+
+* ``table:<db_table>`` for every table read by a listing-style query,
+* ``row:<db_table>:<pk>`` for every model instance loaded and for tables
+  only read through ``get()`` lookups, plus ``rows:<db_table>``,
+* ``context:<name>`` for VersionedContextCache values used by the page.
+
+Each tag has a version number in the cache and an entry remembers the
+versions it was built with. ``post_save``/``post_delete``/``m2m_changed``
+bump the tags of the changed rows and their tables, so a project edit drops
+the listing pages and that project's detail page but not other detail pages;
+bulk writes call ``purge_model`` to drop everything built from a table. As
+with the context cache, nothing read inside an open transaction is stored,
+and entries expire after ``settings.PAGE_CACHE_TIMEOUT`` seconds so that
+per-process cache backends cannot serve stale pages for long.
+"""
+import contextvars
+from contextlib import contextmanager
+import hashlib
+import logging
+import re
+import time
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300
+IGNORED_QUERY_PARAMS = ('utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid')
+IGNORED_APPS = ('admin', 'auth', 'contenttypes', 'migrations', 'sessions') # Writes here never change anonymous pages
+IGNORED_MODELS = ('portfolio.requestprofile',) # Nor here (profiles are only shown in the admin)
+MAX_ROW_TAGS_PER_TABLE = 25 # Beyond this a page depends on the whole table instead
+UNCACHEABLE_DIRECTIVES = ('private', 'no-cache', 'no-store', 'max-age=0')
+SKIPPED_HEADERS = ('set-cookie', 'vary', 'content-length')
+
+TABLE_RE = re.compile(r'\b(?:FROM|JOIN)\s+[`"]?(\w+)[`"]?', re.IGNORECASE)
+GET_LOOKUP_RE = re.compile(r'\bLIMIT 21\s*$') # QuerySet.get() caps its query at MAX_GET_RESULTS rows
+GENERATION_KEY = 'page_cache:generation'
+
+_recorder = contextvars.ContextVar('page_cache_recorder', default=None)
+
+
+def enabled():
+    return getattr(settings, 'PAGE_CACHE_ENABLED', False)
+
+
+def timeout():
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+
+
+def table_tag(table):
+    return f"table:{table}"
+
+
+def rows_tag(table):
+    return f"rows:{table}"
+
+
+def row_tag(table, pk):
+    return f"row:{table}:{pk}"
+
+
+def _tag_key(tag):
+    return f"page_cache:tag:{hashlib.sha1(tag.encode('utf-8')).hexdigest()}"
+
+
+# --- Dependency recording ---
+
+class DependencyRecorder:
+    """ Collects the tags of one page render from the SQL it runs and the instances it loads. """
+
+    def __init__(self):
+        self.tables = set()
+        self.rows = {} # db_table -> {pk, ...}
+        self.tags = set()
+        self.paused = 0
+        self._pending_get = None # primary table of the last get() lookup, until it yields an instance
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.paused:
+            return execute(sql, params, many, context)
+        self._close_get()
+        tables = TABLE_RE.findall(sql)
+        if tables and GET_LOOKUP_RE.search(sql):
+            # A single-row lookup only depends on the row it returns (tagged via post_init)
+            self._pending_get = tables[0]
+            self.rows.setdefault(tables[0], set())
+        else:
+            self.tables.update(tables)
+        return execute(sql, params, many, context)
+
+    def _close_get(self):
+        if self._pending_get is not None:
+            # The lookup returned nothing: a later insert could change the page
+            self.tables.add(self._pending_get)
+            self._pending_get = None
+
+    def instance_loaded(self, instance):
+        if self.paused:
+            return
+        table = instance._meta.db_table
+        if table == self._pending_get:
+            self._pending_get = None
+        if instance.pk is not None:
+            self.rows.setdefault(table, set()).add(instance.pk)
+
+    def all_tags(self):
+        self._close_get()
+        tags = set(self.tags)
+        tags.update(table_tag(table) for table in self.tables)
+        for table, pks in self.rows.items():
+            if table in self.tables:
+                continue
+            tags.add(rows_tag(table))
+            if len(pks) > MAX_ROW_TAGS_PER_TABLE:
+                tags.add(table_tag(table))
+            else:
+                tags.update(row_tag(table, pk) for pk in pks)
+        return tags
+
+
+def _on_post_init(sender, instance, **kwargs):
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.instance_loaded(instance)
+
+
+@contextmanager
+def recording():
+    """ Records the dependencies of the code run inside the block; yields the DependencyRecorder. """
+    recorder = DependencyRecorder()
+    token = _recorder.set(recorder)
+    try:
+        with connection.execute_wrapper(recorder):
+            yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+@contextmanager
+def paused():
+    """ Queries inside the block are not dependencies of the page (e.g. conditional GET validators). """
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    recorder.paused += 1
+    try:
+        yield
+    finally:
+        recorder.paused -= 1
+
+
+def add_tags(*tags):
+    """ Marks the page being rendered (if any) as depending on ``tags``. """
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.tags.update(tags)
+
+
+# --- Tag versions ---
+
+def _tag_versions(tags):
+    found = cache.get_many([_tag_key(tag) for tag in tags])
+    return {tag: found.get(_tag_key(tag), 0) for tag in tags}
+
+
+def _bump(tags):
+    for tag in tags:
+        try:
+            cache.incr(_tag_key(tag))
+        except ValueError:
+            # Missing (never purged or evicted): entries stored with version 0 must not match
+            cache.set(_tag_key(tag), int(time.time() * 1000), timeout=None)
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def purge_tags(*tags):
+    """
+    Invalidates every cached page depending on one of ``tags``. Inside a transaction
+    the purge is repeated on commit, so pages rendered in between are dropped too.
+    """
+    if not tags:
+        return
+    _bump(tags)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(tags))
+    logger.debug(f"Page cache purged: {', '.join(sorted(tags))}")
+
+
+def purge_model(model, pks=None):
+    """ For bulk writes: drops pages built from ``model``'s table (all rows, or only ``pks`` plus listings). """
+    table = model._meta.db_table
+    if pks is None:
+        purge_tags(table_tag(table), rows_tag(table))
+    else:
+        purge_tags(table_tag(table), *[row_tag(table, pk) for pk in pks])
+
+
+def _tracked(model):
+    return model._meta.app_label not in IGNORED_APPS and model._meta.label_lower not in IGNORED_MODELS
+
+
+def _on_save_or_delete(sender, instance, raw=False, **kwargs):
+    if _tracked(sender):
+        table = sender._meta.db_table
+        purge_tags(table_tag(table), row_tag(table, instance.pk))
+
+
+def _on_m2m_changed(sender, instance, action, reverse=False, model=None, pk_set=None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear') or not _tracked(type(instance)):
+        return
+    # Listings table-tag the instance's table and drop its row tags, so purge the table too
+    table = instance._meta.db_table
+    tags = [table_tag(sender._meta.db_table), table_tag(table), row_tag(table, instance.pk)]
+    if reverse and model is not None:
+        # e.g. skill.projects.add(project): the project pages change as well
+        related_table = model._meta.db_table
+        tags.append(table_tag(related_table))
+        tags.extend(row_tag(related_table, pk) for pk in pk_set or ())
+        if pk_set is None:
+            tags.append(rows_tag(related_table))
+    purge_tags(*tags)
+
+
+def connect_signals():
+    post_init.connect(_on_post_init, dispatch_uid="page_cache_post_init")
+    post_save.connect(_on_save_or_delete, dispatch_uid="page_cache_post_save")
+    post_delete.connect(_on_save_or_delete, dispatch_uid="page_cache_post_delete")
+    m2m_changed.connect(_on_m2m_changed, dispatch_uid="page_cache_m2m_changed")
+
+
+# --- Middleware ---
+
+def cache_key(request):
+    params = sorted(
+        (key, value) for key, values in request.GET.lists() if key not in IGNORED_QUERY_PARAMS for value in values
+    )
+    url = f"{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}"
+    return f"page_cache:page:{hashlib.sha256(url.encode('utf-8')).hexdigest()}"
+
+
+def _has_messages(request):
+    storage = getattr(request, '_messages', None)
+    return storage is not None and (storage.used or len(storage) > 0)
+
+
+def _is_anonymous(request):
+    user = getattr(request, 'user', None)
+    return user is None or not user.is_authenticated
+
+
+def response_is_cacheable(request, response):
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    if not response.get('Content-Type', '').startswith('text/html'):
+        return False
+    cache_control = response.get('Cache-Control', '').lower()
+    if any(directive in cache_control for directive in UNCACHEABLE_DIRECTIVES):
+        return False
+    # A CSRF token was rendered into the page (e.g. a form): it is specific to this visitor
+    return not request.META.get('CSRF_COOKIE_NEEDS_UPDATE') and not _has_messages(request)
+
+
+class PageCacheMiddleware:
+    """ Serves and stores anonymous GET pages (see the module docstring). Place after MessageMiddleware. """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def can_store(self):
+        """ Only store pages rendered outside a transaction, i.e. from committed data. """
+        return not connection.in_atomic_block
+
+    def __call__(self, request):
+        if not enabled() or request.method not in ('GET', 'HEAD') or not _is_anonymous(request) or _has_messages(request):
+            return self.get_response(request)
+        key = cache_key(request)
+        cached = cache.get(key)
+        if cached is not None and _tag_versions(cached['tags']) == cached['tags']:
+            return self._rebuild(request, cached)
+        if request.method == 'HEAD':
+            return self.get_response(request)
+
+        generation = cache.get(GENERATION_KEY)
+        with recording() as recorder:
+            response = self.get_response(request)
+        if response_is_cacheable(request, response) and self.can_store() and cache.get(GENERATION_KEY) == generation:
+            # No purge happened while rendering, so the content matches these tag versions
+            self._store(key, response, recorder.all_tags())
+            response['X-Page-Cache'] = 'MISS'
+        return response
+
+    def _store(self, key, response, tags):
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+        cache.set(key, {
+            'tags': _tag_versions(tags),
+            'status': response.status_code,
+            'headers': [(name, value) for name, value in response.items() if name.lower() not in SKIPPED_HEADERS],
+            'content': response.content,
+        }, timeout=timeout())
+
+    def _rebuild(self, request, cached):
+        response = HttpResponse(cached['content'], status=cached['status'])
+        for name, value in cached['headers']:
+            response[name] = value
+        patch_vary_headers(response, ('Cookie',))
+        # The view (and its conditional_page check) does not run on a hit: answer the validators here
+        etag = response.get('ETag')
+        last_modified = response.get('Last-Modified')
+        last_modified = last_modified and parse_http_date_safe(last_modified)
+        if etag or last_modified:
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+        response['X-Page-Cache'] = 'HIT'
+        return response
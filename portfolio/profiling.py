@@ -0,0 +1,335 @@
+# portfolio/profiling.py
+"""
+Opt-in sampling profiler for slow requests, with flame graphs in the admin.
+
+With ``settings.PROFILING_ENABLED``, ``ProfilingMiddleware`` profiles a
+request when:
+
+* it carries ``X-Profile: <token>``, a token signed with the site's secret
+  key (``make_token()``; the admin's profile list shows a current one),
+* it is picked by ``settings.PROFILING_SAMPLE_RATE`` (0 to 1), or
+* ``settings.PROFILING_SLOW_MS`` is set: every request is sampled and the
+  profile is kept only if the request took at least that long.
+
+Profiling is statistical: one background thread per process wakes every
+``settings.PROFILING_INTERVAL_MS`` milliseconds and records the call stack
+of every thread serving a profiled request (``sys._current_frames()``).
+The profiled code runs unmodified, so the overhead does not depend on how
+many calls it makes, and template rendering and Markdown filters show up
+like any other call below the view. Stacks start at the view middleware
+chain (the frames of the WSGI server are dropped).
+
+A kept profile is written to ``settings.PROFILING_DIR`` as gzip-compressed
+JSON (a table of distinct frames plus ``[frame indices, sample count]``
+per distinct stack) and indexed by a ``RequestProfile`` row with the route
+and timing metadata. Only the newest ``settings.PROFILING_MAX_PROFILES``
+are kept. The admin lists them and shows each as an SVG flame graph
+(``flame_graph_svg``).
+"""
+import gzip
+import json
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'HTTP_X_PROFILE'
+TOKEN_SALT = 'portfolio.profiling'
+TOKEN_MAX_AGE = 24 * 3600 # Seconds a signed X-Profile token stays valid
+MAX_STACK_DEPTH = 200
+
+TRIGGER_HEADER = 'header'
+TRIGGER_SAMPLE = 'sample'
+TRIGGER_SLOW = 'slow'
+
+
+def enabled():
+    return getattr(settings, 'PROFILING_ENABLED', False)
+
+
+def profile_dir():
+    return Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def make_token():
+    """ A value for the ``X-Profile`` request header, valid for TOKEN_MAX_AGE seconds. """
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign('profile')
+
+
+def token_is_valid(token):
+    try:
+        return signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=TOKEN_MAX_AGE) == 'profile'
+    except signing.BadSignature:
+        return False
+
+
+def trigger_for(request):
+    """ Why ``request`` should be profiled (a TRIGGER_* value), or None. """
+    token = request.META.get(HEADER)
+    if token and token_is_valid(token):
+        return TRIGGER_HEADER
+    rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+    if rate and random.random() < rate:
+        return TRIGGER_SAMPLE
+    if getattr(settings, 'PROFILING_SLOW_MS', None):
+        return TRIGGER_SLOW
+    return None
+
+
+# --- Sampling ---
+
+class StackCollector:
+    """ Sample counts per distinct call stack of one thread, below the frame running ``root_code``. """
+
+    def __init__(self, root_code):
+        self.root_code = root_code
+        self.stacks = Counter() # (code, ...) root first -> samples
+        self.samples = 0
+
+    def add(self, frame):
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            if frame.f_code is self.root_code:
+                break
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def profile(self):
+        """ {'frames': [[function, file, line], ...], 'stacks': [[[frame index, ...], samples], ...]} """
+        frames, index = [], {}
+        stacks = []
+        for stack, count in self.stacks.most_common():
+            indices = []
+            for code in stack:
+                if code not in index:
+                    index[code] = len(frames)
+                    frames.append([getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno])
+                indices.append(index[code])
+            stacks.append([indices, count])
+        return {'frames': frames, 'stacks': stacks}
+
+
+class Sampler:
+    """ One daemon thread per process, sampling the threads registered with ``start()``. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = {} # thread ident -> StackCollector
+        self._wake = threading.Event()
+        self._thread = None
+
+    def interval(self):
+        return max(1, getattr(settings, 'PROFILING_INTERVAL_MS', 5)) / 1000
+
+    def start(self, collector):
+        with self._lock:
+            self._active[threading.get_ident()] = collector
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self):
+        """ Unregisters the current thread; waits for a sample in progress, so the collector is no longer written to. """
+        with self._lock:
+            self._active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                idle = not self._active
+                if idle:
+                    self._wake.clear()
+            if idle:
+                self._wake.wait()
+                continue
+            time.sleep(self.interval())
+            # Sample under the lock: only threads still registered, each still inside its root frame
+            with self._lock:
+                frames = sys._current_frames()
+                for ident, collector in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        collector.add(frame)
+                del frames
+
+
+sampler = Sampler()
+
+
+# --- Storage ---
+
+def save_profile(request, response, trigger, duration_ms, collector):
+    """ Writes the profile file and its RequestProfile row; returns the row. """
+    from .models import RequestProfile
+    from .request_metrics import route_name
+
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    file_name = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:12]}.json.gz"
+    route = route_name(request)
+    data = {
+        'route': route,
+        'path': request.path,
+        'method': request.method,
+        'status': response.status_code,
+        'duration_ms': duration_ms,
+        'interval_ms': sampler.interval() * 1000,
+        'trigger': trigger,
+        **collector.profile(),
+    }
+    with gzip.open(directory / file_name, 'wt', encoding='utf-8', compresslevel=6) as f:
+        json.dump(data, f, separators=(',', ':'))
+    profile = RequestProfile.objects.create(
+        method=request.method, path=request.path[:500], route=route[:200], status_code=response.status_code,
+        duration_ms=duration_ms, sample_count=collector.samples, trigger=trigger, file_name=file_name,
+    )
+    _prune()
+    return profile
+
+
+def _prune():
+    from .models import RequestProfile
+    keep = getattr(settings, 'PROFILING_MAX_PROFILES', 200)
+    stale = RequestProfile.objects.order_by('-created_at', '-pk')[keep:]
+    for profile in stale:
+        profile.delete() # The post_delete receiver removes the file
+
+
+def load_profile(file_name):
+    """ The stored profile data, or None if the file is missing or unreadable. """
+    path = profile_dir() / Path(file_name).name
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read profile {path}: {e}")
+        return None
+
+
+def delete_profile_file(file_name):
+    try:
+        (profile_dir() / Path(file_name).name).unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not delete profile file {file_name}: {e}")
+
+
+# --- Middleware ---
+
+class ProfilingMiddleware:
+    """ Profiles the requests picked by ``trigger_for`` (see the module docstring). Place near the end of MIDDLEWARE. """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not enabled():
+            return self.get_response(request)
+        trigger = trigger_for(request)
+        if trigger is None:
+            return self.get_response(request)
+        collector = StackCollector(ProfilingMiddleware.__call__.__code__)
+        started = time.perf_counter()
+        sampler.start(collector)
+        try:
+            response = self.get_response(request)
+        finally:
+            sampler.stop()
+        duration_ms = (time.perf_counter() - started) * 1000
+        if trigger == TRIGGER_SLOW and duration_ms < settings.PROFILING_SLOW_MS:
+            return response
+        if not collector.samples:
+            return response
+        try:
+            save_profile(request, response, trigger, duration_ms, collector)
+        except Exception as e:
+            logger.error(f"Could not save request profile for {request.path}: {e}", exc_info=True)
+        return response
+
+
+# --- Flame graph ---
+
+FLAME_WIDTH = 1200
+FLAME_ROW_HEIGHT = 17
+FLAME_MIN_WIDTH = 0.5 # Narrower frames are not drawn
+PROJECT_APPS = ('portfolio', 'blog', 'demos', 'skills', 'topics', 'recommendations', 'accounts')
+
+
+def _frame_label(frame):
+    function, filename, line = frame
+    parts = Path(filename).parts
+    short = "/".join(parts[-2:]) if len(parts) > 1 else filename
+    return f"{function} ({short}:{line})", parts
+
+
+def _frame_colour(parts, label):
+    if any(app in parts for app in PROJECT_APPS) and 'site-packages' not in parts:
+        hue = 20 # Project code: orange
+    elif 'django' in parts:
+        hue = 200 # Django: blue
+    else:
+        hue = 45 # Everything else: yellow
+    shade = sum(label.encode('utf-8')) % 20
+    return f"hsl({hue}, 70%, {55 + shade}%)"
+
+
+def _tree(profile):
+    root = {'children': {}, 'count': 0}
+    for indices, count in profile['stacks']:
+        root['count'] += count
+        node = root
+        for index in indices:
+            node = node['children'].setdefault(index, {'children': {}, 'count': 0})
+            node['count'] += count
+    return root
+
+
+def flame_graph_svg(profile):
+    """ SVG flame graph (callers on top, callees below) of a stored profile. """
+    frames = profile['frames']
+    root = _tree(profile)
+    total = root['count']
+    if not total:
+        return '<p>No samples were recorded.</p>'
+    interval = profile.get('interval_ms') or 1
+    rects = []
+    max_depth = 0
+    pending = [(root, 0, 0.0)]
+    while pending:
+        node, depth, x = pending.pop()
+        offset = x
+        for index, child in sorted(node['children'].items(), key=lambda item: -item[1]['count']):
+            width = child['count'] / total * FLAME_WIDTH
+            if width >= FLAME_MIN_WIDTH:
+                label, parts = _frame_label(frames[index])
+                y = depth * FLAME_ROW_HEIGHT
+                share = child['count'] / total * 100
+                text = escape(label[:int(width // 7)]) if width > 30 else ''
+                rects.append(
+                    f'<g><title>{escape(label)}: {child["count"]} samples, ~{child["count"] * interval:.0f} ms ({share:.1f}%)</title>'
+                    f'<rect x="{offset:.1f}" y="{y}" width="{width:.1f}" height="{FLAME_ROW_HEIGHT - 1}" '
+                    f'fill="{_frame_colour(parts, label)}" rx="2"/>'
+                    + (f'<text x="{offset + 3:.1f}" y="{y + FLAME_ROW_HEIGHT - 5}">{text}</text>' if text else '')
+                    + '</g>'
+                )
+                max_depth = max(max_depth, depth + 1)
+                pending.append((child, depth + 1, offset))
+            offset += width
+    height = max_depth * FLAME_ROW_HEIGHT
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="100%" viewBox="0 0 {FLAME_WIDTH} {height}" '
+        f'style="font: 11px monospace; max-width: {FLAME_WIDTH}px">{"".join(rects)}</svg>'
+    )
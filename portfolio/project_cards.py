@@ -0,0 +1,84 @@
+# portfolio/project_cards.py
+"""
+Builds the ``ProjectCard`` read model used by the project listing pages.
+
+A card holds everything a listing shows beyond the Project's own columns: a
+plain-text excerpt of the rendered description, the first few skills, the
+skill count and the topics. Cards are rebuilt from signals (project saves,
+skill/topic M2M changes, skill and topic edits) and by the bulk importer,
+which bypasses signals. ``attach_cards`` builds any card that is still
+missing when a listing is rendered, so pages never depend on a backfill.
+"""
+import html
+import logging
+
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+from . import page_cache
+from .models import Project, ProjectCard
+
+logger = logging.getLogger(__name__)
+
+CARD_SKILLS = 4 # Skills stored per card; templates show at most this many
+EXCERPT_WORDS = 60 # Longer than any listing's truncatewords
+CARD_FIELDS = ['excerpt', 'skills', 'skill_count', 'topics']
+
+
+def card_values(project):
+    """ Card field values for a project (use a project with skills/topics prefetched). """
+    text = html.unescape(strip_tags(project.rendered_html('description'))).strip()
+    skills = list(project.skills.all()) if hasattr(project, 'skills') else []
+    topics = list(project.topics.all()) if hasattr(project, 'topics') else []
+    return {
+        'excerpt': Truncator(text).words(EXCERPT_WORDS),
+        'skills': [{'name': skill.name, 'slug': skill.slug} for skill in skills[:CARD_SKILLS]],
+        'skill_count': len(skills),
+        'topics': [{'name': topic.name, 'slug': topic.slug} for topic in topics],
+    }
+
+
+def _prefetched(queryset):
+    related = [name for name in ('skills', 'topics') if hasattr(Project, name)]
+    return queryset.prefetch_related(*related)
+
+
+def _write_cards(projects, batch_size=200):
+    cards = [ProjectCard(project=project, **card_values(project)) for project in projects]
+    if cards:
+        ProjectCard.objects.bulk_create(
+            cards, batch_size=batch_size,
+            update_conflicts=True, unique_fields=['project'], update_fields=CARD_FIELDS + ['updated_at'],
+        )
+        # bulk_create sends no post_save: drop the pages showing these cards
+        page_cache.purge_model(ProjectCard, [card.project_id for card in cards])
+    return cards
+
+
+def rebuild_project_cards(project_ids=None, batch_size=200):
+    """ Rebuilds the cards of the given projects (all projects if None). Returns the number written. """
+    queryset = Project.objects.all()
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return 0
+        queryset = queryset.filter(pk__in=project_ids)
+    written = 0
+    projects = list(_prefetched(queryset))
+    for start in range(0, len(projects), batch_size):
+        written += len(_write_cards(projects[start:start + batch_size], batch_size))
+    return written
+
+
+def attach_cards(projects):
+    """
+    Evaluates a ``select_related('card')`` queryset and builds the cards that do
+    not exist yet on its cached instances. Returns the same queryset, so views
+    can still pass it to templates (and callers can use count()/exists()).
+    """
+    missing = {project.pk: project for project in projects if not hasattr(project, 'card')}
+    if missing:
+        logger.info(f"Building {len(missing)} missing project card(s).")
+        for card in _write_cards(_prefetched(Project.objects.filter(pk__in=missing))):
+            missing[card.project_id].card = card
+    return projects
@@ -0,0 +1,454 @@
+# portfolio/request_metrics.py
+"""
+Per-request performance instrumentation: Server-Timing headers and
+Prometheus histograms.
+
+``RequestMetricsMiddleware`` (first in MIDDLEWARE) times every request and
+``ViewTimingMiddleware`` (last) the view, including URL resolution and the
+rendering of template responses. While the request runs:
+
+* every query on the default connection is counted and timed through
+  ``connection.execute_wrapper``,
+* ``TimedDjangoTemplates`` (the template backend) times the top-level
+  template renders and, separately, each context processor.
+
+The phases overlap: ``db`` includes the queries run while templates render
+(lazy querysets), and ``tpl`` excludes the context processors. The timings
+are sent to staff users, and to everyone with
+``settings.SERVER_TIMING_ENABLED`` (development), in a ``Server-Timing``
+header (``db``, ``cp``, ``tpl``, ``view``, ``total``), which browser
+developer tools show next to the request.
+
+Every request is also added to per-route histograms (the route is the URL
+name, so the number of series stays bounded). Each process accumulates its
+own in memory and writes them, at most every ``FLUSH_INTERVAL`` seconds, to
+its own file under ``settings.METRICS_DIR`` (atomically, with a rename), so
+gunicorn workers never write to the same file. ``metrics_view`` (``/metrics``)
+adds up the files of all workers and answers in the Prometheus text format;
+it is open to staff users and to requests bearing ``settings.METRICS_TOKEN``.
+On each scrape the files of workers that exited are folded into
+``RETIRED_FILE`` (under a file lock), so counts never go backwards and the
+directory does not grow as gunicorn recycles workers.
+"""
+import contextvars
+import functools
+import hmac
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.template.exceptions import TemplateDoesNotExist
+from django.urls import Resolver404, resolve
+from django.views.decorators.cache import never_cache
+
+try:
+    import fcntl
+except ImportError: # Windows: files of exited workers are not folded together
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 5.0 # Seconds between writes of this process's metrics file
+FILE_PREFIX = 'metrics-'
+RETIRED_FILE = 'metrics-retired.json' # Metrics of exited workers, added up
+UNMATCHED_ROUTE = '<unmatched>'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_timings = contextvars.ContextVar('request_metrics_timings', default=None)
+
+
+def enabled():
+    return getattr(settings, 'REQUEST_METRICS_ENABLED', True)
+
+
+def server_timing_enabled(request):
+    """ Timings reveal query counts and durations: only staff get them unless SERVER_TIMING_ENABLED. """
+    if getattr(settings, 'SERVER_TIMING_ENABLED', False):
+        return True
+    user = getattr(request, 'user', None)
+    return user is not None and user.is_staff
+
+
+# --- Per-request timings ---
+
+class RequestTimings:
+    """ Durations (seconds) and query count of one request. """
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.context_processors = 0.0
+        self.template = 0.0
+        self.view = None # None when no view ran (e.g. a page cache hit)
+        self.total = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self):
+        metrics = [
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f'cp;dur={self.context_processors * 1000:.1f};desc="Context processors"',
+            f'tpl;dur={self.template * 1000:.1f};desc="Templates"',
+        ]
+        if self.view is not None:
+            metrics.append(f'view;dur={self.view * 1000:.1f};desc="View"')
+        metrics.append(f'total;dur={self.total * 1000:.1f};desc="Total"')
+        return ", ".join(metrics)
+
+
+def _timed_processor(processor):
+    @functools.wraps(processor)
+    def timed(request):
+        timings = _timings.get()
+        if timings is None:
+            return processor(request)
+        started = time.perf_counter()
+        try:
+            return processor(request)
+        finally:
+            timings.context_processors += time.perf_counter() - started
+    return timed
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _timings.get()
+        if timings is None or timings.template_depth:
+            return super().render(context, request)
+        timings.template_depth += 1
+        started = time.perf_counter()
+        context_processors = timings.context_processors
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_depth -= 1
+            elapsed = time.perf_counter() - started
+            timings.template += elapsed - (timings.context_processors - context_processors)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """ The Django template backend, with render and context processor timing for ``RequestMetricsMiddleware``. """
+
+    def __init__(self, params):
+        super().__init__(params)
+        # Engine.template_context_processors is a cached_property: replace its value with timed wrappers
+        self.engine.__dict__['template_context_processors'] = tuple(
+            _timed_processor(processor) for processor in self.engine.template_context_processors
+        )
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+# --- Histograms and the multi-process store ---
+
+Histogram = namedtuple('Histogram', 'name help buckets value')
+
+HISTOGRAMS = (
+    Histogram('portfolio_request_duration_seconds', "Time spent on the request, middleware included.",
+              DURATION_BUCKETS, lambda timings: timings.total),
+    Histogram('portfolio_view_duration_seconds', "Time spent in the view, template response rendering included.",
+              DURATION_BUCKETS, lambda timings: timings.view),
+    Histogram('portfolio_template_duration_seconds', "Time spent rendering templates, context processors excluded.",
+              DURATION_BUCKETS, lambda timings: timings.template),
+    Histogram('portfolio_context_processor_duration_seconds', "Time spent in template context processors.",
+              DURATION_BUCKETS, lambda timings: timings.context_processors),
+    Histogram('portfolio_db_duration_seconds', "Time spent executing database queries.",
+              DURATION_BUCKETS, lambda timings: timings.db),
+    Histogram('portfolio_db_queries', "Database queries per request.",
+              QUERY_BUCKETS, lambda timings: timings.queries),
+)
+REQUESTS_COUNTER = 'portfolio_requests_total'
+
+
+def metrics_dir():
+    return Path(getattr(settings, 'METRICS_DIR', None) or Path(tempfile.gettempdir()) / 'portfolio-metrics')
+
+
+def _worker_pid(path):
+    """ The process id in a worker's file name, or None (e.g. RETIRED_FILE). """
+    pid = path.name[len(FILE_PREFIX):-len('.json')]
+    return int(pid) if pid.isdigit() else None
+
+
+def _process_exited(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError: # e.g. PermissionError: it exists, as another user
+        return False
+    return False
+
+
+def _read_snapshot(path):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Skipping unreadable metrics file {path}: {e}")
+        return None
+
+
+def _write_snapshot(path, snapshot):
+    """ Atomic write (temporary file and rename) of a metrics file. """
+    tmp_path = path.parent / f".{path.name}.{os.getpid()}.tmp"
+    tmp_path.write_text(json.dumps(snapshot), encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def _add_up(snapshots):
+    """ ({(metric, route): series}, {(route, method, status): count}) summed over ``snapshots``. """
+    histograms, requests = {}, {}
+    for snapshot in snapshots:
+        for metric, route, series in snapshot.get('histograms', []):
+            total = histograms.setdefault((metric, route), [0] * len(series))
+            if len(total) == len(series): # Bucket layout changed between deploys otherwise
+                histograms[(metric, route)] = [a + b for a, b in zip(total, series)]
+        for route, method, status, count in snapshot.get('requests', []):
+            requests[(route, method, status)] = requests.get((route, method, status), 0) + count
+    return histograms, requests
+
+
+@contextmanager
+def _file_lock(directory):
+    with open(directory / ".lock", "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class MetricsStore:
+    """ This process's histograms and request counts, persisted to its own file (see the module docstring). """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {} # (metric, route) -> [count per bucket..., count above the last bucket, sum]
+        self._requests = {} # (route, method, status) -> count
+        self._next_flush = 0.0
+        self._dirty = False
+
+    def record(self, route, method, status, timings):
+        with self._lock:
+            for histogram in HISTOGRAMS:
+                value = histogram.value(timings)
+                if value is None:
+                    continue
+                series = self._histograms.setdefault(
+                    (histogram.name, route), [0] * (len(histogram.buckets) + 1) + [0.0]
+                )
+                index = next((i for i, bound in enumerate(histogram.buckets) if value <= bound), len(histogram.buckets))
+                series[index] += 1
+                series[-1] += value
+            key = (route, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._dirty = True
+        if time.monotonic() >= self._next_flush:
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'histograms': [[metric, route, list(series)] for (metric, route), series in self._histograms.items()],
+                'requests': [[route, method, status, count] for (route, method, status), count in self._requests.items()],
+            }
+
+    def flush(self):
+        """ Writes this process's metrics file (if anything changed since the last write). """
+        self._next_flush = time.monotonic() + FLUSH_INTERVAL
+        if not self._dirty:
+            return
+        self._dirty = False
+        directory = metrics_dir()
+        target = directory / f"{FILE_PREFIX}{os.getpid()}.json"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            _write_snapshot(target, self.snapshot())
+        except OSError as e:
+            logger.warning(f"Could not write request metrics to {target}: {e}")
+
+    def reset(self):
+        """ Drops this process's metrics (tests). """
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+            self._dirty = True
+
+    def collect(self):
+        """ The metrics of every process that wrote a file, added up (this process's are flushed first). """
+        self.flush()
+        directory = metrics_dir()
+        snapshots, paths = [], []
+        try:
+            with _file_lock(directory):
+                retire_exited_workers(directory)
+                paths = sorted(directory.glob(f"{FILE_PREFIX}*.json"))
+                snapshots = [snapshot for snapshot in map(_read_snapshot, paths) if snapshot is not None]
+        except OSError as e:
+            logger.warning(f"Could not read request metrics from {directory}: {e}")
+        if not any(path.name == f"{FILE_PREFIX}{os.getpid()}.json" for path in paths):
+            snapshots.append(self.snapshot()) # The directory is not writable: at least this process's
+        return _add_up(snapshots)
+
+
+store = MetricsStore()
+
+
+def retire_exited_workers(directory):
+    """ Folds the files of exited processes into RETIRED_FILE. Call with the file lock held. """
+    if fcntl is None: # Without the lock two scrapes could fold the same file twice
+        return
+    exited = [path for path in directory.glob(f"{FILE_PREFIX}*.json")
+              if _worker_pid(path) not in (None, os.getpid()) and _process_exited(_worker_pid(path))]
+    if not exited:
+        return
+    retired_path = directory / RETIRED_FILE
+    paths = [retired_path, *exited] if retired_path.exists() else exited
+    snapshots = [snapshot for snapshot in map(_read_snapshot, paths) if snapshot is not None]
+    histograms, requests = _add_up(snapshots)
+    _write_snapshot(retired_path, {
+        'histograms': [[metric, route, series] for (metric, route), series in histograms.items()],
+        'requests': [[route, method, status, count] for (route, method, status), count in requests.items()],
+    })
+    for path in exited:
+        path.unlink(missing_ok=True)
+
+
+# --- Prometheus text format ---
+
+def _label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(histograms, requests):
+    lines = [
+        f"# HELP {REQUESTS_COUNTER} Requests served, by route, method and status.",
+        f"# TYPE {REQUESTS_COUNTER} counter",
+    ]
+    for (route, method, status), count in sorted(requests.items()):
+        lines.append(f'{REQUESTS_COUNTER}{{route="{_label(route)}",method="{_label(method)}",status="{_label(status)}"}} {count}')
+    for histogram in HISTOGRAMS:
+        lines.append(f"# HELP {histogram.name} {histogram.help}")
+        lines.append(f"# TYPE {histogram.name} histogram")
+        for (metric, route), series in sorted(histograms.items()):
+            if metric != histogram.name or len(series) != len(histogram.buckets) + 2:
+                continue
+            route = _label(route)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, series):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{route="{route}",le="{_number(float(bound))}"}} {cumulative}')
+            count = cumulative + series[-2]
+            lines.append(f'{metric}_bucket{{route="{route}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{route="{route}"}} {_number(float(series[-1]))}')
+            lines.append(f'{metric}_count{{route="{route}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+# --- Middleware and view ---
+
+def route_name(request):
+    """ The URL name of the request's route (resolved here for responses served before the URLconf ran). """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return UNMATCHED_ROUTE
+    return match.view_name or match.route or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """ Times requests (see the module docstring). Place first in MIDDLEWARE so that everything is included. """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not enabled():
+            return self.get_response(request)
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(timings):
+                response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        timings.total = time.perf_counter() - started
+        if server_timing_enabled(request):
+            response['Server-Timing'] = timings.server_timing()
+        try:
+            store.record(route_name(request), request.method, response.status_code, timings)
+        except Exception as e:
+            logger.error(f"Could not record request metrics: {e}", exc_info=True)
+        return response
+
+
+class ViewTimingMiddleware:
+    """ Times the view for ``RequestMetricsMiddleware``. Place last in MIDDLEWARE. """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = _timings.get()
+        if timings is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            timings.view = time.perf_counter() - started
+
+
+def _authorized(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(token) and header.startswith('Bearer ') and hmac.compare_digest(header[len('Bearer '):], token)
+
+
+@never_cache
+def metrics_view(request):
+    """ Prometheus scrape endpoint for staff users or ``Authorization: Bearer <METRICS_TOKEN>``. """
+    if not _authorized(request):
+        response = HttpResponse("Authentication required.\n", status=401, content_type='text/plain')
+        response['WWW-Authenticate'] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(render_prometheus(*store.collect()), content_type=CONTENT_TYPE)
@@ -0,0 +1,694 @@
+# portfolio/search_index.py
+"""
+In-process full-text search over projects, skills, topics, blog posts, demos
+and recommendations, ranked with BM25.
+
+Documents are tokenized into an inverted index (term -> postings of document
+and weighted term frequency; title words count ``TITLE_WEIGHT`` times). The
+index is persisted as a compact snapshot under ``settings.SEARCH_INDEX_DIR``:
+a versioned directory of ``.npy`` arrays (memory-mapped by every worker that
+loads it) plus a ``CURRENT`` pointer file naming the latest version.
+
+Model signals update the local process immediately through an overlay on
+top of the immutable snapshot (changed documents are hidden in the snapshot
+and re-added to the overlay). When the transaction commits, the changed
+documents are re-read from the database and appended, under a file lock, to
+the snapshot's change log (``CHANGES_FILE``, one JSON line per commit);
+other workers replay the new lines into their overlay the next time they
+search. Once the log holds more than ``COMPACT_MIN_CHANGES`` changes and
+``COMPACT_FRACTION`` of the snapshot's documents, it is merged into a new
+snapshot (``rebuild_search_index --compact`` does so on demand), so a
+single save costs the size of the changed documents, not of the corpus.
+A snapshot that is missing or was built from another database is rebuilt
+from the database on first use.
+
+Query terms are ANDed; each term also matches indexed words it is a prefix
+of, at a lower weight, so partial words still find results.
+"""
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.html import strip_tags
+
+try:
+    import fcntl
+except ImportError: # Windows: snapshot writes are not serialised across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 3
+PREFIX_WEIGHT = 0.5 # Weight of an indexed word matched only by prefix
+MAX_PREFIX_EXPANSIONS = 50
+CHECK_INTERVAL = 1.0 # Seconds between checks for a newer snapshot
+KEEP_VERSIONS = 2
+CHANGES_FILE = "changes.jsonl"
+COMPACT_MIN_CHANGES = 100 # Logged changes before the log is merged into a new snapshot...
+COMPACT_FRACTION = 0.1 # ...and as a share of the snapshot's documents
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or that the their this to was were "
+    "will with".split()
+)
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+# --- Document sources ---
+
+class SearchSource:
+    """ How one model is turned into search documents (``title`` and ``body`` text). """
+
+    def __init__(self, doc_type, model_label, document, related=(), published=None):
+        self.doc_type = doc_type
+        self.model_label = model_label
+        self.document = document
+        self.related = related # prefetch_related lookups used by ``document``
+        self.published = published or {} # filter kwargs for indexable rows
+
+    @property
+    def model(self):
+        try:
+            return apps.get_model(self.model_label)
+        except LookupError:
+            return None
+
+    def queryset(self):
+        queryset = self.model.objects.filter(**self.published)
+        if self.related:
+            queryset = queryset.prefetch_related(*self.related)
+        return queryset
+
+
+def _text(*parts):
+    return " ".join(strip_tags(str(part)) for part in parts if part)
+
+
+def _project_document(project):
+    names = [skill.name for skill in project.skills.all()] if hasattr(project, 'skills') else []
+    names += [topic.name for topic in project.topics.all()] if hasattr(project, 'topics') else []
+    body = _text(project.description, project.long_description_markdown, project.results_metrics,
+                 project.challenges, project.lessons_learned, *names)
+    return project.title, body
+
+
+def _skill_document(skill):
+    return skill.name, _text(skill.description, skill.category.name if skill.category else "")
+
+
+def _topic_document(topic):
+    return topic.name, _text(topic.description)
+
+
+def _blogpost_document(post):
+    return post.title, _text(post.content)
+
+
+def _demo_document(demo):
+    sections = [(section.section_title, section.section_content_markdown, section.code_snippet_explanation)
+                for section in demo.sections.all()]
+    return demo.title, _text(demo.description, demo.meta_keywords, *[part for parts in sections for part in parts])
+
+
+def _recommendation_document(product):
+    sections = [(section.section_title, section.section_content_markdown) for section in product.sections.all()]
+    return product.name, _text(product.short_description, product.main_description_md, product.category,
+                               *[part for parts in sections for part in parts])
+
+
+SOURCES = {
+    'project': SearchSource('project', 'portfolio.Project', _project_document, related=('skills', 'topics')),
+    'skill': SearchSource('skill', 'skills.Skill', _skill_document, related=('category',)),
+    'topic': SearchSource('topic', 'topics.ProjectTopic', _topic_document),
+    'blogpost': SearchSource('blogpost', 'blog.BlogPost', _blogpost_document, published={'status': 'published'}),
+    'demo': SearchSource('demo', 'demos.Demo', _demo_document, related=('sections',), published={'is_published': True}),
+    'recommendation': SearchSource('recommendation', 'recommendations.RecommendedProduct', _recommendation_document, related=('sections',)),
+}
+
+
+def doc_key(doc_type, pk):
+    return f"{doc_type}:{pk}"
+
+
+def split_key(key):
+    doc_type, _, pk = key.partition(':')
+    return doc_type, int(pk)
+
+
+def term_frequencies(title, body):
+    counts = Counter(body_token for body_token in tokenize(body))
+    for token in tokenize(title):
+        counts[token] += TITLE_WEIGHT
+    return counts
+
+
+def load_documents(keys=None):
+    """
+    {doc key: term Counter} read from the database, for the given keys or for
+    everything indexable. Keys whose row is missing or unpublished map to None.
+    """
+    wanted = None
+    if keys is not None:
+        wanted = {}
+        for key in keys:
+            doc_type, pk = split_key(key)
+            wanted.setdefault(doc_type, set()).add(pk)
+    documents = {}
+    for doc_type, source in SOURCES.items():
+        if source.model is None or (wanted is not None and doc_type not in wanted):
+            continue
+        queryset = source.queryset()
+        if wanted is not None:
+            queryset = queryset.filter(pk__in=wanted[doc_type])
+            documents.update({doc_key(doc_type, pk): None for pk in wanted[doc_type]})
+        for obj in queryset:
+            documents[doc_key(doc_type, obj.pk)] = term_frequencies(*source.document(obj))
+    return documents
+
+
+# --- Compact, immutable index (one snapshot) ---
+
+class InvertedIndex:
+    """ Sorted terms with CSR-style postings: term i owns postings offsets[i]:offsets[i + 1]. """
+
+    ARRAYS = ('doc_lengths', 'offsets', 'post_docs', 'post_tfs')
+
+    def __init__(self, doc_keys, terms, doc_lengths, offsets, post_docs, post_tfs):
+        self.doc_keys = doc_keys
+        self.terms = terms
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.doc_ids = {key: i for i, key in enumerate(doc_keys)}
+        self.doc_lengths = doc_lengths
+        self.offsets = offsets
+        self.post_docs = post_docs
+        self.post_tfs = post_tfs
+
+    @classmethod
+    def build(cls, documents):
+        """ Builds an index from {doc key: term Counter}. """
+        doc_keys = sorted(documents)
+        postings = {}
+        doc_lengths = np.zeros(len(doc_keys), dtype=np.float32)
+        for doc_id, key in enumerate(doc_keys):
+            counts = documents[key]
+            doc_lengths[doc_id] = sum(counts.values())
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append((doc_id, tf))
+        terms = sorted(postings)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        post_docs, post_tfs = [], []
+        for i, term in enumerate(terms):
+            entries = postings[term]
+            offsets[i + 1] = offsets[i] + len(entries)
+            post_docs.extend(doc_id for doc_id, _ in entries)
+            post_tfs.extend(tf for _, tf in entries)
+        return cls(doc_keys, terms, doc_lengths, offsets,
+                   np.asarray(post_docs, dtype=np.int32), np.asarray(post_tfs, dtype=np.float32))
+
+    @classmethod
+    def empty(cls):
+        return cls.build({})
+
+    def postings(self, term):
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return None, None
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.post_docs[start:end], self.post_tfs[start:end]
+
+    def documents(self, skip=()):
+        """ Rebuilds {doc key: term Counter} (used when merging changes into a new snapshot). """
+        documents = {key: Counter() for doc_id, key in enumerate(self.doc_keys) if doc_id not in skip}
+        for term_id, term in enumerate(self.terms):
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            for doc_id, tf in zip(self.post_docs[start:end].tolist(), self.post_tfs[start:end].tolist()):
+                if doc_id not in skip:
+                    documents[self.doc_keys[doc_id]][term] = tf
+        return documents
+
+    def save(self, directory, meta):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        with open(directory / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(dict(meta, doc_keys=self.doc_keys, terms=self.terms), f)
+
+    @classmethod
+    def load(cls, directory):
+        directory = Path(directory)
+        with open(directory / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in cls.ARRAYS}
+        return cls(meta.pop("doc_keys"), meta.pop("terms"), **arrays), meta
+
+
+# --- Live index: snapshot + in-process overlay ---
+
+def _database_id():
+    """ Identifies the database a snapshot was built from (e.g. to ignore snapshots during tests). """
+    db = connection.settings_dict
+    return f"{db['ENGINE']}:{db.get('HOST') or ''}:{db['NAME']}"
+
+
+class SearchIndex:
+    def __init__(self, directory=None):
+        self._directory = directory # overrides settings.SEARCH_INDEX_DIR (e.g. for benchmarks)
+        self._lock = threading.RLock()
+        self._base = None
+        self._version = None
+        self._rejected = None # snapshot version built from another database
+        self._next_check = 0.0
+        self.generation = 0 # bumped whenever the visible documents may have changed
+        self._reset_overlay()
+        self._pending = set()
+
+    def _reset_overlay(self):
+        self.generation += 1
+        self._hidden = set() # snapshot doc ids replaced or removed locally
+        self._overlay = {} # doc key -> term Counter
+        self._overlay_postings = {} # term -> {doc key: tf}
+        self._changes_offset = 0 # bytes of the snapshot's change log applied
+        self._change_count = 0 # changes in the log up to that offset
+
+    @property
+    def directory(self):
+        root = self._directory or getattr(settings, 'SEARCH_INDEX_DIR', None)
+        return Path(root) if root else Path(settings.BASE_DIR) / 'search_index'
+
+    # --- Snapshot handling ---
+
+    def _current_version(self):
+        try:
+            return (self.directory / "CURRENT").read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    @contextmanager
+    def _file_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_snapshot(self, version):
+        """ Loads (memory-maps) a snapshot version; returns False if it is unusable here. """
+        try:
+            base, meta = InvertedIndex.load(self.directory / version)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not load search index snapshot '{version}': {e}")
+            return False
+        if meta.get("database") != _database_id():
+            self._rejected = version
+            return False
+        self._base, self._version = base, version
+        self._reset_overlay()
+        self._read_changes()
+        return True
+
+    def _write_snapshot(self, index):
+        """ Writes a new snapshot version and points CURRENT at it. Call with the file lock held. """
+        version = f"v{time.time_ns()}"
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp-"))
+        try:
+            index.save(tmp_dir, {"database": _database_id()})
+            os.replace(tmp_dir, self.directory / version)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        pointer = self.directory / ".CURRENT.tmp"
+        pointer.write_text(version, encoding="utf-8")
+        os.replace(pointer, self.directory / "CURRENT")
+        for old in sorted(self.directory.glob("v*"), reverse=True)[KEEP_VERSIONS:]:
+            # Workers that still map an old version keep their open file handles
+            shutil.rmtree(old, ignore_errors=True)
+        return version
+
+    def _can_persist(self):
+        # Data read inside a transaction may still roll back
+        return not connection.in_atomic_block
+
+    def ensure_loaded(self):
+        """ Loads the newest snapshot (at most every CHECK_INTERVAL seconds), building one if needed. """
+        now = time.monotonic()
+        if self._base is not None and now < self._next_check:
+            return
+        with self._lock:
+            self._next_check = now + CHECK_INTERVAL
+            current = self._current_version()
+            if current and current in (self._version, self._rejected) and self._base is not None:
+                if current == self._version:
+                    self._read_changes()
+                return
+            if current and current != self._rejected and self._load_snapshot(current):
+                return
+            if self._base is None:
+                self.rebuild(persist=self._can_persist())
+
+    def rebuild(self, persist=True):
+        """ Indexes everything from the database (and writes a snapshot if ``persist``). Returns the doc count. """
+        documents = load_documents()
+        index = InvertedIndex.build(documents)
+        with self._lock:
+            version = None
+            if persist:
+                with self._file_lock():
+                    version = self._write_snapshot(index)
+            self._base, self._version = index, version
+            self._reset_overlay()
+            self._pending.clear()
+        logger.info(f"Search index rebuilt with {len(documents)} document(s).")
+        return len(documents)
+
+    def reset(self):
+        """ Drops the in-memory index; the next search loads or rebuilds it. """
+        with self._lock:
+            self._base = self._version = None
+            self._next_check = 0.0
+            self._reset_overlay()
+            self._pending.clear()
+
+    # --- Incremental updates ---
+
+    def _remove_local(self, key):
+        base_id = self._base.doc_ids.get(key)
+        if base_id is not None:
+            self._hidden.add(base_id)
+        old = self._overlay.pop(key, None)
+        if old:
+            for term in old:
+                postings = self._overlay_postings.get(term)
+                if postings is not None:
+                    postings.pop(key, None)
+                    if not postings:
+                        del self._overlay_postings[term]
+
+    def _apply(self, documents):
+        self.generation += 1
+        for key, counts in documents.items():
+            self._remove_local(key)
+            if counts:
+                self._overlay[key] = counts
+                for term, tf in counts.items():
+                    self._overlay_postings.setdefault(term, {})[key] = tf
+
+    def reindex(self, keys):
+        """
+        Re-reads the given documents from the database into this process's index
+        and schedules merging them into the shared snapshot once the transaction commits.
+        """
+        keys = set(keys)
+        if not keys:
+            return
+        if self._base is None:
+            # Nothing loaded in this process yet: the change is still published on commit
+            with self._lock:
+                self._pending.update(keys)
+        else:
+            documents = load_documents(keys)
+            with self._lock:
+                self._apply(documents)
+                self._pending.update(keys)
+        transaction.on_commit(self.publish)
+
+    def _read_changes(self):
+        """ Replays the lines other workers appended to the current snapshot's change log since the last read. """
+        if self._version is None:
+            return
+        path = self.directory / self._version / CHANGES_FILE
+        try:
+            with open(path, "rb") as f:
+                f.seek(self._changes_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Could not read search index changes {path}: {e}")
+            return
+        end = data.rfind(b"\n") + 1 # A line still being written is read next time
+        self._changes_offset += end
+        for line in data[:end].splitlines():
+            try:
+                changes = json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable line in {path}")
+                continue
+            self._apply({key: Counter(counts) if counts else None for key, counts in changes.items()})
+            self._change_count += len(changes)
+
+    def _append_changes(self, documents):
+        """ Logs ``documents`` for the other workers. Call with the file lock held, after ``_read_changes``. """
+        line = json.dumps({key: dict(counts) if counts else None for key, counts in documents.items()},
+                          separators=(",", ":")) + "\n"
+        data = line.encode("utf-8")
+        with open(self.directory / self._version / CHANGES_FILE, "ab") as f:
+            f.write(data)
+        self._changes_offset += len(data)
+        self._change_count += len(documents)
+
+    def _compact(self):
+        """ Merges the snapshot and the change log into a new snapshot. Call with the file lock held. """
+        merged = self._base.documents(skip=self._hidden)
+        merged.update(self._overlay)
+        index = InvertedIndex.build(merged)
+        self._version = self._write_snapshot(index)
+        self._base = index
+        self._reset_overlay()
+
+    def publish(self):
+        """ Appends pending changes (re-read after commit) to the change log, compacting it past the thresholds. """
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            if not pending:
+                return
+            try:
+                with self._file_lock():
+                    current = self._current_version()
+                    if not (current and (current == self._version or self._load_snapshot(current))):
+                        # No usable snapshot yet: a full build includes the changes
+                        self._base, self._version = InvertedIndex.build(load_documents()), None
+                        self._reset_overlay()
+                        self._version = self._write_snapshot(self._base)
+                        return
+                    self._read_changes()
+                    documents = load_documents(pending)
+                    self._apply(documents)
+                    self._append_changes(documents)
+                    threshold = max(COMPACT_MIN_CHANGES, COMPACT_FRACTION * len(self._base.doc_keys))
+                    if self._change_count >= threshold:
+                        self._compact()
+            except OSError as e:
+                logger.error(f"Could not write search index changes: {e}", exc_info=True)
+
+    def compact(self):
+        """ Merges the current change log into a new snapshot; returns False if there was nothing to merge. """
+        with self._lock:
+            self.ensure_loaded()
+            with self._file_lock():
+                current = self._current_version()
+                if not (current and (current == self._version or self._load_snapshot(current))):
+                    return False
+                self._read_changes()
+                if not self._change_count:
+                    return False
+                self._compact()
+                return True
+
+    # --- Querying ---
+
+    def _stats(self):
+        base_lengths = self._base.doc_lengths
+        total = float(base_lengths.sum()) - sum(float(base_lengths[doc_id]) for doc_id in self._hidden)
+        total += sum(sum(counts.values()) for counts in self._overlay.values())
+        count = len(self._base.doc_keys) - len(self._hidden) + len(self._overlay)
+        return count, (total / count if count else 0.0)
+
+    def _expansions(self, token):
+        """ Indexed terms matching a query token: the exact term, plus longer terms it prefixes. """
+        expansions = {token: 1.0}
+        if len(token) < 2:
+            return expansions
+        terms = self._base.terms
+        i = bisect_left(terms, token)
+        while i < len(terms) and terms[i].startswith(token) and len(expansions) <= MAX_PREFIX_EXPANSIONS:
+            expansions.setdefault(terms[i], PREFIX_WEIGHT)
+            i += 1
+        for term in self._overlay_postings:
+            if term.startswith(token) and len(expansions) <= MAX_PREFIX_EXPANSIONS:
+                expansions.setdefault(term, PREFIX_WEIGHT)
+        return expansions
+
+    def _term_postings(self, term):
+        """ {doc key: tf} for a term across the snapshot (minus hidden docs) and the overlay. """
+        postings = {}
+        docs, tfs = self._base.postings(term)
+        if docs is not None:
+            for doc_id, tf in zip(docs.tolist(), tfs.tolist()):
+                if doc_id not in self._hidden:
+                    postings[self._base.doc_keys[doc_id]] = tf
+        postings.update(self._overlay_postings.get(term, {}))
+        return postings
+
+    def _doc_length(self, key):
+        counts = self._overlay.get(key)
+        if counts is not None:
+            return sum(counts.values())
+        return float(self._base.doc_lengths[self._base.doc_ids[key]])
+
+    def search(self, query, doc_types=None, limit=None):
+        """ Returns [(doc key, score), ...] best first for documents containing every query term. """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        self.ensure_loaded()
+        with self._lock:
+            count, avgdl = self._stats()
+            if not count:
+                return []
+            scores = None
+            for token in tokens:
+                token_scores = {}
+                for term, weight in self._expansions(token).items():
+                    postings = self._term_postings(term)
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, tf in postings.items():
+                        norm = K1 * (1 - B + B * self._doc_length(key) / avgdl)
+                        token_scores[key] = token_scores.get(key, 0.0) + weight * idf * tf * (K1 + 1) / (tf + norm)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {key: score + token_scores[key] for key, score in scores.items() if key in token_scores}
+                if not scores:
+                    return []
+        if doc_types is not None:
+            scores = {key: score for key, score in scores.items() if split_key(key)[0] in doc_types}
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit] if limit else ranked
+
+    def search_grouped(self, query, limit=None):
+        """ {doc type: [pk, ...]} best first, with every source's type present. """
+        grouped = {doc_type: [] for doc_type in SOURCES}
+        for key, _ in self.search(query, limit=limit):
+            doc_type, pk = split_key(key)
+            grouped[doc_type].append(pk)
+        return grouped
+
+
+search_index = SearchIndex()
+
+
+# --- Signal wiring ---
+
+def _affected_keys(instance):
+    """ Search documents whose text includes this instance. """
+    label = instance._meta.label
+    keys = []
+    for doc_type, source in SOURCES.items():
+        if source.model_label == label:
+            keys.append(doc_key(doc_type, instance.pk))
+    if label in ('skills.Skill', 'topics.ProjectTopic') and hasattr(instance, 'projects'):
+        # Project documents include their skill and topic names
+        keys += [doc_key('project', pk) for pk in instance.projects.values_list('pk', flat=True)]
+    elif label == 'skills.SkillCategory':
+        keys += [doc_key('skill', pk) for pk in instance.skills.values_list('pk', flat=True)]
+    elif label == 'demos.DemoSection' and instance.demo_id:
+        keys.append(doc_key('demo', instance.demo_id))
+    elif label == 'recommendations.RecommendationSection' and instance.recommendation_id:
+        keys.append(doc_key('recommendation', instance.recommendation_id))
+    return keys
+
+
+def affected_keys(model, pks):
+    """ Set-based ``_affected_keys`` for bulk writes: the documents including any of the rows ``pks`` of ``model``. """
+    pks = list(pks)
+    if not pks:
+        return []
+    label = model._meta.label
+    keys = [doc_key(doc_type, pk) for doc_type, source in SOURCES.items() if source.model_label == label for pk in pks]
+    if label in ('skills.Skill', 'topics.ProjectTopic') and hasattr(model, 'projects'):
+        projects = model._meta.get_field('projects')
+        project_pks = projects.related_model.objects.filter(**{f"{projects.field.name}__in": pks}).values_list('pk', flat=True)
+        keys += [doc_key('project', pk) for pk in project_pks.distinct()]
+    elif label == 'skills.SkillCategory':
+        keys += [doc_key('skill', pk) for pk in model._meta.get_field('skills').related_model.objects
+                 .filter(category__in=pks).values_list('pk', flat=True)]
+    elif label == 'demos.DemoSection':
+        keys += [doc_key('demo', pk) for pk in model.objects.filter(pk__in=pks).values_list('demo_id', flat=True).distinct()]
+    elif label == 'recommendations.RecommendationSection':
+        keys += [doc_key('recommendation', pk) for pk in model.objects.filter(pk__in=pks)
+                 .values_list('recommendation_id', flat=True).distinct()]
+    return keys
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search_index.reindex(_affected_keys(instance))
+
+
+def _on_pre_delete(sender, instance, **kwargs):
+    instance._search_keys = _affected_keys(instance)
+
+
+def _on_post_delete(sender, instance, **kwargs):
+    search_index.reindex(getattr(instance, '_search_keys', []))
+
+
+def _on_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._search_cleared_keys = [doc_key('project', pk) for pk in instance.projects.values_list('pk', flat=True)]
+    elif action == 'post_clear' and reverse:
+        search_index.reindex(getattr(instance, '_search_cleared_keys', []))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        pks = (pk_set or []) if reverse else [instance.pk]
+        search_index.reindex(doc_key('project', pk) for pk in pks)
+
+
+WATCHED_MODELS = (
+    'portfolio.Project', 'skills.Skill', 'skills.SkillCategory', 'topics.ProjectTopic', 'blog.BlogPost',
+    'demos.Demo', 'demos.DemoSection', 'recommendations.RecommendedProduct', 'recommendations.RecommendationSection',
+)
+
+
+def connect_signals():
+    from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+    for label in WATCHED_MODELS:
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            continue
+        uid = f"search_index_{label}"
+        post_save.connect(_on_save, sender=model, dispatch_uid=f"{uid}_save")
+        pre_delete.connect(_on_pre_delete, sender=model, dispatch_uid=f"{uid}_pre_delete")
+        post_delete.connect(_on_post_delete, sender=model, dispatch_uid=f"{uid}_post_delete")
+    Project = apps.get_model('portfolio.Project')
+    for field_name in ('skills', 'topics'):
+        if hasattr(Project, field_name):
+            m2m_changed.connect(_on_m2m_changed, sender=getattr(Project, field_name).through,
+                                dispatch_uid=f"search_index_project_{field_name}")
@@ -0,0 +1,116 @@
+# portfolio/search_suggest.py
+"""
+Prefix index behind the search box typeahead (``portfolio:search_suggest``).
+
+Project, demo and blog post titles plus skill and topic names are normalised
+to lowercase words and stored in one sorted array of keys. Every title is
+keyed from each of its first ``MAX_WORD_STARTS`` words ("vision transformer",
+"transformer"), so a prefix of any word finds it. A lookup is a ``bisect``
+into that array followed by a short scan, entirely in memory.
+
+The array is rebuilt lazily when ``search_index.generation`` changes, i.e.
+when this process applied a model change or loaded a newer shared search
+index snapshot; between changes suggestions never touch the database.
+"""
+import logging
+import threading
+from bisect import bisect_left
+
+from .search_index import SOURCES, TOKEN_RE, search_index
+
+logger = logging.getLogger(__name__)
+
+MAX_WORD_STARTS = 8 # Words of a title that can start a match
+MAX_SCAN = 200 # Keys examined per lookup (common prefixes stop early)
+MAX_QUERY_LENGTH = 100
+
+# Suggested content in display order: doc type -> (title field, label)
+SUGGEST_TYPES = {
+    'project': ('title', 'Project'),
+    'demo': ('title', 'Demo'),
+    'skill': ('name', 'Skill'),
+    'topic': ('name', 'Topic'),
+    'blogpost': ('title', 'Blog post'),
+}
+
+
+def normalize(text):
+    return " ".join(TOKEN_RE.findall((text or "").lower()))
+
+
+class PrefixIndex:
+    """ Sorted keys with parallel (entry, word position) arrays; entries are (label, doc type, url). """
+
+    def __init__(self, entries):
+        self.entries = entries
+        keyed = []
+        for entry_id, (label, _, _) in enumerate(entries):
+            words = normalize(label).split()
+            for position in range(min(len(words), MAX_WORD_STARTS)):
+                keyed.append((" ".join(words[position:]), entry_id, position))
+        keyed.sort()
+        self.keys = [key for key, _, _ in keyed]
+        self.entry_ids = [entry_id for _, entry_id, _ in keyed]
+        self.positions = [position for _, _, position in keyed]
+
+    def lookup(self, prefix, limit):
+        """ Entries with a word sequence starting with ``prefix``; title starts and short titles first. """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        type_order = {doc_type: i for i, doc_type in enumerate(SUGGEST_TYPES)}
+        best = {}
+        start = bisect_left(self.keys, prefix)
+        for i in range(start, min(start + MAX_SCAN, len(self.keys))):
+            if not self.keys[i].startswith(prefix):
+                break
+            entry_id = self.entry_ids[i]
+            label, doc_type, _ = self.entries[entry_id]
+            rank = (self.positions[i] > 0, type_order[doc_type], len(label), label.lower())
+            if entry_id not in best or rank < best[entry_id]:
+                best[entry_id] = rank
+        ranked = sorted(best, key=best.get)[:limit]
+        return [self.entries[entry_id] for entry_id in ranked]
+
+
+def load_entries():
+    entries = []
+    for doc_type, (title_field, _) in SUGGEST_TYPES.items():
+        source = SOURCES[doc_type]
+        if source.model is None:
+            continue
+        for obj in source.model.objects.filter(**source.published).order_by(title_field):
+            label = getattr(obj, title_field)
+            if label:
+                entries.append((label, doc_type, obj.get_absolute_url()))
+    return entries
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._generation = None
+
+    def current(self):
+        search_index.ensure_loaded()
+        generation = search_index.generation
+        if self._index is None or generation != self._generation:
+            with self._lock:
+                if self._index is None or generation != self._generation:
+                    self._index = PrefixIndex(load_entries())
+                    self._generation = generation
+        return self._index
+
+    def suggest(self, query, limit):
+        """ [{'label', 'type', 'url'}, ...] for the typed prefix. """
+        query = (query or "")[:MAX_QUERY_LENGTH]
+        if not normalize(query):
+            return []
+        return [
+            {'label': label, 'type': SUGGEST_TYPES[doc_type][1], 'url': url}
+            for label, doc_type, url in self.current().lookup(query, limit)
+        ]
+
+
+suggest_index = SuggestIndex()
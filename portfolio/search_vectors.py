@@ -0,0 +1,258 @@
+# portfolio/search_vectors.py
+"""
+PostgreSQL full-text search for ``search_results_view``.
+
+Each searchable model has a ``search_vector`` column (``SearchVectorField``)
+holding a weighted tsvector of its text: the title is weighted 'A', the
+short description 'B', long Markdown/body text 'C' and the rest 'D'.
+Projects also include the names of their skills and topics ('C'), read with
+a ``string_agg`` subquery over the link tables. The columns are backed by
+GIN indexes (created by the migrations on PostgreSQL only) and refreshed
+with a single ``UPDATE ... SET search_vector = ...`` after every save, link
+change and skill/topic rename or delete, or per batch by bulk imports and
+``update_search_vectors``.
+
+Queries use ``websearch_to_tsquery`` (quoted phrases, ``or``, ``-word``), are
+ordered by ``SearchRank`` and annotated with a ``ts_headline`` snippet.
+With ``settings.SEARCH_BACKEND = 'auto'`` this backend is used whenever the
+default database is PostgreSQL; elsewhere (SQLite in development and tests)
+search falls back to the in-process BM25 index in search_index.py.
+"""
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection
+from django.db.models import F, OuterRef, Subquery
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import mark_safe
+
+logger = logging.getLogger(__name__)
+
+# Markers ts_headline puts around matches; escaped text is then wrapped in <mark>
+HEADLINE_START = '\x02'
+HEADLINE_STOP = '\x03'
+
+
+class VectorSource:
+    """
+    A model with a ``search_vector`` column: its weighted fields, the field used for snippets
+    and ``(many-to-many field, related field, weight)`` for text of linked rows.
+    """
+
+    def __init__(self, doc_type, model_label, weighted_fields, headline_field, related_fields=()):
+        self.doc_type = doc_type
+        self.model_label = model_label
+        self.weighted_fields = weighted_fields
+        self.headline_field = headline_field
+        self.related_fields = related_fields
+
+    @property
+    def model(self):
+        try:
+            return apps.get_model(self.model_label)
+        except LookupError:
+            return None
+
+    def vector(self):
+        config = search_config()
+        fields = iter(self.weighted_fields)
+        name, weight = next(fields)
+        vector = SearchVector(name, weight=weight, config=config)
+        for name, weight in fields:
+            vector += SearchVector(name, weight=weight, config=config)
+        for m2m_field, related_field, weight in self.related_fields:
+            field = self.m2m_field(m2m_field)
+            if field is not None:
+                vector += SearchVector(_joined_related(field, related_field), weight=weight, config=config)
+        return vector
+
+    def m2m_field(self, name):
+        """ The model's many-to-many field ``name``, or None if its app is not installed. """
+        model = self.model
+        try:
+            return model._meta.get_field(name) if model is not None else None
+        except FieldDoesNotExist:
+            return None
+
+
+def _joined_related(field, related_field):
+    """ Subquery: ``related_field`` of every row linked to the outer row through ``field``, space-separated. """
+    from django.contrib.postgres.aggregates import StringAgg # Imports psycopg: PostgreSQL only
+    through = field.remote_field.through
+    source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+    return Subquery(
+        through._default_manager.filter(**{source: OuterRef('pk')})
+        .values(source)
+        .annotate(joined=StringAgg(f"{target}__{related_field}", delimiter=' '))
+        .values('joined')
+    )
+
+
+VECTOR_SOURCES = {
+    'project': VectorSource('project', 'portfolio.Project', (
+        ('title', 'A'), ('description', 'B'), ('long_description_markdown', 'C'),
+        ('results_metrics', 'D'), ('challenges', 'D'), ('lessons_learned', 'D'),
+    ), 'description', related_fields=(('skills', 'name', 'C'), ('topics', 'name', 'C'))),
+    'skill': VectorSource('skill', 'skills.Skill', (('name', 'A'), ('description', 'B')), 'description'),
+    'topic': VectorSource('topic', 'topics.ProjectTopic', (('name', 'A'), ('description', 'B')), 'description'),
+    'blogpost': VectorSource('blogpost', 'blog.BlogPost', (('title', 'A'), ('content', 'B')), 'content'),
+    'demo': VectorSource('demo', 'demos.Demo', (
+        ('title', 'A'), ('description', 'B'), ('meta_keywords', 'C'), ('meta_description', 'D'),
+    ), 'description'),
+    'recommendation': VectorSource('recommendation', 'recommendations.RecommendedProduct', (
+        ('name', 'A'), ('short_description', 'B'), ('main_description_md', 'C'), ('category', 'D'),
+    ), 'short_description'),
+}
+
+
+def search_config():
+    return getattr(settings, 'SEARCH_VECTOR_CONFIG', 'english')
+
+
+def postgres_search_enabled():
+    """ True when search should run on the stored tsvector columns rather than the in-process index. """
+    backend = getattr(settings, 'SEARCH_BACKEND', 'auto')
+    if backend == 'index':
+        return False
+    is_postgres = connection.vendor == 'postgresql'
+    if backend == 'postgres' and not is_postgres:
+        logger.warning("SEARCH_BACKEND is 'postgres' but the database is not PostgreSQL; using the search index.")
+    return is_postgres
+
+
+def _source_for(model):
+    label = model._meta.label
+    for source in VECTOR_SOURCES.values():
+        if source.model_label == label:
+            return source
+    return None
+
+
+def update_search_vectors(model, pks=None):
+    """ Recomputes ``search_vector`` for the given rows (all rows if ``pks`` is None). Returns the row count. """
+    source = _source_for(model)
+    if source is None or connection.vendor != 'postgresql':
+        return 0
+    queryset = model._default_manager.all()
+    if pks is not None:
+        queryset = queryset.filter(pk__in=list(pks))
+    return queryset.update(search_vector=source.vector())
+
+
+def ranked(queryset, doc_type, query, limit=None):
+    """
+    Filters ``queryset`` to rows matching ``query``, best ``SearchRank`` first,
+    annotated with ``search_rank`` and a ``search_headline`` snippet.
+    """
+    source = VECTOR_SOURCES[doc_type]
+    config = search_config()
+    search_query = SearchQuery(query, search_type='websearch', config=config)
+    queryset = (
+        queryset.filter(search_vector=search_query)
+        .annotate(
+            search_rank=SearchRank(F('search_vector'), search_query),
+            search_headline=SearchHeadline(
+                source.headline_field, search_query, config=config,
+                start_sel=HEADLINE_START, stop_sel=HEADLINE_STOP, highlight_all=False,
+                max_words=35, min_words=15, max_fragments=2, fragment_delimiter=' … ',
+            ),
+        )
+        .order_by('-search_rank', 'pk')
+    )
+    return queryset[:limit] if limit else queryset
+
+
+def headline_html(headline):
+    """ A ts_headline snippet as safe HTML: the text is escaped and matches are wrapped in <mark>. """
+    if not headline:
+        return ''
+    text = escape(strip_tags(headline))
+    return mark_safe(text.replace(HEADLINE_START, '<mark>').replace(HEADLINE_STOP, '</mark>'))
+
+
+# --- Signal wiring ---
+
+def _on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and set(update_fields) <= {'search_vector'}):
+        return
+    update_search_vectors(sender, [instance.pk])
+
+
+def _on_m2m_changed(sender, instance, action, reverse, pk_set, model, **kwargs):
+    """ Links changed: from the vector's side (``instance`` is e.g. a project) or from the skill/topic side. """
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    source_model = model if reverse else type(instance)
+    if not reverse:
+        if action != 'pre_clear':
+            update_search_vectors(source_model, [instance.pk])
+    elif action == 'pre_clear':
+        # The affected rows are only known before the links are removed
+        instance._cleared_search_vector_pks = _linked_pks(sender, instance)
+    elif action == 'post_clear':
+        update_search_vectors(source_model, getattr(instance, '_cleared_search_vector_pks', []))
+    else:
+        update_search_vectors(source_model, pk_set or [])
+
+
+def _linked_pks(through, instance):
+    """ (model with the vector, pks of its rows linked to ``instance``) for the link table ``through``. """
+    for source in VECTOR_SOURCES.values():
+        for m2m_field, related_field, weight in source.related_fields:
+            field = source.m2m_field(m2m_field)
+            if field is not None and field.remote_field.through is through:
+                return list(through._default_manager.filter(
+                    **{field.m2m_reverse_field_name(): instance.pk}
+                ).values_list(f"{field.m2m_field_name()}_id", flat=True))
+    return []
+
+
+def _on_related_save(sender, instance, raw=False, **kwargs):
+    """ A skill or topic was saved (e.g. renamed): refresh the rows whose vectors include its text. """
+    if raw:
+        return
+    for through, source_model in _dependents(sender):
+        update_search_vectors(source_model, _linked_pks(through, instance))
+
+
+def _on_related_pre_delete(sender, instance, **kwargs):
+    instance._search_vector_dependents = [
+        (source_model, _linked_pks(through, instance)) for through, source_model in _dependents(sender)
+    ]
+
+
+def _on_related_post_delete(sender, instance, **kwargs):
+    for source_model, pks in getattr(instance, '_search_vector_dependents', []):
+        update_search_vectors(source_model, pks)
+
+
+def _dependents(related_model):
+    """ (link table, model with the vector) for every vector that includes text of ``related_model``. """
+    dependents = []
+    for source in VECTOR_SOURCES.values():
+        for m2m_field, related_field, weight in source.related_fields:
+            field = source.m2m_field(m2m_field)
+            if field is not None and field.related_model is related_model:
+                dependents.append((field.remote_field.through, source.model))
+    return dependents
+
+
+def connect_signals():
+    from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+    for source in VECTOR_SOURCES.values():
+        if source.model is None:
+            continue
+        post_save.connect(_on_save, sender=source.model, dispatch_uid=f"search_vector_{source.model_label}")
+        for m2m_field, related_field, weight in source.related_fields:
+            field = source.m2m_field(m2m_field)
+            if field is None:
+                continue
+            related = field.related_model
+            uid = f"search_vector_{source.model_label}_{m2m_field}"
+            m2m_changed.connect(_on_m2m_changed, sender=field.remote_field.through, dispatch_uid=f"{uid}_change")
+            post_save.connect(_on_related_save, sender=related, dispatch_uid=f"{uid}_related_save")
+            pre_delete.connect(_on_related_pre_delete, sender=related, dispatch_uid=f"{uid}_related_pre_delete")
+            post_delete.connect(_on_related_post_delete, sender=related, dispatch_uid=f"{uid}_related_delete")
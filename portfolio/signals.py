@@ -0,0 +1,107 @@
+# portfolio/signals.py
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import UserProfile, Project, RequestProfile, Skill, ProjectTopic
+from .context_processors import profile_cache
+from .home_snapshot import SNAPSHOT_MODELS, home_snapshot_cache
+from .page_cache import connect_signals as connect_page_cache_signals
+from .profiling import delete_profile_file
+from .project_cards import rebuild_project_cards
+from .search_index import connect_signals as connect_search_index_signals
+from .search_vectors import connect_signals as connect_search_vector_signals
+from .sitemap_files import connect_signals as connect_sitemap_signals
+
+
+@receiver([post_save, post_delete], sender=UserProfile, dispatch_uid="portfolio_invalidate_profile_context")
+def invalidate_profile_context(sender, **kwargs):
+    """ Drops the cached context-processor profile whenever the profile changes. """
+    profile_cache.invalidate()
+
+
+# --- Home page snapshot (see home_snapshot.py) ---
+
+def invalidate_home_snapshot(sender, raw=False, **kwargs):
+    if not raw:
+        home_snapshot_cache.invalidate()
+
+
+def invalidate_home_snapshot_on_m2m_change(sender, action, **kwargs):
+    """ The featured project cards list their skills. """
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        home_snapshot_cache.invalidate()
+
+
+for snapshot_model in SNAPSHOT_MODELS:
+    label = snapshot_model._meta.label_lower
+    post_save.connect(invalidate_home_snapshot, sender=snapshot_model, dispatch_uid=f"portfolio_home_snapshot_{label}_save")
+    post_delete.connect(invalidate_home_snapshot, sender=snapshot_model, dispatch_uid=f"portfolio_home_snapshot_{label}_delete")
+m2m_changed.connect(invalidate_home_snapshot_on_m2m_change, sender=Project.skills.through, dispatch_uid="portfolio_home_snapshot_skills_change")
+
+
+# --- Project cards (see project_cards.py) ---
+
+@receiver(post_save, sender=Project, dispatch_uid="portfolio_rebuild_card_on_project_save")
+def rebuild_card_on_project_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        rebuild_project_cards([instance.pk])
+
+
+def rebuild_cards_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """ project.skills/topics changed (reverse: a skill's or topic's projects changed). """
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        if action != 'pre_clear':
+            rebuild_project_cards([instance.pk])
+    elif action == 'pre_clear':
+        # The affected projects are only known before the links are removed
+        instance._cleared_card_project_ids = list(instance.projects.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        rebuild_project_cards(getattr(instance, '_cleared_card_project_ids', []))
+    else:
+        rebuild_project_cards(pk_set or [])
+
+
+def rebuild_cards_on_related_save(sender, instance, raw=False, **kwargs):
+    """ A skill or topic was renamed or re-slugged: refresh the cards showing it. """
+    if not raw and instance.pk:
+        rebuild_project_cards(instance.projects.values_list('pk', flat=True))
+
+
+def remember_cards_on_related_delete(sender, instance, **kwargs):
+    instance._card_project_ids = list(instance.projects.values_list('pk', flat=True))
+
+
+def rebuild_cards_on_related_delete(sender, instance, **kwargs):
+    rebuild_project_cards(getattr(instance, '_card_project_ids', []))
+
+
+for related_model, m2m_field in ((Skill, 'skills'), (ProjectTopic, 'topics')):
+    if related_model is None:
+        continue
+    label = related_model._meta.model_name
+    m2m_changed.connect(rebuild_cards_on_m2m_change, sender=getattr(Project, m2m_field).through, dispatch_uid=f"portfolio_rebuild_cards_on_{m2m_field}_change")
+    post_save.connect(rebuild_cards_on_related_save, sender=related_model, dispatch_uid=f"portfolio_rebuild_cards_on_{label}_save")
+    pre_delete.connect(remember_cards_on_related_delete, sender=related_model, dispatch_uid=f"portfolio_remember_cards_on_{label}_delete")
+    post_delete.connect(rebuild_cards_on_related_delete, sender=related_model, dispatch_uid=f"portfolio_rebuild_cards_on_{label}_delete")
+
+
+# --- Search index and PostgreSQL search vectors (see search_index.py, search_vectors.py) ---
+connect_search_index_signals()
+connect_search_vector_signals()
+
+
+# --- Anonymous page cache (see page_cache.py) ---
+connect_page_cache_signals()
+
+
+# --- Precomputed sitemaps (see sitemap_files.py) ---
+connect_sitemap_signals()
+
+
+# --- Request profiles (see profiling.py) ---
+
+@receiver(post_delete, sender=RequestProfile, dispatch_uid="portfolio_delete_profile_file")
+def delete_profile_file_on_delete(sender, instance, **kwargs):
+    delete_profile_file(instance.file_name)
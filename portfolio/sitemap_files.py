@@ -0,0 +1,260 @@
+# portfolio/sitemap_files.py
+"""
+Precomputed sitemaps, served as files instead of being built per request.
+
+``write_sitemaps`` renders each section of the ``sitemaps`` registered in
+the root URLconf into ``sitemap-<section>.xml.gz`` (``-<page>`` for sections
+larger than ``Sitemap.limit``) under ``settings.SITEMAP_DIR``, plus the
+sitemap index ``sitemap.xml`` listing them with the latest ``lastmod`` of
+each file. The files of each domain go to their own subdirectory. URLs use
+``settings.SITEMAP_DOMAIN`` if set; otherwise the views generate and serve
+the files of the requested host, as Django's sitemap views would. Files are
+only rewritten when their content changed, so their mtime is a valid
+Last-Modified.
+
+Saves and deletes of a model backing a section (the queryset model of its
+``items()``, or the labels in a ``depends_on`` attribute) leave a marker
+file for that section (in every domain's directory) once the transaction
+commits; the next sitemap request regenerates only the marked sections and
+the index. Bulk writes call
+``mark_model_dirty``. Sections listing URL names only change with the code
+and are regenerated by ``manage.py generate_sitemaps`` at deploy.
+"""
+import gzip
+import json
+import logging
+import os
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.template.loader import render_to_string
+from django.urls import get_urlconf
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.utils.module_loading import import_string
+from django.views.static import was_modified_since
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'sitemap.xml'
+MANIFEST_NAME = '.sitemaps.json'
+DIRTY_PREFIX = '.dirty-'
+DEFAULT_MAX_AGE = 3600
+
+_section_models = None # model label -> {section, ...}, built on first use
+
+
+def sitemap_dir():
+    return Path(getattr(settings, 'SITEMAP_DIR', settings.BASE_DIR / 'sitemaps'))
+
+
+def domain_dir(domain):
+    """ The directory holding the files of ``domain`` (a validated host name, possibly with a port). """
+    return sitemap_dir() / domain.lower()
+
+
+def registered_sitemaps():
+    """ {section: Sitemap instance} for the ``sitemaps`` dict of the root URLconf. """
+    sitemaps = import_string(f"{get_urlconf() or settings.ROOT_URLCONF}.sitemaps")
+    return {name: sitemap() if isinstance(sitemap, type) else sitemap for name, sitemap in sitemaps.items()}
+
+
+def section_filename(section, page=1):
+    return f"sitemap-{section}.xml.gz" if page == 1 else f"sitemap-{section}-{page}.xml.gz"
+
+
+# --- Generation ---
+
+def _write_if_changed(path, content):
+    """ Writes ``content`` atomically unless the file already holds it; returns True if written. """
+    try:
+        if path.read_bytes() == content:
+            return False
+    except OSError:
+        pass
+    # A temporary file of its own, so that concurrent refreshes never write to the same one
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp', delete=False) as f:
+        tmp_path = Path(f.name)
+        f.write(content)
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _load_manifest(directory):
+    try:
+        with open(directory / MANIFEST_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _render_section(sitemap, site, protocol):
+    """ [(filename suffix page, gzip bytes, latest lastmod or None), ...] for every page of ``sitemap``. """
+    pages = []
+    for page in sitemap.paginator.page_range:
+        urls = sitemap.get_urls(page=page, site=site, protocol=protocol)
+        xml = render_to_string('sitemap.xml', {'urlset': urls})
+        lastmods = [url['lastmod'] for url in urls if url.get('lastmod')]
+        latest = max(lastmods) if lastmods else None
+        # mtime=0 keeps the bytes stable, so unchanged sections are not rewritten
+        pages.append((page, gzip.compress(xml.encode('utf-8'), mtime=0), latest))
+    return pages
+
+
+def _parse_lastmod(value):
+    if not value:
+        return None
+    # Sections whose lastmod is a DateField store a plain date
+    return date.fromisoformat(value) if len(value) == 10 else datetime.fromisoformat(value)
+
+
+def write_sitemaps(sections=None, domain=None, protocol=None):
+    """
+    Regenerates ``sections`` (default: all) and the index of ``domain`` (default:
+    ``settings.SITEMAP_DOMAIN``). Returns the names of the files that were (re)written.
+    """
+    domain = domain or getattr(settings, 'SITEMAP_DOMAIN', '')
+    if not domain:
+        raise ValueError("No sitemap domain: set settings.SITEMAP_DOMAIN or pass one.")
+    protocol = protocol or settings.SITEMAP_PROTOCOL
+    directory = domain_dir(domain)
+    directory.mkdir(parents=True, exist_ok=True)
+    site = SimpleNamespace(domain=domain, name=domain)
+    sitemaps = registered_sitemaps()
+    manifest = _load_manifest(directory)
+    if manifest.get('domain') != domain or manifest.get('protocol') != protocol:
+        manifest = {'domain': domain, 'protocol': protocol, 'sections': {}}
+        sections = None
+    manifest['sections'] = {name: files for name, files in manifest['sections'].items() if name in sitemaps}
+    written = []
+
+    if sections is None:
+        sections = list(sitemaps)
+    for name in sections:
+        (directory / f"{DIRTY_PREFIX}{name}").unlink(missing_ok=True) # Changes from now on mark it again
+    for name in [name for name in sections if name in sitemaps]:
+        try:
+            pages = _render_section(sitemaps[name], site, protocol)
+        except Exception as e:
+            logger.error(f"Sitemap section '{name}' could not be generated: {e}", exc_info=True)
+            continue
+        files = []
+        for page, content, latest in pages:
+            filename = section_filename(name, page)
+            if _write_if_changed(directory / filename, content):
+                written.append(filename)
+            files.append([filename, latest.isoformat() if latest else None])
+        for old_filename, _ in manifest['sections'].get(name, []):
+            if old_filename not in {filename for filename, _ in files}:
+                (directory / old_filename).unlink(missing_ok=True)
+        manifest['sections'][name] = files
+
+    for name in list(manifest['sections']):
+        if name not in sitemaps:
+            del manifest['sections'][name]
+    entries = [
+        {'location': f"{protocol}://{domain}/{filename}", 'last_mod': _parse_lastmod(lastmod)}
+        for name in sitemaps for filename, lastmod in manifest['sections'].get(name, [])
+    ]
+    index = render_to_string('sitemap_index.xml', {'sitemaps': entries}).encode('utf-8')
+    if _write_if_changed(directory / INDEX_FILENAME, index):
+        written.append(INDEX_FILENAME)
+    _write_if_changed(directory / MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8'))
+    if written:
+        logger.info(f"Sitemaps written to {directory}: {', '.join(written)}")
+    return written
+
+
+def dirty_sections(domain):
+    directory = domain_dir(domain)
+    if not directory.is_dir():
+        return []
+    return sorted(path.name[len(DIRTY_PREFIX):] for path in directory.glob(f"{DIRTY_PREFIX}*"))
+
+
+def refresh(domain):
+    """ Generates everything of ``domain`` on first use and regenerates the sections marked dirty. """
+    if not (domain_dir(domain) / INDEX_FILENAME).exists():
+        write_sitemaps(domain=domain)
+        return
+    sections = dirty_sections(domain)
+    if sections:
+        write_sitemaps(sections, domain=domain)
+
+
+# --- Change tracking ---
+
+def sections_for_model(model):
+    global _section_models
+    if _section_models is None:
+        mapping = {}
+        for name, sitemap in registered_sitemaps().items():
+            labels = getattr(sitemap, 'depends_on', None)
+            if labels is None:
+                items = sitemap.items()
+                labels = (items.model._meta.label,) if isinstance(items, QuerySet) else ()
+            for label in labels:
+                mapping.setdefault(label, set()).add(name)
+        _section_models = mapping
+    return _section_models.get(model._meta.label, set())
+
+
+def mark_dirty(sections):
+    """ Marks ``sections`` in every generated domain (where nothing was generated, the first request generates all). """
+    for index in sitemap_dir().glob(f"*/{INDEX_FILENAME}"):
+        for name in sections:
+            (index.parent / f"{DIRTY_PREFIX}{name}").touch()
+
+
+def mark_model_dirty(model):
+    """ Marks the sections built from ``model`` for regeneration once the current transaction commits. """
+    sections = sections_for_model(model)
+    if sections:
+        transaction.on_commit(lambda: mark_dirty(sections))
+
+
+def _on_save_or_delete(sender, raw=False, **kwargs):
+    if not raw:
+        mark_model_dirty(sender)
+
+
+def connect_signals():
+    post_save.connect(_on_save_or_delete, dispatch_uid="sitemap_files_post_save")
+    post_delete.connect(_on_save_or_delete, dispatch_uid="sitemap_files_post_delete")
+
+
+# --- Views ---
+
+def _serve(request, filename, content_type):
+    domain = getattr(settings, 'SITEMAP_DOMAIN', '') or request.get_host()
+    refresh(domain)
+    path = domain_dir(domain) / filename
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise Http404("No such sitemap.")
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+    response = FileResponse(open(path, 'rb'), content_type=content_type)
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'SITEMAP_MAX_AGE', DEFAULT_MAX_AGE))
+    return response
+
+
+def sitemap_index_view(request):
+    return _serve(request, INDEX_FILENAME, 'application/xml')
+
+
+def sitemap_section_view(request, filename):
+    return _serve(request, filename, 'application/gzip')
@@ -0,0 +1,77 @@
+# portfolio/slugs.py
+"""
+Unique slug allocation shared by the models with auto-generated slugs.
+
+A slug that is taken gets the smallest free ``-<n>`` suffix (``n >= 1``), as
+the models' ``save()`` methods always did, but the taken slugs are read with
+one query (``slug = base OR slug LIKE 'base-%'``) instead of one ``exists()``
+per candidate. ``allocate_slugs`` does the same for a batch of bases, so a
+bulk import reads the relevant slugs in one round trip per
+``BASES_PER_QUERY`` bases and stays linear in the number of rows, even when
+many rows share a base slug.
+
+Nothing is locked: the unique constraint on the slug column remains the
+guard against two processes allocating the same slug concurrently.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+BASES_PER_QUERY = 100 # Keeps the OR-ed conditions well below database expression limits
+
+
+def _taken_slugs(model, bases, exclude_pks, field):
+    taken = set()
+    bases = list(bases)
+    for start in range(0, len(bases), BASES_PER_QUERY):
+        chunk = bases[start:start + BASES_PER_QUERY]
+        condition = reduce(or_, (Q(**{field: base}) | Q(**{f"{field}__startswith": f"{base}-"}) for base in chunk))
+        queryset = model._base_manager.filter(condition)
+        if exclude_pks:
+            queryset = queryset.exclude(pk__in=exclude_pks)
+        taken.update(queryset.values_list(field, flat=True))
+    return taken
+
+
+def allocate_slugs(model, bases, exclude_pks=(), field='slug'):
+    """
+    Unique slugs for ``bases`` (already slugified), in order, unique among themselves and
+    among the rows of ``model`` other than ``exclude_pks`` (the instances being re-slugged).
+    """
+    bases = list(bases)
+    if not bases:
+        return []
+    exclude_pks = [pk for pk in exclude_pks if pk is not None]
+    taken = _taken_slugs(model, dict.fromkeys(bases), exclude_pks, field)
+    next_suffix = {} # base -> smallest suffix that may still be free
+    slugs = []
+    for base in bases:
+        slug = base
+        if slug in taken:
+            counter = next_suffix.get(base, 1)
+            while f"{base}-{counter}" in taken:
+                counter += 1
+            slug = f"{base}-{counter}"
+            next_suffix[base] = counter + 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def unique_slug(model, base, exclude_pk=None, field='slug'):
+    """ The slug ``base`` or ``base-<n>`` with the smallest free ``n``, from one query. """
+    return allocate_slugs(model, [base], exclude_pks=[exclude_pk], field=field)[0]
+
+
+def assign_unique_slug(instance, source_field, field='slug'):
+    """ For ``save()``: slugifies the instance's slug (or ``source_field`` when empty) and makes it unique. """
+    base = slugify(getattr(instance, field) or getattr(instance, source_field))
+    setattr(instance, field, unique_slug(type(instance), base, exclude_pk=instance.pk, field=field))
+
+
+def is_allocated_from(slug, base):
+    """ True if ``slug`` is ``base`` or one of its ``-<n>`` de-duplicated forms. """
+    return re.fullmatch(rf"{re.escape(base)}(-\d+)?", slug or '') is not None
@@ -0,0 +1,107 @@
+// portfolio/static/portfolio/js/search-suggest.js
+
+// Typeahead for the search boxes in base.html: every input with a
+// data-suggest-url attribute asks that endpoint for title suggestions as the
+// visitor types and shows them in a dropdown under the input.
+document.addEventListener('DOMContentLoaded', function () {
+    const DEBOUNCE_MS = 80;
+
+    document.querySelectorAll('input[data-suggest-url]').forEach(function (input) {
+        const form = input.form;
+        const list = document.createElement('ul');
+        list.setAttribute('role', 'listbox');
+        list.className = 'absolute z-50 mt-1 w-full bg-white dark:bg-gray-800 border border-gray-200 dark:border-gray-700 rounded-md shadow-lg text-sm hidden';
+        form.appendChild(list);
+
+        const responses = new Map(); // query -> suggestions, for backspacing
+        let timer = null;
+        let active = -1;
+        let latest = '';
+
+        function hide() {
+            list.classList.add('hidden');
+            active = -1;
+        }
+
+        function highlight(index) {
+            const items = list.querySelectorAll('li');
+            items.forEach(function (item, i) {
+                item.classList.toggle('bg-gray-100', i === index);
+                item.classList.toggle('dark:bg-gray-700', i === index);
+            });
+            active = index;
+        }
+
+        function render(suggestions) {
+            list.innerHTML = '';
+            suggestions.forEach(function (suggestion) {
+                const item = document.createElement('li');
+                item.setAttribute('role', 'option');
+                const link = document.createElement('a');
+                link.href = suggestion.url;
+                link.className = 'flex justify-between gap-2 px-3 py-2 text-gray-800 dark:text-gray-100 hover:bg-gray-100 dark:hover:bg-gray-700';
+                const label = document.createElement('span');
+                label.textContent = suggestion.label;
+                const type = document.createElement('span');
+                type.className = 'text-xs text-gray-500 dark:text-gray-400';
+                type.textContent = suggestion.type;
+                link.append(label, type);
+                item.appendChild(link);
+                list.appendChild(item);
+            });
+            active = -1;
+            list.classList.toggle('hidden', suggestions.length === 0);
+        }
+
+        function fetchSuggestions(query) {
+            if (responses.has(query)) {
+                render(responses.get(query));
+                return;
+            }
+            const url = input.dataset.suggestUrl + '?q=' + encodeURIComponent(query);
+            fetch(url, { headers: { 'Accept': 'application/json' } })
+                .then(function (response) { return response.ok ? response.json() : { suggestions: [] }; })
+                .then(function (data) {
+                    responses.set(query, data.suggestions);
+                    if (query === latest) {
+                        render(data.suggestions);
+                    }
+                })
+                .catch(function () { /* Suggestions are optional; the form still submits */ });
+        }
+
+        input.addEventListener('input', function () {
+            latest = input.value.trim();
+            clearTimeout(timer);
+            if (!latest) {
+                hide();
+                return;
+            }
+            timer = setTimeout(function () { fetchSuggestions(latest); }, DEBOUNCE_MS);
+        });
+
+        input.addEventListener('keydown', function (event) {
+            const items = list.querySelectorAll('li');
+            if (list.classList.contains('hidden') || !items.length) {
+                return;
+            }
+            if (event.key === 'ArrowDown') {
+                event.preventDefault();
+                highlight((active + 1) % items.length);
+            } else if (event.key === 'ArrowUp') {
+                event.preventDefault();
+                highlight((active - 1 + items.length) % items.length);
+            } else if (event.key === 'Enter' && active >= 0) {
+                event.preventDefault();
+                window.location.href = items[active].querySelector('a').href;
+            } else if (event.key === 'Escape') {
+                hide();
+            }
+        });
+
+        input.addEventListener('blur', function () {
+            // Delay so a click on a suggestion still follows its link
+            setTimeout(hide, 150);
+        });
+    });
+});
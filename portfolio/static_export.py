@@ -0,0 +1,269 @@
+# portfolio/static_export.py
+"""
+Pre-rendered HTML export of the pages listed in the sitemaps.
+
+``export_site`` requests every location of the ``sitemaps`` registered in
+the root URLconf through Django's test client and writes the HTML to
+``<output>/<path>/index.html``, a layout WhiteNoise (``WHITENOISE_ROOT`` with
+``WHITENOISE_INDEX_FILE``) or any static host serves directly. Pages the
+page cache would not store (forms with a CSRF token, cookies, non-HTML or
+non-200 responses) are skipped, since a static copy of them would be wrong.
+
+While a page renders, its dependencies are recorded with the page cache's
+``DependencyRecorder`` (``table:``, ``row:`` and ``context:`` tags). The
+export manifest (``MANIFEST_NAME`` in the output directory) stores, for
+every page, a fingerprint of each dependency: a hash of one row, of every
+row of a table, or of the tables a context-cache value is built from, plus
+the collected-static manifest that hashed asset names come from. Later runs
+recompute the fingerprints (one query per table involved) and only render
+pages whose fingerprints changed, pages new to the sitemaps and pages whose
+file is missing; pages that left the sitemaps are deleted. Template or code
+changes are not tracked: export with ``force=True`` after a deploy.
+"""
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+
+from . import context_cache, page_cache
+from .sitemap_files import registered_sitemaps
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.export-manifest.json'
+MANIFEST_VERSION = 1
+STATIC_MANIFEST_TAG = 'static:manifest'
+
+
+def _digest(value):
+    return hashlib.sha1(repr(value).encode('utf-8')).hexdigest()
+
+
+# --- URLs ---
+
+def sitemap_paths(sitemaps=None):
+    """ Sorted, de-duplicated paths of every item in ``sitemaps`` (default: the root URLconf's). """
+    if sitemaps is None:
+        sitemaps = registered_sitemaps()
+    paths = set()
+    for name, sitemap in sitemaps.items():
+        if isinstance(sitemap, type):
+            sitemap = sitemap()
+        try:
+            items = list(sitemap.items())
+        except Exception as e:
+            logger.error(f"Static export: could not list sitemap '{name}': {e}", exc_info=True)
+            continue
+        for item in items:
+            location = sitemap.location
+            path = location(item) if callable(location) else location
+            if not path:
+                continue
+            if urlsplit(path).query:
+                logger.warning(f"Static export: skipping '{path}' from sitemap '{name}' (query strings cannot be exported).")
+                continue
+            paths.add(path)
+    return sorted(paths)
+
+
+def output_file(path):
+    """ The file, relative to the output directory, that serves ``path`` ('/a/b/' -> 'a/b/index.html'). """
+    parts = [part for part in unquote(urlsplit(path).path).split('/') if part]
+    if any(part in ('.', '..') for part in parts):
+        raise ValueError(f"Unsafe path for export: {path}")
+    return '/'.join(parts + ['index.html'])
+
+
+# --- Dependency fingerprints ---
+
+class Fingerprints:
+    """ Current fingerprint of each dependency tag, computed with one query per table and memoised. """
+
+    def __init__(self):
+        self._models = {
+            model._meta.db_table: model
+            for model in apps.get_models(include_auto_created=True) if not model._meta.proxy
+        }
+        self._rows = {} # db_table -> {str(pk): digest}
+        self._values = {}
+
+    def _table_rows(self, table):
+        if table not in self._rows:
+            model = self._models.get(table)
+            if model is not None:
+                fields = [field.attname for field in model._meta.concrete_fields]
+                rows = model._base_manager.order_by('pk').values_list('pk', *fields)
+                self._rows[table] = {str(row[0]): _digest(row[1:]) for row in rows}
+            else:
+                # Not a model table (e.g. created by raw SQL): the table as a whole is the only unit
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT * FROM {connection.ops.quote_name(table)}")
+                    self._rows[table] = {str(i): _digest(row) for i, row in enumerate(sorted(map(repr, cursor.fetchall())))}
+        return self._rows[table]
+
+    def _context(self, name):
+        cached = context_cache.registered(name)
+        if cached is None:
+            return None
+        with page_cache.recording() as recorder:
+            cached.loader()
+        return _digest(sorted(self.combined(recorder.all_tags()).items()))
+
+    def _static_manifest(self):
+        manifest = Path(settings.STATIC_ROOT) / 'staticfiles.json'
+        try:
+            return hashlib.sha1(manifest.read_bytes()).hexdigest()
+        except OSError:
+            return None
+
+    def __getitem__(self, tag):
+        if tag not in self._values:
+            kind, _, rest = tag.partition(':')
+            if kind == 'table':
+                value = _digest(sorted(self._table_rows(rest).items()))
+            elif kind == 'row':
+                table, _, pk = rest.partition(':')
+                value = self._table_rows(table).get(pk)
+            elif kind == 'context':
+                value = self._context(rest)
+            elif tag == STATIC_MANIFEST_TAG:
+                value = self._static_manifest()
+            else:
+                value = None
+            self._values[tag] = value
+        return self._values[tag]
+
+    def combined(self, tags):
+        """ {tag: fingerprint} for the tags that identify content (``rows:`` tags only exist for purging). """
+        return {tag: self[tag] for tag in sorted(tags) if not tag.startswith('rows:')}
+
+
+# --- Export ---
+
+class ExportResult:
+    def __init__(self):
+        self.written = []
+        self.unchanged = []
+        self.up_to_date = []
+        self.skipped = []
+        self.removed = []
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(output_dir / MANIFEST_NAME, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def _write_manifest(output_dir, manifest):
+    tmp_path = output_dir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, output_dir / MANIFEST_NAME)
+
+
+def _is_stale(entry, output_dir, fingerprints):
+    if not (output_dir / entry['file']).exists():
+        return True
+    return any(fingerprints[tag] != value for tag, value in entry['deps'].items())
+
+
+def _remove_file(output_dir, relative):
+    target = output_dir / relative
+    try:
+        target.unlink()
+    except FileNotFoundError:
+        pass
+    # Drop directories left empty, up to the output directory
+    parent = target.parent
+    while parent != output_dir:
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+        parent = parent.parent
+
+
+def _render(client, path, secure):
+    """ Renders ``path``; returns (html bytes or None, dependency tags). """
+    with page_cache.recording() as recorder:
+        response = client.get(path, secure=secure)
+    if response.status_code != 200:
+        logger.warning(f"Static export: '{path}' returned {response.status_code}; not exported.")
+        return None, set()
+    if not page_cache.response_is_cacheable(response.wsgi_request, response):
+        logger.info(f"Static export: '{path}' is visitor-specific or not HTML; not exported.")
+        return None, set()
+    return response.content, recorder.all_tags()
+
+
+def export_site(output_dir, host='localhost', force=False, paths=None):
+    """
+    Brings ``output_dir`` up to date with the sitemap pages (or ``paths``) and returns an
+    ``ExportResult``. With ``force`` every page is rendered regardless of the manifest.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    if manifest.get('host') != host:
+        manifest = {}
+    previous = manifest.get('pages', {})
+    pages = {}
+    result = ExportResult()
+    fingerprints = Fingerprints()
+    client = Client(HTTP_HOST=host, raise_request_exception=False)
+    secure = getattr(settings, 'SECURE_SSL_REDIRECT', False)
+    if paths is None:
+        paths = sitemap_paths()
+
+    # Render with the page cache off so that every query (and so every dependency) is seen
+    with override_settings(PAGE_CACHE_ENABLED=False):
+        for path in paths:
+            entry = previous.get(path)
+            if entry is not None and not force and not _is_stale(entry, output_dir, fingerprints):
+                pages[path] = entry
+                result.up_to_date.append(path)
+                continue
+            content, tags = _render(client, path, secure)
+            if content is None:
+                if entry is not None:
+                    _remove_file(output_dir, entry['file'])
+                result.skipped.append(path)
+                continue
+            relative = output_file(path)
+            sha256 = hashlib.sha256(content).hexdigest()
+            target = output_dir / relative
+            if entry is not None and entry['sha256'] == sha256 and entry['file'] == relative and target.exists():
+                result.unchanged.append(path)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.with_name(f"{target.name}.tmp")
+                tmp_path.write_bytes(content)
+                os.replace(tmp_path, target)
+                result.written.append(path)
+            # Fingerprints of rows written since this run started are recomputed on the next run
+            pages[path] = {'file': relative, 'deps': fingerprints.combined(tags | {STATIC_MANIFEST_TAG}), 'sha256': sha256}
+
+    for path, entry in previous.items():
+        if path not in pages and path not in result.skipped:
+            _remove_file(output_dir, entry['file'])
+            result.removed.append(path)
+
+    _write_manifest(output_dir, {'version': MANIFEST_VERSION, 'host': host, 'pages': pages})
+    logger.info(
+        f"Static export to {output_dir}: {len(result.written)} written, {len(result.unchanged)} unchanged, "
+        f"{len(result.up_to_date)} up to date, {len(result.skipped)} skipped, {len(result.removed)} removed."
+    )
+    return result
@@ -0,0 +1,41 @@
+# portfolio/templatetags/fragment_cache.py
+from django import template
+
+from portfolio.fragment_cache import cached_fragment
+
+register = template.Library()
+
+
+class CacheFragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary = vary
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        vary = [expression.resolve(context) for expression in self.vary]
+        return cached_fragment(name, vary, lambda: self.nodelist.render(context))
+
+
+@register.tag
+def cachefragment(parser, token):
+    """
+    Caches the enclosed block, keyed on the versions of the vary arguments
+    (see portfolio/fragment_cache.py). Fragments nest: a grid keyed on its list
+    is composed of the cached fragments of its items.
+
+    Usage:
+        {% load fragment_cache %}
+        {% cachefragment "project_grid" projects %}
+            {% for project in projects %}
+                {% cachefragment "project_card" project %}...{% endcachefragment %}
+            {% endfor %}
+        {% endcachefragment %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' tag requires at least a fragment name.")
+    nodelist = parser.parse(('endcachefragment',))
+    parser.delete_first_token()
+    return CacheFragmentNode(nodelist, parser.compile_filter(bits[1]), [parser.compile_filter(bit) for bit in bits[2:]])
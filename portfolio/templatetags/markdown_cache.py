@@ -0,0 +1,22 @@
+# portfolio/templatetags/markdown_cache.py
+from django import template
+
+from portfolio.markdown_cache import render_markdown
+
+register = template.Library()
+
+
+@register.filter
+def cached_markdown(obj, field_name):
+    """
+    Renders a Markdown field of a model instance, serving the pre-rendered HTML
+    stored by MarkdownCacheMixin when it is up to date.
+
+    Usage: {{ project|cached_markdown:"long_description_markdown" }}
+    Falls back to a live markdownify render for objects without the mixin.
+    """
+    if obj is None or not field_name:
+        return ""
+    if hasattr(obj, "rendered_html"):
+        return obj.rendered_html(field_name)
+    return render_markdown(getattr(obj, field_name, "") or "")
@@ -0,0 +1,17 @@
+# portfolio/templatetags/search_highlight.py
+from django import template
+
+from portfolio.search_vectors import headline_html
+
+register = template.Library()
+
+
+@register.filter
+def search_headline(headline):
+    """
+    Renders a ts_headline snippet annotated by search_vectors.ranked() as
+    escaped text with the matched words wrapped in <mark>.
+
+    Usage: {{ project.search_headline|search_headline }}
+    """
+    return headline_html(headline)
@@ -1,30 +1,62 @@
 # portfolio/tests.py
 
-from django.test import TestCase, Client, override_settings
+from django.test import TestCase, Client, RequestFactory, override_settings
 from django.urls import reverse, resolve
 from django.utils.text import slugify
 from django.utils import timezone
 from django.core import mail
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import Q
 from django.contrib import admin as django_admin_site # Renamed to avoid conflict
 from django.contrib.auth.models import User
 from django.contrib.messages import get_messages # Removed DEFAULT_LEVELS as it's not used directly
 from django.db import IntegrityError
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.template import Context, Template
+from markdownify.templatetags.markdownify import markdownify
 
 
 # Import models from this app
-from .models import Project, Certificate, UserProfile, ColophonEntry
+from .models import Project, Certificate, UserProfile, ColophonEntry, ImportManifest, ProjectCard, RequestProfile
+from .project_cards import rebuild_project_cards
+from .search_index import SearchIndex, search_index, tokenize
+from .search_suggest import PrefixIndex
+from . import search_vectors
+from .page_cache import PageCacheMiddleware, cache_key
+from . import sitemap_files
+from .conditional import timestamp_field
+from .slugs import allocate_slugs, unique_slug
+from . import fragment_cache, page_cache
+from .home_snapshot import RANDOM_DISPLAY_COUNT, ROTATION_COUNT, home_snapshot_cache
+from .static_export import MANIFEST_NAME, export_site, output_file, sitemap_paths
+from . import benchmark, profiling, request_metrics
+from skills.models import Skill, SkillCategory
+from topics.models import ProjectTopic
 from .forms import ContactForm
+from .markdown_cache import content_hash
+from .context_cache import VersionedContextCache
+from .context_processors import user_profile_context, get_context_profile, profile_cache
 from . import views # Import views to test view functions directly if needed for URL resolution checks
 from .sitemaps import StaticViewSitemap, ProjectSitemap
 # Import UserProfileAdmin if you intend to test its specifics
 from .admin import ProjectAdmin, CertificateAdmin, UserProfileAdmin, ColophonEntryAdmin # Added ColophonEntryAdmin
+import gzip
+import json
+import sys
+import time
 import os
 import shutil
+import subprocess
+import tempfile
+import numpy as np
 import datetime # For datetime.fromisoformat
 from datetime import timedelta # For form_load_time simulation
+from io import StringIO
+from unittest.mock import patch
 
 # Import models from other apps safely for testing context
 try:
@@ -235,6 +267,1118 @@ class ColophonEntryModelTests(TestCase):
         self.assertEqual(entries[3], entry2) # JavaScript
 
 
+class MarkdownCacheTests(TestCase):
+    """Tests for the rendered Markdown cache stored on models using MarkdownCacheMixin."""
+    def test_save_populates_cache_for_markdown_fields(self):
+        project = Project.objects.create(title="Cached Project", description="Some **bold** text.")
+        entry = project.rendered_markdown.get('description')
+        self.assertIsNotNone(entry)
+        self.assertEqual(entry['hash'], content_hash("Some **bold** text."))
+        self.assertIn("<strong>bold</strong>", entry['html'])
+        self.assertNotIn('challenges', project.rendered_markdown) # Empty fields are not cached
+
+    def test_cache_is_refreshed_when_source_changes(self):
+        project = Project.objects.create(title="Changing Project", description="First *version*.")
+        project.description = "Second *version*."
+        project.save(update_fields=['description'])
+        project.refresh_from_db()
+        self.assertIn("Second", project.rendered_markdown['description']['html'])
+        self.assertEqual(project.rendered_markdown['description']['hash'], content_hash("Second *version*."))
+
+    def test_unchanged_source_is_not_re_rendered(self):
+        project = Project.objects.create(title="Stable Project", description="Stable text.")
+        with patch('portfolio.markdown_cache.render_markdown') as mock_render:
+            project.title = "Stable Project Renamed"
+            project.save()
+            mock_render.assert_not_called()
+
+    def test_rendered_html_falls_back_to_live_render_on_stale_cache(self):
+        project = Project.objects.create(title="Stale Project", description="Original.")
+        project.description = "Edited without *saving*."
+        self.assertEqual(str(project.rendered_html('description')), str(markdownify("Edited without *saving*.")))
+
+    def test_cached_markdown_filter_matches_markdownify(self):
+        profile = UserProfile.objects.create(privacy_policy_markdown="# Privacy\n\nWe keep **nothing**.")
+        rendered = Template('{% load markdown_cache %}{{ profile|cached_markdown:"privacy_policy_markdown" }}').render(Context({'profile': profile}))
+        self.assertEqual(rendered, str(markdownify(profile.privacy_policy_markdown)))
+
+    def test_rebuild_markdown_cache_command(self):
+        project = Project.objects.create(title="Bulk Project", description="Cached *soon*.")
+        Project.objects.filter(pk=project.pk).update(rendered_markdown={})
+        call_command('rebuild_markdown_cache', stdout=StringIO())
+        project.refresh_from_db()
+        self.assertIn('description', project.rendered_markdown)
+
+
+
+class SlugAllocatorTests(TestCase):
+    def test_next_free_suffix_is_found_with_one_query(self):
+        for title in ["Same Title"] * 4 + ["Same Title Extended"]:
+            Project.objects.create(title=title, description="Slug test.")
+        Project.objects.filter(slug="same-title-2").delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(unique_slug(Project, "same-title"), "same-title-2") # Gaps are reused, as before
+        project = Project.objects.get(slug="same-title-1")
+        self.assertEqual(unique_slug(Project, "same-title-1", exclude_pk=project.pk), "same-title-1")
+
+    def test_batch_allocation_is_unique_within_the_batch(self):
+        Project.objects.create(title="Batch", description="Slug test.")
+        with self.assertNumQueries(1):
+            slugs = allocate_slugs(Project, ["batch", "batch", "batch-1", "other"])
+        self.assertEqual(slugs, ["batch-1", "batch-2", "batch-1-1", "other"])
+
+    def test_models_share_the_allocator(self):
+        first = Project.objects.create(title="Shared Slug", description="Slug test.")
+        second = Project.objects.create(title="Shared Slug", description="Slug test.")
+        self.assertEqual((first.slug, second.slug), ("shared-slug", "shared-slug-1"))
+        second.save()
+        self.assertEqual(second.slug, "shared-slug-1")
+
+
+class ProjectCardTests(TestCase):
+    """Tests for the denormalised ProjectCard read model."""
+    def setUp(self):
+        self.python = Skill.objects.create(name="Python", description="Language.")
+        self.web = ProjectTopic.objects.create(name="Web Development", description="Web.")
+        self.project = Project.objects.create(title="Card Project", description="A *Django* & **Python** site.")
+
+    def test_card_follows_saves_and_m2m_changes(self):
+        card = ProjectCard.objects.get(project=self.project)
+        self.assertEqual(card.excerpt, "A Django & Python site.")
+        self.assertEqual(card.skills, [])
+        self.project.skills.add(self.python)
+        self.project.topics.add(self.web)
+        card.refresh_from_db()
+        self.assertEqual(card.skills, [{'name': 'Python', 'slug': self.python.slug}])
+        self.assertEqual(card.topics, [{'name': 'Web Development', 'slug': self.web.slug}])
+        self.python.name = "Python 3"
+        self.python.save()
+        card.refresh_from_db()
+        self.assertEqual(card.skills[0]['name'], "Python 3")
+        self.web.projects.clear()
+        card.refresh_from_db()
+        self.assertEqual(card.topics, [])
+
+    def test_card_keeps_first_skills_and_count(self):
+        skills = [Skill.objects.create(name=f"Skill {i}", description="x") for i in range(6)]
+        self.project.skills.set(skills)
+        card = ProjectCard.objects.get(project=self.project)
+        self.assertEqual(len(card.skills), 4)
+        self.assertEqual(card.skill_count, 6)
+        self.assertEqual(card.more_skills, 2)
+
+    def test_missing_cards_are_built_when_listing(self):
+        ProjectCard.objects.all().delete()
+        response = self.client.get(reverse('portfolio:all_projects'))
+        self.assertContains(response, "A Django &amp; Python site.")
+        self.assertTrue(ProjectCard.objects.filter(project=self.project).exists())
+        self.assertEqual(rebuild_project_cards(), 1)
+
+    @override_settings(PAGE_CACHE_ENABLED=True)
+    @patch.object(PageCacheMiddleware, 'can_store', return_value=True)
+    def test_rebuilt_cards_purge_cached_listings(self, mock_can_store):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        listing = reverse('portfolio:all_projects')
+        self.client.get(listing)
+        Project.objects.filter(pk=self.project.pk).update(description="An *updated* excerpt.") # No signals
+        rebuild_project_cards([self.project.pk])
+        response = self.client.get(listing)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, "An updated excerpt.")
+
+    def test_all_projects_query_count_does_not_grow_with_projects(self):
+        for i in range(3):
+            project = Project.objects.create(title=f"Extra {i}", description="More.")
+            project.skills.add(self.python)
+            project.topics.add(self.web)
+        self.client.get(reverse('portfolio:all_projects')) # warm the context caches
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(reverse('portfolio:all_projects'))
+        for i in range(10):
+            project = Project.objects.create(title=f"More {i}", description="More.")
+            project.skills.add(self.python)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(reverse('portfolio:all_projects'))
+        self.assertEqual(len(many), len(few))
+
+
+@override_settings(SEARCH_INDEX_DIR=os.path.join(tempfile.gettempdir(), 'portfolio-test-search-index'))
+class SearchIndexTests(TestCase):
+    """Tests for the BM25 inverted index behind search_results_view."""
+    def setUp(self):
+        shutil.rmtree(settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        search_index.reset()
+        self.addCleanup(search_index.reset)
+        self.vision = Project.objects.create(title="Vision Transformer", description="Image classification with attention.")
+        self.notes = Project.objects.create(title="Reading Notes", description="Notes on the vision transformer paper and attention.")
+        self.skill = Skill.objects.create(name="PyTorch", description="Deep learning framework.")
+
+    def keys(self, query, index=search_index):
+        return [key for key, _ in index.search(query)]
+
+    def test_tokenize_lowercases_and_drops_stopwords(self):
+        self.assertEqual(tokenize("The Vision-Transformer, and PyTorch_2!"), ['vision', 'transformer', 'pytorch', '2'])
+
+    def test_title_matches_rank_first_and_terms_are_anded(self):
+        self.assertEqual(self.keys("vision transformer"), [f"project:{self.vision.pk}", f"project:{self.notes.pk}"])
+        self.assertEqual(self.keys("notes attention"), [f"project:{self.notes.pk}"])
+        self.assertEqual(self.keys("vision pytorch"), [])
+
+    def test_prefixes_match_longer_words(self):
+        self.assertEqual(self.keys("classif"), [f"project:{self.vision.pk}"])
+        self.assertEqual(self.keys("pytor"), [f"skill:{self.skill.pk}"])
+
+    def test_signals_update_the_index_incrementally(self):
+        self.assertEqual(self.keys("segmentation"), [])
+        project = Project.objects.create(title="Segmentation", description="U-Net.")
+        self.assertEqual(self.keys("segmentation"), [f"project:{project.pk}"])
+        project.skills.add(self.skill)
+        self.assertEqual(self.keys("segmentation pytorch"), [f"project:{project.pk}"])
+        self.skill.name = "Torch"
+        self.skill.save()
+        self.assertEqual(self.keys("segmentation pytorch"), [])
+        self.assertEqual(self.keys("segmentation torch"), [f"project:{project.pk}"])
+        project.delete()
+        self.assertEqual(self.keys("segmentation"), [])
+
+    def test_snapshot_is_shared_and_changes_are_published_on_commit(self):
+        search_index.rebuild(persist=True)
+        other = SearchIndex()
+        self.assertEqual(self.keys("vision", other), self.keys("vision"))
+        self.assertIsInstance(other._base.post_docs, np.memmap)
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(title="Vision Robotics", description="Grasping.")
+        other._next_check = 0 # skip the polling interval
+        self.assertIn(f"project:{project.pk}", self.keys("robotics", other))
+
+    def test_changes_are_logged_until_compacted(self):
+        search_index.rebuild(persist=True)
+        version = search_index._current_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(title="Vision Robotics", description="Grasping.")
+        self.assertEqual(search_index._current_version(), version) # Appended to the log, no new snapshot
+        self.assertIn(f"project:{project.pk}", self.keys("robotics", SearchIndex()))
+        with patch('portfolio.search_index.COMPACT_MIN_CHANGES', 2), self.captureOnCommitCallbacks(execute=True):
+            project.title = "Vision Manipulation"
+            project.save()
+        compacted = search_index._current_version()
+        self.assertNotEqual(compacted, version)
+        self.assertFalse(os.path.exists(os.path.join(settings.SEARCH_INDEX_DIR, compacted, 'changes.jsonl')))
+        self.assertEqual(self.keys("manipulation", SearchIndex()), [f"project:{project.pk}"])
+        key = f"project:{project.pk}"
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        out = StringIO()
+        call_command('rebuild_search_index', compact=True, stdout=out)
+        self.assertIn("Compacted", out.getvalue())
+        other = SearchIndex()
+        self.assertEqual(self.keys("manipulation", other), [])
+        self.assertNotIn(key, other._base.doc_keys)
+
+    def test_search_view_ranks_results_and_covers_other_content(self):
+        post = BlogPost.objects.create(title="Attention explained", content="About transformers.", status='published')
+        BlogPost.objects.create(title="Attention draft", content="Draft.", status='draft')
+        response = self.client.get(reverse('portfolio:search_results'), {'q': 'attention'})
+        self.assertEqual(list(response.context['projects']), [self.vision, self.notes])
+        self.assertEqual(list(response.context['blog_posts']), [post])
+        self.assertContains(response, "Attention explained")
+        self.assertNotContains(response, "Attention draft")
+
+
+@override_settings(SEARCH_INDEX_DIR=os.path.join(tempfile.gettempdir(), 'portfolio-test-search-index'))
+class SearchSuggestTests(TestCase):
+    """Tests for the search box typeahead endpoint."""
+    def setUp(self):
+        shutil.rmtree(settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        search_index.reset()
+        self.addCleanup(search_index.reset)
+        self.project = Project.objects.create(title="Vision Transformer", description="Attention.")
+        self.skill = Skill.objects.create(name="Python")
+        self.url = reverse('portfolio:search_suggest')
+
+    def suggest(self, query, **params):
+        response = self.client.get(self.url, {'q': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(item['label'], item['type']) for item in response.json()['suggestions']]
+
+    def test_prefix_index_matches_word_starts_and_ranks_title_starts_first(self):
+        index = PrefixIndex([("Data Vision", 'project', '/a/'), ("Vision Transformer", 'project', '/b/'), ("Vis", 'skill', '/c/')])
+        self.assertEqual([label for label, _, _ in index.lookup("vis", 10)], ["Vision Transformer", "Vis", "Data Vision"])
+        self.assertEqual([label for label, _, _ in index.lookup("vision tr", 10)], ["Vision Transformer"])
+        self.assertEqual(index.lookup("  ", 10), [])
+
+    def test_suggestions_include_urls_and_are_cacheable(self):
+        response = self.client.get(self.url, {'q': 'trans'})
+        self.assertEqual(response.json()['suggestions'], [
+            {'label': "Vision Transformer", 'type': "Project", 'url': self.project.get_absolute_url()},
+        ])
+        self.assertIn('max-age=', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+        self.assertEqual(self.suggest(''), [])
+
+    def test_results_are_capped(self):
+        for i in range(12):
+            Skill.objects.create(name=f"Pandas {i}")
+        self.assertEqual(len(self.suggest('pa')), 8)
+        self.assertEqual(len(self.suggest('pa', limit=3)), 3)
+        self.assertEqual(len(self.suggest('pa', limit='x')), 8)
+
+    def test_warm_lookups_skip_the_database_and_see_changes(self):
+        self.suggest('py')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('pyt'), [("Python", "Skill")])
+        self.skill.name = "PyTorch"
+        self.skill.save()
+        self.assertEqual(self.suggest('pyt'), [("PyTorch", "Skill")])
+
+
+class SearchVectorTests(TestCase):
+    """Tests for the PostgreSQL full-text search backend that also apply on SQLite."""
+    def test_backend_falls_back_to_the_index_off_postgres(self):
+        self.assertFalse(search_vectors.postgres_search_enabled())
+        with override_settings(SEARCH_BACKEND='index'):
+            self.assertFalse(search_vectors.postgres_search_enabled())
+        self.assertEqual(search_vectors.update_search_vectors(Project), 0)
+
+    def test_vectors_weight_the_title_highest(self):
+        for source in search_vectors.VECTOR_SOURCES.values():
+            self.assertEqual(source.weighted_fields[0][1], 'A')
+            self.assertIsNotNone(source.model, source.model_label)
+            source.model._meta.get_field('search_vector')
+            source.model._meta.get_field(source.headline_field)
+
+    def test_project_vectors_follow_skill_and_topic_names(self):
+        project = Project.objects.create(title="Vector Project", description="One.")
+        skill = Skill.objects.create(name="Vector Skill")
+        topic = ProjectTopic.objects.create(name="Vector Topic")
+        with patch.object(search_vectors, 'update_search_vectors') as mock_update:
+            project.skills.add(skill)
+            project.topics.add(topic)
+            skill.name = "Renamed Skill"
+            skill.save()
+            topic.projects.clear()
+            skill.delete()
+        refreshed = [(call.args[0], list(call.args[1])) for call in mock_update.call_args_list if call.args[0] is Project]
+        self.assertEqual(refreshed, [(Project, [project.pk])] * 5)
+
+    def test_headline_is_escaped_and_highlighted(self):
+        headline = f"<b>x</b> uses {search_vectors.HEADLINE_START}PyTorch{search_vectors.HEADLINE_STOP} & more"
+        rendered = Template("{% load search_highlight %}{{ headline|search_headline }}").render(Context({'headline': headline}))
+        self.assertEqual(rendered, "x uses <mark>PyTorch</mark> &amp; more")
+
+    def test_update_command_is_a_no_op_off_postgres(self):
+        out = StringIO()
+        call_command('update_search_vectors', stdout=out)
+        self.assertIn("not PostgreSQL", out.getvalue())
+
+    def test_benchmark_rolls_back_its_corpus(self):
+        out = StringIO()
+        call_command('benchmark_search', rows=60, queries=6, vocabulary=300, stdout=out)
+        self.assertIn("BM25 index", out.getvalue())
+        self.assertIn("icontains scan", out.getvalue())
+        self.assertFalse(Project.objects.filter(slug__startswith='search-benchmark').exists())
+
+
+@override_settings(PAGE_CACHE_ENABLED=True)
+@patch.object(PageCacheMiddleware, 'can_store', return_value=True) # TestCase wraps each test in a transaction
+class PageCacheTests(TestCase):
+    """Tests for the anonymous full-page cache middleware."""
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.first = Project.objects.create(title="First Project", description="One.")
+        self.second = Project.objects.create(title="Second Project", description="Two.")
+
+    def get(self, url, **params):
+        return self.client.get(url, params)
+
+    def test_repeat_anonymous_request_is_served_from_cache(self, mock_can_store):
+        url = self.first.get_absolute_url()
+        first = self.get(url)
+        self.assertEqual(first['X-Page-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.get(url)
+        self.assertEqual(second['X-Page-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], first['Content-Type'])
+
+    def test_saving_a_project_purges_its_pages_only(self, mock_can_store):
+        listing = reverse('portfolio:all_projects')
+        for url in (listing, self.first.get_absolute_url(), self.second.get_absolute_url()):
+            self.get(url)
+        self.first.title = "Renamed Project"
+        self.first.save()
+        self.assertContains(self.get(self.first.get_absolute_url()), "Renamed Project")
+        response = self.get(listing)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, "Renamed Project")
+        self.assertEqual(self.get(self.second.get_absolute_url())['X-Page-Cache'], 'HIT')
+
+    def test_cache_hits_answer_conditional_requests(self, mock_can_store):
+        for url in (self.first.get_absolute_url(), reverse('portfolio:all_projects')):
+            first = self.get(url)
+            with self.assertNumQueries(0):
+                not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+                since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+            self.assertEqual(not_modified.status_code, 304, url)
+            self.assertEqual(not_modified['X-Page-Cache'], 'HIT')
+            self.assertEqual(not_modified.content, b'')
+            self.assertEqual(since.status_code, 304, url)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_new_rows_purge_listings(self, mock_can_store):
+        listing = reverse('portfolio:all_projects')
+        self.get(listing)
+        Project.objects.create(title="Third Project", description="Three.")
+        self.assertContains(self.get(listing), "Third Project")
+
+    def test_m2m_changes_purge_the_project_page(self, mock_can_store):
+        url = self.first.get_absolute_url()
+        self.get(url)
+        self.first.skills.add(Skill.objects.create(name="Rust"))
+        self.assertContains(self.get(url), "Rust")
+
+    def test_m2m_changes_purge_the_listing(self, mock_can_store):
+        listing = reverse('portfolio:all_projects')
+        skill = Skill.objects.create(name="Haskell")
+        topic = ProjectTopic.objects.create(name="Compilers")
+        self.get(listing)
+        self.first.skills.add(skill)
+        response = self.get(listing)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, f'?skill={skill.slug}"')
+        topic.projects.add(self.second) # Reverse side
+        response = self.get(listing)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, reverse('topics:topic_detail', kwargs={'topic_slug': topic.slug}))
+
+    @override_settings(SEARCH_INDEX_DIR=os.path.join(tempfile.gettempdir(), 'portfolio-test-search-index'))
+    def test_new_matches_purge_empty_search_results(self, mock_can_store):
+        shutil.rmtree(settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        search_index.reset()
+        self.addCleanup(search_index.reset)
+        search_index.rebuild(persist=True) # Already loaded: the search itself runs no SQL
+        url = reverse('portfolio:search_results')
+        self.assertEqual(self.get(url, q="robotics")['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.get(url, q="robotics")['X-Page-Cache'], 'HIT')
+        Skill.objects.create(name="Robotics")
+        response = self.get(url, q="robotics")
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, "Robotics")
+
+    def test_profile_changes_purge_pages_using_it(self, mock_can_store):
+        UserProfile.objects.create(site_identifier="main_profile", full_name="Old Name")
+        url = reverse('portfolio:privacy_policy')
+        self.get(url)
+        profile = UserProfile.objects.get()
+        profile.full_name = "New Name"
+        profile.save()
+        self.assertContains(self.get(url), "New Name")
+
+    def test_bookkeeping_tables_are_not_tracked(self, mock_can_store):
+        from django.contrib.sessions.models import Session
+        from django.db.migrations.recorder import MigrationRecorder
+        for model in (MigrationRecorder.Migration, Session, User, RequestProfile):
+            self.assertFalse(page_cache._tracked(model), model)
+        self.assertTrue(page_cache._tracked(Project))
+
+    def test_query_strings_are_normalised(self, mock_can_store):
+        request_factory = RequestFactory()
+        a = request_factory.get('/search/', {'q': 'x', 'page': '2', 'utm_source': 'newsletter'})
+        b = request_factory.get('/search/?page=2&q=x')
+        c = request_factory.get('/search/', {'q': 'y', 'page': '2'})
+        self.assertEqual(cache_key(a), cache_key(b))
+        self.assertNotEqual(cache_key(a), cache_key(c))
+
+    def test_pages_with_csrf_forms_are_not_stored(self, mock_can_store):
+        url = reverse('portfolio:contact')
+        self.get(url)
+        self.assertNotIn('X-Page-Cache', self.get(url))
+
+    def test_authenticated_visitors_bypass_the_cache(self, mock_can_store):
+        url = self.first.get_absolute_url()
+        self.get(url)
+        user = User.objects.create_user(username="member", password="pw-12345")
+        self.client.force_login(user)
+        self.assertNotIn('X-Page-Cache', self.get(url))
+
+    def test_disabled_cache_is_transparent(self, mock_can_store):
+        with override_settings(PAGE_CACHE_ENABLED=False):
+            url = self.first.get_absolute_url()
+            self.get(url)
+            self.assertNotIn('X-Page-Cache', self.get(url))
+
+
+class RequestMetricsTests(TestCase):
+    """Tests for Server-Timing headers and the /metrics endpoint."""
+    def setUp(self):
+        self.metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.metrics_dir, ignore_errors=True)
+        settings_override = override_settings(METRICS_DIR=self.metrics_dir, METRICS_TOKEN='scrape-token')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        request_metrics.store.reset()
+        self.addCleanup(request_metrics.store.reset)
+        Project.objects.create(title="Timed Project", description="Measured.")
+
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_response_has_server_timing(self):
+        response = self.client.get(reverse('portfolio:all_projects'), HTTP_HOST='localhost')
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'cp;dur=', 'tpl;dur=', 'view;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertNotIn('desc="0 queries"', timing)
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_server_timing_is_only_sent_to_staff_when_disabled(self):
+        response = self.client.get(reverse('portfolio:all_projects'), HTTP_HOST='localhost')
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.client.force_login(User.objects.create_user(username="staff", password="pw-12345", is_staff=True))
+        response = self.client.get(reverse('portfolio:all_projects'), HTTP_HOST='localhost')
+        self.assertTrue(response.has_header('Server-Timing'))
+
+    def test_metrics_require_staff_or_token(self):
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_HOST='localhost').status_code, 401)
+        response = self.client.get(reverse('metrics'), HTTP_HOST='localhost', HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, 401)
+        self.client.force_login(User.objects.create_user(username="staff", password="pw-12345", is_staff=True))
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_HOST='localhost').status_code, 200)
+
+    def test_metrics_add_up_every_worker_file(self):
+        self.client.get(reverse('portfolio:all_projects'), HTTP_HOST='localhost')
+        other = request_metrics.MetricsStore()
+        other.record('portfolio:all_projects', 'GET', 200, request_metrics.RequestTimings())
+        with open(os.path.join(self.metrics_dir, 'metrics-999999.json'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps(other.snapshot()))
+        response = self.client.get(reverse('metrics'), HTTP_HOST='localhost', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('portfolio_requests_total{route="portfolio:all_projects",method="GET",status="200"} 2', body)
+        self.assertIn('portfolio_request_duration_seconds_count{route="portfolio:all_projects"} 2', body)
+        self.assertIn('portfolio_db_queries_bucket{route="portfolio:all_projects",le="+Inf"} 2', body)
+
+    def test_files_of_exited_workers_are_folded_together(self):
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        other = request_metrics.MetricsStore()
+        other.record('portfolio:all_projects', 'GET', 200, request_metrics.RequestTimings())
+        with open(os.path.join(self.metrics_dir, f'metrics-{exited.pid}.json'), 'w', encoding='utf-8') as f:
+            f.write(json.dumps(other.snapshot()))
+        for expected in (2, 3): # The retired count survives later scrapes
+            self.client.get(reverse('portfolio:all_projects'), HTTP_HOST='localhost')
+            body = self.client.get(reverse('metrics'), HTTP_HOST='localhost', HTTP_AUTHORIZATION='Bearer scrape-token').content.decode()
+            self.assertIn(f'portfolio_requests_total{{route="portfolio:all_projects",method="GET",status="200"}} {expected}', body)
+        self.assertEqual(sorted(name for name in os.listdir(self.metrics_dir) if name.endswith('.json')),
+                         [f'metrics-{os.getpid()}.json', request_metrics.RETIRED_FILE])
+
+
+class ProfilingTests(TestCase):
+    """Tests for the opt-in sampling profiler and its admin flame graphs."""
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        settings_override = override_settings(PROFILING_ENABLED=True, PROFILING_DIR=self.profile_dir, PROFILING_INTERVAL_MS=1)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # One deterministic sample, taken in the request thread when profiling starts
+        self.sampler_patch = patch.object(profiling.sampler, 'start', side_effect=lambda collector: collector.add(sys._getframe()))
+        self.sampler_patch.start()
+        self.addCleanup(self.sampler_patch.stop)
+
+    def get(self, **headers):
+        return self.client.get(reverse('portfolio:all_projects'), HTTP_HOST='localhost', **headers)
+
+    def test_signed_header_records_a_profile(self):
+        self.get(HTTP_X_PROFILE=profiling.make_token())
+        profile = RequestProfile.objects.get()
+        self.assertEqual((profile.route, profile.trigger, profile.status_code), ('portfolio:all_projects', 'header', 200))
+        data = profiling.load_profile(profile.file_name)
+        self.assertEqual(data['route'], 'portfolio:all_projects')
+        self.assertEqual(sum(count for _, count in data['stacks']), profile.sample_count)
+
+    def test_requests_are_not_profiled_without_a_trigger(self):
+        self.get(HTTP_X_PROFILE='forged-token')
+        self.get()
+        with override_settings(PROFILING_SLOW_MS=60_000):
+            self.get()
+        self.assertFalse(RequestProfile.objects.exists())
+
+    def test_sampled_and_slow_requests_are_profiled(self):
+        with override_settings(PROFILING_SAMPLE_RATE=1.0):
+            self.get()
+        with override_settings(PROFILING_SLOW_MS=0.001):
+            self.get()
+        self.assertEqual(sorted(RequestProfile.objects.values_list('trigger', flat=True)), ['sample', 'slow'])
+
+    def test_sampler_collects_stacks_of_registered_threads(self):
+        self.sampler_patch.stop() # The real sampler thread
+        collector = profiling.StackCollector(None)
+        profiling.sampler.start(collector)
+        deadline = time.perf_counter() + 0.2
+        while not collector.samples and time.perf_counter() < deadline:
+            sum(range(1000))
+        profiling.sampler.stop()
+        self.assertGreater(collector.samples, 0)
+        samples = collector.samples
+        time.sleep(0.02)
+        self.assertEqual(collector.samples, samples) # Nothing is added once stop() returned
+        self.assertIn('test_sampler_collects_stacks_of_registered_threads', [frame[0].rsplit('.', 1)[-1] for frame in collector.profile()['frames']])
+
+    def test_admin_shows_flame_graph_and_delete_removes_the_file(self):
+        self.get(HTTP_X_PROFILE=profiling.make_token())
+        profile = RequestProfile.objects.get()
+        self.client.force_login(User.objects.create_superuser('profiler', 'profiler@example.com', 'pw-12345'))
+        response = self.client.get(reverse('admin:portfolio_requestprofile_change', args=[profile.pk]), HTTP_HOST='localhost')
+        self.assertContains(response, '<svg')
+        self.assertContains(self.client.get(reverse('admin:portfolio_requestprofile_changelist'), HTTP_HOST='localhost'), 'X-Profile')
+        profile.delete()
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+
+class StaticExportTests(TestCase):
+    """Tests for the incremental pre-rendered HTML export."""
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output, ignore_errors=True)
+        self.first = Project.objects.create(title="First Project", description="One.")
+        self.second = Project.objects.create(title="Second Project", description="Two.")
+        self.paths = [self.first.get_absolute_url(), self.second.get_absolute_url()]
+
+    def export(self, paths=None, **kwargs):
+        return export_site(self.output, host='testserver', paths=paths or self.paths, **kwargs)
+
+    def test_output_file_layout(self):
+        self.assertEqual(output_file('/'), 'index.html')
+        self.assertEqual(output_file('/projects/a-b/'), 'projects/a-b/index.html')
+        with self.assertRaises(ValueError):
+            output_file('/projects/../../etc/')
+
+    def test_sitemap_paths_include_projects(self):
+        paths = sitemap_paths()
+        self.assertIn(reverse('portfolio:index'), paths)
+        self.assertIn(self.first.get_absolute_url(), paths)
+
+    def test_export_writes_pages_and_manifest(self):
+        result = self.export()
+        self.assertEqual(sorted(result.written), sorted(self.paths))
+        with open(os.path.join(self.output, output_file(self.first.get_absolute_url())), encoding='utf-8') as f:
+            self.assertIn("First Project", f.read())
+        self.assertTrue(os.path.exists(os.path.join(self.output, MANIFEST_NAME)))
+        self.assertEqual(sorted(self.export().up_to_date), sorted(self.paths))
+
+    def test_only_pages_with_changed_rows_are_rendered_again(self):
+        self.export()
+        self.first.title = "Renamed Project"
+        self.first.save()
+        result = self.export()
+        self.assertEqual(result.written, [self.first.get_absolute_url()])
+        self.assertEqual(result.up_to_date, [self.second.get_absolute_url()])
+        with open(os.path.join(self.output, output_file(self.first.get_absolute_url())), encoding='utf-8') as f:
+            self.assertIn("Renamed Project", f.read())
+
+    def test_force_and_missing_files_render_again(self):
+        self.export()
+        os.remove(os.path.join(self.output, output_file(self.second.get_absolute_url())))
+        self.assertEqual(self.export().written, [self.second.get_absolute_url()])
+        result = self.export(force=True)
+        self.assertEqual(sorted(result.unchanged), sorted(self.paths))
+
+    def test_pages_leaving_the_sitemap_are_removed(self):
+        self.export()
+        result = self.export(paths=self.paths[:1])
+        self.assertEqual(result.removed, [self.second.get_absolute_url()])
+        self.assertFalse(os.path.exists(os.path.join(self.output, output_file(self.second.get_absolute_url()))))
+
+    def test_pages_with_forms_are_not_exported(self):
+        result = self.export(paths=[reverse('portfolio:contact')])
+        self.assertEqual(result.skipped, [reverse('portfolio:contact')])
+        self.assertFalse(os.path.exists(os.path.join(self.output, output_file(reverse('portfolio:contact')))))
+
+
+@override_settings(SEARCH_INDEX_DIR=os.path.join(tempfile.gettempdir(), 'portfolio-test-search-index'))
+class RouteBenchmarkTests(TestCase):
+    """Tests for the HTTP benchmark helpers behind benchmark_routes."""
+    def setUp(self):
+        self.sitemap_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.sitemap_dir, ignore_errors=True)
+        self.addCleanup(search_index.reset)
+        self.counts = benchmark.seed(scale=0.1)
+
+    def test_seed_writes_the_scaled_catalogue(self):
+        self.assertEqual(Project.objects.count(), self.counts['projects'])
+        self.assertEqual(ProjectCard.objects.count(), self.counts['projects'])
+        self.assertTrue(Project.objects.filter(skills__isnull=False).exists())
+        self.assertTrue(UserProfile.objects.filter(site_identifier="main_profile").exists())
+
+    def test_routes_cover_public_pages_with_sampled_details(self):
+        routes = benchmark.discover_routes()
+        for name in ('portfolio:index', 'portfolio:all_projects', 'blog:blog_post_list', 'skills:skill_list',
+                     'topics:topic_list', 'demos:all_demos_list', 'recommendations:recommendation_list',
+                     'portfolio:project_detail', 'blog:blog_post_detail', 'sitemap_section'):
+            self.assertIn(name, routes)
+        self.assertEqual(routes[f"portfolio:search_results?q={benchmark.SEARCH_QUERY}"],
+                         f"{reverse('portfolio:search_results')}?q={benchmark.SEARCH_QUERY}")
+        self.assertFalse(any(path.startswith(('/admin/', '/accounts/')) for path in routes.values()))
+
+    def test_measure_route_reports_latency_queries_and_size(self):
+        with override_settings(PAGE_CACHE_ENABLED=False, SITEMAP_DIR=self.sitemap_dir):
+            row = benchmark.measure_route(Client(HTTP_HOST='localhost'), reverse('portfolio:all_projects'), iterations=3, warmup=0)
+        self.assertEqual(row['status'], 200)
+        self.assertGreater(row['bytes'], 0)
+        self.assertGreater(row['queries'], 0)
+        self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+
+    def test_compare_flags_regressions_beyond_the_threshold(self):
+        before = {'status': 200, 'bytes': 1000, 'p95_ms': 10.0, 'queries': 3, 'peak_kb': 100.0}
+        baseline = {'routes': {'page': before, 'other': before}}
+        current = {'routes': {
+            'page': dict(before, p95_ms=20.0, queries=5),
+            'other': dict(before, p95_ms=11.0, bytes=1100),
+            'new': dict(before, status=500),
+        }}
+        regressions = benchmark.compare(current, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(message.startswith('page:') for message in regressions))
+
+
+@override_settings(SEARCH_INDEX_DIR=os.path.join(tempfile.gettempdir(), 'portfolio-test-search-index'))
+class SitemapFilesTests(TestCase):
+    """Tests for the precomputed, gzip-compressed sitemap files."""
+    def setUp(self):
+        # Commit callbacks run here also publish search index snapshots
+        self.addCleanup(shutil.rmtree, settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        search_index.reset()
+        self.addCleanup(search_index.reset)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings_override = override_settings(SITEMAP_DIR=directory, SITEMAP_DOMAIN='example.com', SITEMAP_PROTOCOL='https')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.directory = directory
+        self.project = Project.objects.create(title="Sitemap Project", description="One.")
+
+    def read_section(self, section, domain='example.com'):
+        with gzip.open(os.path.join(self.directory, domain, sitemap_files.section_filename(section)), 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def test_write_sitemaps_writes_index_and_compressed_sections(self):
+        written = sitemap_files.write_sitemaps()
+        self.assertIn('sitemap.xml', written)
+        self.assertIn('sitemap-projects.xml.gz', written)
+        self.assertIn(f"https://example.com{self.project.get_absolute_url()}", self.read_section('projects'))
+        with open(os.path.join(self.directory, 'example.com', 'sitemap.xml'), encoding='utf-8') as f:
+            self.assertIn("<loc>https://example.com/sitemap-projects.xml.gz</loc>", f.read())
+        self.assertEqual(sitemap_files.write_sitemaps(), [])
+
+    def test_saves_mark_only_their_sections_dirty(self):
+        self.assertIn('projects', sitemap_files.sections_for_model(Project))
+        self.assertFalse(sitemap_files.sections_for_model(User))
+        sitemap_files.write_sitemaps()
+        with self.captureOnCommitCallbacks(execute=True):
+            added = Project.objects.create(title="Added Project", description="Two.")
+        self.assertEqual(sitemap_files.dirty_sections('example.com'), ['projects'])
+        sitemap_files.refresh('example.com')
+        self.assertEqual(sitemap_files.dirty_sections('example.com'), [])
+        self.assertIn(added.get_absolute_url(), self.read_section('projects'))
+
+    def test_views_serve_the_files(self):
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/xml')
+        self.assertIn(b"https://example.com/sitemap-projects.xml.gz", b"".join(response.streaming_content))
+        self.assertEqual(self.client.get('/sitemap.xml', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        section = self.client.get('/sitemap-projects.xml.gz')
+        self.assertEqual(section['Content-Type'], 'application/gzip')
+        self.assertIn(self.project.get_absolute_url().encode(), gzip.decompress(b"".join(section.streaming_content)))
+        self.assertEqual(self.client.get('/sitemap-missing.xml.gz').status_code, 404)
+
+    @override_settings(SITEMAP_DOMAIN='', ALLOWED_HOSTS=['portfolio.example', 'other.example'])
+    def test_without_a_domain_each_host_gets_its_own_files(self):
+        for host in ('portfolio.example', 'other.example'):
+            response = self.client.get('/sitemap.xml', HTTP_HOST=host)
+            self.assertIn(f"https://{host}/sitemap-projects.xml.gz".encode(), b"".join(response.streaming_content))
+        with self.captureOnCommitCallbacks(execute=True):
+            added = Project.objects.create(title="Added Project", description="Two.")
+        for host in ('portfolio.example', 'other.example'):
+            self.assertEqual(sitemap_files.dirty_sections(host), ['projects'])
+            self.client.get('/sitemap.xml', HTTP_HOST=host)
+            self.assertIn(f"https://{host}{added.get_absolute_url()}", self.read_section('projects', host))
+        with self.assertRaises(CommandError):
+            call_command('generate_sitemaps', stdout=StringIO())
+
+
+class FragmentCacheTests(TestCase):
+    GRID = Template(
+        "{% load fragment_cache %}{% cachefragment 'test_grid' projects %}"
+        "{% for project in projects %}{% cachefragment 'test_card' project %}"
+        "[{{ project.title }}:{% for skill in project.skills.all %}{{ skill.name }}{% endfor %}]"
+        "{% endcachefragment %}{% endfor %}{% endcachefragment %}"
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.skill = Skill.objects.create(name="Fragment Skill")
+        cls.projects = [Project.objects.create(title=f"Fragment {i}", description="Card.") for i in range(3)]
+        cls.projects[0].skills.add(cls.skill)
+
+    def setUp(self):
+        cache.clear()
+
+    def render(self):
+        projects = Project.objects.filter(title__startswith="Fragment").order_by('pk').prefetch_related('skills')
+        with patch('portfolio.page_cache.recording', wraps=page_cache.recording) as mock_recording:
+            html = self.GRID.render(Context({'projects': projects}))
+        return html, mock_recording.call_count # One recording per fragment rendered
+
+    def test_versions_include_loaded_relations_without_queries(self):
+        project = Project.objects.prefetch_related('skills').get(pk=self.projects[0].pk)
+        with self.assertNumQueries(0):
+            before = fragment_cache.version(project)
+        Skill.objects.filter(pk=self.skill.pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+        project = Project.objects.prefetch_related('skills').get(pk=self.projects[0].pk)
+        self.assertNotEqual(fragment_cache.version(project), before)
+
+    def test_editing_one_card_renders_only_it_and_its_grid(self):
+        html, misses = self.render()
+        self.assertEqual(misses, 4)
+        self.assertIn("[Fragment 0:Fragment Skill]", html)
+        self.assertEqual(self.render(), (html, 0))
+        self.projects[1].title = "Fragment One"
+        self.projects[1].save()
+        html, misses = self.render()
+        self.assertEqual(misses, 2)
+        self.assertIn("[Fragment One:]", html)
+
+    def test_hits_add_the_recorded_dependencies_to_the_page(self):
+        self.render()
+        with page_cache.recording() as recorder:
+            self.render()
+        self.assertIn(page_cache.table_tag(Project._meta.db_table), recorder.all_tags())
+
+    @override_settings(FRAGMENT_CACHE_ENABLED=False)
+    def test_disabled_cache_always_renders(self):
+        self.render()
+        # Not a new version (update() skips auto_now), but nothing was cached
+        Project.objects.filter(pk=self.projects[2].pk).update(title="Fragment Two")
+        html, misses = self.render()
+        self.assertEqual(misses, 0)
+        self.assertIn("[Fragment Two:]", html)
+
+
+class ConditionalGetTests(TestCase):
+    """Tests for ETag/Last-Modified validators and 304 responses on model-backed pages."""
+    def setUp(self):
+        profile_cache.invalidate()
+        self.skill = Skill.objects.create(name="Conditional Skill")
+        self.project = Project.objects.create(title="Conditional Project", description="One.")
+        self.project.skills.add(self.skill)
+        self.url = self.project.get_absolute_url()
+
+    def test_models_track_updated_at(self):
+        for model in (Project, Certificate, Skill, SkillCategory, ProjectTopic, ColophonEntry):
+            self.assertEqual(timestamp_field(model), 'updated_at', model)
+        before = self.project.updated_at
+        self.project.title = "Renamed"
+        self.project.save()
+        self.assertGreater(self.project.updated_at, before)
+
+    def test_matching_validators_get_304_without_rendering(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        with patch('portfolio.views.render') as mock_render:
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+            since = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(since.status_code, 304)
+        mock_render.assert_not_called()
+
+    def test_validators_change_with_the_rows_shown(self):
+        etag = self.client.get(self.url)['ETag']
+        self.project.skills.remove(self.skill) # Link changes touch no timestamp
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        etag = self.client.get(self.url)['ETag']
+        self.project.title = "Renamed Project"
+        self.project.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Renamed Project")
+
+    def test_list_pages_have_validators(self):
+        for url in (reverse('portfolio:all_projects'), reverse('portfolio:certificates'), reverse('portfolio:colophon'),
+                    reverse('skills:skill_list'), self.skill.get_absolute_url(), reverse('topics:topic_list')):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304, url)
+
+    def test_authenticated_visitors_get_no_validators(self):
+        self.client.force_login(User.objects.create_user(username="member", password="pw-12345"))
+        self.assertFalse(self.client.get(self.url).has_header('ETag'))
+
+
+class ImportDataCommandTests(TestCase):
+    """Tests for import_data, comparing the row-by-row and --bulk modes."""
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+
+    def write_csv(self, name, text):
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def projects_csv(self, name, rows):
+        # The text columns below are NOT NULL, so every row fills them
+        header = "title,description,skills,topics,order,is_featured,results_metrics,challenges,lessons_learned,code_snippet,code_language\n"
+        return self.write_csv(name, header + "".join(f"{row},Results.,Challenges.,Lessons.,print(1),python\n" for row in rows))
+
+    def import_all(self, bulk, projects_csv=None):
+        options = {'update': True, 'bulk': bulk, 'stdout': StringIO()}
+        call_command('import_data', self.write_csv('skills.csv', "name,category_name,description,order\nPython,Languages,Language.,1\nDjango,Frameworks,Framework.,2\nSQL,Languages,Queries.,3\n"), model_type='skills', unique_field='name', **options)
+        call_command('import_data', self.write_csv('topics.csv', "name,description,order\nWeb Development,Web.,1\nMachine Learning,ML.,2\n"), model_type='topics', unique_field='name', **options)
+        out = StringIO()
+        options['stdout'] = out
+        call_command('import_data', projects_csv or self.projects_csv('projects.csv', [
+            "Portfolio Site,A *Django* site.,\"Python, django\",Web Development,1,True",
+            "Model Zoo,Some **models**.,\"Python, Unknown Skill\",machine-learning,2,False",
+            "Portfolio Site!,Same slug base.,SQL,,3,False",
+        ]), model_type='projects', unique_field='title', **options)
+        return out.getvalue()
+
+    def snapshot(self):
+        return sorted(
+            (p.title, p.slug, p.description, p.order, p.is_featured,
+             tuple(sorted(p.skills.values_list('name', flat=True))), tuple(sorted(p.topics.values_list('name', flat=True))))
+            for p in Project.objects.all()
+        ), sorted(Skill.objects.values_list('name', 'slug', 'category__name'))
+
+    def test_bulk_import_matches_row_by_row_import(self):
+        self.import_all(bulk=False)
+        expected = self.snapshot()
+        Project.objects.all().delete(); Skill.objects.all().delete(); SkillCategory.objects.all().delete(); ProjectTopic.objects.all().delete()
+        output = self.import_all(bulk=True)
+        self.assertEqual(self.snapshot(), expected)
+        self.assertIn("Created: 3, Updated: 0, Skipped: 0, Unchanged: 0", output)
+        self.assertIn("Unknown Skill' not found", output)
+        self.assertIn('<em>Django</em>', Project.objects.get(title="Portfolio Site").rendered_markdown['description']['html'])
+        # Bulk writes send no signals, so the importer rebuilds the listing cards itself
+        card = ProjectCard.objects.get(project__title="Portfolio Site")
+        self.assertEqual((card.excerpt, card.skill_count, card.topics[0]['name']), ("A Django site.", 2, "Web Development"))
+
+    def test_bulk_reimport_only_writes_changes(self):
+        self.import_all(bulk=True)
+        self.assertIn("Created: 0, Updated: 0, Skipped: 0, Unchanged: 3", self.import_all(bulk=True))
+        changed = self.projects_csv('projects_changed.csv', ["Portfolio Site,A *Wagtail* site.,SQL,Web Development,1,True"])
+        output = self.import_all(bulk=True, projects_csv=changed)
+        self.assertIn("Created: 0, Updated: 1, Skipped: 0, Unchanged: 0", output)
+        project = Project.objects.get(title="Portfolio Site")
+        self.assertIn('<em>Wagtail</em>', project.rendered_markdown['description']['html'])
+        self.assertEqual(list(project.skills.values_list('name', flat=True)), ['SQL'])
+
+    def test_bulk_import_uses_fewer_queries(self):
+        rows = [f"Project {i},Description {i},\"Python, Django\",Web Development,{i},False" for i in range(30)]
+        projects_csv = self.projects_csv('many_projects.csv', rows)
+        with CaptureQueriesContext(connection) as row_queries:
+            self.import_all(bulk=False, projects_csv=projects_csv)
+        Project.objects.all().delete()
+        with CaptureQueriesContext(connection) as bulk_queries:
+            self.import_all(bulk=True, projects_csv=projects_csv)
+        self.assertEqual(Project.objects.count(), 30)
+        self.assertLess(len(bulk_queries), len(row_queries) / 5)
+
+    @override_settings(SEARCH_INDEX_DIR=os.path.join(tempfile.gettempdir(), 'portfolio-test-search-index'))
+    def test_bulk_import_reindexes_written_rows_only(self):
+        shutil.rmtree(settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, settings.SEARCH_INDEX_DIR, ignore_errors=True)
+        search_index.reset()
+        self.addCleanup(search_index.reset)
+        search_index.rebuild(persist=True)
+        version = search_index._current_version()
+        with patch.object(SearchIndex, 'rebuild') as mock_rebuild, self.captureOnCommitCallbacks(execute=True):
+            self.import_all(bulk=True)
+        mock_rebuild.assert_not_called()
+        self.assertEqual(search_index._current_version(), version) # Appended to the change log
+        project = Project.objects.get(title="Model Zoo")
+        self.assertEqual([key for key, _ in SearchIndex().search("zoo python")], [f"project:{project.pk}"])
+
+class InitialPopulateAllTests(TestCase):
+    """Tests for the manifest-based change detection in initial_populate_all."""
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir, ignore_errors=True)
+        self.categories_csv = os.path.join(self.tmpdir, 'categories.csv')
+        self.skills_csv = os.path.join(self.tmpdir, 'skills.csv')
+        with open(self.categories_csv, 'w', encoding='utf-8') as f:
+            f.write("name,description\nLanguages,Programming languages\n")
+        self.write_skills("Python,Languages,A language.,1\nSQL,Languages,Queries.,2\nRust,Languages,Systems.,3\n")
+
+    def write_skills(self, rows):
+        with open(self.skills_csv, 'w', encoding='utf-8') as f:
+            f.write("name,category_name,description,order\n" + rows)
+
+    def populate(self, *args):
+        out = StringIO()
+        # Only the two configured files exist; every other source fails and is reported as such
+        with override_settings(CSV_FILES={'SKILLCATEGORIES_CSV': self.categories_csv, 'SKILLS_CSV': self.skills_csv}):
+            call_command('initial_populate_all', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def summary_line(self, output, label):
+        return next(line.split() for line in output.splitlines() if line.startswith(label + ' '))
+
+    def test_first_run_imports_everything_and_records_manifest(self):
+        output = self.populate()
+        self.assertEqual(self.summary_line(output, 'Skills')[1:5], ['full', '3', '3', '0'])
+        self.assertEqual(self.summary_line(output, 'Projects')[1], 'failed')
+        self.assertEqual(sorted(Skill.objects.values_list('name', flat=True)), ['Python', 'Rust', 'SQL'])
+        self.assertEqual(sorted(ImportManifest.objects.get(source='Skills').row_hashes), ['Python', 'Rust', 'SQL'])
+        self.assertIn("Total:", output)
+
+    def test_unchanged_files_are_skipped(self):
+        self.populate()
+        with patch('django.core.management.call_command') as mock_call:
+            output = self.populate()
+        mock_call.assert_not_called()
+        self.assertEqual(self.summary_line(output, 'Skills')[1:5], ['unchanged', '3', '0', '0'])
+
+    def test_changed_file_upserts_changed_rows_and_deletes_removed_ones(self):
+        self.populate()
+        untouched = Skill.objects.get(name='Python')
+        Skill.objects.filter(pk=untouched.pk).update(description='Edited in the admin.')
+        self.write_skills("Python,Languages,A language.,1\nSQL,Languages,Structured queries.,2\nGo,Languages,Concurrency.,4\n")
+        output = self.populate()
+        self.assertEqual(self.summary_line(output, 'Skills')[1:5], ['incremental', '3', '2', '1'])
+        self.assertEqual(sorted(Skill.objects.values_list('name', flat=True)), ['Go', 'Python', 'SQL'])
+        self.assertEqual(Skill.objects.get(name='SQL').description, 'Structured queries.')
+        # Rows whose CSV content did not change are not re-imported
+        self.assertEqual(Skill.objects.get(name='Python').description, 'Edited in the admin.')
+
+    def test_force_reimports_unchanged_files(self):
+        self.populate()
+        output = self.populate('--force')
+        self.assertEqual(self.summary_line(output, 'Skills')[1:5], ['full', '3', '3', '0'])
+
+    def test_changed_skills_relink_projects(self):
+        projects_csv = os.path.join(self.tmpdir, 'projects.csv')
+        with open(projects_csv, 'w', encoding='utf-8') as f:
+            f.write("title,description,skills,topics,order,is_featured,results_metrics,challenges,lessons_learned,code_snippet,code_language\n"
+                    "Engine,A game engine.,\"Rust, SQL\",,1,False,Results.,Challenges.,Lessons.,print(1),python\n")
+
+        def populate():
+            out = StringIO()
+            with override_settings(CSV_FILES={'SKILLCATEGORIES_CSV': self.categories_csv, 'SKILLS_CSV': self.skills_csv,
+                                              'PROJECTS_CSV': projects_csv}):
+                call_command('initial_populate_all', stdout=out, stderr=StringIO())
+            return out.getvalue()
+
+        def linked():
+            return sorted(Project.objects.get(title="Engine").skills.values_list('name', flat=True))
+
+        populate()
+        self.assertEqual(linked(), ['Rust', 'SQL'])
+        self.write_skills("Python,Languages,A language.,1\nSQL,Languages,Queries.,2\n")
+        populate()
+        self.assertEqual(linked(), ['SQL'])
+        self.write_skills("Python,Languages,A language.,1\nSQL,Languages,Queries.,2\nRust,Languages,Systems.,3\n")
+        output = populate()
+        self.assertEqual(self.summary_line(output, 'Projects')[1], 'full')
+        self.assertEqual(linked(), ['Rust', 'SQL'])
+        self.assertEqual(self.summary_line(populate(), 'Projects')[1], 'unchanged')
+
+
+# --- Context Processor Tests ---
+@patch.object(VersionedContextCache, 'can_store', return_value=True) # TestCase wraps each test in a transaction
+class UserProfileContextProcessorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = UserProfile.objects.create(full_name="Context User", about_me_markdown="Long *markdown*.")
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        profile_cache.invalidate()
+
+    def test_profile_is_served_from_cache(self, mock_can_store):
+        self.assertEqual(user_profile_context(self.factory.get('/'))['user_profile'], self.profile)
+        with self.assertNumQueries(0):
+            profile = user_profile_context(self.factory.get('/'))['user_profile']
+        self.assertEqual(profile.full_name, "Context User")
+
+    def test_context_profile_is_slim_and_loads_deferred_fields_in_one_query(self, mock_can_store):
+        profile = user_profile_context(self.factory.get('/'))['user_profile']
+        self.assertIn('about_me_markdown', profile.get_deferred_fields())
+        with self.assertNumQueries(1):
+            self.assertEqual(profile.about_me_markdown, "Long *markdown*.")
+            self.assertIsNone(profile.privacy_policy_markdown)
+        # Loading fields on one request's instance must not leak into the cached projection
+        self.assertIn('about_me_markdown', get_context_profile().get_deferred_fields())
+
+    def test_save_invalidates_cached_profile(self, mock_can_store):
+        user_profile_context(self.factory.get('/'))
+        self.profile.full_name = "Renamed User"
+        self.profile.save()
+        self.assertEqual(user_profile_context(self.factory.get('/'))['user_profile'].full_name, "Renamed User")
+
+    def test_delete_invalidates_cached_profile(self, mock_can_store):
+        user_profile_context(self.factory.get('/'))
+        UserProfile.objects.all().delete()
+        with self.assertLogs('portfolio.context_processors', level='WARNING'):
+            self.assertIsNone(user_profile_context(self.factory.get('/'))['user_profile'])
+
+    def test_profile_is_memoised_per_request(self, mock_can_store):
+        request = self.factory.get('/')
+        first = user_profile_context(request)['user_profile']
+        self.assertIs(user_profile_context(request)['user_profile'], first)
+
+
+@patch.object(VersionedContextCache, 'can_store', return_value=True) # TestCase wraps each test in a transaction
+class HomeSnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.skills = [Skill.objects.create(name=f"Snapshot Skill {i}") for i in range(10)]
+        cls.project = Project.objects.create(title="Snapshot Project", description="Shown on the home page.")
+        cls.project.skills.add(cls.skills[0])
+
+    def setUp(self):
+        home_snapshot_cache.invalidate()
+
+    def test_warm_home_page_needs_no_queries(self, mock_can_store):
+        self.client.get(reverse('portfolio:index'), HTTP_HOST='localhost')
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('portfolio:index'), HTTP_HOST='localhost')
+        self.assertContains(response, "Snapshot Project")
+        self.assertEqual(len(response.context['featured_skills']), RANDOM_DISPLAY_COUNT)
+
+    def test_rotations_are_random_picks_of_the_catalogue(self, mock_can_store):
+        snapshot = home_snapshot_cache.get()
+        self.assertEqual(len(snapshot.skill_rotations), ROTATION_COUNT)
+        for rotation in snapshot.skill_rotations:
+            self.assertEqual(len(set(rotation)), RANDOM_DISPLAY_COUNT)
+            self.assertTrue(set(rotation) <= set(self.skills))
+
+    def test_changes_rebuild_the_snapshot(self, mock_can_store):
+        home_snapshot_cache.get()
+        self.project.title = "Renamed Snapshot Project"
+        self.project.save()
+        self.assertEqual(home_snapshot_cache.get().context()['featured_projects'][0].title, "Renamed Snapshot Project")
+        self.project.skills.add(self.skills[1])
+        self.assertEqual(len(home_snapshot_cache.get().context()['featured_projects'][0].skills.all()), 2)
+
+    def test_scheduled_blog_post_is_shown_once_published(self, mock_can_store):
+        if not BLOG_APP_EXISTS:
+            self.skipTest("Blog app not available")
+        post = BlogPost.objects.create(title="Scheduled", content="Soon", status='published', published_date=timezone.now() + timedelta(hours=1))
+        self.assertIsNone(home_snapshot_cache.get().context()['latest_blog_post'])
+        with patch('portfolio.home_snapshot.timezone.now', return_value=timezone.now() + timedelta(hours=2)):
+            self.assertEqual(home_snapshot_cache.get().context()['latest_blog_post'], post)
+
+
+
 # --- Form Tests ---
 class ContactFormTests(TestCase):
     def test_valid_contact_form(self):
@@ -24,6 +24,8 @@ urlpatterns = [
     path('cv/', views.cv_view, name='cv'),
     # Add path for the search results view
     path('search/', views.search_results_view, name='search_results'),
+    # Typeahead suggestions for the search box (JSON)
+    path('search/suggest/', views.search_suggest_view, name='search_suggest'),
     # Add path for the Hire Me page view
     path('hire-me/', views.hire_me_view, name='hire_me'),
     # Add path for the Privacy Policy page view
@@ -7,7 +7,14 @@ import logging
 # Ensure your logger is named consistently, e.g., using __name__
 # or 'portfolio' if that's how you've configured it in settings.LOGGING
 logger = logging.getLogger(__name__)
-from .models import Project, Certificate, ColophonEntry # Assuming UserProfile is handled by context processor
+from .models import Project, ProjectCard, Certificate, ColophonEntry # Assuming UserProfile is handled by context processor
+from .conditional import conditional_page
+from . import page_cache
+from .home_snapshot import home_snapshot_cache
+from .project_cards import attach_cards
+from .search_index import search_index
+from .search_suggest import suggest_index
+from . import search_vectors
 
 # Import models from other apps safely
 try:
@@ -32,82 +39,21 @@ except ImportError:
     ProjectTopic = None
 
 from collections import OrderedDict # To maintain category order if needed
-import random # Import the random module
 
 from django.utils import timezone
 from .forms import ContactForm # Your ContactForm from forms.py
 from django.core.mail import send_mail
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Case, Q, When
+from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
 from django.utils.text import Truncator
 from datetime import datetime, timedelta # For timestamp check
 import smtplib # For more specific SMTP exceptions
 
-# Constants from your original file
-FEATURED_ITEMS_COUNT = 6
-RANDOM_DISPLAY_COUNT = 6
-
 def index(request):
-    """ View function for the home page. """
-    featured_projects = Project.objects.order_by('order', '-date_created')[:FEATURED_ITEMS_COUNT]
-    featured_certificates = Certificate.objects.order_by('order', '-date_issued')[:FEATURED_ITEMS_COUNT]
-
-    latest_blog_post = None
-    if BlogPost:
-        try:
-            latest_blog_post = BlogPost.objects.filter(status='published', published_date__lte=timezone.now()).latest('published_date')
-        except BlogPost.DoesNotExist:
-            latest_blog_post = None
-        except Exception as e:
-            logger.error(f"Error fetching latest blog post: {e}", exc_info=True)
-            latest_blog_post = None
-
-    featured_recommendations = []
-    if RecommendedProduct:
-        try:
-            featured_recommendations = RecommendedProduct.objects.order_by('order', 'name')[:FEATURED_ITEMS_COUNT]
-        except Exception as e:
-            logger.error(f"Error fetching featured recommendations: {e}", exc_info=True)
-
-    featured_skills = []
-    if Skill:
-        try:
-            all_skills = list(Skill.objects.select_related('category').all())
-            if len(all_skills) > RANDOM_DISPLAY_COUNT:
-                featured_skills = random.sample(all_skills, RANDOM_DISPLAY_COUNT)
-            else:
-                featured_skills = all_skills
-        except Exception as e:
-            logger.error(f"Error fetching skills: {e}", exc_info=True)
-
-    featured_topics = []
-    if ProjectTopic:
-        try:
-            all_topics = list(ProjectTopic.objects.all())
-            if len(all_topics) > RANDOM_DISPLAY_COUNT:
-                featured_topics = random.sample(all_topics, RANDOM_DISPLAY_COUNT)
-            else:
-                featured_topics = all_topics
-        except Exception as e:
-            logger.error(f"Error fetching topics: {e}", exc_info=True)
-
-    featured_demos = []
-    if Demo:
-        try:
-            featured_demos = Demo.objects.filter(is_published=True, is_featured=True).order_by('order', 'title')[:FEATURED_ITEMS_COUNT]
-        except Exception as e:
-            logger.error(f"Error fetching featured demos: {e}", exc_info=True)
-
-    context = {
-        'featured_projects': featured_projects,
-        'featured_certificates': featured_certificates,
-        'latest_blog_post': latest_blog_post,
-        'featured_recommendations': featured_recommendations,
-        'featured_topics': featured_topics,
-        'featured_skills': featured_skills,
-        'featured_demos': featured_demos,
-    }
-    return render(request, 'portfolio/index.html', context)
+    """ View function for the home page, served from the precomputed snapshot (see home_snapshot.py). """
+    return render(request, 'portfolio/index.html', home_snapshot_cache.get().context())
 
 
 # If using django-ratelimit, you would import and use its decorator
@@ -220,6 +166,16 @@ def contact_view(request):
     return render(request, 'portfolio/contact_page.html', context)
 
 
+def _project_detail_dependencies(request, slug):
+    dependencies = [Project.objects.filter(slug=slug)]
+    if Skill:
+        dependencies.append(Skill.objects.filter(projects__slug=slug))
+    if ProjectTopic:
+        dependencies.append(ProjectTopic.objects.filter(projects__slug=slug))
+    return dependencies
+
+
+@conditional_page(_project_detail_dependencies)
 def project_detail(request, slug):
     """ View function for a single project detail page. """
     project = get_object_or_404(Project, slug=slug)
@@ -238,6 +194,7 @@ def project_detail(request, slug):
     return render(request, 'portfolio/project_detail.html', context)
 
 
+@conditional_page(lambda request: [Certificate.objects.all()])
 def certificates_view(request):
     """ View function for the certificates page. """
     certificates = Certificate.objects.order_by('order', '-date_issued')
@@ -250,9 +207,19 @@ def certificates_view(request):
     return render(request, 'portfolio/certificates.html', context)
 
 
+def _all_projects_dependencies(request):
+    dependencies = [Project.objects.all(), ProjectCard.objects.all()]
+    if Skill:
+        dependencies.append(Skill.objects.all())
+    if ProjectTopic:
+        dependencies.append(ProjectTopic.objects.all())
+    return dependencies
+
+
+@conditional_page(_all_projects_dependencies)
 def all_projects_view(request):
     """ View function for the page listing all projects with filtering and sorting. """
-    projects_qs = Project.objects.all() # Start with all projects
+    projects_qs = Project.objects.select_related('card') # Cards carry the skills/topics/excerpt shown in the list
     
     selected_skill_slug = request.GET.get('skill', None)
     selected_topic_slug = request.GET.get('topic', None)
@@ -292,7 +259,7 @@ def all_projects_view(request):
         projects_qs = projects_qs.order_by('-date_created') # Fallback to default sort
 
     context = {
-        'projects': projects_qs, # Pass the filtered and sorted queryset
+        'projects': attach_cards(projects_qs), # Filtered and sorted projects, each with its card
         'skills_list': skills_list,
         'topics_list': topics_list,
         'selected_skill_slug': selected_skill_slug,
@@ -321,52 +288,81 @@ def cv_view(request):
     }
     return render(request, 'portfolio/cv_page.html', context=context)
 
+def _ranked(queryset, pks):
+    """ Filters a queryset to ``pks`` and keeps their order (best search match first). """
+    if not pks:
+        return queryset.none()
+    return queryset.filter(pk__in=pks).order_by(Case(*[When(pk=pk, then=position) for position, pk in enumerate(pks)]))
+
+
 def search_results_view(request):
+    """
+    Site search: PostgreSQL full-text search on the stored search vectors when the
+    database supports it (search_vectors.py), otherwise the in-process BM25 index
+    (search_index.py). Both return each section best match first.
+    """
     query = request.GET.get('q', '')
     
     projects_found = Project.objects.none()
     # Ensure skills_found and topics_found are initialized correctly based on app existence
     skills_found = Skill.objects.none() if Skill else None 
     topics_found = ProjectTopic.objects.none() if ProjectTopic else None
-    
-    if query:
-        # Search Projects
-        projects_q_filter = Q(title__icontains=query) | Q(description__icontains=query)
-        if Skill and hasattr(Project, 'skills'): # Check if skills relationship exists
-            projects_q_filter |= Q(skills__name__icontains=query)
-        if ProjectTopic and hasattr(Project, 'topics'): # Check if topics relationship exists
-            projects_q_filter |= Q(topics__name__icontains=query)
-        
-        projects_found = Project.objects.filter(projects_q_filter).distinct().order_by('-date_created')
-
+    blog_posts_found = demos_found = recommendations_found = None
 
-        # Search Skills (if Skill model is available)
+    if query:
+        limit = getattr(settings, 'SEARCH_RESULTS_LIMIT', 100)
+        if search_vectors.postgres_search_enabled():
+            def find(doc_type, queryset):
+                return search_vectors.ranked(queryset, doc_type, query, limit)
+        else:
+            results = search_index.search_grouped(query, limit=limit)
+            def find(doc_type, queryset):
+                return _ranked(queryset, results[doc_type])
+        def rank(doc_type, queryset):
+            # A section without hits runs no SQL: a new matching row must still drop the cached page
+            page_cache.add_tags(page_cache.table_tag(queryset.model._meta.db_table))
+            return find(doc_type, queryset)
+        projects_found = attach_cards(rank('project', Project.objects.select_related('card')))
         if Skill:
-            skills_found = Skill.objects.filter(
-                Q(name__icontains=query) |
-                Q(description__icontains=query) |
-                Q(category__name__icontains=query) # Search by category name
-            ).distinct().select_related('category').order_by('name')
-
-        # Search Topics (if ProjectTopic model is available)
+            skills_found = rank('skill', Skill.objects.select_related('category'))
         if ProjectTopic:
-            topics_found = ProjectTopic.objects.filter(
-                Q(name__icontains=query) |
-                Q(description__icontains=query)
-            ).distinct().order_by('name')
-            
+            topics_found = rank('topic', ProjectTopic.objects.all())
+        # Indexed rows are re-filtered in case the index lags behind an unpublish
+        if BlogPost:
+            blog_posts_found = rank('blogpost', BlogPost.objects.filter(status='published'))
+        if Demo:
+            demos_found = rank('demo', Demo.objects.filter(is_published=True))
+        if RecommendedProduct:
+            recommendations_found = rank('recommendation', RecommendedProduct.objects.all())
+
     context = {
         'query': query,
         'projects': projects_found,
         'skills': skills_found,
         'topics': topics_found,
+        'blog_posts': blog_posts_found,
+        'demos': demos_found,
+        'recommendations': recommendations_found,
         'page_title': f'Search Results for "{query}"' if query else 'Search',
-        'meta_description': f"Search results for '{query}' in projects, skills, and topics." if query else "Search the portfolio content.",
+        'meta_description': f"Search results for '{query}' in projects, skills, topics, blog posts, demos and recommendations." if query else "Search the portfolio content.",
         'meta_keywords': f"search, results, {query.lower() if query else ''}, portfolio",
     }
     return render(request, 'portfolio/search_results.html', context)
 
 
+def search_suggest_view(request):
+    """ Typeahead JSON for the search box: title prefixes answered from memory by search_suggest.py. """
+    query = request.GET.get('q', '')
+    max_results = getattr(settings, 'SEARCH_SUGGEST_LIMIT', 8)
+    try:
+        limit = min(max(int(request.GET.get('limit', max_results)), 1), max_results)
+    except ValueError:
+        limit = max_results
+    response = JsonResponse({'query': query, 'suggestions': suggest_index.suggest(query, limit)})
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'SEARCH_SUGGEST_MAX_AGE', 60))
+    return response
+
+
 def hire_me_view(request):
     context = {
         'page_title': 'Hire Me - Services & Availability',
@@ -405,6 +401,7 @@ def terms_and_conditions_view(request):
     }
     return render(request, 'portfolio/terms_and_conditions.html', context=context)
 
+@conditional_page(lambda request: [ColophonEntry.objects.all()])
 def colophon_page(request):
     """
     View to display the Colophon page, detailing how the site was built.
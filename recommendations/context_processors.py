@@ -2,6 +2,8 @@
 
 import logging # Import the logging module
 
+from portfolio.context_cache import VersionedContextCache
+
 # Import the model safely in case the app isn't always installed
 try:
     from .models import RecommendedProduct
@@ -12,15 +14,25 @@ except ImportError:
 # Get an instance of a logger
 logger = logging.getLogger(__name__)
 
+
+def _count_recommendations():
+    return RecommendedProduct.objects.count()
+
+
+# Invalidated by the RecommendedProduct post_save/post_delete receivers in recommendations/signals.py
+recommendation_count_cache = VersionedContextCache('recommendation_count', _count_recommendations)
+
+
 def recommendation_context(request):
     """
     Adds the count of recommended products to the template context.
+    The count is served from a versioned in-process cache instead of a COUNT query per request.
     """
     count = 0
     if RECOMMENDATIONS_APP_AVAILABLE:
         try:
             # Get the count of products
-            count = RecommendedProduct.objects.count()
+            count = recommendation_count_cache.get()
         except Exception as e:
             # Handle potential database errors gracefully if needed
             logger.warning(f"Could not query RecommendedProduct count: {e}") # Changed print to logger.warning
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationsection',
+            name='rendered_markdown',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Cache of rendered HTML for Markdown fields, keyed by field name.'),
+        ),
+        migrations.AddField(
+            model_name='recommendedproduct',
+            name='rendered_markdown',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Cache of rendered HTML for Markdown fields, keyed by field name.'),
+        ),
+    ]
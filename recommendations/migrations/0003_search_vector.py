@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:25
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# GIN index for the full-text search column; other databases have no use for it
+def create_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE INDEX IF NOT EXISTS "recommendations_recommendedproduct_search_vector_gin" ON "recommendations_recommendedproduct" USING gin ("search_vector")')
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS "recommendations_recommendedproduct_search_vector_gin"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recommendations', '0002_rendered_markdown_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendedproduct',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted full-text vector (PostgreSQL search, see portfolio/search_vectors.py).', null=True),
+        ),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+    ]
@@ -1,10 +1,15 @@
 # recommendations/models.py
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.utils.text import slugify
 from django.urls import reverse
 
-class RecommendedProduct(models.Model):
+from portfolio.markdown_cache import MarkdownCacheMixin
+from portfolio.slugs import assign_unique_slug
+
+class RecommendedProduct(MarkdownCacheMixin, models.Model):
     """ Represents a recommended product (book, tool, course, etc.), populated from CSVs. """
+    markdown_fields = ('main_description_md', 'short_description', 'page_meta_description')
+
     name = models.CharField(max_length=200, help_text="Name of the product (from summary CSV 'name').")
     slug = models.SlugField(
         max_length=220,
@@ -64,6 +69,7 @@ class RecommendedProduct(models.Model):
 
     date_created = models.DateTimeField(auto_now_add=True)
     last_updated = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Weighted full-text vector (PostgreSQL search, see portfolio/search_vectors.py).")
 
     class Meta:
         ordering = ['order', 'name'] # Default ordering
@@ -81,31 +87,14 @@ class RecommendedProduct(models.Model):
         The population script should ideally provide the slug from 'reco_slug'.
         This save method ensures slugs are always valid and unique if created/edited via admin.
         """
-        if not self.slug: # If slug is somehow empty, generate from name
-            base_slug = slugify(self.name)
-        else: # Ensure provided slug is properly slugified
-            base_slug = slugify(self.slug)
-
-        candidate_slug = base_slug
-        counter = 1
-        # Check for uniqueness, excluding self if this is an update
-        qs = RecommendedProduct.objects.filter(slug=candidate_slug)
-        if self.pk:
-            qs = qs.exclude(pk=self.pk)
-
-        while qs.exists():
-            candidate_slug = f"{base_slug}-{counter}"
-            counter += 1
-            qs = RecommendedProduct.objects.filter(slug=candidate_slug) # Re-check with new candidate
-            if self.pk: # Ensure to keep excluding self in loop
-                qs = qs.exclude(pk=self.pk)
-
-        self.slug = candidate_slug
+        assign_unique_slug(self, 'name')
         super().save(*args, **kwargs)
 
 
-class RecommendationSection(models.Model):
+class RecommendationSection(MarkdownCacheMixin, models.Model):
     """ Represents a content section for a detailed recommendation page. """
+    markdown_fields = ('section_content_markdown',)
+
     recommendation = models.ForeignKey(
         RecommendedProduct,
         related_name='sections',
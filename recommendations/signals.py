@@ -0,0 +1,12 @@
+# recommendations/signals.py
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import RecommendedProduct
+from .context_processors import recommendation_count_cache
+
+
+@receiver([post_save, post_delete], sender=RecommendedProduct, dispatch_uid="recommendations_invalidate_count_context")
+def invalidate_recommendation_count(sender, **kwargs):
+    """ Drops the cached recommendation count whenever a product is added, changed or removed. """
+    recommendation_count_cache.invalidate()
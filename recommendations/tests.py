@@ -14,9 +14,10 @@ from .models import RecommendedProduct, RecommendationSection
 from . import views 
 from .admin import RecommendedProductAdmin, RecommendationSectionAdmin, RecommendationSectionInline 
 from .sitemaps import RecommendationStaticViewSitemap, RecommendedProductSitemap 
-from .context_processors import recommendation_context 
+from .context_processors import recommendation_context, recommendation_count_cache
 
 from portfolio.models import UserProfile 
+from portfolio.context_cache import VersionedContextCache
 
 # --- Model Tests ---
 class RecommendedProductModelTests(TestCase):
@@ -491,6 +492,18 @@ class RecommendationContextProcessorTests(TestCase):
         self.assertIn('recommendation_count', context)
         self.assertEqual(context['recommendation_count'], 0)
 
+    @patch.object(VersionedContextCache, 'can_store', return_value=True)
+    def test_recommendation_count_cached_and_invalidated_by_signals(self, mock_can_store):
+        recommendation_count_cache.invalidate()
+        product = RecommendedProduct.objects.create(name="Prod Cached", product_url="url_cached", order=1)
+        self.assertEqual(recommendation_context(self.factory.get('/'))['recommendation_count'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(recommendation_context(self.factory.get('/'))['recommendation_count'], 1)
+        RecommendedProduct.objects.create(name="Prod Cached 2", product_url="url_cached2", order=2)
+        self.assertEqual(recommendation_context(self.factory.get('/'))['recommendation_count'], 2)
+        product.delete()
+        self.assertEqual(recommendation_context(self.factory.get('/'))['recommendation_count'], 1)
+
     @patch('recommendations.context_processors.RECOMMENDATIONS_APP_AVAILABLE', False)
     def test_recommendation_count_app_not_available(self):
         request = self.factory.get('/')
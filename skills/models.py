@@ -1,13 +1,16 @@
 # skills/models.py
 
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.utils.text import slugify
 from django.urls import reverse
 
+from portfolio.slugs import assign_unique_slug
+
 class SkillCategory(models.Model):
     """ Optional: Category for grouping skills """
     name = models.CharField(max_length=100, unique=True)
     order = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order', 'name']
@@ -32,6 +35,8 @@ class Skill(models.Model):
     # proficiency = models.CharField(max_length=50, blank=True, help_text="e.g., Expert, Intermediate, Basic")
     # icon_url = models.URLField(blank=True, null=True)
     order = models.PositiveIntegerField(default=0, help_text="Order within category.")
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Weighted full-text vector (PostgreSQL search, see portfolio/search_vectors.py).")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['category__order', 'category__name', 'order', 'name'] # Order by category, then skill order
@@ -60,25 +65,6 @@ class Skill(models.Model):
         Auto-generate slug if not provided or ensure provided slug is slugified.
         Ensures slug uniqueness.
         """
-        if self.slug: # If a slug is provided, ensure it's in the correct format
-            self.slug = slugify(self.slug)
-        else: # Otherwise, generate from name
-            self.slug = slugify(self.name)
-
-        # Ensure slug uniqueness
-        original_slug = self.slug
-        counter = 1
-        # Check for other instances with the same slug
-        # Exclude self.pk to allow updating an instance without triggering uniqueness conflict with itself
-        queryset = Skill.objects.filter(slug=self.slug)
-        if self.pk:
-            queryset = queryset.exclude(pk=self.pk)
-
-        while queryset.exists():
-            self.slug = f'{original_slug}-{counter}'
-            counter += 1
-            queryset = Skill.objects.filter(slug=self.slug) # Re-check with new slug
-            if self.pk:
-                queryset = queryset.exclude(pk=self.pk)
-
+        # A provided slug is slugified, otherwise it is generated from the name; either way it is made unique
+        assign_unique_slug(self, 'name')
         super().save(*args, **kwargs)
\ No newline at end of file
@@ -11,7 +11,22 @@ except ImportError:
     Demo = None
     DEMOS_APP_ENABLED = False
 
+# Import the project card helper and conditional GET support safely
+try:
+    from portfolio.conditional import conditional_page
+    from portfolio.models import Project, ProjectCard
+    from portfolio.project_cards import attach_cards
+except ImportError:
+    Project, ProjectCard = None, None
+
+    def attach_cards(projects):
+        return projects
+
+    def conditional_page(dependencies):
+        return lambda view: view
 
+
+@conditional_page(lambda request: [SkillCategory.objects.all(), Skill.objects.all()])
 def skill_list(request):
     """ Displays skills grouped by category. """
     # Fetch categories with their related skills prefetched for efficiency
@@ -27,11 +42,20 @@ def skill_list(request):
     return render(request, 'skills/skill_list.html', context)
 
 
+def _skill_detail_dependencies(request, slug):
+    dependencies = [Skill.objects.filter(slug=slug)]
+    if Project:
+        dependencies.append(Project.objects.filter(skills__slug=slug))
+        dependencies.append(ProjectCard.objects.filter(project__skills__slug=slug))
+    return dependencies
+
+
+@conditional_page(_skill_detail_dependencies)
 def skill_detail(request, slug):
     """ Displays details for a single skill, related projects, and related demos. """
-    # Prefetch related projects and their topics for efficiency
-    skill = get_object_or_404(Skill.objects.prefetch_related('projects__topics'), slug=slug)
-    related_projects = skill.projects.all() # Use related_name 'projects' from Project model
+    skill = get_object_or_404(Skill, slug=slug)
+    # Use related_name 'projects' from Project model; cards carry the description excerpt
+    related_projects = attach_cards(skill.projects.select_related('card'))
 
     # Fetch related demos using the related_name 'demos' from Demo model
     related_demos = None
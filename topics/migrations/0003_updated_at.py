@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('topics', '0002_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projecttopic',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
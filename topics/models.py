@@ -1,8 +1,10 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
-from django.utils.text import slugify
 from django.urls import reverse
 
+from portfolio.slugs import assign_unique_slug
+
 # Create your models here.
 
 
@@ -13,6 +15,8 @@ class ProjectTopic(models.Model):
     slug = models.SlugField(max_length=120, unique=True, blank=True)
     description = models.TextField(blank=True, help_text="Optional description of the topic.")
     order = models.PositiveIntegerField(default=0, help_text="Order for display.")
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Weighted full-text vector (PostgreSQL search, see portfolio/search_vectors.py).")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order', 'name']
@@ -23,18 +27,7 @@ class ProjectTopic(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.name)
-        else:
-            # If a slug is provided, ensure it's in a valid slug format.
-            base_slug = slugify(self.slug)
-
-        candidate_slug = base_slug
-        counter = 1
-        while ProjectTopic.objects.filter(slug=candidate_slug).exclude(pk=self.pk).exists():
-            candidate_slug = f"{base_slug}-{counter}"
-            counter += 1
-        self.slug = candidate_slug
+        assign_unique_slug(self, 'name')
         super().save(*args, **kwargs)
 
     # Add get_absolute_url method
@@ -5,12 +5,17 @@ from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from .models import ProjectTopic
 # Import Project model safely for prefetching
 try:
-    from portfolio.models import Project
+    from portfolio.conditional import conditional_page
+    from portfolio.models import Project, ProjectCard
+    from portfolio.project_cards import attach_cards
     PORTFOLIO_APP_EXISTS = True
 except ImportError:
-    Project = None
+    Project, ProjectCard = None, None
     PORTFOLIO_APP_EXISTS = False
 
+    def conditional_page(dependencies):
+        return lambda view: view
+
 # def topic_list(request):
 #     """ Displays a list of all project topics. """
 #     all_topics = ProjectTopic.objects.all() # Fetches all, ordered by Meta
@@ -22,6 +27,7 @@ except ImportError:
 #     }
 #     return render(request, 'topics/topic_list.html', context)
 
+@conditional_page(lambda request: [ProjectTopic.objects.all()])
 def topic_list(request):
     # Get all topic objects, ordered as desired (e.g., by name)
     all_topics_list = ProjectTopic.objects.all().order_by('order', 'name')
@@ -51,14 +57,23 @@ def topic_list(request):
     }
     return render(request, 'topics/topic_list.html', context) # Adjust template path if needed
 
+def _topic_detail_dependencies(request, topic_slug):
+    dependencies = [ProjectTopic.objects.filter(slug=topic_slug)]
+    if PORTFOLIO_APP_EXISTS:
+        dependencies.append(Project.objects.filter(topics__slug=topic_slug))
+        dependencies.append(ProjectCard.objects.filter(project__topics__slug=topic_slug))
+    return dependencies
+
+
+@conditional_page(_topic_detail_dependencies)
 def topic_detail(request, topic_slug):
     """ Displays details for a single topic and lists associated projects. """
     topic = get_object_or_404(ProjectTopic, slug=topic_slug)
     related_projects = None
     if PORTFOLIO_APP_EXISTS and Project and hasattr(topic, 'projects'):
         # Get related projects using the related_name 'projects'
-        # Prefetch skills/topics for efficiency in the template
-        related_projects = topic.projects.prefetch_related('skills', 'topics').all()
+        # Their cards carry the skills and excerpt shown in the template
+        related_projects = attach_cards(topic.projects.select_related('card'))
 
     context = {
         'topic': topic,